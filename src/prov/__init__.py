@@ -1,19 +1,20 @@
 from __future__ import annotations  # defer eval: TYPE_CHECKING names in signatures
 
-import logging
 import os
 import warnings
 from collections.abc import Iterable
 from typing import IO, TYPE_CHECKING, Any, cast
 
 if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
     from prov.model import ProvDocument, StreamOrPath
 
 __author__ = "Trung Dong Huynh"
 __email__ = "trungdong@donggiang.com"
 __version__ = "3.1.0"
 
-__all__ = ["Error", "model", "read"]
+__all__ = ["Error", "aread", "model", "read"]
 
 
 class Error(Exception):
@@ -74,7 +75,10 @@ def _detect_and_parse(
         TypeError: If no registered serializer produced a non-empty
             document from ``src``/``content``.
     """
-    # Lazy import: prov and prov.model are circularly dependent.
+    # Lazy imports: prov and prov.model are circularly dependent, and
+    # logging is kept off the import of prov.
+    import logging
+
     from prov.model import ProvDocument
 
     stream, start_pos = _prepare_stream(src)
@@ -205,3 +209,29 @@ def read(
             raise
 
     return _detect_and_parse(src, content, serializers)
+
+
+async def aread(
+    source: Any,
+    format: str | None = None,
+    executor: Executor | None = None,
+) -> ProvDocument | None:
+    """Read a :class:`~prov.model.ProvDocument` without blocking the event loop.
+
+    The asynchronous counterpart of :func:`read`: parsing runs in
+    ``executor``, and ``source`` may also be an asynchronous stream (any
+    object with an ``async read(size)`` method). See :func:`prov.aio.aread`.
+
+    Args:
+        source: An asynchronous stream, or any source :func:`read` accepts.
+        format: Serialization format, as for :func:`read` (default: ``None``,
+            meaning it is detected).
+        executor: The :class:`~concurrent.futures.Executor` to parse in
+            (default: ``None``, meaning the event loop's default executor).
+
+    Returns:
+        The deserialized :class:`~prov.model.ProvDocument`.
+    """
+    from prov.aio import aread as _aread
+
+    return await _aread(source, format, executor)
@@ -0,0 +1,423 @@
+"""Compact adjacency-list graphs of PROV documents.
+
+:class:`AdjacencyGraph` is a lightweight alternative to the NetworkX graph
+built by :func:`prov.graph.prov_to_graph`. Its nodes are small integers,
+mapped to and from the elements' :class:`~prov.identifier.QualifiedName`\\ s,
+and the edges of each relation type are held in compressed sparse row (CSR)
+arrays in both directions. Building one needs neither unification nor a
+graph library, and traversals only walk integer arrays; the graph can still
+be exported to NetworkX with :meth:`AdjacencyGraph.to_networkx` when a
+NetworkX algorithm is needed.
+
+.. moduleauthor:: Trung Dong Huynh <trungdong@donggiang.com>
+"""
+
+from __future__ import annotations  # defer eval: TYPE_CHECKING names in signatures
+
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from prov.constants import (
+    PROV_COMMUNICATION,
+    PROV_DERIVATION,
+    PROV_GENERATION,
+    PROV_USAGE,
+)
+from prov.identifier import QualifiedName
+from prov.model import ProvBundle, ProvRecord
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+__author__ = "Trung Dong Huynh"
+__email__ = "trungdong@donggiang.com"
+
+__all__ = ["LINEAGE_RELATION_TYPES", "AdjacencyGraph"]
+
+LINEAGE_RELATION_TYPES = frozenset(
+    {PROV_DERIVATION, PROV_GENERATION, PROV_USAGE, PROV_COMMUNICATION}
+)
+"""The relations followed by default by :meth:`prov.model.ProvBundle.ancestors`
+and :meth:`~prov.model.ProvBundle.descendants`: those through which data
+flows between entities and activities."""
+
+
+@dataclass(frozen=True)
+class _CSR:
+    """The edges of one relation type, grouped by node.
+
+    The ids of the edges leaving (or, for a reverse index, entering) node
+    ``n`` are ``edges[offsets[n]:offsets[n + 1]]``.
+    """
+
+    offsets: array[int]
+    edges: array[int]
+
+
+def _build_csr(node_count: int, ends: array[int], edge_ids: list[int]) -> _CSR:
+    # A counting sort of the edges by the node at their `ends` end
+    offsets = array("q", bytes(8 * (node_count + 1)))
+    for edge in edge_ids:
+        offsets[ends[edge] + 1] += 1
+    for node in range(node_count):
+        offsets[node + 1] += offsets[node]
+    positions = offsets[:-1]
+    edges = array("q", bytes(8 * len(edge_ids)))
+    for edge in edge_ids:
+        node = ends[edge]
+        edges[positions[node]] = edge
+        positions[node] += 1
+    return _CSR(offsets, edges)
+
+
+class AdjacencyGraph:
+    """A compact, integer-indexed graph of the elements and relations of a bundle.
+
+    Every element, and every element referred to by a relation, becomes a
+    node, identified by its qualified name; records sharing an identifier
+    share their node, so no unification is needed. Every relation whose
+    first two formal attributes are both set becomes an edge from the first
+    to the second (e.g. from the generated to the used entity of a
+    derivation, or from an entity to the activity that generated it), the
+    same edges :func:`prov.graph.prov_to_graph` draws. Edges thus point from
+    an element to what it depends on: following them leads to its
+    ancestors, and following them backwards to its descendants.
+
+    The graph is a snapshot: it does not follow later changes to the bundle.
+    """
+
+    def __init__(self, bundle: ProvBundle, include_bundles: bool = True):
+        """Build the graph of a bundle or document.
+
+        Args:
+            bundle: The :class:`~prov.model.ProvBundle` or
+                :class:`~prov.model.ProvDocument` to index.
+            include_bundles: For a document, whether the records of its
+                bundles are part of the graph too (default: ``True``). An
+                identifier used in several bundles is a single node.
+        """
+        self._node_ids: dict[QualifiedName, int] = {}
+        self._names: list[QualifiedName] = []
+        self._node_types: list[QualifiedName | None] = []
+        self._edge_sources = array("q")
+        self._edge_targets = array("q")
+        self._relations: list[ProvRecord] = []
+        edges_by_type: dict[QualifiedName, list[int]] = {}
+
+        bundles = [bundle]
+        if include_bundles and bundle.is_document():
+            bundles.extend(bundle.bundles)
+        for source_bundle in bundles:
+            for record in source_bundle._records:
+                if record.is_element():
+                    node = self._add_node(record.identifier)  # type: ignore[arg-type]
+                    if self._node_types[node] is None:
+                        self._node_types[node] = record.get_type()
+                    continue
+                if not record.is_relation():  # pragma: no cover -- no other kind
+                    continue
+                attribute_values = record._attributes
+                ends = [
+                    next(iter(attribute_values.get(attr_name, ())), None)
+                    for attr_name in record.FORMAL_ATTRIBUTES[:2]
+                ]
+                if ends[0] is None or ends[1] is None:
+                    continue  # only one end: not an edge
+                edge = len(self._relations)
+                self._edge_sources.append(self._add_node(ends[0]))
+                self._edge_targets.append(self._add_node(ends[1]))
+                self._relations.append(record)
+                edges_by_type.setdefault(record.get_type(), []).append(edge)
+
+        node_count = len(self._names)
+        self._forward = {
+            relation_type: _build_csr(node_count, self._edge_sources, edge_ids)
+            for relation_type, edge_ids in edges_by_type.items()
+        }
+        self._backward = {
+            relation_type: _build_csr(node_count, self._edge_targets, edge_ids)
+            for relation_type, edge_ids in edges_by_type.items()
+        }
+
+    def _add_node(self, name: QualifiedName) -> int:
+        node = self._node_ids.get(name)
+        if node is None:
+            node = self._node_ids[name] = len(self._names)
+            self._names.append(name)
+            self._node_types.append(None)
+        return node
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._node_ids
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}: {len(self._names)} nodes, "
+            f"{len(self._relations)} edges>"
+        )
+
+    @property
+    def names(self) -> Sequence[QualifiedName]:
+        """The qualified names of the nodes, indexed by node id."""
+        return self._names
+
+    @property
+    def relation_types(self) -> Iterable[QualifiedName]:
+        """The record types of the relations with at least one edge."""
+        return self._forward.keys()
+
+    def number_of_edges(self) -> int:
+        """Return the number of edges (i.e. relations drawn) in the graph."""
+        return len(self._relations)
+
+    def node_id(self, name: QualifiedName) -> int:
+        """Return the integer id of the node for a qualified name.
+
+        Raises:
+            KeyError: If there is no such node.
+        """
+        return self._node_ids[name]
+
+    def node_type(self, name: QualifiedName) -> QualifiedName | None:
+        """Return the element type a node was first declared with.
+
+        Returns:
+            E.g. :data:`~prov.constants.PROV_ENTITY`, or ``None`` for a node
+            only referred to by relations.
+
+        Raises:
+            KeyError: If there is no such node.
+        """
+        return self._node_types[self._node_ids[name]]
+
+    def edges(
+        self, relation_types: Iterable[QualifiedName] | None = None
+    ) -> Iterator[tuple[QualifiedName, QualifiedName, ProvRecord]]:
+        """Iterate over the edges as ``(from, to, relation)`` triples.
+
+        Args:
+            relation_types: Only yield the edges of relations of these record
+                types, e.g. :data:`~prov.constants.PROV_DERIVATION` (default:
+                ``None``, meaning all relations).
+        """
+        names = self._names
+        for index in self._indexes(self._forward, relation_types):
+            for edge in index.edges:
+                yield (
+                    names[self._edge_sources[edge]],
+                    names[self._edge_targets[edge]],
+                    self._relations[edge],
+                )
+
+    def induced_relations(
+        self,
+        names: Iterable[QualifiedName],
+        relation_types: Iterable[QualifiedName] | None = None,
+    ) -> Iterator[ProvRecord]:
+        """Iterate over the relations between the given nodes.
+
+        Only the edges leaving the given nodes are looked at, so this costs
+        time in proportion to those, not to the size of the graph.
+
+        Args:
+            names: Qualified names of the nodes; names with no node are
+                ignored.
+            relation_types: Only yield relations of these record types
+                (default: ``None``, meaning all relations).
+
+        Returns:
+            An iterator over the relation records whose two ends are both
+            among ``names``.
+        """
+        nodes = {self._node_ids[name] for name in names if name in self._node_ids}
+        indexes = self._indexes(self._forward, relation_types)
+        for node in nodes:
+            for index in indexes:
+                for position in range(index.offsets[node], index.offsets[node + 1]):
+                    edge = index.edges[position]
+                    if self._edge_targets[edge] in nodes:
+                        yield self._relations[edge]
+
+    def successors(
+        self,
+        name: QualifiedName,
+        relation_types: Iterable[QualifiedName] | None = None,
+    ) -> Iterator[QualifiedName]:
+        """Iterate over what a node directly depends on.
+
+        A node is yielded once for every edge leading to it.
+
+        Raises:
+            KeyError: If there is no node for ``name``.
+        """
+        node = self._node_ids[name]
+        for index in self._indexes(self._forward, relation_types):
+            for position in range(index.offsets[node], index.offsets[node + 1]):
+                yield self._names[self._edge_targets[index.edges[position]]]
+
+    def predecessors(
+        self,
+        name: QualifiedName,
+        relation_types: Iterable[QualifiedName] | None = None,
+    ) -> Iterator[QualifiedName]:
+        """Iterate over what directly depends on a node.
+
+        A node is yielded once for every edge leading from it.
+
+        Raises:
+            KeyError: If there is no node for ``name``.
+        """
+        node = self._node_ids[name]
+        for index in self._indexes(self._backward, relation_types):
+            for position in range(index.offsets[node], index.offsets[node + 1]):
+                yield self._names[self._edge_sources[index.edges[position]]]
+
+    def ancestors(
+        self,
+        *names: QualifiedName,
+        relation_types: Iterable[QualifiedName] | None = None,
+        max_depth: int | None = None,
+    ) -> Iterator[QualifiedName]:
+        """Iterate, breadth first, over everything the given nodes depend on.
+
+        Each node reachable by following edges from any of ``names`` is
+        yielded once, nearest first; the starting nodes themselves are not,
+        unless one is reachable from another. Nodes are found as the
+        iteration proceeds, so it costs time in proportion to the edges
+        visited before it is stopped.
+
+        Args:
+            *names: Qualified names of the nodes to start from.
+            relation_types: Only follow the edges of relations of these record
+                types (default: ``None``, meaning all relations).
+            max_depth: Only yield nodes at most this many edges away (default:
+                ``None``, meaning no limit).
+
+        Raises:
+            KeyError: If there is no node for one of ``names``.
+        """
+        indexes = self._indexes(self._forward, relation_types)
+        for node, _ in self._walk(names, indexes, self._edge_targets, max_depth):
+            yield self._names[node]
+
+    def descendants(
+        self,
+        *names: QualifiedName,
+        relation_types: Iterable[QualifiedName] | None = None,
+        max_depth: int | None = None,
+    ) -> Iterator[QualifiedName]:
+        """Iterate, breadth first, over everything depending on the given nodes.
+
+        As :meth:`ancestors`, but following edges backwards.
+        """
+        indexes = self._indexes(self._backward, relation_types)
+        for node, _ in self._walk(names, indexes, self._edge_sources, max_depth):
+            yield self._names[node]
+
+    def shortest_path(
+        self,
+        source: QualifiedName,
+        target: QualifiedName,
+        relation_types: Iterable[QualifiedName] | None = None,
+    ) -> list[QualifiedName] | None:
+        """Return a shortest lineage path from a node to one of its ancestors.
+
+        Args:
+            source: Qualified name of the node to start from.
+            target: Qualified name of the ancestor to reach.
+            relation_types: Only follow the edges of relations of these record
+                types (default: ``None``, meaning all relations).
+
+        Returns:
+            The qualified names of the nodes along the path, from ``source``
+            to ``target`` included, or ``None`` if ``target`` is not an
+            ancestor of ``source``.
+
+        Raises:
+            KeyError: If there is no node for ``source`` or ``target``.
+        """
+        target_node = self._node_ids[target]
+        if source == target:
+            return [source]
+        indexes = self._indexes(self._forward, relation_types)
+        reached_by: dict[int, int] = {}
+        for node, edge in self._walk((source,), indexes, self._edge_targets, None):
+            reached_by[node] = edge
+            if node == target_node:
+                break
+        else:
+            return None
+        path = [target_node]
+        source_node = self._node_ids[source]
+        while path[-1] != source_node:
+            path.append(self._edge_sources[reached_by[path[-1]]])
+        return [self._names[node] for node in reversed(path)]
+
+    def to_networkx(self) -> nx.MultiDiGraph[Any]:
+        """Export the graph as a NetworkX ``MultiDiGraph``.
+
+        Nodes are the qualified names, with their declared element type (see
+        :meth:`node_type`) under the ``"prov_type"`` node attribute; each
+        edge keeps its relation record under the ``"relation"`` edge
+        attribute, as in :func:`prov.graph.prov_to_graph`.
+
+        Raises:
+            ModuleNotFoundError: If NetworkX (the ``graph`` extra) is not
+                installed.
+        """
+        try:
+            import networkx as nx
+        except ImportError as e:  # pragma: no cover -- networkx (graph extra) absent
+            raise ModuleNotFoundError(
+                'AdjacencyGraph.to_networkx() requires the optional "graph" extra; '
+                'install "prov[graph]" to use NetworkX graph interop'
+            ) from e
+        g: nx.MultiDiGraph[Any] = nx.MultiDiGraph()
+        for name, node_type in zip(self._names, self._node_types, strict=True):
+            g.add_node(name, prov_type=node_type)
+        for source, target, relation in self.edges():
+            g.add_edge(source, target, relation=relation)
+        return g
+
+    @staticmethod
+    def _indexes(
+        indexes: dict[QualifiedName, _CSR],
+        relation_types: Iterable[QualifiedName] | None,
+    ) -> list[_CSR]:
+        if relation_types is None:
+            return list(indexes.values())
+        return [indexes[t] for t in dict.fromkeys(relation_types) if t in indexes]
+
+    def _walk(
+        self,
+        names: Iterable[QualifiedName],
+        indexes: list[_CSR],
+        ends: array[int],
+        max_depth: int | None,
+    ) -> Iterator[tuple[int, int]]:
+        # Breadth-first search from the nodes of `names`, yielding each node
+        # reached and the edge it was first reached by.
+        starts = [self._node_ids[name] for name in names]
+        seen = bytearray(len(self._names))
+        queue: deque[tuple[int, int]] = deque()
+        for node in starts:
+            queue.append((node, 0))
+        while queue:
+            node, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for index in indexes:
+                edges = index.edges
+                for position in range(index.offsets[node], index.offsets[node + 1]):
+                    edge = edges[position]
+                    next_node = ends[edge]
+                    if not seen[next_node]:
+                        seen[next_node] = 1
+                        yield next_node, edge
+                        queue.append((next_node, depth + 1))
@@ -0,0 +1,290 @@
+"""Reading and writing PROV documents from asyncio code.
+
+Parsing and encoding a document are CPU-bound and the standard serializers
+work on blocking streams, so :func:`aread` and :func:`aserialize` run them in
+an executor (by default, the event loop's thread pool) and only move data
+between it and the event loop: an asynchronous source is read in chunks on
+the loop and handed to the parser off it, and the output of a serializer is
+handed back to the loop in chunks, through a bounded queue, as it is written.
+The event loop thus stays free to serve other tasks while a large document is
+being read or written.
+
+PROV-XML and PROV-JSON-LD, whose deserializers can decode records as they are
+read, are parsed from an asynchronous source as its chunks arrive, so that
+only a chunk of the input is held in memory at a time; the other formats need
+the whole input to parse it.
+
+Asynchronous streams are duck-typed: a source needs an ``async read(size)``
+method (e.g. :class:`asyncio.StreamReader`, or a file opened with
+``aiofiles``) and a destination a ``write(data)`` method, either a coroutine
+function or, as for :class:`asyncio.StreamWriter`, a plain method paired with
+an ``async drain()``. Bytes are written unless the destination has an
+``encoding`` attribute, as text streams have.
+
+.. moduleauthor:: Trung Dong Huynh <trungdong@donggiang.com>
+"""
+
+from __future__ import annotations  # defer eval: TYPE_CHECKING names in signatures
+
+import asyncio
+import contextlib
+import functools
+import inspect
+import io
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from prov.model import ProvDocument
+
+__author__ = "Trung Dong Huynh"
+__email__ = "trungdong@donggiang.com"
+
+__all__ = ["CHUNK_SIZE", "aread", "aserialize"]
+
+CHUNK_SIZE = 1 << 16
+"""Size, in bytes or characters, of the chunks read from or written to
+asynchronous streams."""
+
+# Number of chunks an encoding thread may get ahead of a slow destination
+_QUEUE_SIZE = 16
+
+# Formats whose deserializers decode a stream as it is read (streaming=True)
+_STREAMING_FORMATS = frozenset({"jsonld", "xml"})
+
+
+def _is_async_stream(obj: Any, method: str) -> bool:
+    return inspect.iscoroutinefunction(getattr(obj, method, None))
+
+
+async def _read_all(source: Any) -> io.IOBase:
+    # Read an asynchronous source to the end, as a blocking in-memory stream
+    chunks = []
+    while chunk := await source.read(CHUNK_SIZE):
+        chunks.append(chunk)
+    if chunks and isinstance(chunks[0], str):
+        return io.StringIO("".join(chunks))
+    return io.BytesIO(b"".join(chunks))
+
+
+class _ChunkReader(io.RawIOBase):
+    """A blocking binary stream reading an asynchronous source.
+
+    A parser reads from it in an executor thread; whenever its last chunk is
+    used up, the next one is read from the source on the event loop, text
+    being encoded as UTF-8.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, source: Any):
+        self._loop = loop
+        self._source = source
+        self._chunk = b""
+        self._offset = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        if self._offset == len(self._chunk):
+            chunk = asyncio.run_coroutine_threadsafe(
+                self._source.read(CHUNK_SIZE), self._loop
+            ).result()
+            self._chunk = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+            self._offset = 0
+        size = min(len(buffer), len(self._chunk) - self._offset)
+        buffer[:size] = self._chunk[self._offset : self._offset + size]
+        self._offset += size
+        return size
+
+
+async def aread(
+    source: Any,
+    format: str | None = None,
+    executor: Executor | None = None,
+) -> ProvDocument | None:
+    """Read a document without blocking the event loop.
+
+    The asynchronous counterpart of :func:`prov.read`, which runs in
+    ``executor``. An asynchronous stream is read on the event loop, in chunks
+    of :data:`CHUNK_SIZE`: in PROV-XML or PROV-JSON-LD, each chunk is handed
+    to the deserializer as it is read, with ``streaming=True`` (unless
+    ``executor`` runs in another process); in any other case, the stream is
+    first read to the end. Any other source (a path, raw content or a
+    blocking stream) is passed on to :func:`prov.read`, so that a file is also
+    read in the executor.
+
+    Args:
+        source: An asynchronous stream, or any source :func:`prov.read`
+            accepts.
+        format: Serialization format, as for :func:`prov.read` (default:
+            ``None``, meaning it is detected).
+        executor: The :class:`~concurrent.futures.Executor` to parse in
+            (default: ``None``, meaning the event loop's default executor).
+            Parsers hold the GIL for long stretches; with a
+            :class:`~concurrent.futures.ProcessPoolExecutor`, parsing does
+            not slow the event loop's thread down at all, at the cost of
+            sending the document back to it.
+
+    Returns:
+        The deserialized :class:`~prov.model.ProvDocument`.
+
+    Raises:
+        TypeError: If ``format`` is ``None`` and the format could not be
+            detected (see :func:`prov.read`).
+        ProvJSONLDException: If an asynchronous PROV-JSON-LD stream does not
+            hold valid JSON (as the streaming deserializer reports it).
+    """
+    from prov import read
+    from prov.model import ProvDocument
+
+    loop = asyncio.get_running_loop()
+    if _is_async_stream(source, "read"):
+        if (
+            format is not None
+            and format.lower() in _STREAMING_FORMATS
+            and not isinstance(executor, ProcessPoolExecutor)
+        ):
+            deserialize = functools.partial(
+                ProvDocument.deserialize,
+                _ChunkReader(loop, source),
+                format=format.lower(),
+                streaming=True,
+            )
+            return await loop.run_in_executor(executor, deserialize)
+        source = await _read_all(source)
+    return await loop.run_in_executor(executor, read, source, format)
+
+
+class _ChunkWriter(io.TextIOBase):
+    """A blocking text stream passing what is written to the event loop.
+
+    A serializer writes to it in an executor thread; whenever
+    :data:`CHUNK_SIZE` characters have been buffered, they are put in a
+    bounded queue read by the event loop, blocking the thread while the
+    queue is full. Once :meth:`abort` is called, it raises instead, so as to
+    stop the serializer.
+    """
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue[str | None]
+    ):
+        self._loop = loop
+        self._queue = queue
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._aborted = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= CHUNK_SIZE:
+            self.flush()
+        return len(text)
+
+    def flush(self) -> None:
+        if self._buffer:
+            # A serializer may write its whole output at once (e.g. PROV-N)
+            text = "".join(self._buffer)
+            for start in range(0, len(text), CHUNK_SIZE):
+                self._put(text[start : start + CHUNK_SIZE])
+            self._buffer = []
+            self._buffered = 0
+
+    def finish(self) -> None:
+        self.flush()
+        self._put(None)
+
+    def abort(self) -> None:
+        # Called on the event loop once the chunks are no longer read
+        self._aborted = True
+
+    def _put(self, chunk: str | None) -> None:
+        if self._aborted:
+            raise OSError("The serialization was aborted")
+        asyncio.run_coroutine_threadsafe(self._queue.put(chunk), self._loop).result()
+
+
+async def _write_chunks(
+    destination: Any, queue: asyncio.Queue[str | None], text: bool
+) -> None:
+    write_is_async = _is_async_stream(destination, "write")
+    drain = getattr(destination, "drain", None)
+    while (chunk := await queue.get()) is not None:
+        data = chunk if text else chunk.encode("utf-8")
+        if write_is_async:
+            await destination.write(data)
+        else:
+            destination.write(data)
+            if drain is not None:
+                await drain()
+
+
+async def aserialize(
+    document: ProvDocument,
+    destination: Any = None,
+    format: str = "json",
+    executor: Executor | None = None,
+    **args: Any,
+) -> str | None:
+    """Serialize a document without blocking the event loop.
+
+    The asynchronous counterpart of
+    :meth:`~prov.model.ProvDocument.serialize`, which runs in ``executor``.
+    For an asynchronous stream ``destination``, the serializer writes to a
+    stream passing its output back to the event loop in chunks of
+    :data:`CHUNK_SIZE`, which are written to ``destination`` while the
+    encoding goes on; at most a few chunks are held in memory at a time.
+
+    The document is read in the executor's thread, so the record stores of
+    the document and its bundles must allow it: the in-memory store does,
+    and so does :class:`~prov.model.store.SQLiteRecordStore`, unless it was
+    given a connection opened with ``check_same_thread=True``.
+
+    Args:
+        document: The document to serialize.
+        destination: An asynchronous stream, a blocking stream or a local
+            file path to write to. If ``None``, the serialization is returned
+            as a string (default: ``None``).
+        format: The serialization format (default: ``"json"``).
+        executor: The :class:`~concurrent.futures.Executor` to encode in
+            (default: ``None``, meaning the event loop's default executor).
+            It must run the serializer in a thread of this process.
+        **args: Extra keyword arguments passed to the serializer.
+
+    Returns:
+        The serialization as a string if no ``destination`` was given,
+        otherwise ``None``.
+    """
+    loop = asyncio.get_running_loop()
+    if not _is_async_stream(destination, "write") and not hasattr(destination, "drain"):
+        serialize = functools.partial(
+            document.serialize, destination, format=format, **args
+        )
+        return await loop.run_in_executor(executor, serialize)
+
+    queue: asyncio.Queue[str | None] = asyncio.Queue(_QUEUE_SIZE)
+    writer = _ChunkWriter(loop, queue)
+
+    def encode() -> None:
+        try:
+            document.serialize(writer, format=format, **args)
+        finally:
+            writer.finish()
+
+    encoding = loop.run_in_executor(executor, encode)
+    try:
+        await _write_chunks(destination, queue, hasattr(destination, "encoding"))
+    except BaseException:
+        # Stop the encoding thread at its next write, after making room for
+        # the chunk it may be waiting to queue
+        writer.abort()
+        while not queue.empty():
+            queue.get_nowait()
+        with contextlib.suppress(Exception):
+            await encoding
+        raise
+    await encoding
+    return None
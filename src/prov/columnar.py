@@ -0,0 +1,595 @@
+"""Columnar (table-per-record-type) export and import of PROV documents.
+
+:func:`prov_to_columns` lays a document out as one table per PROV record
+type, with a row per record: its bundle, its identifier and one column per
+formal attribute. Time attributes (``prov:time``, ``prov:startTime``,
+``prov:endTime``) are kept as :class:`datetime.datetime` columns; all other
+string-valued columns are :class:`DictionaryColumn`\\ s, which store each
+distinct string once and the column itself as an array of integer indices.
+Non-formal attributes, which can be repeated, go into a single long-format
+``attributes`` table keyed by record type and row.
+
+The result converts to `Apache Arrow <https://arrow.apache.org/>`_ tables
+(dictionary columns become zero-copy ``DictionaryArray`` indices) and, via
+Arrow, to pandas data frames. :func:`columns_to_prov` reverses the export.
+
+Qualified names are written as ``prefix:local`` strings, with a prefix their
+bundle (or, for bundle identifiers, the document) resolves to the name's
+namespace URI, which need not be the prefix the name was created with.
+
+.. moduleauthor:: Trung Dong Huynh <trungdong@donggiang.com>
+"""
+
+from __future__ import annotations  # defer eval: pyarrow types in signatures
+
+import array
+import datetime
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, TypeAlias
+
+from prov.constants import (
+    PROV_ATTRIBUTE_LITERALS,
+    PROV_QUALIFIEDNAME,
+    XSD_ANYURI,
+    XSD_BOOLEAN,
+    XSD_DATETIME,
+)
+from prov.identifier import Identifier, Namespace, QualifiedName
+from prov.model import (
+    PROV_REC_CLS,
+    Literal,
+    NamespaceManager,
+    ProvBundle,
+    ProvDocument,
+    canonical_xsd_datatype,
+)
+
+if TYPE_CHECKING:
+    import pandas
+    import pyarrow
+
+__author__ = "Trung Dong Huynh"
+__email__ = "trungdong@donggiang.com"
+
+__all__ = [
+    "ColumnarDocument",
+    "DictionaryColumn",
+    "columns_to_prov",
+    "prov_to_columns",
+]
+
+_NULL_INDEX = -1
+
+
+class DictionaryColumn:
+    """A dictionary-encoded column of optional strings.
+
+    Each distinct string is stored once in :attr:`dictionary`; the column
+    values are the positions of their strings in it, held in :attr:`indices`
+    (a compact ``array.array`` of C ints), with ``-1`` marking a null value.
+    """
+
+    def __init__(
+        self,
+        dictionary: Iterable[str] = (),
+        indices: Iterable[int] = (),
+    ):
+        """Create a column, empty by default.
+
+        Args:
+            dictionary: The distinct strings of the column (default: empty).
+            indices: The column values, as positions in ``dictionary`` or
+                ``-1`` for null (default: empty).
+        """
+        self.dictionary: list[str] = list(dictionary)
+        self.indices: array.array[int] = array.array("i", indices)
+        self._positions = {value: i for i, value in enumerate(self.dictionary)}
+
+    def append(self, value: str | None) -> None:
+        """Append a value, adding it to the dictionary if it is new.
+
+        Args:
+            value: The string to append, or ``None`` for a null value.
+        """
+        if value is None:
+            self.indices.append(_NULL_INDEX)
+            return
+        position = self._positions.get(value)
+        if position is None:
+            position = self._positions[value] = len(self.dictionary)
+            self.dictionary.append(value)
+        self.indices.append(position)
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, i: int) -> str | None:
+        index = self.indices[i]
+        return self.dictionary[index] if index != _NULL_INDEX else None
+
+    def __iter__(self) -> Iterator[str | None]:
+        dictionary = self.dictionary
+        return (
+            dictionary[index] if index != _NULL_INDEX else None
+            for index in self.indices
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, DictionaryColumn):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {len(self)} values, {len(self.dictionary)} distinct>"
+
+
+Column: TypeAlias = (
+    "DictionaryColumn | list[datetime.datetime | None] | array.array[int]"
+)
+"""A table column: dictionary-encoded strings, datetimes or integers."""
+
+Table: TypeAlias = "dict[str, Column]"
+"""A table, as its columns keyed by name; all columns have the same length."""
+
+
+@dataclass
+class ColumnarDocument:
+    """A PROV document laid out as tables (see the module documentation).
+
+    In every table, a ``bundle`` column holds the identifier of the bundle a
+    row belongs to, or null for the document's own records and namespaces.
+    """
+
+    namespaces: Table = field(default_factory=dict)
+    """Namespace declarations: ``bundle``, ``prefix`` (null for a default
+    namespace) and ``uri``."""
+    bundles: Table = field(default_factory=dict)
+    """The document's bundles, in an ``identifier`` column."""
+    records: dict[QualifiedName, Table] = field(default_factory=dict)
+    """A table per record type found in the document, keyed by the type. Its
+    columns are ``bundle``, ``identifier`` and one per formal attribute of
+    the type, named after the attribute (e.g. ``"prov:entity"``)."""
+    attributes: Table = field(default_factory=dict)
+    """Non-formal attributes in long format: ``record_type`` and ``row`` (the
+    record's row in the table of its type), then ``attribute``, ``value``
+    (its lexical form), ``datatype`` and ``langtag``."""
+
+    def tables(self) -> dict[str, Table]:
+        """Return all tables keyed by name.
+
+        The record tables are named after their record type (e.g.
+        ``"prov:Entity"``), next to ``"namespaces"``, ``"bundles"`` and
+        ``"attributes"``.
+        """
+        tables = {"namespaces": self.namespaces, "bundles": self.bundles}
+        tables.update(
+            (str(record_type), table) for record_type, table in self.records.items()
+        )
+        tables["attributes"] = self.attributes
+        return tables
+
+    def to_arrow(self) -> dict[str, pyarrow.Table]:
+        """Convert the tables to Apache Arrow tables.
+
+        Dictionary columns become ``dictionary<int32, string>`` arrays whose
+        indices share the memory of :attr:`DictionaryColumn.indices`; datetime
+        columns become ``timestamp[us]`` arrays, with a ``UTC`` time zone if
+        any value in the column is timezone-aware (naive values in such a
+        column are taken to be in UTC).
+
+        Returns:
+            The ``pyarrow.Table``\\ s keyed by table name (see :meth:`tables`).
+
+        Raises:
+            ModuleNotFoundError: If ``pyarrow`` is not installed.
+        """
+        pa = _import_pyarrow()
+        return {
+            name: pa.table(
+                {
+                    column_name: _column_to_arrow(pa, column)
+                    for column_name, column in table.items()
+                }
+            )
+            for name, table in self.tables().items()
+        }
+
+    @classmethod
+    def from_arrow(cls, tables: dict[str, pyarrow.Table]) -> ColumnarDocument:
+        """Create a columnar document from Apache Arrow tables.
+
+        Args:
+            tables: Tables as produced by :meth:`to_arrow`. Plain string
+                columns are accepted in place of dictionary-encoded ones.
+
+        Returns:
+            The corresponding :class:`ColumnarDocument`.
+
+        Raises:
+            ModuleNotFoundError: If ``pyarrow`` is not installed.
+            KeyError: If a table is named after an unknown record type.
+        """
+        pa = _import_pyarrow()
+        record_types = {str(record_type): record_type for record_type in PROV_REC_CLS}
+        columnar = cls()
+        for name, arrow_table in tables.items():
+            table = {
+                column_name: _column_from_arrow(pa, arrow_table.column(column_name))
+                for column_name in arrow_table.column_names
+            }
+            if name in ("namespaces", "bundles", "attributes"):
+                setattr(columnar, name, table)
+            else:
+                columnar.records[record_types[name]] = table
+        return columnar
+
+    def to_pandas(self) -> dict[str, pandas.DataFrame]:
+        """Convert the tables to pandas data frames, through :meth:`to_arrow`.
+
+        Dictionary columns become categorical columns.
+
+        Returns:
+            The ``pandas.DataFrame``\\ s keyed by table name.
+
+        Raises:
+            ModuleNotFoundError: If ``pyarrow`` or ``pandas`` is not installed.
+        """
+        return {name: table.to_pandas() for name, table in self.to_arrow().items()}
+
+    @classmethod
+    def from_pandas(cls, frames: dict[str, pandas.DataFrame]) -> ColumnarDocument:
+        """Create a columnar document from pandas data frames.
+
+        Args:
+            frames: Data frames as produced by :meth:`to_pandas`.
+
+        Returns:
+            The corresponding :class:`ColumnarDocument`.
+
+        Raises:
+            ModuleNotFoundError: If ``pyarrow`` or ``pandas`` is not installed.
+        """
+        pa = _import_pyarrow()
+        return cls.from_arrow(
+            {
+                name: pa.Table.from_pandas(frame, preserve_index=False)
+                for name, frame in frames.items()
+            }
+        )
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.compute
+    except ImportError as e:  # pragma: no cover -- pyarrow absent
+        raise ModuleNotFoundError(
+            "Arrow and pandas conversion of prov.columnar tables requires "
+            "pyarrow; install it with: pip install pyarrow"
+        ) from e
+    return pyarrow
+
+
+def _column_to_arrow(pa: Any, column: Column) -> Any:
+    if isinstance(column, DictionaryColumn):
+        indices = pa.Array.from_buffers(
+            pa.int32(), len(column), [None, pa.py_buffer(column.indices)]
+        )
+        if _NULL_INDEX in column.indices:
+            # Only columns holding nulls need their own indices with a validity
+            # bitmap; the others keep sharing the column's buffer.
+            indices = pa.compute.if_else(
+                pa.compute.equal(indices, _NULL_INDEX),
+                pa.scalar(None, pa.int32()),
+                indices,
+            )
+        return pa.DictionaryArray.from_arrays(
+            indices, pa.array(column.dictionary, pa.string())
+        )
+    if isinstance(column, array.array):
+        return pa.array(column, pa.int64())
+    if any(value is not None and value.tzinfo is not None for value in column):
+        utc = datetime.timezone.utc
+        return pa.array(
+            [
+                value
+                if value is None
+                else value.replace(tzinfo=utc)
+                if value.tzinfo is None
+                else value.astimezone(utc)
+                for value in column
+            ],
+            pa.timestamp("us", tz="UTC"),
+        )
+    return pa.array(column, pa.timestamp("us"))
+
+
+def _column_from_arrow(pa: Any, column: Any) -> Column:
+    column = column.combine_chunks() if hasattr(column, "combine_chunks") else column
+    if pa.types.is_timestamp(column.type):
+        return list(column.cast(pa.timestamp("us", tz=column.type.tz)).to_pylist())
+    if pa.types.is_integer(column.type):
+        return array.array("q", column.to_pylist())
+    if pa.types.is_null(column.type):
+        return DictionaryColumn((), [_NULL_INDEX] * len(column))
+    if not pa.types.is_dictionary(column.type):
+        column = column.dictionary_encode()
+    indices = column.indices.fill_null(_NULL_INDEX)
+    return DictionaryColumn(column.dictionary.to_pylist(), indices.to_pylist())
+
+
+def _scope_prefixes(bundle: ProvBundle) -> dict[str, str]:
+    # For each namespace URI, a prefix the bundle resolves to it. The bundle's
+    # own prefixes shadow its document's, and a name's own prefix may be bound
+    # to another URI in the scope it is written in (e.g. a bundle identifier)
+    bound: dict[str, Namespace] = {}
+    manager: NamespaceManager | None = bundle._namespaces
+    while manager is not None:
+        for prefix, namespace in manager.items():
+            bound.setdefault(prefix, namespace)
+        manager = manager.parent
+    prefixes: dict[str, str] = {}
+    for prefix, namespace in bound.items():
+        if prefix or namespace.uri not in prefixes:
+            prefixes[namespace.uri] = prefix
+    return prefixes
+
+
+def _name(prefixes: dict[str, str], qname: Identifier | None) -> str:
+    # A qualified name as a string resolving back to it (see _scope_prefixes)
+    if not isinstance(qname, QualifiedName):
+        return str(qname)
+    namespace = qname.namespace
+    if prefixes.get(namespace.uri, namespace.prefix) == namespace.prefix:
+        return str(qname)
+    prefix = prefixes[namespace.uri]
+    return f"{prefix}:{qname.localpart}" if prefix else qname.localpart
+
+
+def _encode_value(
+    prefixes: dict[str, str], value: Any
+) -> tuple[str, str | None, str | None]:
+    # The lexical form, datatype and language tag of an attribute value
+    if isinstance(value, Literal):
+        datatype = value.datatype
+        return (
+            value.value,
+            _name(prefixes, datatype) if datatype is not None else None,
+            value.langtag,
+        )
+    if isinstance(value, QualifiedName):
+        return _name(prefixes, value), str(PROV_QUALIFIEDNAME), None
+    if isinstance(value, Identifier):
+        return value.uri, str(XSD_ANYURI), None
+    if isinstance(value, bool):
+        return ("true" if value else "false"), str(XSD_BOOLEAN), None
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(), str(XSD_DATETIME), None
+    if (datatype := canonical_xsd_datatype(value)) is not None:
+        return (
+            (repr(value) if isinstance(value, float) else str(value)),
+            str(datatype),
+            None,
+        )
+    return str(value), None, None
+
+
+def prov_to_columns(prov_bundle: ProvBundle) -> ColumnarDocument:
+    """Convert a document (or a single bundle) into a :class:`ColumnarDocument`.
+
+    Args:
+        prov_bundle: The :class:`~prov.model.ProvDocument` to convert, with
+            its bundles; a :class:`~prov.model.ProvBundle` is converted as if
+            its records were a document's own.
+
+    Returns:
+        The document's tables.
+    """
+    ns_bundles, ns_prefixes, ns_uris = (DictionaryColumn() for _ in range(3))
+    bundle_ids = DictionaryColumn()
+    attr_types, attr_names, attr_values, attr_datatypes, attr_langtags = (
+        DictionaryColumn() for _ in range(5)
+    )
+    attr_rows: array.array[int] = array.array("q")
+    # Per record type: its bundle and identifier columns, and formal columns
+    record_columns: dict[
+        QualifiedName, tuple[DictionaryColumn, DictionaryColumn, list[Column]]
+    ] = {}
+
+    bundles: list[tuple[str | None, ProvBundle]] = [(None, prov_bundle)]
+    if prov_bundle.is_document():
+        document_prefixes = _scope_prefixes(prov_bundle)
+        for bundle in prov_bundle.bundles:
+            name = _name(document_prefixes, bundle.identifier)
+            bundle_ids.append(name)
+            bundles.append((name, bundle))
+
+    for bundle_id, bundle in bundles:
+        prefixes = _scope_prefixes(bundle)
+        default_namespace = bundle.get_default_namespace()
+        if default_namespace is not None:
+            ns_bundles.append(bundle_id)
+            ns_prefixes.append(None)
+            ns_uris.append(default_namespace.uri)
+        for namespace in sorted(bundle.namespaces, key=lambda ns: ns.prefix):
+            ns_bundles.append(bundle_id)
+            ns_prefixes.append(namespace.prefix)
+            ns_uris.append(namespace.uri)
+
+        for record in bundle._records:
+            record_type = record.get_type()
+            columns = record_columns.get(record_type)
+            if columns is None:
+                columns = record_columns[record_type] = (
+                    DictionaryColumn(),
+                    DictionaryColumn(),
+                    [
+                        [] if attr in PROV_ATTRIBUTE_LITERALS else DictionaryColumn()
+                        for attr in record.FORMAL_ATTRIBUTES
+                    ],
+                )
+            bundle_column, identifier_column, formal_columns = columns
+            row = len(bundle_column)
+            bundle_column.append(bundle_id)
+            identifier = record.identifier
+            identifier_column.append(
+                _name(prefixes, identifier) if identifier is not None else None
+            )
+            for column, value in zip(formal_columns, record.args, strict=True):
+                if isinstance(column, DictionaryColumn):
+                    column.append(_name(prefixes, value) if value is not None else None)
+                elif isinstance(column, list):
+                    column.append(value)
+            record_type_name = str(record_type)
+            for attr, value in record.extra_attributes:
+                lexical, datatype, langtag = _encode_value(prefixes, value)
+                attr_types.append(record_type_name)
+                attr_rows.append(row)
+                attr_names.append(_name(prefixes, attr))
+                attr_values.append(lexical)
+                attr_datatypes.append(datatype)
+                attr_langtags.append(langtag)
+
+    records: dict[QualifiedName, Table] = {}
+    for record_type, (
+        bundle_column,
+        identifier_column,
+        formal_columns,
+    ) in record_columns.items():
+        table: Table = {"bundle": bundle_column, "identifier": identifier_column}
+        table.update(
+            (str(attr), column)
+            for attr, column in zip(
+                PROV_REC_CLS[record_type].FORMAL_ATTRIBUTES, formal_columns, strict=True
+            )
+        )
+        records[record_type] = table
+    return ColumnarDocument(
+        namespaces={"bundle": ns_bundles, "prefix": ns_prefixes, "uri": ns_uris},
+        bundles={"identifier": bundle_ids},
+        records=records,
+        attributes={
+            "record_type": attr_types,
+            "row": attr_rows,
+            "attribute": attr_names,
+            "value": attr_values,
+            "datatype": attr_datatypes,
+            "langtag": attr_langtags,
+        },
+    )
+
+
+def _string_column(table: Table, name: str) -> DictionaryColumn:
+    # A table's string column, empty if the table does not have it
+    column = table.get(name)
+    if column is None:
+        return DictionaryColumn()
+    if not isinstance(column, DictionaryColumn):
+        raise TypeError(f'Column "{name}" does not hold strings')
+    return column
+
+
+def _decode_value(
+    bundle: ProvBundle, lexical: str, datatype: str | None, langtag: str | None
+) -> Any:
+    # The inverse of _encode_value; typed literals are turned back into
+    # Python values by the record when the attribute is added to it.
+    if datatype is None and langtag is None:
+        return lexical
+    datatype_qname = bundle.valid_qualified_name(datatype) if datatype else None
+    return Literal(lexical, datatype_qname, langtag)
+
+
+def columns_to_prov(columnar: ColumnarDocument) -> ProvDocument:
+    """Convert a :class:`ColumnarDocument` back into a document.
+
+    Records are added table by table, so the order of records of different
+    types is not preserved, but the resulting document is equal to the one
+    originally passed to :func:`prov_to_columns`.
+
+    Args:
+        columnar: The tables to convert.
+
+    Returns:
+        A new :class:`~prov.model.ProvDocument`.
+    """
+    document = ProvDocument()
+    bundles: dict[str, ProvBundle] = {}
+
+    def target(bundle_id: str | None) -> ProvBundle:
+        if bundle_id is None:
+            return document
+        bundle = bundles.get(bundle_id)
+        if bundle is None:
+            bundle = bundles[bundle_id] = document.bundle(bundle_id)
+        return bundle
+
+    # The document's own namespaces first, so that bundle identifiers resolve.
+    namespaces = columnar.namespaces
+    declarations = sorted(
+        zip(
+            _string_column(namespaces, "bundle"),
+            _string_column(namespaces, "prefix"),
+            _string_column(namespaces, "uri"),
+            strict=True,
+        ),
+        key=lambda declaration: declaration[0] is not None,
+    )
+    for bundle_id, prefix, uri in declarations:
+        if uri is None:
+            continue
+        bundle = target(bundle_id)
+        if prefix is None:
+            bundle.set_default_namespace(uri)
+        else:
+            bundle.add_namespace(prefix, uri)
+    for bundle_id in _string_column(columnar.bundles, "identifier"):
+        target(bundle_id)
+
+    attributes = columnar.attributes
+    rows = attributes.get("row", array.array("q"))
+    if not isinstance(rows, array.array):
+        raise TypeError('Column "row" does not hold integers')
+    extras: dict[
+        tuple[str | None, int], list[tuple[str, str, str | None, str | None]]
+    ] = defaultdict(list)
+    for record_type_name, row, attr, lexical, datatype, langtag in zip(
+        _string_column(attributes, "record_type"),
+        rows,
+        _string_column(attributes, "attribute"),
+        _string_column(attributes, "value"),
+        _string_column(attributes, "datatype"),
+        _string_column(attributes, "langtag"),
+        strict=True,
+    ):
+        if attr is None or lexical is None:
+            raise ValueError("Attribute names and values cannot be null")
+        extras[(record_type_name, row)].append((attr, lexical, datatype, langtag))
+
+    for record_type, table in columnar.records.items():
+        record_type_name = str(record_type)
+        formal_names = PROV_REC_CLS[record_type].FORMAL_ATTRIBUTES
+        formal_columns = [table.get(str(attr)) for attr in formal_names]
+        for row, (bundle_id, identifier) in enumerate(
+            zip(
+                _string_column(table, "bundle"),
+                _string_column(table, "identifier"),
+                strict=True,
+            )
+        ):
+            bundle = target(bundle_id)
+            formal = [
+                (attr, column[row])
+                for attr, column in zip(formal_names, formal_columns, strict=True)
+                if column is not None and column[row] is not None
+            ]
+            other = [
+                (attr, _decode_value(bundle, lexical, datatype, langtag))
+                for attr, lexical, datatype, langtag in extras.get(
+                    (record_type_name, row), ()
+                )
+            ]
+            bundle.new_record(record_type, identifier, formal, other)
+    return document
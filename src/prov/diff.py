@@ -0,0 +1,162 @@
+"""Structural diff of two PROV documents.
+
+Records are bucketed by a key -- ``(record type, identifier)`` for identified
+records, and the record's own :meth:`~prov.model.ProvRecord.digest` for
+anonymous ones -- and each bucket is compared through the records' digests,
+so a whole diff costs O(n) in the number of records rather than the
+quadratic pairwise search of :meth:`prov.model.ProvBundle.__eq__`.
+
+.. moduleauthor:: Trung Dong Huynh <trungdong@donggiang.com>
+"""
+
+from __future__ import annotations  # defer eval: TYPE_CHECKING names in signatures
+
+from collections import defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from prov.identifier import QualifiedName
+from prov.model import ProvBundle, ProvDocument, ProvRecord
+
+__author__ = "Trung Dong Huynh"
+__email__ = "trungdong@donggiang.com"
+
+__all__ = [
+    "ADDED",
+    "CHANGED",
+    "REMOVED",
+    "RecordDiff",
+    "diff_bundles",
+    "diff_documents",
+]
+
+ADDED = "added"
+"""Change kind of records found only in the second document."""
+REMOVED = "removed"
+"""Change kind of records found only in the first document."""
+CHANGED = "changed"
+"""Change kind of an identified record whose content differs between documents."""
+
+_RecordKey = tuple[QualifiedName, QualifiedName | None, str | None]
+
+
+@dataclass(frozen=True)
+class RecordDiff:
+    """One difference between two documents, for a single record key.
+
+    ``old`` holds the first document's records for the key and ``new`` the
+    second's; one of them is empty for an :data:`ADDED` or :data:`REMOVED`
+    difference. Several records can share a key when an identifier is
+    asserted more than once (see :meth:`~prov.model.ProvBundle.unified`).
+    """
+
+    change: str
+    """One of :data:`ADDED`, :data:`REMOVED` or :data:`CHANGED`."""
+    bundle: QualifiedName | None
+    """Identifier of the bundle holding the records, ``None`` for the document."""
+    record_type: QualifiedName
+    """The PROV type of the records."""
+    identifier: QualifiedName | None
+    """The records' identifier, ``None`` for anonymous relations."""
+    old: tuple[ProvRecord, ...]
+    """The records for the key in the first document."""
+    new: tuple[ProvRecord, ...]
+    """The records for the key in the second document."""
+
+
+def _bucket_records(bundle: ProvBundle) -> dict[_RecordKey, list[ProvRecord]]:
+    """Group a bundle's records by their diff key, keeping assertion order."""
+    buckets: dict[_RecordKey, list[ProvRecord]] = defaultdict(list)
+    for record in bundle._records:
+        identifier = record.identifier
+        key = (
+            (record.get_type(), identifier, None)
+            if identifier is not None
+            else (record.get_type(), None, record.digest())
+        )
+        buckets[key].append(record)
+    return buckets
+
+
+def _digests(records: list[ProvRecord]) -> frozenset[str]:
+    return frozenset(record.digest() for record in records)
+
+
+def diff_bundles(
+    bundle1: ProvBundle | None,
+    bundle2: ProvBundle | None,
+    bundle_id: QualifiedName | None = None,
+) -> Iterator[RecordDiff]:
+    """Yield the record differences between two bundles.
+
+    Records are matched by ``(record type, identifier)``; a key present on
+    both sides whose records do not hold the same set of digests is reported
+    as :data:`CHANGED`. Anonymous records can only be matched by content, so
+    they are only ever :data:`ADDED` or :data:`REMOVED`. Removed and changed
+    keys are yielded in the first bundle's record order, followed by added
+    keys in the second bundle's record order. Like bundle equality, repeated
+    identical records count once.
+
+    Args:
+        bundle1: The first (old) bundle, or ``None`` if it does not exist.
+        bundle2: The second (new) bundle, or ``None`` if it does not exist.
+        bundle_id: The bundle identifier reported on each difference
+            (default: ``None``, for a document's top-level records).
+
+    Yields:
+        A :class:`RecordDiff` per differing record key.
+    """
+    buckets1 = _bucket_records(bundle1) if bundle1 is not None else {}
+    buckets2 = _bucket_records(bundle2) if bundle2 is not None else {}
+    for key, old_records in buckets1.items():
+        record_type, identifier, _ = key
+        new_records = buckets2.get(key)
+        if new_records is None:
+            yield RecordDiff(
+                REMOVED, bundle_id, record_type, identifier, tuple(old_records), ()
+            )
+        elif _digests(old_records) != _digests(new_records):
+            yield RecordDiff(
+                CHANGED,
+                bundle_id,
+                record_type,
+                identifier,
+                tuple(old_records),
+                tuple(new_records),
+            )
+    for key, new_records in buckets2.items():
+        if key not in buckets1:
+            record_type, identifier, _ = key
+            yield RecordDiff(
+                ADDED, bundle_id, record_type, identifier, (), tuple(new_records)
+            )
+
+
+def diff_documents(
+    document1: ProvDocument, document2: ProvDocument
+) -> Iterator[RecordDiff]:
+    """Yield the record differences between two documents, bundle by bundle.
+
+    The documents' top-level records are compared first, then each named
+    bundle of either document, matched by identifier (see
+    :func:`diff_bundles`). A bundle present in only one document has all of
+    its records reported as :data:`REMOVED` or :data:`ADDED`. Differences are
+    produced lazily, so they can be written out as they are found. The
+    documents are equal (in the sense of their
+    :meth:`~prov.model.ProvDocument.digest`) exactly when nothing is yielded.
+
+    Args:
+        document1: The first (old) document.
+        document2: The second (new) document.
+
+    Yields:
+        A :class:`RecordDiff` per differing record key.
+    """
+    yield from diff_bundles(document1, document2)
+    bundles2 = {bundle.identifier: bundle for bundle in document2.bundles}
+    for bundle1 in document1.bundles:
+        yield from diff_bundles(
+            bundle1, bundles2.pop(bundle1.identifier, None), bundle1.identifier
+        )
+    for bundle_id, bundle2 in bundles2.items():
+        yield from diff_bundles(None, bundle2, bundle_id)
@@ -12,11 +12,13 @@ References:
 .. moduleauthor:: Trung Dong Huynh <trungdong@donggiang.com>
 """
 
+import contextlib
+import re
 import typing
 from dataclasses import dataclass, field
 from datetime import datetime
 from html import escape
-from typing import Any
+from typing import IO, Any
 
 try:
     import pydot
@@ -50,6 +52,7 @@ from prov.model import (
     PROV_START,
     PROV_USAGE,
     Identifier,
+    PathLike,
     ProvActivity,
     ProvAgent,
     ProvBundle,
@@ -182,6 +185,9 @@ ANNOTATION_ROW_TEMPLATE = """    <TR>
         <TD align=\"left\" href=\"%s\">%s</TD>
         <TD align=\"left\"%s>%s</TD>
     </TR>"""
+ANNOTATION_OMITTED_ROW_TEMPLATE = """    <TR>
+        <TD align=\"left\" colspan=\"2\">(%d more)</TD>
+    </TR>"""
 ANNOTATION_END_ROW = "    </TABLE>>"
 
 
@@ -228,13 +234,19 @@ class _DotRenderState:
     annotation_count: int = 0
 
 
-def _attach_attribute_annotation(
-    state: _DotRenderState,
-    dot: DotContainer,
-    node: pydot.Node,
+def _truncated(text: str, max_length: int | None) -> str:
+    if max_length is None or len(text) <= max_length:
+        return text
+    return text[:max_length] + "\u2026"
+
+
+def _annotation_label(
     record: ProvRecord,
-) -> None:
-    # Adding a node to show all attributes
+    max_attributes: int | None = None,
+    max_value_length: int | None = None,
+) -> str | None:
+    # The HTML-like label of the annotation node showing a record's
+    # non-element attributes, or None if it has no such attribute
     attributes = [
         (attr_name, value)
         for attr_name, value in record.attributes
@@ -242,10 +254,14 @@ def _attach_attribute_annotation(
     ]
 
     if not attributes:
-        return  # No attribute to display
+        return None  # No attribute to display
 
     # Sort the attributes.
     attributes = sorted_attributes(record.get_type(), attributes)
+    omitted = 0
+    if max_attributes is not None and len(attributes) > max_attributes:
+        omitted = len(attributes) - max_attributes
+        attributes = attributes[:max_attributes]
 
     ann_rows = [ANNOTATION_START_ROW]
     ann_rows.extend(
@@ -255,17 +271,35 @@ def _attach_attribute_annotation(
             escape(str(attr)),
             f' href="{value.uri}"' if isinstance(value, Identifier) else "",
             escape(
-                str(value)
-                if not isinstance(value, datetime)
-                else str(value.isoformat())
+                _truncated(
+                    str(value)
+                    if not isinstance(value, datetime)
+                    else str(value.isoformat()),
+                    max_value_length,
+                )
             ),
         )
         for attr, value in attributes
     )
+    if omitted:
+        ann_rows.append(ANNOTATION_OMITTED_ROW_TEMPLATE % omitted)
     ann_rows.append(ANNOTATION_END_ROW)
+    return "\n".join(ann_rows)
+
+
+def _attach_attribute_annotation(
+    state: _DotRenderState,
+    dot: DotContainer,
+    node: pydot.Node,
+    record: ProvRecord,
+) -> None:
+    # Adding a node to show all attributes
+    label = _annotation_label(record)
+    if label is None:
+        return  # No attribute to display
     state.annotation_count += 1
     annotations = pydot.Node(
-        f"ann{state.annotation_count}", label="\n".join(ann_rows), **ANNOTATION_STYLE
+        f"ann{state.annotation_count}", label=label, **ANNOTATION_STYLE
     )
     dot.add_node(annotations)
     dot.add_edge(pydot.Edge(annotations, node, **ANNOTATION_LINK_STYLE))
@@ -532,3 +566,318 @@ def prov_to_dot(
 
     _bundle_to_dot(state, maindot, unified)
     return maindot
+
+
+class _DotLiteral(str):
+    """An attribute value already in DOT syntax, written as is by :func:`_dot_attributes`.
+
+    Used for HTML-like labels and for the values :func:`prov_to_dot` quotes
+    itself (node labels and URLs), so that both writers quote alike.
+    """
+
+    __slots__ = ()
+
+
+def _quoted(text: str) -> _DotLiteral:
+    return _DotLiteral('"{}"'.format(text.replace("\\", "\\\\").replace('"', '\\"')))
+
+
+# A DOT ID that needs no quoting: an alphanumeric string or a numeral
+_DOT_PLAIN_ID_RE = re.compile(
+    r"[A-Za-z_][A-Za-z0-9_]*|-?(?:\.[0-9]+|[0-9]+(?:\.[0-9]*)?)"
+)
+
+
+def _dot_attributes(attributes: dict[str, Any]) -> str:
+    # Format a DOT attribute list as pydot does: HTML-like labels as they
+    # are, plain IDs unquoted, and anything else quoted and escaped
+    formatted = []
+    for name, value in attributes.items():
+        text = str(value)
+        if not isinstance(value, _DotLiteral) and not _DOT_PLAIN_ID_RE.fullmatch(text):
+            text = _quoted(text)
+        formatted.append(f"{name}={text}")
+    return ", ".join(formatted)
+
+
+@dataclass
+class _DotWriterState:
+    """State shared by the helpers of one :func:`write_dot` call.
+
+    Mirrors :class:`_DotRenderState`, but maps element URIs to node ids
+    rather than ``pydot.Node`` objects, since nodes and edges are written to
+    ``stream`` as soon as they are found, and also keeps count of what the
+    ``max_nodes``/``max_edges`` caps leave out.
+    """
+
+    stream: IO[str]
+    use_labels: bool
+    show_element_attributes: bool
+    show_relation_attributes: bool
+    show_nary: bool
+    max_nodes: int | None
+    max_edges: int | None
+    max_attributes: int | None
+    max_value_length: int | None
+    node_map: dict[str, str] = field(default_factory=dict)
+    node_count: int = 0
+    edge_count: int = 0
+    bnode_count: int = 0
+    cluster_count: int = 0
+    annotation_count: int = 0
+    omitted_nodes: set[str] = field(default_factory=set)
+    omitted_edges: int = 0
+
+    def write_node(self, node_id: str, attributes: dict[str, Any]) -> None:
+        self.stream.write(f"{node_id} [{_dot_attributes(attributes)}];\n")
+
+    def write_edge(self, tail: str, head: str, attributes: dict[str, Any]) -> None:
+        self.stream.write(f"{tail} -> {head} [{_dot_attributes(attributes)}];\n")
+
+    def has_room_for_node(self, uri: str) -> bool:
+        if self.max_nodes is None or self.node_count < self.max_nodes:
+            return True
+        self.omitted_nodes.add(uri)
+        return False
+
+
+def _write_annotation(state: _DotWriterState, node_id: str, record: ProvRecord) -> None:
+    label = _annotation_label(record, state.max_attributes, state.max_value_length)
+    if label is None:
+        return  # No attribute to display
+    state.annotation_count += 1
+    annotation_id = f"ann{state.annotation_count}"
+    state.write_node(annotation_id, {"label": _DotLiteral(label), **ANNOTATION_STYLE})
+    state.write_edge(annotation_id, node_id, ANNOTATION_LINK_STYLE)
+
+
+def _write_element(state: _DotWriterState, record: ProvRecord) -> None:
+    uri = record.identifier.uri  # type: ignore[union-attr]
+    if not state.has_room_for_node(uri):
+        return
+    state.node_count += 1
+    node_id = f"n{state.node_count}"
+    node_label: str
+    if state.use_labels and record.label != record.identifier:
+        # See _add_node()
+        node_label = _DotLiteral(
+            f"<{_truncated(record.label, state.max_value_length)}<br />"
+            f'<font color="#333333" point-size="10">'
+            f"{record.identifier}</font>>"
+        )
+    else:
+        node_label = _quoted(str(record.identifier))
+    state.write_node(
+        node_id,
+        {"label": node_label, "URL": _quoted(uri), **DOT_PROV_STYLE[record.get_type()]},
+    )
+    state.node_map[uri] = node_id
+    if state.show_element_attributes:
+        _write_annotation(state, node_id, record)
+
+
+def _write_node_for(
+    state: _DotWriterState,
+    qname: QualifiedName | None,
+    prov_type: type[ProvElement] | None = None,
+) -> str:
+    # The id of the node for `qname`, writing a generic node (or, for None, a
+    # blank node) first if there is none yet. Callers check the node cap.
+    if qname is None:
+        state.bnode_count += 1
+        bnode_id = f"b{state.bnode_count}"
+        state.write_node(bnode_id, {"label": "", "shape": "point", "color": "gray"})
+        return bnode_id
+    uri = qname.uri
+    node_id = state.node_map.get(uri)
+    if node_id is None:
+        state.node_count += 1
+        node_id = state.node_map[uri] = f"n{state.node_count}"
+        style = GENERIC_NODE_STYLE[prov_type] if prov_type else DOT_PROV_STYLE[0]
+        state.write_node(
+            node_id, {"label": _quoted(str(qname)), "URL": _quoted(uri), **style}
+        )
+    return node_id
+
+
+def _write_relation(state: _DotWriterState, rec: ProvRecord) -> None:
+    # See _add_relation() and _draw_nary_or_annotated_relation()
+    formal = [
+        (attr_name, value, INFERRED_ELEMENT_CLASS.get(attr_name))
+        for attr_name, value in rec.formal_attributes
+        if attr_name in PROV_ATTRIBUTE_QNAMES
+    ]
+    if len(formal) < 2:  # too few elements for a relation?
+        return  # cannot draw this
+    if state.max_edges is not None and state.edge_count >= state.max_edges:
+        state.omitted_edges += 1
+        return
+    (_, qname0, inferred_type0), (_, qname1, inferred_type1) = formal[:2]
+    new_uris = {
+        qname.uri
+        for qname in (qname0, qname1)
+        if qname is not None and qname.uri not in state.node_map
+    }
+    if state.max_nodes is not None and (
+        state.node_count + len(new_uris) > state.max_nodes
+    ):
+        state.omitted_nodes.update(new_uris)
+        state.omitted_edges += 1
+        return
+    state.edge_count += 1
+
+    # From here on, nodes are written in the same order as prov_to_dot() adds
+    # them; the check above guarantees there is room for the two ends.
+    style = DOT_PROV_STYLE[rec.get_type()]
+    add_attribute_annotation = state.show_relation_attributes and any(
+        attr_name not in PROV_ATTRIBUTE_QNAMES for attr_name, _ in rec.attributes
+    )
+    add_nary_elements = len(formal) > 2 and state.show_nary
+    if not (add_nary_elements or add_attribute_annotation):
+        # show a simple binary relation with no annotation
+        node0 = _write_node_for(state, qname0, inferred_type0)
+        node1 = _write_node_for(state, qname1, inferred_type1)
+        state.write_edge(node0, node1, style)
+        return
+
+    # a blank node for n-ary relations or the attribute annotation
+    bnode = _write_node_for(state, None)
+    node0 = _write_node_for(state, qname0, inferred_type0)
+    state.write_edge(node0, bnode, {"arrowhead": "none", **style})
+    style = dict(style)
+    del style["label"]  # not showing label in the second segment
+    node1 = _write_node_for(state, qname1, inferred_type1)
+    state.write_edge(bnode, node1, style)
+    if add_nary_elements:
+        style["color"] = "gray"  # all remaining segment to be gray
+        style["fontcolor"] = "dimgray"  # text in darker gray
+        for attr_name, qname, inferred_type in formal[2:]:
+            if qname is not None and (
+                qname.uri in state.node_map or state.has_room_for_node(qname.uri)
+            ):
+                style["label"] = attr_name.localpart
+                state.write_edge(
+                    bnode, _write_node_for(state, qname, inferred_type), style
+                )
+    if add_attribute_annotation:
+        _write_annotation(state, bnode, rec)
+
+
+def _write_bundle(state: _DotWriterState, bundle: ProvBundle) -> None:
+    relations = []
+    for rec in bundle.get_records():
+        if rec.is_element():
+            _write_element(state, rec)
+        else:
+            relations.append(rec)
+
+    if not bundle.is_bundle():
+        for sub_bundle in bundle.bundles:
+            state.cluster_count += 1
+            state.stream.write(f"subgraph cluster_c{state.cluster_count} {{\n")
+            identifier = sub_bundle.identifier
+            state.stream.write(
+                _dot_attributes({"URL": _quoted(identifier.uri)}) + ";\n"  # type: ignore[union-attr]
+            )
+            state.stream.write(
+                _dot_attributes({"label": _quoted(str(identifier))}) + ";\n"
+            )
+            _write_bundle(state, sub_bundle)
+            state.stream.write("}\n")
+
+    for rec in relations:
+        _write_relation(state, rec)
+
+
+def write_dot(
+    bundle: ProvBundle,
+    destination: IO[str] | PathLike,
+    show_nary: bool = True,
+    use_labels: bool = False,
+    direction: str = "BT",
+    show_element_attributes: bool = True,
+    show_relation_attributes: bool = True,
+    max_nodes: int | None = None,
+    max_edges: int | None = None,
+    max_attributes: int | None = None,
+    max_value_length: int | None = None,
+    unify: bool = True,
+) -> None:
+    """Write a provenance bundle/document as DOT text, without building a graph.
+
+    Produces the same drawing as :func:`prov_to_dot` (same node and edge
+    styles, attribute annotations and bundle clusters), but writes each
+    node and edge out as soon as it is found instead of building a
+    :class:`pydot.Dot` object graph first, so its memory use and run time
+    stay linear for documents far too large for pydot. The caps below keep
+    the output of such documents small enough for Graphviz to lay out; what
+    they leave out is counted in a comment at the end of the output.
+
+    Args:
+        bundle: The provenance bundle/document to be converted.
+        destination: A text stream, or the path of a file to write
+            (UTF-8-encoded).
+        show_nary: As for :func:`prov_to_dot`.
+        use_labels: As for :func:`prov_to_dot`.
+        direction: As for :func:`prov_to_dot`.
+        show_element_attributes: As for :func:`prov_to_dot`.
+        show_relation_attributes: As for :func:`prov_to_dot`.
+        max_nodes: The maximum number of element nodes to draw (default:
+            ``None``, no limit). Elements beyond it, and the relations
+            involving them, are left out.
+        max_edges: The maximum number of relations to draw (default:
+            ``None``, no limit).
+        max_attributes: The maximum number of attributes shown in an
+            annotation; the rest are summarised as "(N more)" (default:
+            ``None``, no limit).
+        max_value_length: The length beyond which attribute values and
+            labels are truncated (default: ``None``, no truncation).
+        unify: Whether to :meth:`~prov.model.ProvBundle.unified` the bundle
+            first, as :func:`prov_to_dot` does (default: ``True``). Skipping
+            it saves time on documents known not to repeat identifiers.
+    """
+    if not hasattr(destination, "write"):
+        with open(destination, "w", encoding="utf-8") as f:
+            write_dot(
+                bundle,
+                f,
+                show_nary,
+                use_labels,
+                direction,
+                show_element_attributes,
+                show_relation_attributes,
+                max_nodes,
+                max_edges,
+                max_attributes,
+                max_value_length,
+                unify,
+            )
+        return
+
+    stream = typing.cast(IO[str], destination)
+    if direction not in {"BT", "TB", "LR", "RL"}:
+        direction = "BT"
+    state = _DotWriterState(
+        stream=stream,
+        use_labels=use_labels,
+        show_element_attributes=show_element_attributes,
+        show_relation_attributes=show_relation_attributes,
+        show_nary=show_nary,
+        max_nodes=max_nodes,
+        max_edges=max_edges,
+        max_attributes=max_attributes,
+        max_value_length=max_value_length,
+    )
+    if unify:
+        # Render the original bundle if it cannot be unified, as prov_to_dot() does
+        with contextlib.suppress(ProvException):
+            bundle = bundle.unified()
+
+    stream.write(f'digraph G {{\nrankdir={direction};\ncharset="utf-8";\n')
+    _write_bundle(state, bundle)
+    if state.omitted_nodes or state.omitted_edges:
+        stream.write(
+            f"// {len(state.omitted_nodes)} nodes and {state.omitted_edges} "
+            "relations omitted\n"
+        )
+    stream.write("}\n")
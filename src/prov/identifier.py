@@ -206,9 +206,9 @@ class Namespace:
         return f"<{self.__class__.__name__}: {self._prefix} {{{self._uri}}}>"
 
     def __getitem__(self, localpart: str) -> QualifiedName:
-        if localpart in self._cache:
-            return self._cache[localpart]
-        else:
-            qname = QualifiedName(self, localpart)
-            self._cache[localpart] = qname
-            return qname
+        qname = self._cache.get(localpart)
+        if qname is None:
+            # setdefault: of two threads minting the same name at once, both
+            # get the one cached first
+            qname = self._cache.setdefault(localpart, QualifiedName(self, localpart))
+        return qname
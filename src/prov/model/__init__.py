@@ -12,14 +12,11 @@ import io as io
 import itertools as itertools
 import logging
 import os as os
-import shutil as shutil
-import tempfile as tempfile
 import typing as typing
 from collections import defaultdict as defaultdict
 from collections.abc import Callable as Callable, Iterable as Iterable
 from io import IOBase as IOBase
 from typing import Any as Any, Union as Union
-from urllib.parse import urlparse as urlparse
 
 from prov import Error as Error, serializers as serializers
 from prov.constants import *
@@ -102,8 +99,33 @@ logger = logging.getLogger(__name__)
 # remove the submodule attributes that the import system bound on this package
 # so that the public namespace (dir(prov.model)) stays identical to the
 # pre-split prov/model.py module. `from prov.model.records import ...` (and
-# `.namespaces`/`.bundle`) still works via sys.modules; only attribute access
+# `.namespaces`/`.bundle`/`.store`/`.snapshot`) still works via sys.modules; only attribute access
 # like `prov.model.records` is hidden, which no historic code could have used.
-for _submodule_name in ("bundle", "namespaces", "records"):
+# The snapshot module is otherwise only imported by ProvDocument.freeze(), which
+# would bind it here afterwards.
+from prov.model import snapshot  # noqa: E402, F401
+
+for _submodule_name in ("bundle", "namespaces", "records", "snapshot", "store"):
     globals().pop(_submodule_name, None)
 del _submodule_name
+
+
+def __getattr__(name: str) -> Any:
+    # The standard library helpers the single-module prov.model imported for
+    # serialize() are still exported, but only imported on first access, so
+    # that importing prov.model does not load them.
+    if name in ("shutil", "tempfile"):
+        import importlib
+
+        globals()[name] = importlib.import_module(name)
+    elif name == "urlparse":
+        from urllib.parse import urlparse
+
+        globals()[name] = urlparse
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return globals()[name]
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), "shutil", "tempfile", "urlparse"})
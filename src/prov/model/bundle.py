@@ -2,16 +2,14 @@
 
 from __future__ import annotations  # defer eval: ProvDocument used before it's defined
 
+import contextlib
 import io
 import itertools
 import logging
 import os
-import shutil
-import tempfile
-from collections import defaultdict
-from collections.abc import Iterable
-from typing import Any, cast
-from urllib.parse import urlparse
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING, Any, cast
 
 from prov import serializers
 from prov.constants import (
@@ -60,6 +58,7 @@ from prov.constants import (
     PROV_LOCATION,
     PROV_MEMBERSHIP,
     PROV_MENTION,
+    PROV_QUALIFIEDNAME,
     PROV_ROLE,
     PROV_SPECIALIZATION,
     PROV_START,
@@ -78,6 +77,7 @@ from prov.model.records import (
     EntityRef,
     GenerationRef,
     InfluencerRef,
+    Literal,
     NameValuePair,
     NSCollection,
     OptionalID,
@@ -108,7 +108,15 @@ from prov.model.records import (
     StreamOrPath,
     UsageRef,
     _ensure_datetime,
+    _sha256,
 )
+from prov.model.store import MemoryRecordStore, RecordStore
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from prov.adjacency import AdjacencyGraph
+    from prov.model.snapshot import FrozenProvDocument
 
 logger = logging.getLogger(__name__)
 
@@ -139,7 +147,7 @@ logger = logging.getLogger(__name__)
 # Alternate/Specialization/Mention/Membership are NOT in that set -- PROV-DM's
 # abstract syntax gives them no identifier parameter, so the specification has
 # no opinion on an id they happen to share with anything (they normally reach
-# `ProvBundle`'s ``_id_map`` only via `new_record()`/deserialization, since the
+# `ProvBundle`'s identifier index only via `new_record()`/deserialization, since the
 # `.alternate()`/`.specialization()`/`.mention()`/`.membership()` convenience
 # methods always pass ``identifier=None``) -- such a pairing is therefore left
 # out of scope, not rejected.
@@ -314,6 +322,7 @@ class ProvBundle:
         identifier: QualifiedName | None = None,
         namespaces: NSCollection | None = None,
         document: ProvDocument | None = None,
+        store: RecordStore | None = None,
     ):
         """Initialise the bundle.
 
@@ -326,11 +335,21 @@ class ProvBundle:
                 (default: ``None``).
             document: Optional parent document for the bundle (default:
                 ``None``).
+            store: Optional :class:`~prov.model.store.RecordStore` to keep
+                the bundle's records in, e.g. a
+                :class:`~prov.model.store.SQLiteRecordStore` for a bundle too
+                large for memory (default: ``None``, meaning a new
+                :class:`~prov.model.store.MemoryRecordStore`).
         """
         #  Initializing bundle-specific attributes
         self._identifier = identifier
-        self._records: list[ProvRecord] = []
-        self._id_map: dict[QualifiedName, list[ProvRecord]] = defaultdict(list)
+        self._records: RecordStore = store if store is not None else MemoryRecordStore()
+        self._records.bind(self)
+        self._records_digest: str | None = None
+        self._version = 0
+        self._lineage_graph: AdjacencyGraph | None = None
+        self._lineage_graph_version = -1
+        self._frozen = False
         self._document = document
         self._namespaces: NamespaceManager = NamespaceManager(
             namespaces, parent=(document._namespaces if document is not None else None)
@@ -368,14 +387,65 @@ class ProvBundle:
         """A copy of the list of all records in this bundle."""
         return list(self._records)
 
+    @property
+    def version(self) -> int:
+        """The bundle's mutation counter.
+
+        It is bumped whenever a record is added, a record's attributes
+        change, or a namespace is added or set as default, so an unchanged
+        value means unchanged content. A document's counter also covers the
+        changes made to its bundles, and adding bundles to it.
+        """
+        return self._version
+
+    @property
+    def frozen(self) -> bool:
+        """Whether the bundle is frozen, i.e. read-only (see :meth:`set_frozen`)."""
+        return self._frozen
+
+    def set_frozen(self, frozen: bool = True) -> None:
+        """Freeze the bundle, making it read-only, or unfreeze it.
+
+        A frozen bundle cannot be changed: adding records, namespaces or
+        attributes to it raises a :class:`ProvException`. In return, reading
+        it has no side effects, so any number of threads can read, query and
+        serialize it at once, without locking. In particular, resolving a
+        name whose namespace is not registered in the bundle does not
+        register it, as it does in a bundle that is not frozen. Freezing a
+        document freezes its bundles too. See
+        ``docs/explanation/concurrency.md``.
+
+        Args:
+            frozen: ``True`` to freeze the bundle, ``False`` to unfreeze it
+                (default: ``True``).
+        """
+        self._frozen = frozen
+        self._namespaces.frozen = frozen
+
+    def _check_not_frozen(self) -> None:
+        # Refuse a mutation of a frozen bundle
+        if self._frozen:
+            raise ProvException(f"{self!r} is frozen and cannot be changed")
+
+    def _mark_modified(self) -> None:
+        # Bump the mutation version of this bundle and its parent document.
+        self._version += 1
+        if self._document is not None and self._document is not self:
+            self._document._mark_modified()
+
     #  Bundle configurations
     def set_default_namespace(self, uri: str) -> None:
         """Set the bundle's default namespace to one with the given URI.
 
         Args:
             uri: The URI of the default namespace.
+
+        Raises:
+            ProvException: If the bundle is frozen.
         """
+        self._check_not_frozen()
         self._namespaces.set_default_namespace(uri)
+        self._mark_modified()
 
     def get_default_namespace(self) -> Namespace | None:
         """Return the default namespace, or ``None`` if none is set."""
@@ -396,17 +466,18 @@ class ProvBundle:
             The registered namespace (which may be an existing or renamed one).
 
         Raises:
-            ProvException: If a prefix string is given without a ``uri``.
+            ProvException: If a prefix string is given without a ``uri``, or
+                if the bundle is frozen.
         """
+        self._check_not_frozen()
         if isinstance(namespace_or_prefix, Namespace):
-            return self._namespaces.add_namespace(namespace_or_prefix)
+            namespace = namespace_or_prefix
+        elif uri is not None:
+            namespace = Namespace(namespace_or_prefix, uri)
         else:
-            if uri is not None:
-                return self._namespaces.add_namespace(
-                    Namespace(namespace_or_prefix, uri)
-                )
-            else:
-                raise ProvException("Cannot add a namespace without a URI")
+            raise ProvException("Cannot add a namespace without a URI")
+        self._mark_modified()
+        return self._namespaces.add_namespace(namespace)
 
     def get_registered_namespaces(self) -> Iterable[Namespace]:
         """Return all namespaces registered on the bundle.
@@ -482,7 +553,102 @@ class ProvBundle:
             identifier is invalid or unknown.
         """
         valid_id = self.valid_qualified_name(identifier)
-        return list(self._id_map[valid_id]) if valid_id is not None else []
+        return self._records.get(valid_id) if valid_id is not None else []
+
+    # Lineage queries
+    def _get_lineage_graph(self) -> AdjacencyGraph:
+        # The graph indexing this bundle (and, for a document, its bundles)
+        # for lineage queries, rebuilt only after a change to the content.
+        from prov.adjacency import AdjacencyGraph
+
+        if self._lineage_graph is None or self._lineage_graph_version != self._version:
+            self._lineage_graph = AdjacencyGraph(self)
+            self._lineage_graph_version = self._version
+        return self._lineage_graph
+
+    def _lineage(
+        self,
+        identifiers: tuple[QualifiedNameCandidate, ...],
+        relation_types: Iterable[QualifiedName] | None,
+        max_depth: int | None,
+        upstream: bool,
+    ) -> Iterator[QualifiedName]:
+        from prov.adjacency import LINEAGE_RELATION_TYPES
+
+        graph = self._get_lineage_graph()
+        names = [
+            name
+            for name in map(self.valid_qualified_name, identifiers)
+            if name is not None and name in graph
+        ]
+        if relation_types is None:
+            relation_types = LINEAGE_RELATION_TYPES
+        walk = graph.ancestors if upstream else graph.descendants
+        yield from walk(*names, relation_types=relation_types, max_depth=max_depth)
+
+    def ancestors(
+        self,
+        *identifiers: QualifiedNameCandidate,
+        relation_types: Iterable[QualifiedName] | None = None,
+        max_depth: int | None = None,
+    ) -> Iterator[QualifiedName]:
+        """Iterate over everything the given elements were derived from.
+
+        The lineage of the elements is followed transitively through the
+        relations of ``relation_types``, from an element to what it depends
+        on: from a generated entity to its generating activity, from an
+        activity to the entities it used and the activities that informed it,
+        from a derived entity to the one it was derived from, and so on. The
+        identifiers found are yielded once each, nearest first, as the search
+        proceeds, so a huge closure can be consumed as a stream, and a search
+        stopped early costs no more than the relations visited so far.
+
+        The search runs over an index of the bundle's relations (for a
+        document, including those in its bundles) which is built on the first
+        query and reused until the content changes.
+
+        Args:
+            *identifiers: Identifiers of the elements to start from; those not
+                found in the bundle are ignored.
+            relation_types: Record types of the relations to follow, e.g.
+                ``[PROV_DERIVATION]`` (default: ``None``, meaning
+                derivations, generations, usages and communications, see
+                :data:`prov.adjacency.LINEAGE_RELATION_TYPES`). Add
+                :data:`~prov.constants.PROV_ATTRIBUTION` and
+                :data:`~prov.constants.PROV_ASSOCIATION` to reach agents too.
+            max_depth: Only follow this many relations from the starting
+                elements (default: ``None``, meaning no limit).
+
+        Returns:
+            An iterator over the qualified names of the ancestors.
+        """
+        return self._lineage(identifiers, relation_types, max_depth, upstream=True)
+
+    def descendants(
+        self,
+        *identifiers: QualifiedNameCandidate,
+        relation_types: Iterable[QualifiedName] | None = None,
+        max_depth: int | None = None,
+    ) -> Iterator[QualifiedName]:
+        """Iterate over everything affected by the given elements.
+
+        This is the impact analysis counterpart of :meth:`ancestors`,
+        following the same relations in the opposite direction: from an
+        entity to the activities that used it and the entities derived from
+        it, from an activity to the entities it generated, and so on.
+
+        Args:
+            *identifiers: Identifiers of the elements to start from; those not
+                found in the bundle are ignored.
+            relation_types: Record types of the relations to follow, as for
+                :meth:`ancestors`.
+            max_depth: Only follow this many relations from the starting
+                elements (default: ``None``, meaning no limit).
+
+        Returns:
+            An iterator over the qualified names of the descendants.
+        """
+        return self._lineage(identifiers, relation_types, max_depth, upstream=False)
 
     # Miscellaneous functions
     def is_document(self) -> bool:
@@ -579,16 +745,76 @@ class ProvBundle:
 
     __hash__ = None  # type: ignore[assignment]
 
+    def digest(self) -> str:
+        """Return a stable, content-addressed fingerprint of the bundle's records.
+
+        The digest is the root of a Merkle-style construction over the
+        :meth:`ProvRecord.digest` of every record: the distinct record digests
+        are sorted and hashed together with SHA-256, so it does not depend on
+        record order, and bundles that compare equal get the same digest. The
+        bundle identifier and namespace prefixes are not part of it, matching
+        :meth:`__eq__`.
+
+        Record digests are cached on the records, and the bundle's own result
+        is cached until a record is added or one of its records changes, so
+        repeated calls on an unchanged bundle cost O(1).
+
+        Returns:
+            The hexadecimal SHA-256 digest of the bundle's content.
+        """
+        if self._records_digest is None:
+            record_digests = sorted(
+                {bytes.fromhex(record.digest()) for record in self._records}
+            )
+            hasher = _sha256(f"{len(record_digests)}:".encode("ascii"))
+            for record_digest in record_digests:
+                hasher.update(record_digest)
+            self._records_digest = hasher.hexdigest()
+        return self._records_digest
+
     # Transformations
+    def clone(self, store: RecordStore | None = None) -> ProvBundle:
+        """Return a copy of the bundle sharing its records copy-on-write.
+
+        The records of the copy share their attribute storage with this
+        bundle's, until a record of either is changed, when it copies its
+        own (see :meth:`ProvRecord.copy`), so cloning a bundle neither copies
+        nor checks the attributes of its records again, and the digest of
+        the records is not computed again either. The copy has the
+        identifier and the namespaces of this bundle, and resolves names
+        against its document's too, but belongs to no document (see
+        :meth:`ProvDocument.add_bundle`) and is never frozen. The original
+        bundle is left untouched.
+
+        Args:
+            store: Optional :class:`~prov.model.store.RecordStore` to keep the
+                records of the copy in (default: ``None``, meaning in memory).
+
+        Returns:
+            The new :class:`ProvBundle`.
+        """
+        bundle = ProvBundle(identifier=self._identifier, store=store)
+        bundle._namespaces = self._namespaces._copy(self._namespaces.parent)
+        self._share_records_to(bundle)
+        return bundle
+
+    def _share_records_to(self, bundle: ProvBundle) -> None:
+        # Add this bundle's records to the new, empty `bundle`, which
+        # resolves names as this bundle does, sharing their attribute storage
+        # (see ProvRecord._share_to); the digest of the records is the same.
+        records = bundle._records
+        for record in self._records:
+            records.add(record._share_to(bundle))
+        bundle._records_digest = self._records_digest
+
     def _unified_records(self) -> list[ProvRecord]:
         """Returns a list of unified records."""
         merged_records = {}
-        for _identifier, records in self._id_map.items():
-            if len(records) > 1:
-                # more than one record having the same identifier: unify them,
-                # per base record type (usually one type, but PROV-CONSTRAINTS
-                # permits an id to carry more than one, e.g. agent + entity)
-                merged_records.update(_unify_record_group(records))
+        for records in self._records.shared_identifiers():
+            # more than one record having the same identifier: unify them,
+            # per base record type (usually one type, but PROV-CONSTRAINTS
+            # permits an id to carry more than one, e.g. agent + entity)
+            merged_records.update(_unify_record_group(records))
         if not merged_records:
             # No merging done, just return the list of original records
             return list(self._records)
@@ -669,11 +895,11 @@ class ProvBundle:
     # Provenance statements
     def _add_record(self, record: ProvRecord) -> None:
         # IMPORTANT: All records need to be added to a bundle/document via this
-        # method. Otherwise, the _id_map dict will not be correctly updated
-        identifier = record.identifier
-        if identifier is not None:
-            self._id_map[identifier].append(record)
-        self._records.append(record)
+        # method. Otherwise, the digest and version will not be correctly updated
+        self._check_not_frozen()
+        self._records.add(record)
+        self._records_digest = None
+        self._mark_modified()
 
     def new_record(
         self,
@@ -724,7 +950,11 @@ class ProvBundle:
 
         The record is re-created within this bundle (resolving its identifier
         and attributes against this bundle's namespaces), so the returned
-        record is a new object, not ``record`` itself.
+        record is a new object, not ``record`` itself. When all the names in
+        the record resolve to themselves here, e.g. for a record of a bundle
+        with the same namespaces, the copy shares the attribute storage of
+        the record copy-on-write instead, as :meth:`ProvRecord.copy` does,
+        and its attributes are not checked again.
 
         Args:
             record: The :class:`ProvRecord` to copy into the bundle.
@@ -732,6 +962,10 @@ class ProvBundle:
         Returns:
             The newly created :class:`ProvRecord` belonging to this bundle.
         """
+        if self._resolves_unchanged(record):
+            new_record = record._share_to(self)
+            self._add_record(new_record)
+            return new_record
         return self.new_record(
             record.get_type(),
             record.identifier,
@@ -739,6 +973,45 @@ class ProvBundle:
             record.extra_attributes,
         )
 
+    def _resolves_unchanged(self, record: ProvRecord) -> bool:
+        # Whether new_record() would re-create `record` here as it is: its
+        # identifier, attribute names and qualified name values resolve to
+        # themselves (registering their namespaces, in the order new_record()
+        # would), and none of its formal attributes has a second value, which
+        # add_record() drops. Its other values were coerced already, and
+        # coerce to themselves.
+        attributes = record._attributes
+        formal_attributes = record.FORMAL_ATTRIBUTES
+        names: list[Any] = [record.identifier]
+        for attr_name in formal_attributes:
+            values = attributes.get(attr_name)
+            if values:
+                if len(values) > 1:
+                    return False
+                names.append(attr_name)
+                names.extend(values)
+        for attr_name, values in attributes.items():
+            if values and attr_name not in formal_attributes:
+                names.append(attr_name)
+                names.extend(values)
+        namespaces = self._namespaces
+        for name in names:
+            if isinstance(name, QualifiedName):
+                namespace = name.namespace
+                if namespaces.get(namespace.prefix) == namespace:
+                    # registered: resolves to the same name, registering nothing
+                    continue
+                resolved = namespaces.valid_qualified_name(name)
+                if resolved is not name and (
+                    resolved != name
+                    or resolved.namespace.prefix != name.namespace.prefix
+                ):
+                    return False
+            elif isinstance(name, Literal) and name.datatype == PROV_QUALIFIEDNAME:
+                # unresolved in the record's bundle, it may resolve here
+                return False
+        return True
+
     def entity(
         self,
         identifier: QualifiedNameCandidate,
@@ -1579,6 +1852,7 @@ class ProvDocument(ProvBundle):
         self,
         records: Iterable[ProvRecord] | None = None,
         namespaces: NSCollection | None = None,
+        store: RecordStore | None = None,
     ):
         """Initialise the document.
 
@@ -1588,11 +1862,19 @@ class ProvDocument(ProvBundle):
             namespaces: Optional namespaces to register, as a ``{prefix: uri}``
                 dict or an iterable of :class:`~prov.identifier.Namespace`
                 (default: ``None``).
+            store: Optional :class:`~prov.model.store.RecordStore` to keep
+                the document's records in; the bundles created with
+                :meth:`bundle` get their stores from it (default: ``None``,
+                meaning in memory).
         """
         ProvBundle.__init__(
-            self, records=records, identifier=None, namespaces=namespaces
+            self, records=records, identifier=None, namespaces=namespaces, store=store
         )
         self._bundles: dict[QualifiedName, ProvBundle] = {}
+        self._serialization_cache: OrderedDict[tuple[Any, ...], str | bytes] | None = (
+            None
+        )
+        self._serialization_cache_size = 0
 
     def __repr__(self) -> str:
         return "<ProvDocument>"
@@ -1615,6 +1897,32 @@ class ProvDocument(ProvBundle):
         # Everything is the same
         return True
 
+    def digest(self) -> str:
+        """Return a stable, content-addressed fingerprint of the whole document.
+
+        Combines the digest of the document's top-level records (see
+        :meth:`ProvBundle.digest`) with the identifier URI and digest of each
+        named bundle, in identifier order, so two documents with the same
+        content and bundle structure get the same digest regardless of
+        record order, namespace prefixes or serialization format. Only the
+        per-bundle digests are recombined on each call; they are themselves
+        cached until their bundle changes.
+
+        Returns:
+            The hexadecimal SHA-256 digest of the document.
+        """
+        bundle_entries = sorted(
+            (bundle_id.uri, bundle.digest())
+            for bundle_id, bundle in self._bundles.items()
+        )
+        hasher = _sha256(bytes.fromhex(super().digest()))
+        hasher.update(f"{len(bundle_entries)}:".encode("ascii"))
+        for bundle_uri, bundle_digest in bundle_entries:
+            encoded_uri = bundle_uri.encode("utf-8")
+            hasher.update(f"{len(encoded_uri)}:".encode("ascii") + encoded_uri)
+            hasher.update(bytes.fromhex(bundle_digest))
+        return hasher.hexdigest()
+
     def is_document(self) -> bool:
         """Return ``True`` if this is a document, ``False`` otherwise."""
         return True
@@ -1632,6 +1940,78 @@ class ProvDocument(ProvBundle):
         """The bundles contained in this document."""
         return self._bundles.values()
 
+    def set_frozen(self, frozen: bool = True) -> None:
+        """Freeze the document and its bundles, or unfreeze them.
+
+        See :meth:`ProvBundle.set_frozen`; a frozen document cannot be given
+        new bundles either.
+
+        Args:
+            frozen: ``True`` to freeze the document, ``False`` to unfreeze it
+                (default: ``True``).
+        """
+        super().set_frozen(frozen)
+        for bundle in self._bundles.values():
+            bundle.set_frozen(frozen)
+
+    def freeze(self) -> FrozenProvDocument:
+        """Return an immutable snapshot of the document as it is now.
+
+        Unlike :meth:`set_frozen`, which makes the document itself read-only,
+        this leaves the document as it is, and free to change: the snapshot
+        does not. It shares the records' attributes with the document rather
+        than copying them, until the document changes a record (see
+        :mod:`prov.model.snapshot`). The snapshot and its bundles are frozen
+        (see :meth:`set_frozen`) for good. Besides, they:
+
+        - index their records by type, for
+          :meth:`~prov.model.snapshot.FrozenProvBundle.get_records`, and by
+          the names their formal attributes refer to, for
+          :meth:`~prov.model.snapshot.FrozenProvBundle.get_records_referencing`;
+        - cache their digest, and the hashes of their records;
+        - are hashable, and compare equal to other snapshots when their
+          digests do.
+
+        Returns:
+            The :class:`~prov.model.snapshot.FrozenProvDocument`.
+        """
+        from prov.model.snapshot import FrozenProvDocument
+
+        return FrozenProvDocument(self)
+
+    def clone(self, store: RecordStore | None = None) -> ProvDocument:
+        """Return a copy of the document sharing its records copy-on-write.
+
+        As :meth:`ProvBundle.clone`, for the document and each of its
+        bundles: cloning a document costs time linear in the number of its
+        records, but no attribute is copied or checked again. E.g. to build
+        several documents on the same base, clone it for each and add the
+        records specific to the clone. Unlike a snapshot (see
+        :meth:`freeze`), the copy can be changed, and is never frozen, so the
+        clone of a snapshot is an ordinary document again.
+
+        Args:
+            store: Optional :class:`~prov.model.store.RecordStore` to keep the
+                records of the copy in; its bundles get their stores from it
+                (default: ``None``, meaning in memory).
+
+        Returns:
+            The new :class:`ProvDocument`.
+        """
+        document = ProvDocument(store=store)
+        document._namespaces = self._namespaces._copy(None)
+        self._share_records_to(document)
+        for bundle_id, bundle in self._bundles.items():
+            bundle_clone = ProvBundle(
+                identifier=bundle_id,
+                document=document,
+                store=document._records.bundle_store(bundle_id),
+            )
+            bundle_clone._namespaces = bundle._namespaces._copy(document._namespaces)
+            bundle._share_records_to(bundle_clone)
+            document._bundles[bundle_id] = bundle_clone
+        return document
+
     # Transformations
     def flattened(self) -> ProvDocument:
         """Return a new document with all bundle records lifted to the top level.
@@ -1684,6 +2064,98 @@ class ProvDocument(ProvBundle):
             document.add_bundle(unified_bundle)
         return document
 
+    def sliced(
+        self,
+        *identifiers: QualifiedNameCandidate,
+        ancestors: bool = True,
+        descendants: bool = False,
+        relation_types: Iterable[QualifiedName] | None = None,
+        max_depth: int | None = None,
+    ) -> ProvDocument:
+        """Return a new document with only the provenance of the given elements.
+
+        The elements reachable from the seed ``identifiers`` are found as by
+        :meth:`~ProvBundle.ancestors` and/or :meth:`~ProvBundle.descendants`.
+        The new document holds the records of the seeds and of those elements,
+        and the relations of ``relation_types`` between any two of them, each
+        in the bundle it is in here. Namespaces are copied from this document
+        and from each bundle with records in the slice.
+
+        The selected records are copied as they are, without resolving and
+        checking their attributes again as :meth:`~ProvBundle.add_record`
+        does, and the search runs over the cached lineage index, so the cost
+        of a slice grows with its size rather than with the document's. The
+        original document is left untouched.
+
+        Args:
+            *identifiers: Identifiers of the seed elements; those not found in
+                the document are ignored.
+            ancestors: Whether to include what the seeds were derived from
+                (default: ``True``).
+            descendants: Whether to include what was derived from the seeds
+                (default: ``False``).
+            relation_types: Record types of the relations to follow and to
+                include (default: ``None``, meaning
+                :data:`prov.adjacency.LINEAGE_RELATION_TYPES`).
+            max_depth: Only follow this many relations from the seeds
+                (default: ``None``, meaning no limit).
+
+        Returns:
+            The new, sliced :class:`ProvDocument`.
+        """
+        from prov.adjacency import LINEAGE_RELATION_TYPES
+
+        graph = self._get_lineage_graph()
+        relation_types = frozenset(
+            LINEAGE_RELATION_TYPES if relation_types is None else relation_types
+        )
+        seeds = [
+            name
+            for name in map(self.valid_qualified_name, identifiers)
+            if name is not None and name in graph
+        ]
+        reached = dict.fromkeys(seeds)
+        for include, walk in (
+            (ancestors, graph.ancestors),
+            (descendants, graph.descendants),
+        ):
+            if include:
+                reached.update(
+                    dict.fromkeys(
+                        walk(*seeds, relation_types=relation_types, max_depth=max_depth)
+                    )
+                )
+
+        sources = [self, *self._bundles.values()]
+        records: list[ProvRecord] = [
+            record
+            for name in reached
+            for source in sources
+            for record in source._records.get(name)
+            if record.is_element()
+        ]
+        records.extend(graph.induced_relations(reached, relation_types))
+
+        document = ProvDocument()
+        for namespace in self.get_registered_namespaces():
+            document.add_namespace(namespace)
+        if (default_namespace := self.get_default_namespace()) is not None:
+            document.set_default_namespace(default_namespace.uri)
+        targets: dict[QualifiedName | None, ProvBundle] = {None: document}
+        for record in records:
+            source = record.bundle
+            target = targets.get(source.identifier)
+            if target is None:  # a named bundle (the document is in already)
+                target = targets[source.identifier] = document.bundle(
+                    cast("QualifiedName", source.identifier)
+                )
+                for namespace in source.get_registered_namespaces():
+                    target.add_namespace(namespace)
+                if (default_namespace := source.get_default_namespace()) is not None:
+                    target.set_default_namespace(default_namespace.uri)
+            target._add_record(record._copy_to(target))
+        return document
+
     def update(self, other: ProvBundle) -> None:
         """Append all records of another document or bundle into this document.
 
@@ -1738,8 +2210,10 @@ class ProvDocument(ProvBundle):
         Raises:
             ProvException: If ``bundle`` is not a :class:`ProvBundle`, is a
                 document with nested bundles, has no usable identifier, or an
-                identifier collides with an existing bundle.
+                identifier collides with an existing bundle, or if the
+                document is frozen.
         """
+        self._check_not_frozen()
         if not isinstance(bundle, ProvBundle):
             raise ProvException(
                 "Only a ProvBundle instance can be added as a bundle in a ProvDocument."
@@ -1773,6 +2247,7 @@ class ProvDocument(ProvBundle):
 
         self._bundles[valid_id] = bundle
         bundle._document = self
+        self._mark_modified()
 
     def bundle(self, identifier: QualifiedNameCandidate) -> ProvBundle:
         """Create a new, empty named bundle in this document.
@@ -1784,9 +2259,11 @@ class ProvDocument(ProvBundle):
             The newly created :class:`ProvBundle`.
 
         Raises:
-            ProvException: If ``identifier`` is ``None`` or invalid, or a bundle
-                with that identifier already exists.
+            ProvException: If ``identifier`` is ``None`` or invalid, a bundle
+                with that identifier already exists, or the document is
+                frozen.
         """
+        self._check_not_frozen()
         if identifier is None:
             raise ProvException(
                 "An identifier is required. Cannot create an unnamed bundle."
@@ -1796,11 +2273,86 @@ class ProvDocument(ProvBundle):
             raise ProvException(f'The provided identifier "{identifier}" is not valid')
         if valid_id in self._bundles:
             raise ProvException("A bundle with that identifier already exists")
-        b = ProvBundle(identifier=valid_id, document=self)
+        b = ProvBundle(
+            identifier=valid_id,
+            document=self,
+            store=self._records.bundle_store(valid_id),
+        )
         self._bundles[valid_id] = b
+        self._mark_modified()
         return b
 
     # Serializing and deserializing
+    def enable_serialization_cache(self, maxsize: int = 8) -> None:
+        """Cache the output of :meth:`serialize` until the document changes.
+
+        Outputs are kept in a least-recently-used cache of at most
+        ``maxsize`` entries, keyed by format, the serializer keyword
+        arguments, whether text or bytes were produced, and the document's
+        :attr:`~ProvBundle.version`. Serializing an unchanged document again
+        with the same arguments then writes the cached output instead of
+        re-encoding the document; any mutation made through the model API
+        (adding records, attributes, namespaces or bundles) changes the
+        version and discards the cached outputs. Calls with unhashable
+        serializer arguments bypass the cache.
+
+        Args:
+            maxsize: The maximum number of cached outputs (default: ``8``).
+
+        Raises:
+            ValueError: If ``maxsize`` is less than 1.
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1; got {maxsize}")
+        if self._serialization_cache is None:
+            self._serialization_cache = OrderedDict()
+        self._serialization_cache_size = maxsize
+        while len(self._serialization_cache) > maxsize:
+            self._serialization_cache.popitem(last=False)
+
+    def disable_serialization_cache(self) -> None:
+        """Stop caching :meth:`serialize` outputs and drop any cached ones."""
+        self._serialization_cache = None
+        self._serialization_cache_size = 0
+
+    def _cached_serialization(
+        self, format: str, binary: bool, args: dict[str, Any]
+    ) -> str | bytes:
+        # Return the serialization of this document (as bytes if `binary`,
+        # as str otherwise), from the serialization cache if possible.
+        # Serializers may write differently to text and binary streams (e.g.
+        # the PROV-XML declaration's encoding), so both kinds are cached
+        # separately. Threads serializing a frozen document at once share
+        # the cache without a lock: each of its operations is atomic, and
+        # those finding an entry already moved or evicted by another thread
+        # let it be.
+        cache = self._serialization_cache
+        key: tuple[Any, ...] | None = None
+        if cache is not None:
+            try:
+                key = (format, binary, self._version, frozenset(args.items()))
+                hash(key)
+            except TypeError:
+                key = None
+            if key is not None:
+                if cache and next(iter(cache))[2] != self._version:
+                    # The document has changed: every cached output is stale.
+                    cache.clear()
+                cached = cache.get(key)
+                if cached is not None:
+                    with contextlib.suppress(KeyError):
+                        cache.move_to_end(key)
+                    return cached
+        buffer: io.BytesIO | io.StringIO = io.BytesIO() if binary else io.StringIO()
+        serializers.get(format)(self).serialize(buffer, **args)
+        output = buffer.getvalue()
+        if cache is not None and key is not None:
+            cache[key] = output
+            while len(cache) > self._serialization_cache_size:
+                with contextlib.suppress(KeyError):
+                    cache.popitem(last=False)
+        return output
+
     def serialize(
         self,
         destination: StreamOrPath | None = None,
@@ -1825,11 +2377,35 @@ class ProvDocument(ProvBundle):
         Returns:
             The serialization as a string if no ``destination`` was given,
             otherwise ``None``.
+
+        See :meth:`enable_serialization_cache` to reuse the output of
+        repeated calls on an unchanged document.
         """
-        serializer = serializers.get(format)(self)
+        write: Callable[[io.IOBase], Any]
+        if self._serialization_cache is not None:
+
+            def write(stream: io.IOBase) -> None:
+                # Serializers may write differently to text and binary streams
+                binary = not serializers._is_text_stream(stream)
+                stream.write(self._cached_serialization(format, binary, args))
+
+        else:
+            serializer = serializers.get(format)(self)
+
+            def write(stream: io.IOBase) -> None:
+                serializer.serialize(stream, **args)
+
+        return self._write_serialization(destination, write)
+
+    @staticmethod
+    def _write_serialization(
+        destination: StreamOrPath | None, write: Callable[[io.IOBase], Any]
+    ) -> str | None:
+        # The destination handling of serialize(): `write` writes the
+        # serialization to the stream it is given
         if destination is None:
             buffer = io.StringIO()
-            serializer.serialize(buffer, **args)
+            write(buffer)
             return buffer.getvalue()
 
         # Duck-type on write() rather than isinstance(..., io.IOBase): common
@@ -1837,27 +2413,63 @@ class ProvDocument(ProvBundle):
         # _TemporaryFileWrapper proxy a stream's write() but are not
         # themselves io.IOBase instances (#240).
         if hasattr(destination, "write"):
-            stream = cast(io.IOBase, destination)
-            serializer.serialize(stream, **args)
-        else:
-            location = str(destination)
-            _scheme, netloc, path, _params, _query, _fragment = urlparse(location)
-            if netloc != "":
-                print(
-                    "WARNING: not saving as location " + "is not a local file reference"
-                )
-                return None
-            fd, name = tempfile.mkstemp()
-            stream = os.fdopen(fd, "wb")
-            serializer.serialize(stream, **args)
-            stream.close()
-            if hasattr(shutil, "move"):
-                shutil.move(name, path)
-            else:
-                shutil.copy(name, path)
-                os.remove(name)
+            write(cast(io.IOBase, destination))
+            return None
+
+        # Only needed for paths; kept off the import of prov.model
+        import shutil
+        import tempfile
+        from urllib.parse import urlparse
+
+        location = str(destination)
+        _scheme, netloc, path, _params, _query, _fragment = urlparse(location)
+        if netloc != "":
+            print("WARNING: not saving as location " + "is not a local file reference")
+            return None
+        # Written to a temporary file first, so that an encoding error leaves
+        # an existing file at the path untouched
+        fd, name = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, "wb") as stream:
+                write(cast(io.IOBase, stream))
+        except BaseException:
+            os.remove(name)
+            raise
+        shutil.move(name, path)
         return None
 
+    async def aserialize(
+        self,
+        destination: Any = None,
+        format: str = "json",
+        executor: Executor | None = None,
+        **args: Any,
+    ) -> str | None:
+        """Serialize this document without blocking the event loop.
+
+        The asynchronous counterpart of :meth:`serialize`: encoding runs in
+        ``executor``, and ``destination`` may also be an asynchronous stream,
+        to which the output is written in chunks as it is produced. The
+        document is read in the executor's thread, which its record stores
+        must allow (see :func:`prov.aio.aserialize`).
+
+        Args:
+            destination: An asynchronous stream, or any destination
+                :meth:`serialize` accepts (default: ``None``, meaning the
+                serialization is returned as a string).
+            format: The serialization format (default: ``"json"``).
+            executor: The :class:`~concurrent.futures.Executor` to encode in
+                (default: ``None``, meaning the event loop's default executor).
+            **args: Extra keyword arguments passed to the underlying serializer.
+
+        Returns:
+            The serialization as a string if no ``destination`` was given,
+            otherwise ``None``.
+        """
+        from prov.aio import aserialize
+
+        return await aserialize(self, destination, format, executor, **args)
+
     @staticmethod
     def deserialize(
         source: StreamOrPath | None = None,
@@ -1873,7 +2485,11 @@ class ProvDocument(ProvBundle):
 
         Args:
             source: A readable stream (any object with a ``read`` method) or
-                a file path to read from (default: ``None``).
+                a file path to read from (default: ``None``). A path is read
+                through :meth:`~prov.serializers.Serializer.deserialize_file`,
+                which the JSON-based formats implement over a memory map of
+                the file and the XML and RDF formats by letting their parser
+                read the file directly.
             content: The document as a ``str`` or ``bytes`` to read from
                 (default: ``None``).
             format: The serialization format (default: ``"json"``, i.e.
@@ -1902,8 +2518,7 @@ class ProvDocument(ProvBundle):
             if hasattr(source, "read"):
                 return serializer.deserialize(cast(io.IOBase, source), **args)
             else:
-                with open(source) as f:
-                    return serializer.deserialize(f, **args)
+                return serializer.deserialize_file(source, **args)
 
         raise TypeError("Either source or content must be provided")
 
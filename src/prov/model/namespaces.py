@@ -7,7 +7,7 @@ from typing import cast
 
 from prov.constants import PROV, XSD, XSI
 from prov.identifier import Identifier, Namespace, QualifiedName
-from prov.model.records import NSCollection, QualifiedNameCandidate
+from prov.model.records import NSCollection, ProvException, QualifiedNameCandidate
 
 DEFAULT_NAMESPACES = {"prov": PROV, "xsd": XSD, "xsi": XSI}
 
@@ -18,6 +18,10 @@ class NamespaceManager(dict[str, Namespace]):
     parent: NamespaceManager | None = None
     """Parent :class:`NamespaceManager` this manager is a child of, if any."""
 
+    frozen: bool = False
+    """Whether the manager is read-only: a frozen manager resolves names
+    without registering their namespace, and refuses new namespaces."""
+
     def __init__(
         self,
         namespaces: NSCollection | None = None,
@@ -52,6 +56,22 @@ class NamespaceManager(dict[str, Namespace]):
         if namespaces is not None:
             self.add_namespaces(namespaces)
 
+    def _copy(
+        self, parent: NamespaceManager | None, frozen: bool = False
+    ) -> NamespaceManager:
+        # A manager resolving names as this one does, for a clone or (frozen)
+        # a snapshot of a bundle
+        manager = NamespaceManager(parent=parent)
+        manager.update(self)
+        manager._namespaces = dict(self._namespaces)
+        manager._default = self._default
+        manager._anon_id_count = self._anon_id_count
+        manager._uri_map = dict(self._uri_map)
+        manager._rename_map = dict(self._rename_map)
+        manager._prefix_renamed_map = dict(self._prefix_renamed_map)
+        manager.frozen = frozen
+        return manager
+
     def get_namespace(self, uri: str) -> Namespace | None:
         """Return the known namespace with the given URI.
 
@@ -81,7 +101,11 @@ class NamespaceManager(dict[str, Namespace]):
 
         Args:
             uri: The URI of the default namespace.
+
+        Raises:
+            ProvException: If the manager is frozen.
         """
+        self._check_not_frozen()
         self._default = Namespace("", uri)
         self[""] = self._default
 
@@ -102,6 +126,10 @@ class NamespaceManager(dict[str, Namespace]):
         Returns:
             The registered namespace, which may be the existing or renamed one
             rather than the argument.
+
+        Raises:
+            ProvException: If the manager is frozen and the namespace is not
+                registered already.
         """
         if namespace in self.values():
             #  no need to do anything
@@ -110,6 +138,7 @@ class NamespaceManager(dict[str, Namespace]):
             #  already renamed and added
             return self._rename_map[namespace]
 
+        self._check_not_frozen()
         # Checking if the URI has been defined and use the existing namespace
         # instead
         uri = namespace.uri
@@ -163,9 +192,10 @@ class NamespaceManager(dict[str, Namespace]):
         """Resolve an identifier to a valid qualified name.
 
         Registers the namespace of the resolved name if it was not registered
-        already. Where the identifier is a string or :class:`Identifier`, an
-        attempt is made to expand a known prefix or compact a known namespace
-        URI, delegating to the parent manager if all local attempts fail.
+        already, unless the manager is :attr:`frozen`. Where the identifier is
+        a string or :class:`Identifier`, an attempt is made to expand a known
+        prefix or compact a known namespace URI, delegating to the parent
+        manager if all local attempts fail.
 
         Args:
             qname: The candidate to resolve, as a
@@ -217,11 +247,14 @@ class NamespaceManager(dict[str, Namespace]):
             # the namespace is a default namespace
             if self._default is None:
                 # no default namespace is defined, reused the one given
-                self._default = namespace
+                if not self.frozen:
+                    self._default = namespace
                 return qname  # no change, return the original
             elif self._default == namespace:
                 # the same default namespace is defined
                 new_qname = self._default[local_part]
+            elif self.frozen:
+                return self._unregistered_qualified_name(qname)
             else:
                 # different default namespace,
                 # use the 'dn' prefix for the new namespace
@@ -236,6 +269,8 @@ class NamespaceManager(dict[str, Namespace]):
             else:
                 # reuse the existing namespace
                 new_qname = existing_ns[local_part]
+        elif self.frozen:
+            return self._unregistered_qualified_name(qname)
         else:
             # Do not reuse the namespace object, making an identical copy
             ns = self.add_namespace(Namespace(namespace.prefix, namespace.uri))
@@ -244,6 +279,17 @@ class NamespaceManager(dict[str, Namespace]):
         # returning the new qname
         return new_qname
 
+    def _unregistered_qualified_name(self, qname: QualifiedName) -> QualifiedName:
+        # What a frozen manager resolves a name whose namespace is not
+        # registered to, instead of registering it: the same name in the
+        # registered namespace of the same URI, if any, or the name itself
+        namespace = self._uri_map.get(qname.namespace.uri)
+        return namespace[qname.localpart] if namespace is not None else qname
+
+    def _check_not_frozen(self) -> None:
+        if self.frozen:
+            raise ProvException("The namespaces are frozen and cannot be changed")
+
     def _resolve_prefixed_string(self, str_value: str) -> QualifiedName | None:
         #  check if the identifier contains a registered prefix
         prefix, local_part = str_value.split(":", 1)
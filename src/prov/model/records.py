@@ -9,6 +9,7 @@ import logging
 import os
 import re
 import typing
+import weakref
 from collections import defaultdict
 from collections.abc import Callable, Iterable, Iterator, MutableSet
 from typing import IO, TYPE_CHECKING, Any, Union, cast
@@ -81,6 +82,8 @@ from prov.constants import (
 from prov.identifier import Identifier, Namespace, QualifiedName
 
 if TYPE_CHECKING:
+    import hashlib
+
     from prov.model.bundle import ProvBundle
 
 logger = logging.getLogger(__name__)
@@ -336,6 +339,16 @@ class TypedValueSet(MutableSet[Any]):
         return f"{type(self).__name__}({list(self._index.values())!r})"
 
 
+def _copy_attributes(
+    attributes: dict[QualifiedName, TypedValueSet],
+) -> dict[QualifiedName, TypedValueSet]:
+    # A copy of a record's attribute storage, down to the value sets
+    return defaultdict(
+        TypedValueSet,
+        ((name, TypedValueSet(values)) for name, values in attributes.items()),
+    )
+
+
 def _ensure_multiline_string_triple_quoted(value: str) -> str:
     # converting the value to a string
     s = str(value)
@@ -382,6 +395,18 @@ def encoding_provn_value(
         return str(value)
 
 
+def _literal_comparison_value(
+    value: str, datatype: QualifiedName | None
+) -> str | decimal.Decimal:
+    # See Literal._comparison_value()
+    if datatype == XSD_DECIMAL:
+        try:
+            return decimal.Decimal(value)
+        except decimal.InvalidOperation:
+            pass
+    return value
+
+
 class Literal:
     """A typed (and optionally language-tagged) PROV literal value.
 
@@ -390,8 +415,28 @@ class Literal:
     ``prov:InternationalizedString``: if no datatype was given one is assumed,
     and any other datatype is overridden (with a warning) to comply with the
     PROV-JSON/PROV-XML rules for language-tagged strings.
+
+    Literals are immutable. Their comparison key (see
+    :meth:`_comparison_value` and :meth:`_comparison_langtag`) and hash are
+    computed once, on construction, since literals are hashed every time
+    they are stored in a record's attribute value sets.
     """
 
+    __slots__ = ("__weakref__", "_datatype", "_hash", "_key", "_langtag", "_value")
+
+    # The intern table of intern(), keyed by the comparison key and the
+    # stored value and language tag of the literals it holds
+    _interned: typing.ClassVar[
+        weakref.WeakValueDictionary[
+            tuple[
+                tuple[str | decimal.Decimal, QualifiedName | None, str | None],
+                str,
+                str | None,
+            ],
+            Literal,
+        ]
+    ] = weakref.WeakValueDictionary()
+
     def __init__(
         self,
         value: Any,
@@ -427,6 +472,55 @@ class Literal:
         self._datatype: QualifiedName | None = datatype
         # langtag is always a string
         self._langtag: str | None = str(langtag) if langtag is not None else None
+        # The comparison key behind __eq__/__hash__, see _comparison_value()
+        # and _comparison_langtag().
+        self._key: tuple[str | decimal.Decimal, QualifiedName | None, str | None] = (
+            _literal_comparison_value(self._value, datatype),
+            datatype,
+            self._langtag.casefold() if self._langtag is not None else None,
+        )
+        self._hash = hash(self._key)
+
+    @classmethod
+    def intern(
+        cls,
+        value: Any,
+        datatype: QualifiedName | None = None,
+        langtag: str | None = None,
+    ) -> Literal:
+        """Return a shared literal equal to ``Literal(value, datatype, langtag)``.
+
+        Literals created through this method are kept in an intern table,
+        so a literal repeated across many records (e.g. the same
+        ``prov:type`` value) is stored once. The table holds its literals
+        weakly: an entry goes away when no record refers to it any more.
+        Literals are looked up once built, with their datatype and language
+        tag normalised; equal literals written differently, such as
+        ``"10"`` and ``"10.00"`` as ``xsd:decimal``, are kept apart so that
+        each is serialized as it was given.
+
+        Interning is opt-in: nothing in the package calls this method, and
+        the constructor and the deserializers always create new literals.
+
+        Args:
+            value: The literal's value; it is stored as its string form.
+            datatype: The qualified name of the value's datatype (default:
+                ``None``).
+            langtag: An optional language tag (default: ``None``).
+
+        Returns:
+            The interned :class:`Literal`.
+        """
+        literal = cls(value, datatype, langtag)
+        key = (literal._key, literal._value, literal._langtag)
+        return cls._interned.setdefault(key, literal)
+
+    def __reduce__(
+        self,
+    ) -> tuple[type[Literal], tuple[str, QualifiedName | None, str | None]]:
+        # Rebuild through __init__ so that the comparison key and hash are
+        # recomputed rather than restored from a pickle.
+        return self.__class__, (self._value, self._datatype, self._langtag)
 
     def __str__(self) -> str:
         return self.provn_representation()
@@ -435,12 +529,10 @@ class Literal:
         return f"<Literal: {self.provn_representation()}>"
 
     def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
         return (
-            (
-                self._comparison_value() == other._comparison_value()
-                and self._datatype == other.datatype
-                and self._comparison_langtag() == other._comparison_langtag()
-            )
+            self._hash == other._hash and self._key == other._key
             if isinstance(other, Literal)
             else False
         )
@@ -449,9 +541,7 @@ class Literal:
         return not (self == other)
 
     def __hash__(self) -> int:
-        return hash(
-            (self._comparison_value(), self._datatype, self._comparison_langtag())
-        )
+        return self._hash
 
     def _comparison_value(self) -> str | decimal.Decimal:
         """The value to use for equality/hash: value-space for xsd:decimal (#77).
@@ -466,12 +556,7 @@ class Literal:
         ``Decimal`` from an ``XSD_DECIMAL`` literal, never against a
         lexical-string value from a different datatype.
         """
-        if self._datatype == XSD_DECIMAL:
-            try:
-                return decimal.Decimal(self._value)
-            except decimal.InvalidOperation:
-                pass
-        return self._value
+        return self._key[0]
 
     def _comparison_langtag(self) -> str | None:
         """The language tag to use for equality/hash: case-folded (#259).
@@ -479,7 +564,7 @@ class Literal:
         RDF 1.1 language tags are case-insensitive; the stored tag itself is
         left untouched so serialized output preserves its original case.
         """
-        return self._langtag.casefold() if self._langtag is not None else None
+        return self._key[2]
 
     @property
     def value(self) -> str:
@@ -559,6 +644,65 @@ class ProvElementIdentifierRequired(ProvException):
         return "An identifier is missing. All PROV elements require a valid identifier."
 
 
+# hashlib.sha256, imported by the first digest computed rather than with
+# prov.model, then kept here for the next ones
+_new_sha256: Callable[[bytes], hashlib._Hash] | None = None
+
+
+def _sha256(data: bytes = b"") -> hashlib._Hash:
+    """Return a new SHA-256 hasher, fed with ``data``."""
+    global _new_sha256
+    if _new_sha256 is None:
+        import hashlib
+
+        _new_sha256 = hashlib.sha256
+    return _new_sha256(data)
+
+
+def _digest_token(text: str) -> bytes:
+    """Length-prefix ``text`` so concatenated tokens can never run together."""
+    encoded = text.encode("utf-8")
+    return f"{len(encoded)}:".encode("ascii") + encoded
+
+
+def _canonical_value_tokens(value: Any) -> tuple[str, ...]:
+    """Return the serialization-independent ``(kind, ...)`` form of a value.
+
+    The form follows the record equality rules, so values that compare equal
+    on a record get the same tokens: a :class:`Literal` uses its value-space
+    comparison key (#77, #259), an aware :class:`datetime.datetime` is
+    normalised to UTC, and the Python type is kept in ``kind`` so that ``2``,
+    ``2.0`` and ``True`` stay distinct (#34).
+    """
+    if isinstance(value, QualifiedName):
+        return ("qname", value.uri)
+    if isinstance(value, Identifier):
+        return ("uri", value.uri)
+    if isinstance(value, Literal):
+        comparison_value = value._comparison_value()
+        if isinstance(comparison_value, decimal.Decimal):
+            comparison_value = (
+                "0" if comparison_value.is_zero() else str(comparison_value.normalize())
+            )
+        langtag = value._comparison_langtag()
+        datatype = value.datatype
+        return (
+            "literal",
+            comparison_value,
+            datatype.uri if datatype is not None else "",
+            langtag if langtag is not None else "",
+        )
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None and value.utcoffset() is not None:
+            value = value.astimezone(datetime.timezone.utc)
+        return ("datetime", value.isoformat())
+    if isinstance(value, bool):  # before int: bool is an int subtype
+        return ("bool", "true" if value else "false")
+    if isinstance(value, float):
+        return ("float", repr(value))
+    return (f"{type(value).__module__}.{type(value).__qualname__}", str(value))
+
+
 #  PROV records
 class ProvRecord:
     """Base class for PROV records."""
@@ -569,6 +713,15 @@ class ProvRecord:
     _prov_type: QualifiedName | None = None
     """PROV type of record."""
 
+    # The hash of a record of a frozen bundle, cached (see __hash__)
+    _hash: int | None = None
+    # Whether the record's attribute storage is shared with another record
+    # (see _share_to), and must be copied before a change
+    _shared: bool = False
+    # The position of the record in a store keeping it out of memory, which
+    # saves the record again after a change (see RecordStore.update)
+    _store_position: int | None = None
+
     def __init__(
         self,
         bundle: ProvBundle,
@@ -588,6 +741,7 @@ class ProvRecord:
         self._attributes: dict[QualifiedName, TypedValueSet] = defaultdict(
             TypedValueSet
         )
+        self._digest: str | None = None
         if attributes:
             self.add_attributes(attributes)
 
@@ -607,13 +761,110 @@ class ProvRecord:
         )
 
     def __hash__(self) -> int:
-        return hash((self.get_type(), self._identifier, self._typed_attributes()))
+        # Cached for the records of frozen bundles, which cannot change; a
+        # bundle unfrozen and changed drops it (see _mark_modified)
+        if self._hash is not None:
+            return self._hash
+        record_hash = hash(
+            (self.get_type(), self._identifier, self._typed_attributes())
+        )
+        if self._bundle is not None and self._bundle._frozen:
+            self._hash = record_hash
+        return record_hash
+
+    def digest(self) -> str:
+        """Return a stable, content-addressed fingerprint of the record.
+
+        Unlike :func:`hash`, which is salted per process, the digest is a
+        SHA-256 hex string computed from a canonical encoding of the record
+        type, its identifier and its attributes, so it can be stored and
+        compared across processes and machines. The encoding does not depend
+        on any serialization format, on namespace prefixes (only URIs are
+        used) or on attribute order, and records that compare equal get the
+        same digest. It is computed once and cached until the record's
+        attributes change.
+
+        Returns:
+            The hexadecimal SHA-256 digest of the record.
+        """
+        if self._digest is None:
+            hasher = _sha256()
+            hasher.update(_digest_token(self.get_type().uri))
+            hasher.update(
+                _digest_token(self._identifier.uri)
+                if self._identifier is not None
+                else b"-"
+            )
+            attribute_tokens = sorted(
+                b"".join(
+                    _digest_token(token)
+                    for token in (attr_name.uri, *_canonical_value_tokens(value))
+                )
+                for attr_name, value in self.attributes
+            )
+            hasher.update(_digest_token(str(len(attribute_tokens))))
+            for token in attribute_tokens:
+                hasher.update(token)
+            self._digest = hasher.hexdigest()
+        return self._digest
+
+    def _prepare_change(self) -> None:
+        # Refuse a change to a record of a frozen bundle; otherwise, give the
+        # record its own attribute storage if it shares it with another
+        # record (copy-on-write), for that record not to see the change.
+        if self._bundle is not None:
+            self._bundle._check_not_frozen()
+        if self._shared:
+            self._attributes = _copy_attributes(self._attributes)
+            self._shared = False
+
+    def _mark_modified(self) -> None:
+        # Drop the cached digest and hash of this record and the digest of
+        # its owning bundle (which is built from its records') after a
+        # mutation, and bump the bundle's mutation version; a record kept
+        # out of memory is saved again.
+        self._digest = None
+        self._hash = None
+        if self._bundle is not None:
+            self._bundle._records_digest = None
+            self._bundle._mark_modified()
+            if self._store_position is not None:
+                self._bundle._records.update(self)
 
     def copy(self) -> ProvRecord:
-        """Return an exact copy of this record."""
-        return PROV_REC_CLS[self.get_type()](
-            self._bundle, self.identifier, self.attributes
-        )
+        """Return an exact copy of this record.
+
+        The copy shares the attribute storage of this record until either of
+        them is changed, when the one changed copies it (copy-on-write), so
+        copying a record neither copies nor checks its attributes again.
+        """
+        return self._share_to(self._bundle)
+
+    def _copy_to(self, bundle: ProvBundle) -> ProvRecord:
+        # A copy of this record owned by `bundle`, for a bundle with the same
+        # namespaces. Unlike ProvBundle.add_record(), the (already resolved
+        # and coerced) attribute values are copied as they are, and so is the
+        # cached digest.
+        record = self.__class__.__new__(self.__class__)
+        record._bundle = bundle
+        record._identifier = self._identifier
+        record._attributes = _copy_attributes(self._attributes)
+        record._digest = self._digest
+        return record
+
+    def _share_to(self, bundle: ProvBundle) -> ProvRecord:
+        # A copy of this record owned by `bundle`, for a bundle resolving its
+        # names as this record's does, sharing this record's attribute
+        # storage instead of copying it, as _copy_to() does. Either record
+        # copies the storage before its next change (see _prepare_change),
+        # so that the other never sees it.
+        record = self.__class__.__new__(self.__class__)
+        record._bundle = bundle
+        record._identifier = self._identifier
+        record._attributes = self._attributes
+        record._digest = self._digest
+        record._shared = self._shared = True
+        return record
 
     def get_type(self) -> QualifiedName:
         """Return the PROV type of the record.
@@ -636,15 +887,20 @@ class ProvRecord:
         under Python equality -- this copy never loses information: unlike
         :meth:`get_attribute`/:attr:`value`, there is no lossy case here.
         """
-        return set(self._attributes[PROV_TYPE])
+        return set(self._attributes.get(PROV_TYPE, ()))
 
     def add_asserted_type(self, type_identifier: QualifiedName) -> None:
         """Add a PROV type assertion to the record.
 
         Args:
             type_identifier: The qualified name of the type to assert.
+
+        Raises:
+            ProvException: If the record's bundle is frozen.
         """
+        self._prepare_change()
         self._attributes[PROV_TYPE].add(type_identifier)
+        self._mark_modified()
 
     def get_attribute(self, attr_name: QualifiedNameCandidate) -> set[Any]:
         """Return the values (if any) for the named attribute.
@@ -667,7 +923,7 @@ class ProvRecord:
                 resolved to a valid qualified name.
         """
         attr_name_qn = self._bundle.mandatory_valid_qname(attr_name)
-        return set(self._attributes[attr_name_qn])
+        return set(self._attributes.get(attr_name_qn, ()))
 
     @property
     def identifier(self) -> QualifiedName | None:
@@ -693,8 +949,9 @@ class ProvRecord:
 
         Missing formal attributes are represented by ``None``.
         """
+        attributes = self._attributes
         return tuple(
-            first(self._attributes[attr_name]) for attr_name in self.FORMAL_ATTRIBUTES
+            first(attributes.get(attr_name, ())) for attr_name in self.FORMAL_ATTRIBUTES
         )
 
     @property
@@ -704,8 +961,9 @@ class ProvRecord:
         Pairs are in declaration order; a missing attribute has a value of
         ``None``.
         """
+        attributes = self._attributes
         return tuple(
-            (attr_name, first(self._attributes[attr_name]))
+            (attr_name, first(attributes.get(attr_name, ())))
             for attr_name in self.FORMAL_ATTRIBUTES
         )
 
@@ -730,11 +988,8 @@ class ProvRecord:
         This is the record's ``prov:label`` attribute if set, otherwise its
         identifier.
         """
-        return str(
-            first(self._attributes[PROV_LABEL])
-            if self._attributes[PROV_LABEL]
-            else self._identifier
-        )
+        labels = self._attributes.get(PROV_LABEL)
+        return str(first(labels) if labels else self._identifier)
 
     @property
     def value(self) -> set[Any]:
@@ -744,7 +999,7 @@ class ProvRecord:
         :meth:`get_attribute` for what that means for a Python-equal-but-
         differently-typed pair of ``prov:value`` values (#34).
         """
-        return set(self._attributes[PROV_VALUE])
+        return set(self._attributes.get(PROV_VALUE, ()))
 
     # Handling attributes
     def _auto_literal_conversion(self, literal: Any) -> Any:
@@ -883,6 +1138,7 @@ class ProvRecord:
                 return
 
         existing_values.add(value)
+        self._mark_modified()
 
     def add_attributes(self, attributes: RecordAttributesArg) -> None:
         """Add attributes to the record.
@@ -899,11 +1155,12 @@ class ProvRecord:
         Raises:
             ProvExceptionInvalidQualifiedName: If an attribute name cannot be
                 resolved to a valid qualified name.
-            ProvException: If a value is invalid for its attribute, or a
+            ProvException: If a value is invalid for its attribute, a
                 second, different value is supplied for a single-valued
-                (non-collection) attribute.
+                (non-collection) attribute, or the record's bundle is frozen.
         """
         if attributes:
+            self._prepare_change()
             if isinstance(attributes, dict):
                 # Converting the dictionary into a list of tuples
                 # (i.e. attribute-value pairs)
@@ -1326,20 +1583,26 @@ class ProvActivity(ProvElement):
                 (default: ``None``).
             endTime: The end time as a :class:`datetime.datetime`
                 (default: ``None``).
+
+        Raises:
+            ProvException: If the activity's bundle is frozen.
         """
+        self._prepare_change()
         if startTime is not None:
             self._attributes[PROV_ATTR_STARTTIME] = TypedValueSet([startTime])
         if endTime is not None:
             self._attributes[PROV_ATTR_ENDTIME] = TypedValueSet([endTime])
+        if startTime is not None or endTime is not None:
+            self._mark_modified()
 
     def get_startTime(self) -> datetime.datetime | None:
         """Return the activity's start time, or ``None`` if unset."""
-        values = self._attributes[PROV_ATTR_STARTTIME]
+        values = self._attributes.get(PROV_ATTR_STARTTIME)
         return first(values) if values else None
 
     def get_endTime(self) -> datetime.datetime | None:
         """Return the activity's end time, or ``None`` if unset."""
-        values = self._attributes[PROV_ATTR_ENDTIME]
+        values = self._attributes.get(PROV_ATTR_ENDTIME)
         return first(values) if values else None
 
     # Convenient assertions that take the current ProvActivity as the first
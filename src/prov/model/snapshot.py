@@ -0,0 +1,194 @@
+"""Frozen snapshots of documents: immutable, indexed and hashable.
+
+:meth:`~prov.model.ProvDocument.freeze` returns a :class:`FrozenProvDocument`,
+a read-only copy of a document as it is at that moment. A snapshot does not
+copy the records of the document: its records share their attributes with
+the document's, and a record of the document copies its own attributes the
+first time it is changed after the snapshot was taken, so the snapshot never
+sees the change (copy-on-write). Taking a snapshot thus costs time linear in
+the number of records, but no attribute is copied or validated again.
+
+In return for being immutable, a snapshot can be shared by threads without
+locking (see ``docs/explanation/concurrency.md``), can be hashed, e.g. to key
+a cache, and is compared with another snapshot by :meth:`digest`. Its records
+are indexed by type and by the names their formal attributes refer to, on
+top of the index by identifier every bundle has.
+"""
+
+from __future__ import annotations  # defer eval: TYPE_CHECKING names in signatures
+
+import heapq
+from collections.abc import Iterable
+from typing import Any, cast
+
+from prov.identifier import QualifiedName
+from prov.model.bundle import ProvBundle, ProvDocument
+from prov.model.records import ProvException, ProvRecord, QualifiedNameCandidate
+from prov.model.store import MemoryRecordStore
+
+__author__ = "Trung Dong Huynh"
+__email__ = "trungdong@donggiang.com"
+
+__all__ = ["FrozenProvBundle", "FrozenProvDocument"]
+
+
+class FrozenProvBundle(ProvBundle):
+    """A bundle of a :class:`FrozenProvDocument`.
+
+    A frozen bundle cannot be changed, nor unfrozen (see
+    :meth:`~prov.model.ProvBundle.set_frozen`). Frozen bundles are hashable,
+    and compare equal to one another when their :meth:`digest` does, as
+    plain bundles of the same records do.
+    """
+
+    # Record positions by record class, and by the names (records)
+    # referenced in their formal attributes
+    _positions_by_class: dict[type[ProvRecord], list[int]]
+    _references: dict[QualifiedName, list[ProvRecord]]
+
+    def __init__(self, bundle: ProvBundle, document: FrozenProvDocument):
+        """Take a snapshot of a bundle of a document.
+
+        Args:
+            bundle: The bundle to take a snapshot of.
+            document: The snapshot of the bundle's document.
+        """
+        ProvBundle.__init__(self, identifier=bundle.identifier, document=document)
+        self._namespaces = bundle._namespaces._copy(document._namespaces, frozen=True)
+        self._share_records(bundle)
+        self.set_frozen()
+
+    def _share_records(self, source: ProvBundle) -> None:
+        # Take the records of `source`, sharing their attributes, and index
+        # them. They are added to the (memory) store directly: a snapshot has
+        # no version to bump, nor digest to drop.
+        store = self._records
+        positions_by_class: dict[type[ProvRecord], list[int]] = {}
+        references: dict[QualifiedName, list[ProvRecord]] = {}
+        for position, record in enumerate(source._records):
+            shared = record._share_to(self)
+            store.add(shared)
+            positions_by_class.setdefault(type(shared), []).append(position)
+            # each name once per record, e.g. for alternateOf(e, e)
+            for name in dict.fromkeys(
+                value
+                for _, value in shared.formal_attributes
+                if isinstance(value, QualifiedName)
+            ):
+                references.setdefault(name, []).append(shared)
+        self._positions_by_class = positions_by_class
+        self._references = references
+
+    def set_frozen(self, frozen: bool = True) -> None:
+        """Keep the bundle frozen.
+
+        Args:
+            frozen: Must be ``True`` (default: ``True``).
+
+        Raises:
+            ProvException: If ``frozen`` is ``False``: a snapshot cannot be
+                unfrozen.
+        """
+        if not frozen:
+            raise ProvException(f"{self!r} is a snapshot and cannot be unfrozen")
+        super().set_frozen(frozen)
+
+    def get_records(
+        self, class_or_type_or_tuple: type | tuple[type] | None = None
+    ) -> Iterable[ProvRecord]:
+        """Return the bundle's records, optionally filtered by type.
+
+        As :meth:`ProvBundle.get_records`, but the records of the classes
+        asked for are looked up in the bundle's index by record class,
+        rather than found by testing every record.
+
+        Args:
+            class_or_type_or_tuple: An optional class or tuple of classes; only
+                records passing ``isinstance()`` against it are returned
+                (default: ``None``, meaning all records).
+
+        Returns:
+            A list of the matching :class:`ProvRecord` objects, in the order
+            they were added.
+        """
+        records = cast(MemoryRecordStore, self._records)
+        if not class_or_type_or_tuple:
+            return list(records)
+        position_lists = [
+            positions
+            for cls, positions in self._positions_by_class.items()
+            if issubclass(cls, class_or_type_or_tuple)
+        ]
+        return [records[position] for position in heapq.merge(*position_lists)]
+
+    def get_records_referencing(
+        self, identifier: QualifiedNameCandidate
+    ) -> list[ProvRecord]:
+        """Return the records referring to an identifier in a formal attribute.
+
+        E.g. the generations, usages, derivations, etc. involving an entity,
+        looked up in the bundle's index of the names referenced by records.
+
+        Args:
+            identifier: The identifier referred to.
+
+        Returns:
+            The matching :class:`ProvRecord` objects, in the order they were
+            added, or an empty list if the identifier is invalid or none
+            refers to it.
+        """
+        valid_id = self.valid_qualified_name(identifier)
+        records = self._references.get(valid_id) if valid_id is not None else None
+        return list(records) if records is not None else []
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is type(self):
+            return self.digest() == other.digest()
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        return hash(self.digest())
+
+
+class FrozenProvDocument(FrozenProvBundle, ProvDocument):
+    """An immutable snapshot of a :class:`~prov.model.ProvDocument`.
+
+    Returned by :meth:`~prov.model.ProvDocument.freeze`. The snapshot and its
+    bundles are :class:`FrozenProvBundle`\\ s. Its records are kept in
+    memory, whatever the store of the document's.
+    """
+
+    def __init__(self, document: ProvDocument):
+        """Take a snapshot of a document.
+
+        Args:
+            document: The document to take a snapshot of.
+        """
+        ProvDocument.__init__(self)
+        self._namespaces = document._namespaces._copy(None, frozen=True)
+        self._document_digest: str | None = None
+        self._share_records(document)
+        for bundle in document.bundles:
+            # bundles are always named
+            self._bundles[bundle.identifier] = FrozenProvBundle(bundle, self)  # type: ignore[index]
+        self.set_frozen()
+
+    def __repr__(self) -> str:
+        return "<FrozenProvDocument>"
+
+    def freeze(self) -> FrozenProvDocument:
+        """Return the snapshot itself, which is immutable already."""
+        return self
+
+    def digest(self) -> str:
+        """Return a stable, content-addressed fingerprint of the whole document.
+
+        See :meth:`ProvDocument.digest`; the digest of a snapshot is
+        computed once.
+
+        Returns:
+            The hexadecimal SHA-256 digest of the document.
+        """
+        if self._document_digest is None:
+            self._document_digest = ProvDocument.digest(self)
+        return self._document_digest
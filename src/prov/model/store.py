@@ -0,0 +1,524 @@
+"""Record stores: where a bundle keeps its records.
+
+A :class:`~prov.model.ProvBundle` keeps its records, in the order they were
+added, and an index of them by identifier in a :class:`RecordStore`. The
+default :class:`MemoryRecordStore` holds them in Python lists, as bundles
+always have; :class:`SQLiteRecordStore` keeps them in an SQLite database
+instead, so that a document larger than memory can be built, queried and
+serialized, its records being read back from disk as they are iterated.
+"""
+
+from __future__ import annotations  # defer eval: TYPE_CHECKING names in signatures
+
+import datetime
+import functools
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, cast
+
+from prov.identifier import Identifier, Namespace, QualifiedName
+from prov.model.records import (
+    PROV_REC_CLS,
+    Literal,
+    ProvException,
+    ProvRecord,
+    TypedValueSet,
+)
+
+if TYPE_CHECKING:
+    import sqlite3
+
+    from prov.model.bundle import ProvBundle
+    from prov.model.records import PathLike
+
+__author__ = "Trung Dong Huynh"
+__email__ = "trungdong@donggiang.com"
+
+__all__ = ["MemoryRecordStore", "RecordStore", "SQLiteRecordStore"]
+
+
+class RecordStore(ABC):
+    """Storage for the records of one bundle.
+
+    A store is attached to the bundle it serves with :meth:`bind` when the
+    bundle is created, and is only written to through :meth:`add`; records
+    are never removed.
+    """
+
+    bundle: ProvBundle | None = None
+    """The bundle whose records are stored, set by :meth:`bind`."""
+
+    def bind(self, bundle: ProvBundle) -> None:
+        """Attach the store to the bundle whose records it holds.
+
+        Args:
+            bundle: The bundle owning the store.
+        """
+        self.bundle = bundle
+
+    @abstractmethod
+    def add(self, record: ProvRecord) -> None:
+        """Append a record to the store.
+
+        Args:
+            record: A record of the bundle the store is bound to.
+        """
+
+    def update(self, record: ProvRecord) -> None:  # noqa: B027 (optional hook)
+        """Save a change made to a record of the store.
+
+        Records call this after each change when their
+        ``_store_position`` is set, which a store keeping its records out
+        of memory does for the records it holds; it then writes the record
+        at that position again. The default does nothing.
+
+        Args:
+            record: The changed record.
+        """
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[ProvRecord]:
+        """Iterate over the records, in the order they were added."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of records."""
+
+    @abstractmethod
+    def get(self, identifier: QualifiedName) -> list[ProvRecord]:
+        """Return the records with an identifier, in the order they were added.
+
+        Args:
+            identifier: The identifier to look up.
+
+        Returns:
+            The records, or an empty list if there is none.
+        """
+
+    @abstractmethod
+    def shared_identifiers(self) -> Iterator[list[ProvRecord]]:
+        """Iterate over the groups of records sharing an identifier.
+
+        Only identifiers given to more than one record are considered; they
+        are the ones :meth:`~prov.model.ProvBundle.unified` merges.
+        """
+
+    @abstractmethod
+    def bundle_store(self, identifier: QualifiedName) -> RecordStore:
+        """Return a new, empty store of the same kind for a bundle of a document.
+
+        :meth:`~prov.model.ProvDocument.bundle` calls this on the document's
+        store, so that the bundles of a document are kept alongside its own
+        records.
+
+        Args:
+            identifier: The identifier of the new bundle.
+        """
+
+
+class MemoryRecordStore(RecordStore):
+    """The default store, keeping records in memory.
+
+    Records are held in a list, and indexed by identifier in a dict of lists.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty store."""
+        self._records: list[ProvRecord] = []
+        # A plain dict, not a defaultdict: looking an identifier up must not
+        # add it, for concurrent reads to be safe
+        self._id_map: dict[QualifiedName, list[ProvRecord]] = {}
+
+    def add(self, record: ProvRecord) -> None:
+        identifier = record.identifier
+        if identifier is not None:
+            records = self._id_map.get(identifier)
+            if records is None:
+                self._id_map[identifier] = [record]
+            else:
+                records.append(record)
+        self._records.append(record)
+
+    def __iter__(self) -> Iterator[ProvRecord]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, index: int) -> ProvRecord:
+        return self._records[index]
+
+    def get(self, identifier: QualifiedName) -> list[ProvRecord]:
+        records = self._id_map.get(identifier)
+        return list(records) if records is not None else []
+
+    def shared_identifiers(self) -> Iterator[list[ProvRecord]]:
+        for records in self._id_map.values():
+            if len(records) > 1:
+                yield records
+
+    def bundle_store(self, identifier: QualifiedName) -> MemoryRecordStore:
+        return MemoryRecordStore()
+
+
+# Tags of the attribute value kinds in SQLiteRecordStore's JSON encoding
+_STRING = "s"
+_QUALIFIED_NAME = "q"
+_URI = "u"
+_LITERAL = "l"
+_BOOLEAN = "b"
+_INTEGER = "i"
+_FLOAT = "f"
+_DATETIME = "t"
+
+_RECORD_TYPES_BY_URI = {record_type.uri: record_type for record_type in PROV_REC_CLS}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prov_records (
+    bundle TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    record_type TEXT NOT NULL,
+    identifier TEXT,
+    content TEXT NOT NULL,
+    PRIMARY KEY (bundle, position)
+);
+CREATE INDEX IF NOT EXISTS prov_records_identifier
+    ON prov_records (bundle, identifier) WHERE identifier IS NOT NULL;
+"""
+
+
+class SQLiteRecordStore(RecordStore):
+    """A store keeping records in an SQLite database.
+
+    Each record is a row holding its type, identifier (indexed, for
+    :meth:`get` and :meth:`shared_identifiers`) and its attributes, encoded
+    as JSON in a form that keeps the exact Python type of every value. The
+    records of a document and of its bundles share one table, keyed by the
+    bundle's identifier, and thus one database file.
+
+    New records are encoded as they are added, and written in batches: the
+    row of a record is kept in memory until ``batch_size`` other records
+    have been added after it, or until the store is read. Records read from
+    the store are rebuilt from their rows each time, without validating
+    their attributes again, so iterating over a stored bundle (e.g. to
+    serialize it) only holds one batch of records at a time in memory. A
+    record read from the store, or added to it, is written again when it is
+    changed, as :meth:`update` describes.
+
+    The store can be used from any thread, e.g. to serialize a document in
+    an executor with :meth:`~prov.model.ProvDocument.aserialize`: the stores
+    of a document take turns on their connection, under one lock. A
+    connection passed in must then have been opened with
+    ``check_same_thread=False``, as the store opens its own.
+
+    Namespaces are not stored: qualified names are saved along with their
+    prefix and namespace URI, so a database re-opened with a new store gives
+    back the same records, but the namespaces of the document it is bound to
+    must be declared again for serialization.
+    """
+
+    def __init__(
+        self,
+        database: PathLike | sqlite3.Connection = ":memory:",
+        batch_size: int = 1000,
+        _bundle_key: str = "",
+        _family: list[SQLiteRecordStore] | None = None,
+    ):
+        """Open (or create) a store in an SQLite database.
+
+        Args:
+            database: Path of the database file, or an open connection to it
+                (default: ``":memory:"``, a private in-memory database).
+                Records already in the database for the document are part of
+                the store. To use the store from other threads than the one
+                creating it, a connection must be opened with
+                ``check_same_thread=False``.
+            batch_size: Number of records written to the database at a time,
+                and read from it at a time when iterating (default: 1000).
+        """
+        # Imported here rather than with prov.model, which loads this module
+        import json
+        import sqlite3
+
+        if isinstance(database, sqlite3.Connection):
+            self._connection = database
+        else:
+            self._connection = sqlite3.connect(
+                os.fspath(database), check_same_thread=False
+            )
+        # The stores sharing the connection, for close() to flush them all,
+        # and the lock they take to use it
+        self._family = _family if _family is not None else []
+        self._lock: threading.RLock = (
+            self._family[0]._lock if self._family else threading.RLock()
+        )
+        self._family.append(self)
+        self._batch_size = batch_size
+        self._bundle_key = _bundle_key
+        # The rows of the records added since the last flush()
+        self._pending: list[tuple[str, int, str, str | None, str]] = []
+        with self._lock:
+            self._connection.executescript(_SCHEMA)
+            (count,) = self._connection.execute(
+                "SELECT count(*) FROM prov_records WHERE bundle = ?", (_bundle_key,)
+            ).fetchone()
+        self._count: int = count
+        self._namespaces: dict[tuple[str, str], Namespace] = {}
+        # The JSON codec of the rows' content, bound once for every row
+        self._dumps = functools.partial(json.dumps, separators=(",", ":"))
+        self._loads = json.loads
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The connection to the database."""
+        return self._connection
+
+    def add(self, record: ProvRecord) -> None:
+        """Append a record to the store.
+
+        The record is encoded at once, and written with the next batch.
+
+        Args:
+            record: A record of the bundle the store is bound to.
+
+        Raises:
+            ProvException: If the record has an attribute value of a type
+                that cannot be stored; the record is not added.
+        """
+        with self._lock:
+            position = len(self)
+            row = self._encode_row(record, position)
+            if len(self._pending) >= self._batch_size:
+                self.flush()
+            self._pending.append(row)
+        record._store_position = position
+
+    def flush(self) -> None:
+        """Write the pending records to the database and commit."""
+        with self._lock:
+            if not self._pending:
+                return
+            rows = self._pending
+            self._count += len(rows)
+            self._pending = []
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT INTO prov_records VALUES (?, ?, ?, ?, ?)", rows
+                )
+
+    def update(self, record: ProvRecord) -> None:
+        """Encode a changed record again, and write it to its row.
+
+        Both the records read from the store and those added to it are
+        saved again when changed, e.g. by
+        :meth:`~prov.model.ProvRecord.add_attributes` or, just after a record
+        is added, by :meth:`~prov.model.ProvBundle.revision`; each record
+        read is a new object, though, so of two records read for the same
+        row, the one changed last is saved.
+
+        Args:
+            record: The changed record.
+
+        Raises:
+            ProvException: If the record now has an attribute value of a type
+                that cannot be stored; the row is left as it was.
+        """
+        position = cast(int, record._store_position)
+        row = self._encode_row(record, position)
+        with self._lock:
+            if position >= self._count:
+                # Not written yet
+                self._pending[position - self._count] = row
+                return
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE prov_records SET content = ? "
+                    "WHERE bundle = ? AND position = ?",
+                    (row[4], self._bundle_key, position),
+                )
+
+    def _encode_row(
+        self, record: ProvRecord, position: int
+    ) -> tuple[str, int, str, str | None, str]:
+        # The row of a record in the prov_records table
+        identifier = record.identifier
+        return (
+            self._bundle_key,
+            position,
+            record.get_type().uri,
+            identifier.uri if identifier is not None else None,
+            self._dumps(_encode_record(record)),
+        )
+
+    def close(self) -> None:
+        """Write the pending records and close the connection to the database.
+
+        The pending records of the stores of the document's bundles, which
+        share the connection, are written too.
+        """
+        with self._lock:
+            for store in self._family:
+                store.flush()
+            self._connection.close()
+
+    def __iter__(self) -> Iterator[ProvRecord]:
+        # The rows are fetched a batch at a time, each under the lock, for
+        # the connection to be free in between
+        with self._lock:
+            self.flush()
+            cursor = self._connection.execute(
+                "SELECT position, record_type, content FROM prov_records "
+                "WHERE bundle = ? ORDER BY position",
+                (self._bundle_key,),
+            )
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(self._batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield self._decode_record(*row)
+
+    def __len__(self) -> int:
+        return self._count + len(self._pending)
+
+    def get(self, identifier: QualifiedName) -> list[ProvRecord]:
+        with self._lock:
+            self.flush()
+            rows = self._connection.execute(
+                "SELECT position, record_type, content FROM prov_records "
+                "WHERE bundle = ? AND identifier = ? ORDER BY position",
+                (self._bundle_key, identifier.uri),
+            ).fetchall()
+        return [self._decode_record(*row) for row in rows]
+
+    def shared_identifiers(self) -> Iterator[list[ProvRecord]]:
+        with self._lock:
+            self.flush()
+            uris = self._connection.execute(
+                "SELECT identifier FROM prov_records "
+                "WHERE bundle = ? AND identifier IS NOT NULL "
+                "GROUP BY identifier HAVING count(*) > 1",
+                (self._bundle_key,),
+            ).fetchall()
+        for (uri,) in uris:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT position, record_type, content FROM prov_records "
+                    "WHERE bundle = ? AND identifier = ? ORDER BY position",
+                    (self._bundle_key, uri),
+                ).fetchall()
+            yield [self._decode_record(*row) for row in rows]
+
+    def bundle_store(self, identifier: QualifiedName) -> SQLiteRecordStore:
+        return SQLiteRecordStore(
+            self._connection,
+            self._batch_size,
+            _bundle_key=identifier.uri,
+            _family=self._family,
+        )
+
+    def _decode_record(
+        self, position: int, record_type_uri: str, content: str
+    ) -> ProvRecord:
+        # Rebuild a record from its row, as ProvRecord._copy_to() does: the
+        # stored values were already checked when the record was created.
+        identifier, attributes = self._loads(content)
+        cls = PROV_REC_CLS[_RECORD_TYPES_BY_URI[record_type_uri]]
+        record = cls.__new__(cls)
+        record._bundle = self.bundle  # type: ignore[assignment]
+        record._identifier = (
+            self._decode_qualified_name(identifier) if identifier is not None else None
+        )
+        record._attributes = defaultdict(TypedValueSet)
+        for name, values in attributes:
+            record._attributes[self._decode_qualified_name(name)] = TypedValueSet(
+                self._decode_value(value) for value in values
+            )
+        record._digest = None
+        record._store_position = position
+        return record
+
+    def _decode_qualified_name(self, encoded: list[str]) -> QualifiedName:
+        prefix, uri, localpart = encoded
+        namespace = self._namespaces.get((prefix, uri))
+        if namespace is None:
+            namespace = self._namespaces[(prefix, uri)] = Namespace(prefix, uri)
+        return namespace[localpart]
+
+    def _decode_value(self, encoded: list[Any]) -> Any:
+        kind = encoded[0]
+        if kind == _STRING:
+            return encoded[1]
+        if kind == _QUALIFIED_NAME:
+            return self._decode_qualified_name(encoded[1:])
+        if kind == _LITERAL:
+            datatype = encoded[2]
+            return Literal(
+                encoded[1],
+                self._decode_qualified_name(datatype) if datatype else None,
+                encoded[3],
+            )
+        if kind == _BOOLEAN:
+            return bool(encoded[1])
+        if kind == _INTEGER:
+            return int(encoded[1])
+        if kind == _FLOAT:
+            return float(encoded[1])
+        if kind == _DATETIME:
+            return datetime.datetime.fromisoformat(encoded[1])
+        if kind == _URI:
+            return Identifier(encoded[1])
+        raise ProvException(f"Unknown value kind in the record store: {kind}")
+
+
+def _encode_qualified_name(qname: QualifiedName) -> list[str]:
+    namespace = qname.namespace
+    return [namespace.prefix, namespace.uri, qname.localpart]
+
+
+def _encode_value(value: Any) -> list[Any]:
+    # The kind of a value and what is needed to rebuild it exactly; bool is
+    # tested before int, and QualifiedName before Identifier, its base class.
+    if isinstance(value, str):
+        return [_STRING, value]
+    if isinstance(value, QualifiedName):
+        return [_QUALIFIED_NAME, *_encode_qualified_name(value)]
+    if isinstance(value, Literal):
+        datatype = value.datatype
+        return [
+            _LITERAL,
+            value.value,
+            _encode_qualified_name(datatype) if datatype is not None else None,
+            value.langtag,
+        ]
+    if isinstance(value, bool):
+        return [_BOOLEAN, value]
+    if isinstance(value, int):
+        # As a string: JSON readers may not keep integers beyond 64 bits
+        return [_INTEGER, str(value)]
+    if isinstance(value, float):
+        return [_FLOAT, repr(value)]
+    if isinstance(value, datetime.datetime):
+        return [_DATETIME, value.isoformat()]
+    if isinstance(value, Identifier):
+        return [_URI, value.uri]
+    raise ProvException(
+        f"Cannot store a value of type {type(value).__name__} in a record store: "
+        f"{value!r}"
+    )
+
+
+def _encode_record(record: ProvRecord) -> list[Any]:
+    identifier = record.identifier
+    return [
+        _encode_qualified_name(identifier) if identifier is not None else None,
+        [
+            [_encode_qualified_name(name), [_encode_value(value) for value in values]]
+            for name, values in record._attributes.items()
+            if values
+        ],
+    ]
@@ -0,0 +1,251 @@
+"""Counters and timers for the phases of reading and writing PROV documents.
+
+Within a :func:`profile` block, the calls to the functions doing each phase
+of the work are counted and timed:
+
+- ``parse``: the deserializers, decoding a serialization into records;
+- ``resolve``: resolving identifiers to qualified names
+  (:meth:`~prov.model.NamespaceManager.valid_qualified_name`);
+- ``coerce``: normalising attribute values to their datatypes;
+- ``build``: creating records (:meth:`~prov.model.ProvBundle.new_record`);
+- ``encode``: the serializers, encoding a document (PROV-N included);
+- ``write``: writing the encoded output to its destination stream.
+
+Times are exclusive: the time spent resolving names while parsing counts for
+``resolve``, not ``parse``, so the times of all phases add up to the time
+spent in any of them.
+
+The functions are only instrumented for the duration of the block, by
+replacing them with timing wrappers on entry and restoring them on exit, so
+that they run with no instrumentation cost at all the rest of the time. Only
+calls made in the thread that entered the block are recorded, and only one
+block can be active at a time.
+
+.. moduleauthor:: Trung Dong Huynh <trungdong@donggiang.com>
+"""
+
+from __future__ import annotations  # defer eval: TYPE_CHECKING names in signatures
+
+import contextlib
+import functools
+import importlib
+import threading
+import time
+from collections.abc import Callable, Iterator
+from typing import Any
+
+__author__ = "Trung Dong Huynh"
+__email__ = "trungdong@donggiang.com"
+
+__all__ = ["PHASES", "ProfileStats", "profile"]
+
+PHASES = ("parse", "resolve", "coerce", "build", "encode", "write")
+"""The phases counted and timed by :func:`profile`, in processing order."""
+
+# The model methods doing the work of a phase, as (module, class, method)
+_MODEL_METHODS = {
+    ("prov.model.namespaces", "NamespaceManager", "valid_qualified_name"): "resolve",
+    ("prov.model.records", "ProvRecord", "_coerce_attribute_value"): "coerce",
+    ("prov.model.bundle", "ProvBundle", "new_record"): "build",
+    ("prov.model.bundle", "ProvBundle", "get_provn"): "encode",
+}
+
+# The phase of the methods of each registered serializer class
+_SERIALIZER_METHODS = {
+    "deserialize": "parse",
+    "deserialize_file": "parse",
+    "serialize": "encode",
+}
+
+# The statistics being collected by the active profile() block, if any
+_active: ProfileStats | None = None
+
+
+class ProfileStats:
+    """The number of calls and the time spent in each phase of the work.
+
+    Attributes:
+        counts: The number of calls made for each of :data:`PHASES` (nested
+            calls for the same phase, e.g. the delegation of name resolution
+            to a parent bundle, count once).
+        times: The time spent in each of :data:`PHASES`, in seconds,
+            excluding the time spent in the other phases it called.
+        total: The duration of the :func:`profile` block(s), in seconds.
+    """
+
+    def __init__(self) -> None:
+        self.counts: dict[str, int] = dict.fromkeys(PHASES, 0)
+        self.times: dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.total = 0.0
+        # The phases being timed, innermost last, as [phase, start time,
+        # time spent in nested phases]; None for a nested call of the phase
+        # above it, already timed by that call
+        self._stack: list[list[Any] | None] = []
+
+    def merge(self, other: ProfileStats) -> None:
+        """Add the counts and times of ``other`` to these.
+
+        Args:
+            other: Statistics collected elsewhere, e.g. in another process.
+        """
+        for phase in PHASES:
+            self.counts[phase] += other.counts[phase]
+            self.times[phase] += other.times[phase]
+        self.total += other.total
+
+    def report(self) -> str:
+        """Format the statistics as a table, one row per phase.
+
+        The last rows give the time spent outside of the phases (``other``)
+        and the total duration.
+
+        Returns:
+            The table, as lines of text.
+        """
+        lines = [f"{'phase':<8} {'calls':>10} {'time (s)':>10} {'%':>6}"]
+        total = self.total or 1.0
+        for phase in PHASES:
+            lines.append(
+                f"{phase:<8} {self.counts[phase]:>10} {self.times[phase]:>10.4f} "
+                f"{100 * self.times[phase] / total:>6.1f}"
+            )
+        other = max(self.total - sum(self.times.values()), 0.0)
+        lines.append(
+            f"{'other':<8} {'':>10} {other:>10.4f} {100 * other / total:>6.1f}"
+        )
+        lines.append(f"{'total':<8} {'':>10} {self.total:>10.4f}")
+        return "\n".join(lines) + "\n"
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Sent back from worker processes once collected
+        return {"counts": self.counts, "times": self.times, "total": self.total}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._stack = []
+
+    def _enter(self, phase: str) -> None:
+        if self._stack and (top := self._stack[-1]) is not None and top[0] == phase:
+            self._stack.append(None)
+        else:
+            self._stack.append([phase, time.perf_counter(), 0.0])
+
+    def _exit(self) -> None:
+        entry = self._stack.pop()
+        if entry is None:
+            return
+        phase, start, nested = entry
+        elapsed = time.perf_counter() - start
+        self.counts[phase] += 1
+        self.times[phase] += elapsed - nested
+        for outer in reversed(self._stack):
+            if outer is not None:
+                outer[2] += elapsed
+                break
+
+
+class _TimedStream:
+    """A destination stream timing the ``write`` phase of its writes."""
+
+    def __init__(self, stream: Any, stats: ProfileStats):
+        self._stream = stream
+        self._stats = stats
+
+    def write(self, data: Any) -> Any:
+        self._stats._enter("write")
+        try:
+            return self._stream.write(data)
+        finally:
+            self._stats._exit()
+
+    def __getattr__(self, name: str) -> Any:
+        # Everything else, including the `encoding` attribute serializers
+        # tell text streams by, is the destination's own
+        return getattr(self._stream, name)
+
+
+def _timed(
+    function: Callable[..., Any],
+    phase: str,
+    stats: ProfileStats,
+    thread: int,
+    timed_stream: bool,
+) -> Callable[..., Any]:
+    # A wrapper of `function` recording its calls in `thread` for `phase`,
+    # and those of its stream argument for `write` if `timed_stream`
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if threading.get_ident() != thread:
+            return function(*args, **kwargs)
+        if timed_stream:
+            # Serializer.serialize(self, stream, ...), the stream being
+            # passed by position or by keyword
+            if "stream" in kwargs:
+                kwargs["stream"] = _TimedStream(kwargs["stream"], stats)
+            elif len(args) > 1:
+                args = (args[0], _TimedStream(args[1], stats), *args[2:])
+        stats._enter(phase)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats._exit()
+
+    return wrapper
+
+
+def _instrumented_methods() -> Iterator[tuple[type, str, str]]:
+    # The (class, method name, phase) of every method to time
+    from prov.serializers import Registry
+
+    for (module_name, class_name, method), phase in _MODEL_METHODS.items():
+        owner = getattr(importlib.import_module(module_name), class_name)
+        yield owner, method, phase
+    if Registry.serializers is None:
+        Registry.load_serializers()
+    for serializer in (Registry.serializers or {}).values():
+        for method, phase in _SERIALIZER_METHODS.items():
+            # Only the methods a serializer defines: inherited ones are
+            # instrumented in the class defining them, if registered
+            if method in vars(serializer):
+                yield serializer, method, phase
+
+
+@contextlib.contextmanager
+def profile() -> Iterator[ProfileStats]:
+    """Count and time the phases of the work done in a ``with`` block.
+
+    Example::
+
+        with profile() as stats:
+            document = prov.read("input.json")
+            document.serialize("output.xml", format="xml")
+        print(stats.report())
+
+    Yields:
+        The :class:`ProfileStats` being collected, complete once the block
+        exits.
+
+    Raises:
+        RuntimeError: If another :func:`profile` block is already active.
+    """
+    global _active
+    if _active is not None:
+        raise RuntimeError("Profiling is already active.")
+    stats = ProfileStats()
+    thread = threading.get_ident()
+    originals = [
+        (owner, method, vars(owner)[method], phase)
+        for owner, method, phase in _instrumented_methods()
+    ]
+    _active = stats
+    for owner, method, function, phase in originals:
+        timed = _timed(function, phase, stats, thread, method == "serialize")
+        setattr(owner, method, timed)
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.total += time.perf_counter() - start
+        for owner, method, function, _ in originals:
+            setattr(owner, method, function)
+        _active = None
@@ -9,15 +9,20 @@ prov-compare -- Compare two PROV-JSON, PROV-XML, or RDF (PROV-O) files for equiv
 @license:    MIT Licence
 
 @contact:    trungdong@donggiang.com
-@deffield    updated: 2025-06-07
+@deffield    updated: 2026-10-19
 """
 
+import json
 import logging
 import os
 import sys
 import traceback
 from argparse import ArgumentParser, FileType, RawDescriptionHelpFormatter
+from collections import Counter
+from typing import IO
 
+from prov.diff import ADDED, CHANGED, REMOVED, RecordDiff, diff_documents
+from prov.identifier import QualifiedName
 from prov.model import ProvDocument
 
 logger = logging.getLogger(__name__)
@@ -25,7 +30,7 @@ logger = logging.getLogger(__name__)
 __all__: list[str] = []
 __version__ = 0.1
 __date__ = "2015-06-16"
-__updated__ = "2025-06-07"
+__updated__ = "2026-10-19"
 
 DEBUG = 0
 TESTRUN = 0
@@ -43,12 +48,80 @@ class CLIError(Exception):
         return self.msg
 
 
+def _diff_json_line(difference: RecordDiff) -> str:
+    """Encode one :class:`~prov.diff.RecordDiff` as a single JSON Lines entry."""
+    return json.dumps(
+        {
+            "change": difference.change,
+            "bundle": str(difference.bundle) if difference.bundle else None,
+            "type": str(difference.record_type),
+            "id": str(difference.identifier) if difference.identifier else None,
+            "old": [record.get_provn() for record in difference.old],
+            "new": [record.get_provn() for record in difference.new],
+        }
+    )
+
+
+def compare_documents(
+    doc1: ProvDocument,
+    doc2: ProvDocument,
+    output: IO[str] | None = None,
+    show_diff: bool = False,
+    show_summary: bool = False,
+) -> bool:
+    """Compare two documents with :func:`~prov.diff.diff_documents`.
+
+    With ``show_diff``, each difference is written to ``output`` as one JSON
+    object per line as soon as it is found, so the output can be consumed
+    while a large comparison is still running. With ``show_summary``, the
+    numbers of added, removed and changed records are written per bundle
+    once the comparison is complete. With neither, the comparison stops at
+    the first difference.
+
+    Args:
+        doc1: The first (old) document.
+        doc2: The second (new) document.
+        output: Text stream for the diff and summary output (default:
+            ``None``, meaning :data:`sys.stdout`).
+        show_diff: Whether to write every difference (default: ``False``).
+        show_summary: Whether to write per-bundle counts (default:
+            ``False``).
+
+    Returns:
+        ``True`` if the documents differ, ``False`` otherwise.
+    """
+    if output is None:
+        output = sys.stdout
+    counts: dict[QualifiedName | None, Counter[str]] = {}
+    differ = False
+    for difference in diff_documents(doc1, doc2):
+        differ = True
+        if not (show_diff or show_summary):
+            break
+        if show_diff:
+            output.write(_diff_json_line(difference) + "\n")
+        counts.setdefault(difference.bundle, Counter())[difference.change] += 1
+    if show_summary:
+        if not counts:
+            output.write("No differences.\n")
+        for bundle_id, bundle_counts in counts.items():
+            scope = f"bundle {bundle_id}" if bundle_id is not None else "document"
+            output.write(
+                f"{scope}: {bundle_counts[ADDED]} added, "
+                f"{bundle_counts[REMOVED]} removed, "
+                f"{bundle_counts[CHANGED]} changed\n"
+            )
+    return differ
+
+
 def main(argv: list[str] | None = None) -> int:  # IGNORE:C0111
     """Run the ``prov-compare`` command-line tool.
 
     Parses two positional file arguments plus ``-f/--format1`` and
     ``-F/--format2`` (each defaulting to ``"json"``), deserializes both
-    files, and compares the resulting documents for equality.
+    files, and compares the resulting documents with
+    :func:`compare_documents`. ``-d/--diff`` writes every difference to
+    stdout as JSON Lines and ``-s/--summary`` writes per-bundle counts.
 
     Args:
         argv: Extra command-line arguments. If not ``None``, they are
@@ -57,8 +130,8 @@ def main(argv: list[str] | None = None) -> int:  # IGNORE:C0111
             program name.
 
     Returns:
-        ``0`` if the two documents are equal, ``1`` if they differ (the
-        truthiness of ``doc1 != doc2``), or ``2`` if an exception was raised
+        ``0`` if the two documents are equal, ``1`` if they differ (any
+        record added, removed or changed), or ``2`` if an exception was raised
         while parsing arguments or deserializing a file (unless
         ``DEBUG``/``TESTRUN`` is set, in which case the exception propagates
         instead). Unlike ``prov-convert``, ``KeyboardInterrupt`` is not
@@ -111,6 +184,20 @@ USAGE
             default="json",
             help="File 2's format: json or xml",
         )
+        parser.add_argument(
+            "-d",
+            "--diff",
+            dest="diff",
+            action="store_true",
+            help="write each added, removed or changed record as a JSON line",
+        )
+        parser.add_argument(
+            "-s",
+            "--summary",
+            dest="summary",
+            action="store_true",
+            help="write the number of added, removed and changed records per bundle",
+        )
         parser.add_argument(
             "-V", "--version", action="version", version=program_version_message
         )
@@ -121,7 +208,11 @@ USAGE
             args = parser.parse_args()
             doc1 = ProvDocument.deserialize(args.file1, format=args.format1.lower())
             doc2 = ProvDocument.deserialize(args.file2, format=args.format2.lower())
-            return doc1 != doc2
+            return int(
+                compare_documents(
+                    doc1, doc2, show_diff=args.diff, show_summary=args.summary
+                )
+            )
 
         finally:
             if args:
@@ -9,26 +9,31 @@ convert -- Convert PROV-JSON to RDF, PROV-N, PROV-XML, or graphical formats (SVG
 @license:    MIT License
 
 @contact:    trungdong@donggiang.com
-@deffield    updated: 2025-06-07
+@deffield    updated: 2026-10-19
 """
 
+import contextlib
+import glob
 import io
 import logging
 import os
 import sys
 import traceback
 from argparse import ArgumentParser, FileType, RawDescriptionHelpFormatter
-from typing import cast
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, cast
 
 from prov import serializers
 from prov.model import ProvDocument
+from prov.profiling import ProfileStats, profile
 
 logger = logging.getLogger(__name__)
 
 __all__: list[str] = []
 __version__ = 0.1
 __date__ = "2014-03-14"
-__updated__ = "2025-06-07"
+__updated__ = "2026-10-19"
 
 DEBUG = 0
 TESTRUN = 0
@@ -73,6 +78,23 @@ GRAPHVIZ_SUPPORTED_FORMATS = {
 to the formats registered in :class:`~prov.serializers.Registry`."""
 
 
+OUTPUT_EXTENSIONS = {
+    "json": ".json",
+    "jsonld": ".jsonld",
+    "provn": ".provn",
+    "rdf": ".trig",
+    "xml": ".xml",
+}
+"""File name extensions of the files written in batch mode, by output format;
+a Graphviz format name is used as its own extension."""
+
+# Number of leading bytes of a file looked at by sniff_format()
+_SNIFF_SIZE = 4096
+
+# The conversion settings of a batch worker process, set by _init_worker()
+_worker_settings: tuple[str, str | None, bool] = ("json", None, False)
+
+
 class CLIError(Exception):
     """Generic exception to raise and log different fatal errors."""
 
@@ -84,11 +106,16 @@ class CLIError(Exception):
         return self.msg
 
 
-def convert_file(infile: io.FileIO, outfile: io.FileIO, output_format: str) -> None:
+def convert_file(
+    infile: io.FileIO,
+    outfile: io.FileIO,
+    output_format: str,
+    input_format: str = "json",
+) -> None:
     """Read a PROV document from ``infile`` and write it to ``outfile`` in ``output_format``.
 
-    ``infile`` is auto-detected across all registered deserialization
-    formats (see :meth:`~prov.model.ProvDocument.deserialize`). For
+    ``infile`` is deserialized as ``input_format`` (see
+    :meth:`~prov.model.ProvDocument.deserialize`). For
     ``output_format``, ``"provn"`` is written directly via
     :meth:`~prov.model.ProvDocument.get_provn`, a name in
     :data:`GRAPHVIZ_SUPPORTED_FORMATS` is rendered through
@@ -102,13 +129,32 @@ def convert_file(infile: io.FileIO, outfile: io.FileIO, output_format: str) -> N
         output_format: Target format name (e.g. ``"json"``, ``"xml"``,
             ``"rdf"``, ``"provn"``, or a Graphviz output format such as
             ``"svg"``/``"pdf"``/``"png"``).
+        input_format: Source format name (default: ``"json"``).
 
     Raises:
         CLIError: If ``output_format`` is not ``"provn"``, not a Graphviz
             format, and not a registered serializer format.
     """
-    prov_doc = ProvDocument.deserialize(infile)
+    prov_doc = ProvDocument.deserialize(infile, format=input_format)
+    write_document(prov_doc, outfile, output_format)
+
+
+def write_document(
+    prov_doc: ProvDocument, outfile: IO[bytes], output_format: str
+) -> None:
+    """Write ``prov_doc`` to ``outfile`` in ``output_format``.
 
+    The output half of :func:`convert_file`, which documents the accepted
+    formats.
+
+    Args:
+        prov_doc: The document to write.
+        outfile: File-like object (opened in binary mode) to write to.
+        output_format: Target format name.
+
+    Raises:
+        CLIError: If ``output_format`` is not supported.
+    """
     # Formats not supported by prov.serializers
     if output_format == "provn":
         outfile.write(prov_doc.get_provn().encode())
@@ -129,12 +175,250 @@ def convert_file(infile: io.FileIO, outfile: io.FileIO, output_format: str) -> N
             raise CLIError(f'Output format "{output_format}" is not supported.') from e
 
 
+def sniff_format(path: str) -> str | None:
+    """Guess the serialization format of a file from its first bytes.
+
+    Much cheaper than the auto-detection of :func:`prov.read`, which parses
+    the whole file with every registered deserializer in turn until one
+    succeeds: a JSON object is taken as PROV-JSON-LD if it has a
+    ``"@context"`` near its start and as PROV-JSON otherwise, an XML
+    document as PROV-XML unless it is RDF/XML, and Turtle/TriG directives (or
+    a ``.ttl``/``.trig`` file name) as RDF.
+
+    Args:
+        path: Path to the file.
+
+    Returns:
+        The format name, or ``None`` if it could not be guessed.
+    """
+    with open(path, "rb") as f:
+        head = f.read(_SNIFF_SIZE).removeprefix(b"\xef\xbb\xbf").lstrip()
+    if head.startswith(b"{"):
+        return "jsonld" if b'"@context"' in head else "json"
+    if head.startswith(b"<"):
+        return None if b"<rdf:RDF" in head else "xml"
+    if head.startswith((b"@prefix", b"@base", b"PREFIX", b"BASE")):
+        return "rdf"
+    if os.path.splitext(path)[1].lower() in (".ttl", ".trig"):
+        return "rdf"
+    return None
+
+
+def _walk_files(directory: str) -> Iterator[str]:
+    # All files under a directory, in a stable order
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            yield os.path.join(root, name)
+
+
+def _glob_base(pattern: str) -> str:
+    # The directory a glob pattern is anchored at, i.e. before any wildcard
+    wildcard = min(
+        (i for i in (pattern.find(c) for c in "*?[") if i >= 0), default=len(pattern)
+    )
+    return os.path.dirname(pattern[:wildcard])
+
+
+def collect_inputs(inputs: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """Expand batch-mode inputs into the files to convert.
+
+    A directory stands for all the files in it and in its subdirectories,
+    and a glob pattern (e.g. ``"data/**/*.json"``) for the files it matches;
+    any other input is taken as a file path. A file found more than once is
+    only yielded the first time.
+
+    Args:
+        inputs: Directories, glob patterns or file paths.
+
+    Yields:
+        A ``(path, relative_path)`` pair per file, where ``relative_path``
+        is the path of the file relative to the directory given, or to the
+        directory a glob pattern starts at (just the file name for a file
+        path), from which the output file name is made.
+    """
+    seen = set()
+    for entry in inputs:
+        if os.path.isdir(entry):
+            found = _walk_files(entry)
+            base = entry
+        elif glob.has_magic(entry):
+            found = (
+                path
+                for path in sorted(glob.iglob(entry, recursive=True))
+                if os.path.isfile(path)
+            )
+            base = _glob_base(entry)
+        else:
+            found = iter([entry])
+            base = os.path.dirname(entry)
+        for path in found:
+            key = os.path.abspath(path)
+            if key not in seen:
+                seen.add(key)
+                yield path, os.path.relpath(path, base or os.curdir)
+
+
+def _init_worker(
+    output_format: str, input_format: str | None, profiled: bool = False
+) -> None:
+    # Load the serializers (and Graphviz support) once per worker process
+    global _worker_settings
+    _worker_settings = (output_format, input_format, profiled)
+    serializers.Registry.load_serializers()
+    if output_format in GRAPHVIZ_SUPPORTED_FORMATS:
+        import prov.dot  # noqa: F401
+
+        return
+    if output_format != "provn":
+        serializers.get(output_format)
+
+
+def _convert_path(task: tuple[str, str]) -> tuple[str | None, ProfileStats | None]:
+    # Convert one file in a worker, returning the error if it failed, so
+    # that one bad file does not stop the batch, and its statistics if the
+    # batch is profiled
+    source, destination = task
+    output_format, input_format, profiled = _worker_settings
+    profiling = profile() if profiled else contextlib.nullcontext()
+    error = None
+    with profiling as stats:
+        try:
+            input_format = input_format or sniff_format(source)
+            if input_format is None:
+                from prov import read
+
+                prov_doc = read(source)
+            else:
+                prov_doc = ProvDocument.deserialize(source, format=input_format)
+            os.makedirs(os.path.dirname(destination) or os.curdir, exist_ok=True)
+            # Written next to the destination and moved there once complete,
+            # so that a failed conversion leaves no partial output behind
+            partial = f"{destination}.{os.getpid()}.part"
+            try:
+                with open(partial, "wb") as outfile:
+                    write_document(cast(ProvDocument, prov_doc), outfile, output_format)
+                os.replace(partial, destination)
+            except BaseException:
+                if os.path.exists(partial):
+                    os.remove(partial)
+                raise
+        except Exception as e:
+            error = str(e) if isinstance(e, CLIError) else f"{type(e).__name__}: {e}"
+    return error, stats
+
+
+def convert_batch(
+    inputs: Iterable[str],
+    output_dir: str,
+    output_format: str,
+    input_format: str | None = None,
+    jobs: int | None = None,
+    errors: IO[str] | None = None,
+    stats: ProfileStats | None = None,
+) -> tuple[int, int]:
+    """Convert many files into ``output_dir`` with a pool of worker processes.
+
+    The files are found by :func:`collect_inputs` and each is written to
+    ``output_dir``, at its relative path there with the extension of
+    ``output_format`` (see :data:`OUTPUT_EXTENSIONS`). Each worker loads the
+    serializers once and then converts files handed to it in chunks, so the
+    cost of starting a process and importing ``prov`` is paid once per
+    worker rather than once per file. A file that cannot be converted is
+    reported on ``errors`` as ``path: message`` and the batch carries on.
+
+    Args:
+        inputs: Directories, glob patterns or file paths to convert.
+        output_dir: Directory to write the converted files to; it is created
+            if needed.
+        output_format: Target format name, as for :func:`convert_file`.
+        input_format: Source format name. If ``None`` (the default), the
+            format of each file is guessed by :func:`sniff_format`, falling
+            back to the auto-detection of :func:`prov.read`.
+        jobs: Number of worker processes (default: ``None``, meaning the
+            number of CPUs). With ``1``, the files are converted in this
+            process.
+        errors: Text stream to report failures on (default: ``None``,
+            meaning ``sys.stderr``).
+        stats: If given, the conversion of each file is profiled (see
+            :func:`prov.profiling.profile`) and the statistics are added to
+            ``stats`` (default: ``None``).
+
+    Returns:
+        The numbers of files converted and of files that failed.
+
+    Raises:
+        CLIError: If ``output_format`` is not supported.
+    """
+    if output_format not in GRAPHVIZ_SUPPORTED_FORMATS and output_format != "provn":
+        try:
+            serializers.get(output_format)
+        except serializers.DoNotExist as e:
+            raise CLIError(f'Output format "{output_format}" is not supported.') from e
+    if errors is None:
+        errors = sys.stderr
+    extension = OUTPUT_EXTENSIONS.get(output_format, f".{output_format}")
+    tasks = []
+    destinations: dict[str, str] = {}
+    failed = 0
+    for source, relative_path in collect_inputs(inputs):
+        destination = os.path.join(
+            output_dir, os.path.splitext(relative_path)[0] + extension
+        )
+        if destination in destinations:
+            errors.write(
+                f"{source}: output {destination} would overwrite that of "
+                f"{destinations[destination]}\n"
+            )
+            failed += 1
+            continue
+        destinations[destination] = source
+        tasks.append((source, destination))
+
+    jobs = min(jobs or os.cpu_count() or 1, len(tasks) or 1)
+    if jobs == 1:
+        _init_worker(output_format, input_format, stats is not None)
+        results: Iterable[tuple[str | None, ProfileStats | None]] = map(
+            _convert_path, tasks
+        )
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(
+            jobs,
+            initializer=_init_worker,
+            initargs=(output_format, input_format, stats is not None),
+        )
+        # Hand the files out in chunks to cut down inter-process traffic,
+        # small enough to keep all workers busy until the end
+        chunksize = max(1, min(64, len(tasks) // (jobs * 4)))
+        results = executor.map(_convert_path, tasks, chunksize=chunksize)
+    converted = 0
+    try:
+        for (source, _), (error, file_stats) in zip(tasks, results, strict=True):
+            if stats is not None and file_stats is not None:
+                stats.merge(file_stats)
+            if error is None:
+                converted += 1
+            else:
+                errors.write(f"{source}: {error}\n")
+                failed += 1
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return converted, failed
+
+
 def main(argv: list[str] | None = None) -> int:  # IGNORE:C0111
     """Run the ``prov-convert`` command-line tool.
 
     Parses ``-f/--format``, an optional input file (default stdin), and an
     optional output file (default stdout), then converts between them via
-    :func:`convert_file`.
+    :func:`convert_file`. In batch mode, i.e. with ``-b/--batch`` and
+    ``-o/--output-dir``, the given directories, glob patterns and files are
+    converted into the output directory by :func:`convert_batch` instead,
+    each failure being reported on stderr. With ``--stats``, the conversion
+    is profiled (see :func:`prov.profiling.profile`) and the statistics are
+    written to stderr.
 
     Args:
         argv: Extra command-line arguments. If not ``None``, they are
@@ -144,7 +428,8 @@ def main(argv: list[str] | None = None) -> int:  # IGNORE:C0111
 
     Returns:
         ``0`` on success or on ``KeyboardInterrupt``; ``2`` if an exception
-        was raised while parsing arguments or converting the file (unless
+        was raised while parsing arguments or converting the file, or if any
+        file failed to convert in batch mode (unless
         ``DEBUG``/``TESTRUN`` is set, in which case the exception
         propagates instead).
     """
@@ -185,6 +470,46 @@ USAGE
             default="json",
             help="output format: json, xml, provn, or one supported by GraphViz (e.g. svg, pdf)",
         )
+        parser.add_argument(
+            "-i",
+            "--input-format",
+            dest="input_format",
+            action="store",
+            default=None,
+            help="input format: json, xml, rdf, jsonld (default: json, or guessed "
+            "for each file in batch mode)",
+        )
+        parser.add_argument(
+            "-b",
+            "--batch",
+            dest="batch",
+            nargs="+",
+            metavar="INPUT",
+            help="convert these directories, glob patterns or files into "
+            "--output-dir instead of infile into outfile",
+        )
+        parser.add_argument(
+            "-o",
+            "--output-dir",
+            dest="output_dir",
+            help="directory to write the files converted in batch mode to",
+        )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            dest="jobs",
+            type=int,
+            default=None,
+            help="number of worker processes in batch mode (default: the number "
+            "of CPUs)",
+        )
+        parser.add_argument(
+            "--stats",
+            dest="stats",
+            action="store_true",
+            help="write the number of calls and the time spent in each phase of "
+            "the conversion (parse, resolve, coerce, build, encode, write) to stderr",
+        )
         parser.add_argument("infile", nargs="?", type=FileType("r"), default=sys.stdin)
         parser.add_argument(
             "outfile", nargs="?", type=FileType("wb"), default=sys.stdout
@@ -197,9 +522,40 @@ USAGE
         try:
             # Process arguments
             args = parser.parse_args()
-            convert_file(args.infile, args.outfile, args.format.lower())
+            if args.batch or args.output_dir:
+                if not (args.batch and args.output_dir):
+                    parser.error("--batch and --output-dir must be used together")
+                stats = ProfileStats() if args.stats else None
+                converted, failed = convert_batch(
+                    args.batch,
+                    args.output_dir,
+                    args.format.lower(),
+                    args.input_format and args.input_format.lower(),
+                    args.jobs,
+                    stats=stats,
+                )
+                sys.stderr.write(
+                    f"{program_name}: {converted} converted, {failed} failed\n"
+                )
+                if stats is not None:
+                    sys.stderr.write(stats.report())
+                return 2 if failed else 0
+            profiling = profile() if args.stats else contextlib.nullcontext()
+            with profiling as stats:
+                if args.input_format:
+                    convert_file(
+                        args.infile,
+                        args.outfile,
+                        args.format.lower(),
+                        args.input_format.lower(),
+                    )
+                else:
+                    convert_file(args.infile, args.outfile, args.format.lower())
+            if stats is not None:
+                sys.stderr.write(stats.report())
         finally:
-            if args:
+            # The standard streams (the defaults) are left open in batch mode
+            if args and not args.batch:
                 if args.infile:
                     args.infile.close()
                 if args.outfile:
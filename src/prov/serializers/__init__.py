@@ -1,13 +1,16 @@
 from __future__ import annotations  # defer eval: TYPE_CHECKING names in signatures
 
+import contextlib
 import io
+import mmap
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from typing import TYPE_CHECKING, Any, ClassVar
 
 from prov import Error
 
 if TYPE_CHECKING:
-    from prov.model import ProvDocument
+    from prov.model import PathLike, ProvDocument
 
 __author__ = "Trung Dong Huynh"
 __email__ = "trungdong@donggiang.com"
@@ -29,6 +32,26 @@ def _is_text_stream(stream: io.IOBase) -> bool:
     return isinstance(stream, io.TextIOBase) or hasattr(stream, "encoding")
 
 
+@contextlib.contextmanager
+def _mapped_file(path: PathLike) -> Iterator[mmap.mmap | bytes]:
+    """Memory-map a file read-only for the duration of the ``with`` block.
+
+    The map is a bytes-like object backed by the OS page cache, so a parser
+    can consume it (e.g. ``str(mapped, "utf-8")``) without first copying the
+    whole file into a Python ``bytes`` object. An empty file, which cannot
+    be mapped, yields ``b""`` instead.
+    """
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap refuses zero-length files.
+            yield b""
+            return
+        with mapped:
+            yield mapped
+
+
 class Serializer(ABC):
     """Serializer for PROV documents."""
 
@@ -74,6 +97,27 @@ class Serializer(ABC):
             The deserialized :class:`~prov.model.ProvDocument`.
         """
 
+    def deserialize_file(self, path: PathLike, **args: Any) -> ProvDocument:
+        """Read and parse a document from a local file.
+
+        :meth:`~prov.model.ProvDocument.deserialize` calls this for a path
+        source, so that a format can read the file in the cheapest way its
+        parser allows (e.g. from a memory map, or by letting the parser open
+        the file itself) rather than through an intermediate text stream.
+        This default opens the file as a text stream and delegates to
+        :meth:`deserialize`.
+
+        Args:
+            path: Path of the file to deserialize the document from.
+            **args: Format-specific deserialization options, as for
+                :meth:`deserialize`.
+
+        Returns:
+            The deserialized :class:`~prov.model.ProvDocument`.
+        """
+        with open(path) as f:
+            return self.deserialize(f, **args)
+
 
 class DoNotExist(Error):
     """Exception for the case a serializer is not available."""
@@ -0,0 +1,89 @@
+"""Blank-node identifiers for the unidentified records of a document.
+
+Formats that key records by identifier, like PROV-JSON, or give each relation
+a node, like PROV-O, need an identifier for the records that have none: the
+unidentified relations, mostly. An :class:`AnonymousIDGenerator` numbers them
+by position: the n-th unidentified record it is given gets ``_:id<n>``. The
+identifiers so depend on the document alone, not on the content of the records
+(which are neither hashed nor compared) nor on the format, so that the same
+document gets the same identifiers in PROV-JSON and PROV-O.
+
+.. moduleauthor:: Trung Dong Huynh <trungdong@donggiang.com>
+"""
+
+from __future__ import annotations  # defer eval: TYPE_CHECKING names in signatures
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from prov.model import ProvRecord
+
+__author__ = "Trung Dong Huynh"
+__email__ = "trungdong@donggiang.com"
+
+__all__ = ["SCOPES", "AnonymousIDGenerator"]
+
+SCOPES = ("bundle", "document")
+"""How far a numbering of unidentified records extends, as given to the
+serializers' ``anonymous_ids`` option: restarting in each bundle, or running
+through the document and its bundles."""
+
+
+class AnonymousIDGenerator:
+    """Assigns blank-node identifiers to unidentified records, by position.
+
+    The records are numbered in the order the generator is given them, by
+    :meth:`get_anon_id` or :meth:`number`; a record given again keeps its
+    identifier. Records are told apart by identity, so two equal records get
+    distinct identifiers.
+
+    Args:
+        local_prefix: The prefix of the identifiers' local part (default:
+            ``"id"``).
+    """
+
+    def __init__(self, local_prefix: str = "id") -> None:
+        self.local_prefix = local_prefix
+        self._count = 0
+        # id() of a record -> the record, kept for its id() not to be reused,
+        # and its identifier
+        self._ids: dict[int, tuple[ProvRecord, str]] = {}
+
+    def number(self, records: Iterable[ProvRecord]) -> None:
+        """Number the unidentified ones of ``records``, in order.
+
+        For a format asking for the identifiers of only some of the records,
+        e.g. as it encodes them, to get those it would have been given had
+        it asked for all of them in order.
+
+        Args:
+            records: The records, e.g. those of a bundle.
+        """
+        get_anon_id = self.get_anon_id
+        for record in records:
+            if not record._identifier:
+                get_anon_id(record)
+
+    def get_anon_id(self, obj: ProvRecord, local_prefix: str | None = None) -> str:
+        """Return the anonymous identifier of a record.
+
+        The identifier is the next in the numbering the first time the record
+        is given, and the same one after that.
+
+        Args:
+            obj: Record needing an anonymous identifier.
+            local_prefix: Prefix used when numbering the record, instead of
+                :attr:`local_prefix`.
+
+        Returns:
+            The blank-node identifier string (``"_:<local_prefix><n>"``) of
+            ``obj``.
+        """
+        entry = self._ids.get(id(obj))
+        if entry is not None:
+            return entry[1]
+        self._count += 1
+        identifier = f"_:{local_prefix or self.local_prefix}{self._count}"
+        self._ids[id(obj)] = (obj, identifier)
+        return identifier
@@ -0,0 +1,247 @@
+"""Pluggable JSON engines for the PROV-JSON and PROV-JSONLD serializers.
+
+The JSON serializers encode documents to, and decode them from, plain Python
+structures (dicts, lists, strings, numbers and booleans), and leave the
+conversion from and to JSON text to a :class:`JSONCodec`. The codec is the
+standard library's :mod:`json` by default, which is always available; a
+faster engine that happens to be installed can be selected instead, for a
+call::
+
+    document.serialize("output.json", format="json", codec="orjson")
+
+or for all of them::
+
+    prov.serializers.jsoncodec.set_default_codec("orjson")
+
+The codecs produce the same JSON values, but not necessarily the same text:
+e.g. ``orjson`` writes compact JSON and leaves non-ASCII characters
+unescaped.
+
+.. moduleauthor:: Trung Dong Huynh <trungdong@donggiang.com>
+"""
+
+from __future__ import annotations  # defer eval: TYPE_CHECKING names in signatures
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, ClassVar
+
+from prov.serializers import DoNotExist
+
+__author__ = "Trung Dong Huynh"
+__email__ = "trungdong@donggiang.com"
+
+__all__ = [
+    "CODECS",
+    "JSONCodec",
+    "OrjsonCodec",
+    "StdlibCodec",
+    "get_codec",
+    "set_default_codec",
+]
+
+
+class JSONCodec(ABC):
+    """A JSON engine converting plain Python structures from and to JSON text."""
+
+    name: ClassVar[str]
+    """The name the codec is selected by."""
+
+    @abstractmethod
+    def dumps(self, obj: Any, **args: Any) -> str:
+        """Encode a plain Python structure as JSON text.
+
+        Args:
+            obj: The structure to encode.
+            **args: Formatting options, as for :func:`json.dumps`.
+
+        Returns:
+            The JSON text.
+
+        Raises:
+            ValueError: If the codec does not support one of ``args``.
+        """
+
+    def dumpb(self, obj: Any, **args: Any) -> bytes:
+        """Encode a plain Python structure as UTF-8-encoded JSON text.
+
+        Args:
+            obj: The structure to encode.
+            **args: Formatting options, as for :meth:`dumps`.
+
+        Returns:
+            The encoded JSON text.
+        """
+        return self.dumps(obj, **args).encode("utf-8")
+
+    @abstractmethod
+    def loads(self, data: str | bytes | memoryview, **args: Any) -> Any:
+        """Decode JSON text into a plain Python structure.
+
+        Args:
+            data: The JSON text, or its UTF-8 encoding.
+            **args: Decoding options, as for :func:`json.loads`.
+
+        Returns:
+            The decoded structure.
+
+        Raises:
+            json.JSONDecodeError: If ``data`` is not valid JSON.
+            ValueError: If the codec does not support one of ``args``.
+        """
+
+    @abstractmethod
+    def layout(self, **args: Any) -> tuple[str | None, str, str]:
+        """Return how :meth:`dumps` lays out the JSON text for ``args``.
+
+        Args:
+            **args: Formatting options, as for :meth:`dumps`.
+
+        Returns:
+            The indentation of each nesting level (``None`` if values are
+            not put on lines of their own), and the separators written
+            between the items of arrays and objects and between the keys
+            and values of objects.
+        """
+
+
+class StdlibCodec(JSONCodec):
+    """The codec of the standard library's :mod:`json` module (the default)."""
+
+    name = "json"
+
+    def dumps(self, obj: Any, **args: Any) -> str:
+        return json.dumps(obj, **args)
+
+    def loads(self, data: str | bytes | memoryview, **args: Any) -> Any:
+        if not isinstance(data, str):
+            data = str(data, "utf-8")
+        return json.loads(data, **args)
+
+    def layout(self, **args: Any) -> tuple[str | None, str, str]:
+        indent = args.get("indent")
+        if isinstance(indent, int):
+            indent = " " * indent
+        item_separator, key_separator = args.get("separators") or (
+            (",", ": ") if indent is not None else (", ", ": ")
+        )
+        return indent, item_separator, key_separator
+
+
+class OrjsonCodec(JSONCodec):
+    """The codec of the `orjson <https://github.com/ijl/orjson>`_ package.
+
+    Only the formatting options ``orjson`` has an equivalent of are
+    supported: ``indent=2``, ``sort_keys`` and ``ensure_ascii=False``.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+
+    def _option(self, args: dict[str, Any]) -> int:
+        option = 0
+        unsupported = set(args) - {"indent", "sort_keys", "ensure_ascii"}
+        if args.get("indent") not in (None, 2):
+            unsupported.add("indent")
+        if args.get("ensure_ascii", False):
+            unsupported.add("ensure_ascii")
+        if unsupported:
+            raise ValueError(
+                f"The orjson codec does not support {sorted(unsupported)!r}"
+            )
+        if args.get("indent") == 2:
+            option |= self._orjson.OPT_INDENT_2
+        if args.get("sort_keys"):
+            option |= self._orjson.OPT_SORT_KEYS
+        return option
+
+    def dumps(self, obj: Any, **args: Any) -> str:
+        return self.dumpb(obj, **args).decode("utf-8")
+
+    def dumpb(self, obj: Any, **args: Any) -> bytes:
+        result: bytes = self._orjson.dumps(obj, option=self._option(args))
+        return result
+
+    def loads(self, data: str | bytes | memoryview, **args: Any) -> Any:
+        if args:
+            raise ValueError(f"The orjson codec does not support {sorted(args)!r}")
+        return self._orjson.loads(data)
+
+    def layout(self, **args: Any) -> tuple[str | None, str, str]:
+        if self._option(args) & self._orjson.OPT_INDENT_2:
+            return "  ", ",", ": "
+        return None, ",", ":"
+
+
+#: The codecs available by name, besides ``"auto"``: the fastest installed.
+CODECS: dict[str, type[JSONCodec]] = {
+    StdlibCodec.name: StdlibCodec,
+    OrjsonCodec.name: OrjsonCodec,
+}
+
+# Codec instances, created on first use
+_instances: dict[str, JSONCodec] = {}
+
+# The name of the codec used when none is given
+_default = StdlibCodec.name
+
+
+def get_codec(codec: str | JSONCodec | None = None) -> JSONCodec:
+    """Return a codec, by name.
+
+    Args:
+        codec: The name of a codec in :data:`CODECS`, ``"auto"`` for the
+            fastest one installed, or a :class:`JSONCodec`, returned as is
+            (default: ``None``, meaning the default codec; see
+            :func:`set_default_codec`).
+
+    Returns:
+        The :class:`JSONCodec`.
+
+    Raises:
+        DoNotExist: If there is no codec of that name, or if it is not
+            installed.
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    name = _default if codec is None else codec
+    if name in _instances:
+        return _instances[name]
+    if name == "auto":
+        try:
+            instance = get_codec(OrjsonCodec.name)
+        except DoNotExist:
+            instance = get_codec(StdlibCodec.name)
+    elif name in CODECS:
+        try:
+            instance = CODECS[name]()
+        except ImportError as e:
+            raise DoNotExist(
+                f'The JSON codec "{name}" needs the {e.name} package, which is '
+                "not installed."
+            ) from e
+    else:
+        raise DoNotExist(
+            f'No JSON codec "{name}"; available codecs: {", ".join([*CODECS, "auto"])}.'
+        )
+    _instances[name] = instance
+    return instance
+
+
+def set_default_codec(codec: str) -> None:
+    """Set the codec the JSON serializers use when none is given.
+
+    Args:
+        codec: The name of the codec, as for :func:`get_codec`.
+
+    Raises:
+        DoNotExist: If there is no codec of that name, or if it is not
+            installed.
+    """
+    global _default
+    get_codec(codec)
+    _default = codec
@@ -0,0 +1,132 @@
+"""Encoding plans: what the serializers need to know about each record type.
+
+What a serializer needs to know about a record's type -- its PROV-N keyword,
+its formal attributes and how their values are rendered, the order of its
+attributes in PROV-XML -- depends on the type alone. It is derived once per
+type here, as a :class:`RecordPlan`, so that the encoders look it up instead
+of re-deriving it for every record. The serializers build their own
+format-specific tables (e.g. JSON-LD terms, PROV-O predicates) from these
+plans, in the same way.
+
+.. moduleauthor:: Trung Dong Huynh <trungdong@donggiang.com>
+"""
+
+from __future__ import annotations  # defer eval: TYPE_CHECKING names in signatures
+
+import datetime
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from prov.constants import (
+    PROV_ATTRIBUTE_LITERALS,
+    PROV_ATTRIBUTES,
+    PROV_LABEL,
+    PROV_LOCATION,
+    PROV_N_MAP,
+    PROV_ROLE,
+    PROV_TYPE,
+    PROV_VALUE,
+)
+from prov.model import PROV_REC_CLS, first
+
+if TYPE_CHECKING:
+    from prov.identifier import QualifiedName
+    from prov.model import NameValuePair, ProvRecord
+
+__author__ = "Trung Dong Huynh"
+__email__ = "trungdong@donggiang.com"
+
+__all__ = ["FORMAL_VALUE_ENCODERS", "RECORD_PLANS", "RecordPlan"]
+
+
+def _isoformat(value: datetime.datetime) -> str:
+    return value.isoformat()
+
+
+#: Formal attribute -> the function rendering its (single) value as a string:
+#: ``str`` for qualified names, ISO 8601 for times.
+FORMAL_VALUE_ENCODERS: dict[QualifiedName, Callable[[Any], str]] = {
+    attr: _isoformat if attr in PROV_ATTRIBUTE_LITERALS else str
+    for attr in PROV_ATTRIBUTES
+}
+
+# The attributes PROV-XML puts after the formal ones, in this order, for
+# every record type
+_UNIVERSAL_ATTRIBUTES = (PROV_LABEL, PROV_LOCATION, PROV_ROLE, PROV_TYPE, PROV_VALUE)
+
+
+def _sort_key_text(value: Any) -> str:
+    return str(value.value if hasattr(value, "value") else value)
+
+
+@dataclass(frozen=True)
+class RecordPlan:
+    """The encoding facts about a record type the serializers share.
+
+    Attributes:
+        record_type: The record type.
+        label: Its PROV-N keyword, e.g. ``"wasGeneratedBy"``.
+        formal_attributes: Its formal attributes, in declaration order, with
+            the function rendering the value of each (see
+            :data:`FORMAL_VALUE_ENCODERS`).
+        attribute_ranks: The position of each formal attribute, then of the
+            universal ``prov:label``, ``prov:location``, ``prov:role``,
+            ``prov:type`` and ``prov:value`` attributes, in the PROV-XML
+            attribute order.
+    """
+
+    record_type: QualifiedName
+    label: str
+    formal_attributes: tuple[tuple[QualifiedName, Callable[[Any], str]], ...]
+    attribute_ranks: dict[QualifiedName, int]
+
+    def formal_values(self, record: ProvRecord) -> list[NameValuePair]:
+        """Return the formal attributes of a record of this type with their value.
+
+        The same pairs as :attr:`~prov.model.ProvRecord.formal_attributes`,
+        ``None`` standing for a missing value.
+        """
+        attributes = record._attributes
+        return [
+            (attr, first(attributes[attr]) if attr in attributes else None)
+            for attr, _ in self.formal_attributes
+        ]
+
+    def sorted_attributes(
+        self, attributes: Iterable[NameValuePair]
+    ) -> list[NameValuePair]:
+        """Sort attributes of a record of this type into the PROV-XML order.
+
+        The same order as :func:`~prov.model.sorted_attributes`, in a single
+        sort: by rank, then by attribute name and value text.
+        """
+        ranks = self.attribute_ranks
+        last = len(ranks)
+        return sorted(
+            attributes,
+            key=lambda pair: (
+                ranks.get(pair[0], last),
+                str(pair[0]),
+                _sort_key_text(pair[1]),
+            ),
+        )
+
+
+def _record_plan(record_type: QualifiedName) -> RecordPlan:
+    formal = PROV_REC_CLS[record_type].FORMAL_ATTRIBUTES
+    ranks: dict[QualifiedName, int] = {}
+    for attr in (*formal, *_UNIVERSAL_ATTRIBUTES):
+        ranks.setdefault(attr, len(ranks))
+    return RecordPlan(
+        record_type=record_type,
+        label=PROV_N_MAP[record_type],
+        formal_attributes=tuple((attr, FORMAL_VALUE_ENCODERS[attr]) for attr in formal),
+        attribute_ranks=ranks,
+    )
+
+
+#: Record type -> its :class:`RecordPlan`.
+RECORD_PLANS: dict[QualifiedName, RecordPlan] = {
+    record_type: _record_plan(record_type) for record_type in PROV_REC_CLS
+}
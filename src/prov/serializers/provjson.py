@@ -13,15 +13,18 @@ from prov.identifier import Identifier, Namespace, QualifiedName
 from prov.model import (
     AttributePair,
     Literal,
+    PathLike,
     ProvBundle,
     ProvDocument,
-    ProvRecord,
     QualifiedNameCandidate,
     canonical_xsd_datatype,
     first,
     parse_xsd_datetime,
 )
-from prov.serializers import Serializer, _is_text_stream
+from prov.serializers import Serializer, _is_text_stream, _mapped_file
+from prov.serializers.anonymous import SCOPES, AnonymousIDGenerator
+from prov.serializers.jsoncodec import get_codec
+from prov.serializers.plans import FORMAL_VALUE_ENCODERS, RECORD_PLANS
 
 logger = logging.getLogger(__name__)
 
@@ -36,33 +39,6 @@ class ProvJSONException(Error):
     """Raised when a PROV-JSON document contains a construct this package cannot decode."""
 
 
-class AnonymousIDGenerator:
-    """Assigns and caches stable blank-node identifiers for unidentified records."""
-
-    def __init__(self) -> None:
-        self._cache: dict[ProvRecord, Identifier] = {}
-        self._count: int = 0
-
-    def get_anon_id(self, obj: ProvRecord, local_prefix: str = "id") -> Identifier:
-        """Return a blank-node :class:`~prov.identifier.Identifier` for a record.
-
-        The same object always gets the same identifier back; a new one
-        (``_:<local_prefix><n>``) is minted and cached the first time a given
-        record is seen.
-
-        Args:
-            obj: Record needing an anonymous identifier.
-            local_prefix: Prefix used when minting a new identifier.
-
-        Returns:
-            The cached or newly minted blank-node identifier for ``obj``.
-        """
-        if obj not in self._cache:
-            self._count += 1
-            self._cache[obj] = Identifier(f"_:{local_prefix}{self._count}")
-        return self._cache[obj]
-
-
 class ProvJSONSerializer(Serializer):
     """PROV-JSON serializer for :class:`~prov.model.ProvDocument`."""
 
@@ -73,22 +49,22 @@ class ProvJSONSerializer(Serializer):
             stream: Stream to write the output to. Text streams receive the
                 JSON text directly; other (binary) streams receive it
                 UTF-8-encoded.
-            **args: Extra keyword arguments passed through to
-                :func:`json.dump`.
+            **args: ``codec`` selects the JSON engine (see
+                :func:`~prov.serializers.jsoncodec.get_codec`).
+                ``anonymous_ids`` sets how the unidentified records are
+                numbered (see :func:`encode_json_document`). Extra keyword
+                arguments are passed through to the codec's ``dumps()``,
+                e.g. :func:`json.dumps` for the default codec.
         """
-        buf = io.StringIO()
-        try:
-            json.dump(self.document, buf, cls=ProvJSONEncoder, **args)
-            buf.seek(0, 0)
-            # Right now this is a bytestream. If the object to stream to is
-            # a text object, it must be decoded. We assume utf-8 here, which
-            # should be fine for almost every case.
-            if _is_text_stream(stream):
-                stream.write(buf.read())
-            else:
-                stream.write(buf.read().encode("utf-8"))
-        finally:
-            buf.close()
+        codec = get_codec(args.pop("codec", None))
+        container = encode_json_document(
+            cast(ProvDocument, self.document),
+            anonymous_ids=args.pop("anonymous_ids", "bundle"),
+        )
+        if _is_text_stream(stream):
+            stream.write(codec.dumps(container, **args))
+        else:
+            stream.write(codec.dumpb(container, **args))
 
     def deserialize(self, stream: io.IOBase, **args: Any) -> ProvDocument:
         """Deserialize a `PROV-JSON <https://openprovenance.org/prov-json/>`_
@@ -96,16 +72,39 @@ class ProvJSONSerializer(Serializer):
 
         Args:
             stream: Input data; binary streams are decoded as UTF-8 first.
-            **args: Extra keyword arguments passed through to
-                :func:`json.load`.
+            **args: ``codec`` selects the JSON engine (see
+                :func:`~prov.serializers.jsoncodec.get_codec`); extra keyword
+                arguments are passed through to its ``loads()``, e.g.
+                :func:`json.loads` for the default codec.
+
+        Returns:
+            The deserialized :class:`~prov.model.ProvDocument`.
+        """
+        codec = get_codec(args.pop("codec", None))
+        container = codec.loads(stream.read(), **args)
+        document = ProvDocument()
+        decode_json_document(container, document)
+        return document
+
+    def deserialize_file(self, path: PathLike, **args: Any) -> ProvDocument:
+        """Deserialize a PROV-JSON file into a :class:`~prov.model.ProvDocument`.
+
+        The file is memory-mapped and decoded as UTF-8 straight from the map,
+        which avoids the intermediate copies of reading it through a stream.
+
+        Args:
+            path: Path of the PROV-JSON file.
+            **args: Keyword arguments, as for :meth:`deserialize`.
 
         Returns:
             The deserialized :class:`~prov.model.ProvDocument`.
         """
-        if not _is_text_stream(stream):
-            buf = io.StringIO(stream.read().decode("utf-8"))
-            stream = buf
-        return cast(ProvDocument, json.load(stream, cls=ProvJSONDecoder, **args))
+        codec = get_codec(args.pop("codec", None))
+        with _mapped_file(path) as mapped, memoryview(mapped) as view:
+            container = codec.loads(view, **args)
+        document = ProvDocument()
+        decode_json_document(container, document)
+        return document
 
 
 class ProvJSONEncoder(json.JSONEncoder):
@@ -172,26 +171,45 @@ def valid_qualified_name(
     return qualified_name
 
 
-def encode_json_document(document: ProvDocument) -> ProvJSONDict:
+def encode_json_document(
+    document: ProvDocument, anonymous_ids: str = "bundle"
+) -> ProvJSONDict:
     """Encode a whole :class:`~prov.model.ProvDocument`, including its named bundles.
 
     Args:
         document: Document to encode.
+        anonymous_ids: How the unidentified records, keyed by a blank-node
+            identifier ``_:id<n>``, are numbered: ``"bundle"`` (the default)
+            to restart the numbering in each bundle, ``"document"`` to number
+            them through the document and its bundles, as the PROV-O
+            serializer does with the same option (see
+            :mod:`prov.serializers.anonymous`).
 
     Returns:
         The PROV-JSON container dict for ``document``, with each named
         bundle's own encoded container nested under ``container["bundle"]``
         keyed by the bundle's identifier string.
+
+    Raises:
+        ValueError: If ``anonymous_ids`` is not one of
+            :data:`~prov.serializers.anonymous.SCOPES`.
     """
-    container = encode_json_container(document)
+    if anonymous_ids not in SCOPES:
+        raise ValueError(
+            f"anonymous_ids must be one of {', '.join(SCOPES)}; got {anonymous_ids!r}"
+        )
+    id_generator = AnonymousIDGenerator() if anonymous_ids == "document" else None
+    container = encode_json_container(document, id_generator)
     for bundle in document.bundles:
         #  encoding the sub-bundle
-        bundle_json = encode_json_container(bundle)
+        bundle_json = encode_json_container(bundle, id_generator)
         container["bundle"][str(bundle.identifier)] = bundle_json
     return container
 
 
-def encode_json_container(bundle: ProvBundle) -> ProvJSONDict:
+def encode_json_container(
+    bundle: ProvBundle, id_generator: AnonymousIDGenerator | None = None
+) -> ProvJSONDict:
     """Encode a single bundle's namespaces and records to a PROV-JSON container dict.
 
     Does not recurse into ``bundle``'s own named bundles; see
@@ -200,6 +218,8 @@ def encode_json_container(bundle: ProvBundle) -> ProvJSONDict:
     Args:
         bundle: Bundle (or document, treated as its top-level bundle) to
             encode.
+        id_generator: Numbers the unidentified records; if ``None``, a new
+            one, starting the numbering at ``_:id1``.
 
     Returns:
         A dict with an optional ``"prefix"`` entry for registered namespaces
@@ -215,15 +235,12 @@ def encode_json_container(bundle: ProvBundle) -> ProvJSONDict:
     if prefixes:
         container["prefix"] = prefixes
 
-    id_generator = AnonymousIDGenerator()
-
-    def real_or_anon_id(r: ProvRecord) -> Identifier:
-        return r._identifier if r._identifier else id_generator.get_anon_id(r)
-
+    get_anon_id = (id_generator or AnonymousIDGenerator()).get_anon_id
     for record in bundle._records:
-        rec_type = record.get_type()
-        rec_label = PROV_N_MAP[rec_type]
-        identifier = str(real_or_anon_id(record))
+        rec_label = RECORD_PLANS[record.get_type()].label
+        identifier = (
+            str(record._identifier) if record._identifier else get_anon_id(record)
+        )
 
         record_json: dict[str, Any] = {}
         if record._attributes:
@@ -231,11 +248,10 @@ def encode_json_container(bundle: ProvBundle) -> ProvJSONDict:
                 if not values:
                     continue
                 attr_name = str(attr)
-                if attr in PROV_ATTRIBUTE_QNAMES:
+                encode_formal = FORMAL_VALUE_ENCODERS.get(attr)
+                if encode_formal is not None:
                     # TODO: QName export
-                    record_json[attr_name] = str(first(values))
-                elif attr in PROV_ATTRIBUTE_LITERALS:
-                    record_json[attr_name] = first(values).isoformat()  # type: ignore[union-attr]
+                    record_json[attr_name] = encode_formal(first(values))
                 else:
                     if len(values) == 1:
                         # single value
@@ -3,11 +3,21 @@
 Implements the W3C member submission "A JSON-LD Representation for the PROV
 Data Model" (https://www.w3.org/submissions/prov-jsonld/): the canonical
 compacted shape only, one JSON object per PROV-DM statement in ``@graph``.
+
+Both directions also have a streaming mode (``streaming=True``), in which the
+writer emits ``@context`` and then each statement as soon as it is encoded,
+and the reader decodes ``@graph`` entries, and the statements of nested
+bundles, one at a time as they are parsed, rather than building (or parsing)
+the whole JSON document in memory first.
 """
 
+import codecs
 import datetime
 import io
+import itertools
 import json
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
 from functools import lru_cache
 from importlib.resources import files
 from typing import Any
@@ -33,6 +43,7 @@ from prov.model import (
     PROV_REC_CLS,
     AttributePair,
     Literal,
+    PathLike,
     ProvBundle,
     ProvDocument,
     ProvElement,
@@ -42,7 +53,9 @@ from prov.model import (
     first,
     parse_xsd_datetime,
 )
-from prov.serializers import Serializer, _is_text_stream
+from prov.serializers import Serializer, _is_text_stream, _mapped_file
+from prov.serializers.jsoncodec import JSONCodec, get_codec
+from prov.serializers.plans import RECORD_PLANS, RecordPlan
 
 __author__ = "Trung Dong Huynh"
 __email__ = "trungdong@donggiang.com"
@@ -95,6 +108,16 @@ FORMAL_ATTRS_BY_TERM: dict[type[ProvRecord], dict[str, QualifiedName]] = {
 }
 
 
+#: Number of characters read from, or written to, a stream at a time in
+#: streaming mode.
+STREAM_CHUNK_SIZE = 1 << 16
+
+# Size, in characters, above which a @graph entry being streamed in is
+# parsed member by member rather than as a whole, so that the statements of
+# a large bundle are decoded as they are read
+_MAX_BUFFERED_ENTRY = 1 << 20
+
+
 class ProvJSONLDException(Error):
     """Raised when a document cannot be written as, or read from, PROV-JSONLD."""
 
@@ -227,6 +250,52 @@ def _encode_attribute_term(attr: QualifiedName, rec_type: QualifiedName) -> str:
     return term
 
 
+@dataclass(frozen=True)
+class _StatementPlan:
+    """How the statements of a record type are encoded.
+
+    Attributes:
+        type_term: The ``@type`` of the statements.
+        formal_attributes: The formal attributes, with their term and the
+            function rendering their value.
+        formal_set: The same attributes, as a set.
+        special_terms: The terms of the special attributes whose term does
+            not depend on the record's namespaces.
+    """
+
+    type_term: str
+    formal_attributes: tuple[tuple[QualifiedName, str, Callable[[Any], str]], ...]
+    formal_set: frozenset[QualifiedName]
+    special_terms: dict[QualifiedName, str]
+
+
+def _statement_plan(plan: RecordPlan) -> _StatementPlan:
+    rec_type = plan.record_type
+    return _StatementPlan(
+        type_term=rec_type.localpart,
+        formal_attributes=tuple(
+            (attr, attr.localpart, encode) for attr, encode in plan.formal_attributes
+        ),
+        formal_set=frozenset(attr for attr, _ in plan.formal_attributes),
+        # The bare "value" term is scoped to Entity, any other record type
+        # uses the prefix the record has for it
+        special_terms={
+            attr: term
+            for attr, term in SPECIAL_ATTR_TERMS.items()
+            if attr != PROV_VALUE or rec_type == PROV_ENTITY
+        },
+    )
+
+
+#: Record type -> the plan its statements are encoded with; Mention, which
+#: has no statement, has none.
+_STATEMENT_PLANS: dict[QualifiedName, _StatementPlan] = {
+    rec_type: _statement_plan(plan)
+    for rec_type, plan in RECORD_PLANS.items()
+    if rec_type != PROV_MENTION
+}
+
+
 def encode_jsonld_statement(record: ProvRecord) -> dict[str, Any]:
     """Encode one PROV record as its submission §4 statement object.
 
@@ -244,29 +313,27 @@ def encode_jsonld_statement(record: ProvRecord) -> dict[str, Any]:
             -- the submission defines no term for ``mentionOf``.
     """
     rec_type = record.get_type()
-    if rec_type == PROV_MENTION:
+    plan = _STATEMENT_PLANS.get(rec_type)
+    if plan is None:
         suffix = f" ({record.identifier})" if record.identifier is not None else ""
         raise ProvJSONLDException(
             f"PROV-JSONLD cannot represent mentionOf{suffix}: "
             "the submission defines no Mention term; see "
             "docs/reference/conformance.md"
         )
-    obj: dict[str, Any] = {"@type": rec_type.localpart}
+    obj: dict[str, Any] = {"@type": plan.type_term}
     if record.identifier is not None:
         obj["@id"] = str(record.identifier)
-    for attr in record.FORMAL_ATTRIBUTES:
-        values = record._attributes.get(attr)
+    attributes = record._attributes
+    for attr, term, encode in plan.formal_attributes:
+        values = attributes.get(attr)
         if values:
-            value = first(values)
-            obj[attr.localpart] = (
-                value.isoformat()  # type: ignore[union-attr]
-                if attr in PROV_ATTRIBUTE_LITERALS
-                else str(value)
-            )
-    for attr, values in record._attributes.items():
-        if attr in record.FORMAL_ATTRIBUTES or not values:
+            obj[term] = encode(first(values))
+    formal_attributes, special_terms = plan.formal_set, plan.special_terms
+    for attr, values in attributes.items():
+        if attr in formal_attributes or not values:
             continue
-        term = _encode_attribute_term(attr, rec_type)
+        term = special_terms.get(attr) or _encode_attribute_term(attr, rec_type)
         obj[term] = [encode_jsonld_value(v, term) for v in values]
     return obj
 
@@ -319,6 +386,87 @@ def encode_jsonld_document(document: ProvDocument, context: str) -> dict[str, An
     return {"@context": context_list, "@graph": graph}
 
 
+def iter_jsonld_document(
+    document: ProvDocument,
+    context: str,
+    codec: str | JSONCodec | None = None,
+    **args: Any,
+) -> Iterator[str]:
+    """Encode a whole document as PROV-JSONLD text, a statement at a time.
+
+    The streaming counterpart of :func:`encode_jsonld_document`: the same
+    document object is produced, as JSON text, but piece by piece, each
+    statement being encoded only when the text before it has been consumed.
+    Unless ``sort_keys`` is given, the text is that ``codec`` would produce
+    for the whole document object with the same ``args``.
+
+    Args:
+        document: Document to encode.
+        context: ``"url"`` or ``"embed"``, as for
+            :func:`encode_jsonld_document`.
+        codec: The JSON engine, as for
+            :func:`~prov.serializers.jsoncodec.get_codec` (default: ``None``,
+            meaning the default codec).
+        **args: Keyword arguments passed to the ``dumps()`` of ``codec`` for
+            each value; the layout options (e.g. ``indent``) also shape the
+            enclosing objects and arrays.
+
+    Yields:
+        Consecutive pieces of the JSON text.
+    """
+    json_codec = get_codec(codec)
+    indent, item_separator, key_separator = json_codec.layout(**args)
+
+    def newline(depth: int) -> str:
+        return "" if indent is None else "\n" + indent * depth
+
+    def dumps(value: Any, depth: int) -> str:
+        # Strings are escaped, so any newline is one of the indentation's
+        return json_codec.dumps(value, **args).replace("\n", newline(depth))
+
+    def array(entries: Iterator[Iterable[str]], depth: int) -> Iterator[str]:
+        separator = "["
+        for entry in entries:
+            yield separator + newline(depth + 1)
+            yield from entry
+            separator = item_separator
+        yield "[]" if separator == "[" else newline(depth) + "]"
+
+    def statements(bundle: ProvBundle, depth: int) -> Iterator[Iterable[str]]:
+        for record in bundle._records:
+            yield (dumps(encode_jsonld_statement(record), depth),)
+
+    def bundle_object(bundle: ProvBundle, depth: int) -> Iterator[str]:
+        member = item_separator + newline(depth + 1)
+        bundle_ns = _encode_namespaces(bundle)
+        bundle_context = [bundle_ns] if bundle_ns else []
+        yield (
+            f'{{{newline(depth + 1)}"@type"{key_separator}"Bundle"{member}'
+            f'"@id"{key_separator}{dumps(str(bundle.identifier), depth + 1)}'
+            f'{member}"@context"{key_separator}{dumps(bundle_context, depth + 1)}'
+            f'{member}"@graph"{key_separator}'
+        )
+        yield from array(statements(bundle, depth + 2), depth + 1)
+        yield newline(depth) + "}"
+
+    context_tail: Any = (
+        JSONLD_CONTEXT_URL if context == "url" else load_vendored_context()
+    )
+    ns_map = _encode_namespaces(document)
+    context_list: list[Any] = [ns_map] if ns_map else []
+    context_list.append(context_tail)
+    yield (
+        f'{{{newline(1)}"@context"{key_separator}{dumps(context_list, 1)}'
+        f'{item_separator}{newline(1)}"@graph"{key_separator}'
+    )
+    entries = itertools.chain(
+        statements(document, 2),
+        (bundle_object(bundle, 2) for bundle in document.bundles),
+    )
+    yield from array(entries, 1)
+    yield newline(0) + "}"
+
+
 def _expect_object(value: Any, description: str) -> dict[str, Any]:
     """Check that a decoded JSON value is an object (a Python ``dict``).
 
@@ -625,23 +773,272 @@ def decode_jsonld_document(container: Any, document: ProvDocument) -> None:
             f'"@graph" must be a JSON array; found {type(graph).__name__}'
         )
     for item in graph:
-        item = _expect_object(item, "A @graph statement")
-        type_term = item.get("@type")
-        is_bundle = (
-            isinstance(type_term, str) and _strip_prov_prefix(type_term) == "Bundle"
+        _decode_graph_entry(item, document)
+
+
+def _is_bundle_object(item: dict[str, Any]) -> bool:
+    """Return whether a ``@graph`` entry is a nested ``Bundle`` object."""
+    type_term = item.get("@type")
+    return isinstance(type_term, str) and _strip_prov_prefix(type_term) == "Bundle"
+
+
+def _decode_graph_entry(item: Any, document: ProvDocument) -> None:
+    """Decode one entry of a document's ``@graph``: a statement or a bundle.
+
+    Args:
+        item: The entry.
+        document: Document to add the decoded record or bundle to.
+
+    Raises:
+        ProvJSONLDException: If ``item`` is not a JSON object, is a bundle
+            object without an ``"@id"``, or is a malformed statement (see
+            :func:`decode_jsonld_statement`).
+    """
+    item = _expect_object(item, "A @graph statement")
+    if not _is_bundle_object(item):
+        decode_jsonld_statement(item, document)
+        return
+    if "@id" not in item:
+        raise ProvJSONLDException(f'A Bundle requires an "@id"; found {item!r}')
+    bundle = ProvBundle(document=document)
+    _decode_context(item.get("@context", []), bundle)
+    for stmt in item.get("@graph", []):
+        decode_jsonld_statement(_expect_object(stmt, "A bundle statement"), bundle)
+    document.add_bundle(bundle, bundle.valid_qualified_name(item["@id"]))
+
+
+class _TooLarge:
+    """Marker of a JSON value larger than the parser was allowed to buffer."""
+
+
+_TOO_LARGE = _TooLarge()
+
+
+class _JSONStreamParser:
+    """Parse the JSON text read from a stream a value or delimiter at a time.
+
+    Only a window of the text is held in memory: values are decoded with
+    :meth:`json.JSONDecoder.raw_decode` as soon as they are complete in it,
+    and the text before them is then dropped.
+    """
+
+    def __init__(self, read: Callable[[int], str], decoder: json.JSONDecoder):
+        self._read = read
+        self._decoder = decoder
+        self._buffer = ""
+        self._position = 0
+        self._consumed = 0  # characters dropped from the buffer so far
+        self._eof = False
+
+    def _fill(self, size: int | None = None) -> bool:
+        # Read more text, dropping what has been parsed; False at the end
+        if self._eof:
+            return False
+        chunk = self._read(size or STREAM_CHUNK_SIZE)
+        if not chunk:
+            self._eof = True
+            return False
+        self._consumed += self._position
+        self._buffer = self._buffer[self._position :] + chunk
+        self._position = 0
+        return True
+
+    def _error(self, message: str, position: int | None = None) -> ProvJSONLDException:
+        # The error at a position in the buffer (default: the current one),
+        # reported as a position in the whole text
+        if position is None:
+            position = self._position
+        return ProvJSONLDException(
+            f"{message} at character {self._consumed + position}"
         )
-        if not is_bundle:
-            decode_jsonld_statement(item, document)
-            continue
-        if "@id" not in item:
-            raise ProvJSONLDException(f'A Bundle requires an "@id"; found {item!r}')
-        bundle = ProvBundle(document=document)
-        _decode_context(item.get("@context", []), bundle)
-        for stmt in item.get("@graph", []):
-            decode_jsonld_statement(_expect_object(stmt, "A bundle statement"), bundle)
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or ``""`` at the end."""
+        while True:
+            buffer, position = self._buffer, self._position
+            while position < len(buffer) and buffer[position] in " \t\n\r":
+                position += 1
+            self._position = position
+            if position < len(buffer):
+                return buffer[position]
+            if not self._fill():
+                return ""
+
+    def expect(self, delimiters: str) -> str:
+        """Consume the next character, which must be one of ``delimiters``."""
+        char = self.peek()
+        if not char or char not in delimiters:
+            expected = " or ".join(repr(d) for d in delimiters)
+            found = repr(char) if char else "the end of the input"
+            raise self._error(f"Expected {expected}, found {found}")
+        self._position += 1
+        return char
+
+    def value(self, max_size: int | None = None) -> Any:
+        """Decode the next JSON value.
+
+        Args:
+            max_size: If given, the number of characters the value may take
+                in the buffer; :data:`_TOO_LARGE` is returned, with nothing
+                consumed, for a longer value (default: ``None``, no limit).
+        """
+        if not self.peek():
+            raise self._error("Expected a JSON value, found the end of the input")
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError as e:
+                # Most likely an incomplete value: read on, doubling the
+                # buffer to keep re-parsing a long value linear overall
+                size = len(self._buffer) - self._position
+                if max_size is not None and size >= max_size:
+                    return _TOO_LARGE
+                if not self._fill(max(STREAM_CHUNK_SIZE, size)):
+                    # The line and column of the decoder's message count
+                    # from the start of the buffer, not of the text
+                    raise self._error(f"Invalid JSON: {e.msg}", e.pos) from e
+                continue
+            # A number may go on past the end of the buffer
+            if end < len(self._buffer) or self._eof or self._buffer[end - 1] in '"]}':
+                self._position = end
+                return value
+            self._fill()
+
+
+def _decode_graph_stream(parser: _JSONStreamParser, document: ProvDocument) -> None:
+    # Decode a document's @graph array as its entries are parsed
+    if parser.peek() != "[":
+        graph = parser.value()
+        raise ProvJSONLDException(
+            f'"@graph" must be a JSON array; found {type(graph).__name__}'
+        )
+    parser.expect("[")
+    if parser.peek() == "]":
+        parser.expect("]")
+        return
+    while True:
+        item = parser.value(_MAX_BUFFERED_ENTRY)
+        if item is _TOO_LARGE and parser.peek() == "{":
+            _decode_large_graph_entry(parser, document)
+        else:
+            _decode_graph_entry(
+                item if item is not _TOO_LARGE else parser.value(), document
+            )
+        if parser.expect(",]") == "]":
+            return
+
+
+def _decode_large_graph_entry(
+    parser: _JSONStreamParser, document: ProvDocument
+) -> None:
+    # Decode a @graph entry too large to be parsed as a whole, member by
+    # member: the statements of a bundle are decoded as they are parsed,
+    # provided that its @type, @id and @context come before its @graph
+    parser.expect("{")
+    item: dict[str, Any] = {}
+    bundle: ProvBundle | None = None
+    if parser.peek() == "}":
+        parser.expect("}")
+    else:
+        while True:
+            key = parser.value()
+            parser.expect(":")
+            streamable = (
+                key == "@graph"
+                and bundle is None
+                and _is_bundle_object(item)
+                and "@id" in item
+                and "@context" in item
+                and parser.peek() == "["
+            )
+            if streamable:
+                bundle = ProvBundle(document=document)
+                _decode_context(item["@context"], bundle)
+                parser.expect("[")
+                if parser.peek() == "]":
+                    parser.expect("]")
+                else:
+                    while True:
+                        stmt = _expect_object(parser.value(), "A bundle statement")
+                        decode_jsonld_statement(stmt, bundle)
+                        if parser.expect(",]") == "]":
+                            break
+            else:
+                item[key] = parser.value()
+            if parser.expect(",}") == "}":
+                break
+    if bundle is None:
+        _decode_graph_entry(item, document)
+    else:
         document.add_bundle(bundle, bundle.valid_qualified_name(item["@id"]))
 
 
+def decode_jsonld_stream(
+    read: Callable[[int], str], document: ProvDocument, **args: Any
+) -> None:
+    """Decode a PROV-JSONLD document as its JSON text is read.
+
+    The streaming counterpart of :func:`decode_jsonld_document`: the
+    entries of ``@graph``, and the statements of the nested bundles, are
+    decoded one at a time as they are parsed, so that only a window of the
+    text and the entry being decoded are held in memory besides
+    ``document``. This needs the ``@context`` of the document, and that of
+    each bundle, to come before its ``@graph``, as
+    :func:`iter_jsonld_document` writes them; otherwise, the ``@graph`` is
+    read as a whole before being decoded.
+
+    Args:
+        read: A function returning up to the given number of characters of
+            the text, or ``""`` at its end, e.g. the ``read`` method of a
+            text stream.
+        document: Document to populate.
+        **args: Keyword arguments passed to :class:`json.JSONDecoder`.
+
+    Raises:
+        ProvJSONLDException: If the text is not valid JSON, with the
+            position of the error in it, or not a well-formed PROV-JSONLD
+            document (see :func:`decode_jsonld_document`). Unlike the
+            :func:`json.loads` of the non-streaming mode, which raises
+            :class:`json.JSONDecodeError` for invalid JSON, the parser finds
+            some syntax errors itself, between the values it decodes.
+    """
+    parser = _JSONStreamParser(read, json.JSONDecoder(**args))
+    if parser.peek() != "{":
+        _expect_object(parser.value(), "A PROV-JSONLD document")
+    parser.expect("{")
+    keys = []
+    context: Any = None
+    graph: Any = None  # a @graph read before the @context
+    if parser.peek() == "}":
+        parser.expect("}")
+    else:
+        while True:
+            key = parser.value()
+            keys.append(key)
+            parser.expect(":")
+            if key == "@context":
+                context = parser.value()
+                if "@graph" not in keys:
+                    _decode_context(context, document)
+            elif key == "@graph" and "@context" in keys:
+                _decode_graph_stream(parser, document)
+            elif key == "@graph":
+                graph = parser.value()
+            else:
+                parser.value()
+            if parser.expect(",}") == "}":
+                break
+    if parser.peek():
+        raise parser._error("Extra data after the PROV-JSONLD document")
+    if "@graph" not in keys or "@context" not in keys:
+        raise ProvJSONLDException(
+            'A PROV-JSONLD document requires both "@context" and "@graph"; '
+            f"found keys {sorted(keys)!r}"
+        )
+    if keys.index("@graph") < keys.index("@context"):
+        decode_jsonld_document({"@context": context, "@graph": graph}, document)
+
+
 class ProvJSONLDSerializer(Serializer):
     """PROV-JSONLD serializer for :class:`~prov.model.ProvDocument`."""
 
@@ -655,8 +1052,14 @@ class ProvJSONLDSerializer(Serializer):
             **args: ``context`` (``"url"`` (default) or ``"embed"``) selects
                 whether ``@context`` references the canonical context by URL
                 or inlines the vendored context object; any other value
-                raises :class:`ValueError`. Remaining keyword arguments are
-                passed through to :func:`json.dump`.
+                raises :class:`ValueError`. ``streaming=True`` writes the
+                output as it is encoded, in chunks of about
+                :data:`STREAM_CHUNK_SIZE` characters (see
+                :func:`iter_jsonld_document`), rather than encoding the whole
+                document first. ``codec`` selects the JSON engine (see
+                :func:`~prov.serializers.jsoncodec.get_codec`). Remaining
+                keyword arguments are passed through to its ``dumps()``,
+                e.g. :func:`json.dumps` for the default codec.
 
         Raises:
             ValueError: If ``context`` is neither ``"url"`` nor ``"embed"``.
@@ -664,21 +1067,36 @@ class ProvJSONLDSerializer(Serializer):
                 document contains a :class:`~prov.model.ProvMention` record.
         """
         context = args.pop("context", "url")
+        streaming = args.pop("streaming", False)
         if context not in ("url", "embed"):
             raise ValueError(f'context must be "url" or "embed"; got {context!r}')
         if self.document is None:
             raise ProvJSONLDException("No document to serialize.")
+        if streaming:
+            self._serialize_stream(stream, context, **args)
+            return
+        codec = get_codec(args.pop("codec", None))
         container = encode_jsonld_document(self.document, context)
-        buf = io.StringIO()
-        try:
-            json.dump(container, buf, **args)
-            buf.seek(0, 0)
-            if _is_text_stream(stream):
-                stream.write(buf.read())
-            else:
-                stream.write(buf.read().encode("utf-8"))
-        finally:
-            buf.close()
+        if _is_text_stream(stream):
+            stream.write(codec.dumps(container, **args))
+        else:
+            stream.write(codec.dumpb(container, **args))
+
+    def _serialize_stream(self, stream: io.IOBase, context: str, **args: Any) -> None:
+        assert self.document is not None
+        text = _is_text_stream(stream)
+        chunks: list[str] = []
+        buffered = 0
+        for piece in iter_jsonld_document(self.document, context, **args):
+            chunks.append(piece)
+            buffered += len(piece)
+            if buffered >= STREAM_CHUNK_SIZE:
+                chunk = "".join(chunks)
+                stream.write(chunk if text else chunk.encode("utf-8"))
+                chunks = []
+                buffered = 0
+        chunk = "".join(chunks)
+        stream.write(chunk if text else chunk.encode("utf-8"))
 
     def deserialize(self, stream: io.IOBase, **args: Any) -> ProvDocument:
         """Deserialize a `PROV-JSONLD <https://www.w3.org/submissions/prov-jsonld/>`_
@@ -690,19 +1108,70 @@ class ProvJSONLDSerializer(Serializer):
 
         Args:
             stream: Input data; binary streams are decoded as UTF-8 first.
-            **args: Extra keyword arguments passed through to
-                :func:`json.load`.
+            **args: ``streaming=True`` decodes the statements as they are
+                read (see :func:`decode_jsonld_stream`), rather than loading
+                the whole JSON document first; the standard library's
+                decoder is then used, whatever the codec. ``codec`` selects
+                the JSON engine (see
+                :func:`~prov.serializers.jsoncodec.get_codec`). Extra keyword
+                arguments are passed through to its ``loads()``, e.g.
+                :func:`json.loads` for the default codec.
 
         Returns:
             The deserialized :class:`~prov.model.ProvDocument`.
 
         Raises:
             ProvJSONLDException: If ``stream`` does not hold a well-formed
-                PROV-JSONLD document (see :func:`decode_jsonld_document`).
+                PROV-JSONLD document (see :func:`decode_jsonld_document`),
+                or, with ``streaming=True``, does not hold valid JSON.
+            json.JSONDecodeError: If ``stream`` does not hold valid JSON,
+                without ``streaming=True`` (the codec's subclass of it, for
+                another codec).
+        """
+        codec = get_codec(args.pop("codec", None))
+        if args.pop("streaming", False):
+            document = ProvDocument()
+            if _is_text_stream(stream):
+                decode_jsonld_stream(stream.read, document, **args)
+            else:
+                reader = codecs.getreader("utf-8")(stream)
+                decode_jsonld_stream(reader.read, document, **args)
+            return document
+        container = codec.loads(stream.read(), **args)
+        document = ProvDocument()
+        decode_jsonld_document(container, document)
+        return document
+
+    def deserialize_file(self, path: PathLike, **args: Any) -> ProvDocument:
+        """Deserialize a PROV-JSONLD file into a :class:`~prov.model.ProvDocument`.
+
+        The file is memory-mapped and decoded as UTF-8 straight from the map,
+        which avoids the intermediate copies of reading it through a stream.
+        With ``streaming=True``, the file is read and decoded in chunks
+        instead, holding only a window of it in memory.
+
+        Args:
+            path: Path of the PROV-JSONLD file.
+            **args: Keyword arguments, as for :meth:`deserialize`.
+
+        Returns:
+            The deserialized :class:`~prov.model.ProvDocument`.
+
+        Raises:
+            ProvJSONLDException: If the file does not hold a well-formed
+                PROV-JSONLD document (see :func:`decode_jsonld_document`),
+                or, with ``streaming=True``, does not hold valid JSON.
+            json.JSONDecodeError: If the file does not hold valid JSON,
+                without ``streaming=True``.
         """
-        if not _is_text_stream(stream):
-            stream = io.StringIO(stream.read().decode("utf-8"))
-        container = json.load(stream, **args)
+        codec = get_codec(args.pop("codec", None))
+        if args.pop("streaming", False):
+            document = ProvDocument()
+            with open(path, encoding="utf-8") as f:
+                decode_jsonld_stream(f.read, document, **args)
+            return document
+        with _mapped_file(path) as mapped, memoryview(mapped) as view:
+            container = codec.loads(view, **args)
         document = ProvDocument()
         decode_jsonld_document(container, document)
         return document
@@ -3,6 +3,8 @@
 import base64
 import datetime
 import io
+import os
+import pathlib
 import re
 import typing
 import warnings
@@ -51,6 +53,8 @@ from prov.constants import (
 )
 from prov.identifier import QualifiedName
 from prov.serializers import Serializer, _is_text_stream
+from prov.serializers.anonymous import AnonymousIDGenerator
+from prov.serializers.plans import RECORD_PLANS
 
 __author__ = "Satrajit S. Ghosh"
 __email__ = "satra@mit.edu"
@@ -70,33 +74,6 @@ class ProvRDFException(Error):
     """Raised when a PROV-RDF/PROV-O graph cannot be decoded by this package."""
 
 
-class AnonymousIDGenerator:
-    """Assigns and caches stable blank-node identifier strings for unidentified records."""
-
-    def __init__(self) -> None:
-        self._cache: dict[Any, str] = {}
-        self._count: int = 0
-
-    def get_anon_id(self, obj: pm.ProvRecord, local_prefix: str = "id") -> str:
-        """Return a blank-node identifier string (``"_:<local_prefix><n>"``) for a record.
-
-        The same object always gets the same identifier string back; a new
-        one is minted and cached the first time a given record is seen.
-
-        Args:
-            obj: Record needing an anonymous identifier.
-            local_prefix: Prefix used when minting a new identifier.
-
-        Returns:
-            The cached or newly minted blank-node identifier string for
-            ``obj``.
-        """
-        if obj not in self._cache:
-            self._count += 1
-            self._cache[obj] = f"_:{local_prefix}{self._count}"
-        return self._cache[obj]
-
-
 _XSD_GYEAR_RE = re.compile(r"^(-?\d{4,})(?:Z|[+-]\d{2}:\d{2})?$")
 _XSD_GYEARMONTH_RE = re.compile(r"^(-?\d{4,})-(\d{2})(?:Z|[+-]\d{2}:\d{2})?$")
 
@@ -293,6 +270,7 @@ _ELEMENT_ATTR_PREDICATES = {
     PROV_ATTR_ENDTIME: _prov_uri("endedAtTime"),
 }
 
+
 #: Relation families that emit both a binary triple and a prov:qualified*
 #: node for an anonymous relation with extra attributes; on decode the binary
 #: triple is reconciled onto that qualified node (its first two formal
@@ -388,6 +366,38 @@ def attr2rdf(attr: QualifiedName) -> URIRef:
     return URIRef(PROV[PROV_ID_ATTRIBUTES_MAP[attr].split("prov:")[1]].uri)
 
 
+def _rewrite_qualified_predicate(rec_type: QualifiedName, pred: URIRef) -> URIRef:
+    """Apply the predicate rewrites of a relation type to a base predicate.
+
+    The rewrites are those of :data:`_COMMON_PREDICATE_REWRITES`, then of
+    :data:`_RELATION_PREDICATE_REWRITES`, in order.
+    """
+    for needle, replacement in (
+        *_COMMON_PREDICATE_REWRITES,
+        *_RELATION_PREDICATE_REWRITES.get(rec_type, ()),
+    ):
+        if needle in pred:
+            pred = replacement
+    return pred
+
+
+#: Relation type -> the predicate of each of its formal attributes, and of
+#: the attributes in :data:`_QUALIFIED_ATTR_PREDICATES`, on its qualification
+#: node: what :meth:`ProvRDFSerializer._qualified_attr_predicate` returns for
+#: them, derived once per type. A predicate only depends on the attribute's
+#: URI, so looking it up by attribute is safe whatever its prefix.
+_QUALIFIED_PREDICATES: dict[QualifiedName, dict[QualifiedName, URIRef]] = {
+    rec_type: {
+        attr: _rewrite_qualified_predicate(rec_type, pred)
+        for attr, pred in {
+            **_QUALIFIED_ATTR_PREDICATES,
+            **{attr: attr2rdf(attr) for attr, _ in plan.formal_attributes},
+        }.items()
+    }
+    for rec_type, plan in RECORD_PLANS.items()
+}
+
+
 class ProvRDFSerializer(Serializer):
     """PROV-O serializer for :class:`~prov.model.ProvDocument`."""
 
@@ -409,8 +419,10 @@ class ProvRDFSerializer(Serializer):
             PROV_N_MAP: Maps record type QualifiedName to PROV-N keyword,
                 used when building the relation predicates; defaults to
                 :data:`~prov.constants.PROV_N_MAP`.
-            **kwargs: Extra keyword arguments passed through to rdflib's
-                ``Graph.serialize()``.
+            **kwargs: ``anonymous_ids`` sets how the blank nodes of the
+                unidentified relations are labelled (see
+                :meth:`encode_document`). Extra keyword arguments are passed
+                through to rdflib's ``Graph.serialize()``.
 
         Raises:
             ProvRDFException: If ``self.document`` is ``None``.
@@ -418,8 +430,12 @@ class ProvRDFSerializer(Serializer):
         if self.document is None:
             raise ProvRDFException("No document to serialize.")
 
-        container = self.encode_document(self.document, PROV_N_MAP=PROV_N_MAP)
         newargs = kwargs.copy()
+        container = self.encode_document(
+            self.document,
+            PROV_N_MAP=PROV_N_MAP,
+            anonymous_ids=newargs.pop("anonymous_ids", None),
+        )
         newargs["format"] = rdf_format
 
         buf = io.BytesIO()
@@ -472,6 +488,49 @@ class ProvRDFSerializer(Serializer):
         # rdflib accepts any readable stream at runtime (via create_input_source)
         # but its declared parameter type does not include io.IOBase.
         container.parse(stream, **newargs)  # type: ignore[arg-type]
+        return self._decode_container(container, relation_mapper, predicate_mapper)
+
+    def deserialize_file(
+        self,
+        path: pm.PathLike,
+        rdf_format: str = "trig",
+        relation_mapper: RelationMapper = RELATION_MAP,
+        predicate_mapper: PredicateMapper = PREDICATE_MAP,
+        **kwargs: Any,
+    ) -> pm.ProvDocument:
+        """Deserialize a PROV-O file into a :class:`~prov.model.ProvDocument`.
+
+        The path is handed to rdflib, which opens the file in binary mode
+        and feeds it to its parser directly, instead of going through a
+        text stream first. Arguments are as for :meth:`deserialize`.
+
+        Args:
+            path: Path of the RDF file.
+            rdf_format: The rdflib RDF format name of the input data.
+            relation_mapper: Maps PROV-O relation predicates to
+                :class:`~prov.model.ProvBundle` factory method names.
+            predicate_mapper: Maps PROV-O predicates to formal attribute
+                QualifiedNames.
+            **kwargs: Extra keyword arguments passed through to rdflib's
+                ``Graph.parse()``.
+
+        Returns:
+            The deserialized :class:`~prov.model.ProvDocument` (also stored
+            in ``self.document``).
+        """
+        newargs = kwargs.copy()
+        newargs["format"] = rdf_format
+        container = Dataset(default_union=True)
+        container.parse(source=pathlib.Path(os.fsdecode(path)), **newargs)
+        return self._decode_container(container, relation_mapper, predicate_mapper)
+
+    def _decode_container(
+        self,
+        container: Dataset,
+        relation_mapper: RelationMapper,
+        predicate_mapper: PredicateMapper,
+    ) -> pm.ProvDocument:
+        """Decode a parsed dataset into a new document, kept in ``self.document``."""
         self.document = pm.ProvDocument()
         self.decode_document(
             container,
@@ -746,6 +805,7 @@ class ProvRDFSerializer(Serializer):
         self,
         document: pm.ProvDocument,
         PROV_N_MAP: RecordTypeLabels = PROV_N_MAP,
+        anonymous_ids: str | None = None,
     ) -> Dataset:
         """Encode a whole :class:`~prov.model.ProvDocument`, including its named bundles.
 
@@ -753,11 +813,30 @@ class ProvRDFSerializer(Serializer):
             document: Document to encode.
             PROV_N_MAP: Maps record type QualifiedName to PROV-N keyword;
                 defaults to :data:`~prov.constants.PROV_N_MAP`.
+            anonymous_ids: ``None`` (the default) for the unidentified
+                relations' qualification nodes to be fresh blank nodes, or
+                ``"document"`` for them to be labelled ``id<n>``, numbered
+                through the document and its bundles: the blank-node
+                identifiers the PROV-JSON serializer keys them by with the
+                same option (see :mod:`prov.serializers.anonymous`). The
+                labels are then the same in every output of the document,
+                hence the blank nodes of two outputs would be merged should
+                their graphs be.
 
         Returns:
             A ``Dataset`` (union view) containing the document's own triples
             plus one named graph per bundle in ``document.bundles``.
+
+        Raises:
+            ValueError: If ``anonymous_ids`` is neither ``None`` nor
+                ``"document"``; blank nodes are shared by the graphs of a
+                dataset, so they cannot be numbered per bundle.
         """
+        if anonymous_ids not in (None, "document"):
+            raise ValueError(
+                f"anonymous_ids must be None or document; got {anonymous_ids!r}"
+            )
+        id_generator = AnonymousIDGenerator() if anonymous_ids else None
         container = Dataset(default_union=True)
         # Encode the document's own records into a plain Graph first, then
         # merge it into the Dataset's default graph via addN(), rather than
@@ -768,7 +847,9 @@ class ProvRDFSerializer(Serializer):
         # wasn't updated), which trips DeprecationWarning even though we
         # never reference that property ourselves. addN() with an explicit
         # graph avoids it.
-        doc_graph = self.encode_container(document, PROV_N_MAP=PROV_N_MAP)
+        doc_graph = self.encode_container(
+            document, PROV_N_MAP=PROV_N_MAP, id_generator=id_generator
+        )
         for prefix, uri in doc_graph.namespaces():
             container.bind(prefix, uri)
         default_graph = container.graph(DATASET_DEFAULT_GRAPH_ID)
@@ -779,6 +860,7 @@ class ProvRDFSerializer(Serializer):
                 item,
                 identifier=item.identifier.uri,  # type: ignore[union-attr]
                 PROV_N_MAP=PROV_N_MAP,
+                id_generator=id_generator,
             )
             # #96: the context passed here must be a Dataset-owned graph
             # (via container.graph(), mirroring `default_graph` above), not
@@ -822,6 +904,7 @@ class ProvRDFSerializer(Serializer):
         PROV_N_MAP: RecordTypeLabels = PROV_N_MAP,
         container: Graph | None = None,
         identifier: str | None = None,
+        id_generator: AnonymousIDGenerator | None = None,
     ) -> Graph:
         """Encode a single bundle's namespaces and records into an RDF graph.
 
@@ -854,6 +937,9 @@ class ProvRDFSerializer(Serializer):
                 ``Dataset`` in here.
             identifier: Identifier for the new graph, used only when
                 ``container`` is ``None``.
+            id_generator: Numbers the unidentified records, for their
+                qualification nodes to be labelled by their number rather
+                than be fresh blank nodes; if ``None``, they are.
 
         Returns:
             The graph that was passed in as ``container``, or the newly
@@ -879,16 +965,22 @@ class ProvRDFSerializer(Serializer):
         if default_namespace is not None:
             container.bind("", default_namespace.uri)
 
-        id_generator = AnonymousIDGenerator()
+        label_bnodes = id_generator is not None
+        get_anon_id = (id_generator or AnonymousIDGenerator()).get_anon_id
 
         def real_or_anon_id(record: pm.ProvRecord) -> str:
-            return (
-                record._identifier.uri
-                if record._identifier
-                else id_generator.get_anon_id(record)
-            )
+            return record._identifier.uri if record._identifier else get_anon_id(record)
 
         for record in bundle._records:
+            # The labels are the numbers of the records in the bundle, as
+            # PROV-JSON gives them: every unidentified record is numbered as
+            # it comes, in this one pass over the records (those of a stored
+            # bundle are new objects on each pass), even if it mints no node
+            bnode_label = (
+                get_anon_id(record)[2:]  # "_:id<n>" -> "id<n>"
+                if label_bnodes and not record._identifier
+                else None
+            )
             rec_type = record.get_type()
             rec_id: URIRef | None
             if hasattr(record, "identifier") and record.identifier:
@@ -898,10 +990,19 @@ class ProvRDFSerializer(Serializer):
                 rec_id = None
             if not record.attributes:
                 continue
+            formal = RECORD_PLANS[rec_type].formal_values(record)
             if record.is_relation():
-                self._encode_relation(container, record, rec_type, rec_id, PROV_N_MAP)
+                self._encode_relation(
+                    container,
+                    record,
+                    rec_type,
+                    rec_id,
+                    PROV_N_MAP,
+                    formal,
+                    bnode_label,
+                )
             else:
-                self._encode_element(container, record, rec_id, real_or_anon_id)
+                self._encode_element(container, record, rec_id, real_or_anon_id, formal)
         return container
 
     def _encode_element(
@@ -910,6 +1011,7 @@ class ProvRDFSerializer(Serializer):
         record: pm.ProvRecord,
         identifier: URIRef | None,
         real_or_anon_id: Callable[[pm.ProvRecord], str],
+        formal: list[pm.NameValuePair],
     ) -> None:
         """Encode an element's (entity/activity/agent) attributes as direct triples.
 
@@ -919,8 +1021,10 @@ class ProvRDFSerializer(Serializer):
             identifier: The element's subject URIRef.
             real_or_anon_id: Resolves a referenced record to its identifier
                 string, minting a stable anonymous one where needed.
+            formal: The element's formal attributes with their value (see
+                :meth:`~prov.serializers.plans.RecordPlan.formal_values`).
         """
-        all_attributes = list(record.formal_attributes) + list(record.attributes)
+        all_attributes = formal + record.attributes
         for attr, value in all_attributes:
             if value is None:
                 continue
@@ -955,6 +1059,8 @@ class ProvRDFSerializer(Serializer):
         rec_type: pm.QualifiedName,
         identifier: URIRef | None,
         PROV_N_MAP: RecordTypeLabels,
+        formal: list[pm.NameValuePair],
+        bnode_label: str | None = None,
     ) -> None:
         """Encode a relation using PROV-O's qualification pattern.
 
@@ -970,45 +1076,52 @@ class ProvRDFSerializer(Serializer):
             identifier: The relation's own subject URIRef, or ``None`` when it
                 is unidentified (in which case a blank node is minted).
             PROV_N_MAP: Maps record type QualifiedName to PROV-N keyword.
+            formal: The relation's formal attributes with their value (see
+                :meth:`~prov.serializers.plans.RecordPlan.formal_values`).
+            bnode_label: Label of the blank node minted for an unidentified
+                relation; if ``None``, a fresh one.
         """
-        bnode = None
-        formal_objects: list[pm.QualifiedName] = []
+        extra = record.extra_attributes
+        formal_objects = [attr for attr, _ in formal]
         used_objects: list[pm.QualifiedName] = []
-        all_attributes = list(record.formal_attributes) + list(record.attributes)
+        all_attributes = formal + record.attributes
         formal_qualifiers = False
-        for attrid, (_attr, value) in enumerate(list(record.formal_attributes)):
+        for attrid, (_attr, value) in enumerate(formal):
             if (identifier is not None and value is not None) or (
                 identifier is None and value is not None and attrid > 1
             ):
                 formal_qualifiers = True
-        has_qualifiers = len(record.extra_attributes) > 0 or formal_qualifiers
+        has_qualifiers = len(extra) > 0 or formal_qualifiers
 
-        node: RdfSubject | None = identifier
+        # The triples of the qualification head only depend on the record:
+        # they are emitted once, before the attributes hanging off its node
+        node, _, skip = self._encode_relation_head(
+            container,
+            rec_type,
+            identifier,
+            PROV_N_MAP,
+            formal,
+            extra,
+            used_objects,
+            has_qualifiers,
+            bnode_label,
+        )
+        if skip:
+            return
+        predicates = _QUALIFIED_PREDICATES[rec_type]
         for attr, value in all_attributes:
-            # The qualification head is (re)built until a blank node is minted
-            # for it; for an identified relation no blank node is ever minted,
-            # so this re-runs per attribute exactly as it always has -- every
-            # triple it emits is idempotent, so the repetition is harmless.
-            if bnode is None:
-                node, bnode, skip = self._encode_relation_head(
-                    container,
-                    record,
-                    rec_type,
-                    node,
-                    PROV_N_MAP,
-                    formal_objects,
-                    used_objects,
-                    has_qualifiers,
-                )
-                if skip:
-                    continue
             if value is not None and attr not in used_objects:
+                pred: RdfTerm | None = predicates.get(attr)
+                if pred is None:
+                    pred = self._qualified_attr_predicate(
+                        rec_type, attr, formal_objects
+                    )
                 container.add(
                     (
                         # a qualified relation always has a URIRef or
                         # BNode identifier by this point
                         cast(RdfSubject, node),
-                        self._qualified_attr_predicate(rec_type, attr, formal_objects),
+                        pred,
                         self.encode_rdf_representation(value),
                     )
                 )
@@ -1016,28 +1129,30 @@ class ProvRDFSerializer(Serializer):
     def _encode_relation_head(
         self,
         container: Graph,
-        record: pm.ProvRecord,
         rec_type: pm.QualifiedName,
         identifier: RdfSubject | None,
         PROV_N_MAP: RecordTypeLabels,
-        formal_objects: list[pm.QualifiedName],
+        formal: list[pm.NameValuePair],
+        extra: tuple[pm.NameValuePair, ...],
         used_objects: list[pm.QualifiedName],
         has_qualifiers: bool,
+        bnode_label: str | None = None,
     ) -> tuple[RdfSubject | None, BNode | None, bool]:
         """Emit a relation's binary triple and its ``prov:qualified*`` node.
 
         Args:
             container: Graph to add triples to.
-            record: The relation record being encoded.
-            rec_type: ``record``'s record type QualifiedName.
+            rec_type: The relation's record type QualifiedName.
             identifier: The relation's subject URIRef, or ``None``.
             PROV_N_MAP: Maps record type QualifiedName to PROV-N keyword.
-            formal_objects: Accumulator, extended with the record's formal
-                attribute names (used to recognise formal attributes later).
+            formal: The relation's formal attributes with their value.
+            extra: The relation's other attributes.
             used_objects: Accumulator, replaced in place with the formal
                 attributes already consumed by the binary triple.
             has_qualifiers: Whether the relation carries anything beyond the
                 two attributes of its binary triple.
+            bnode_label: Label of the blank node minted for it, if any; if
+                ``None``, a fresh one.
 
         Returns:
             ``(node, bnode, skip)``: the subject to hang remaining attributes
@@ -1045,22 +1160,19 @@ class ProvRDFSerializer(Serializer):
             whether the caller should skip this attribute entirely.
         """
         pred = _prov_uri(PROV_N_MAP[rec_type])
-        valid_formal_indices = set()
-        for idx, (key, val) in enumerate(record.formal_attributes):
-            formal_objects.append(key)
-            if val:
-                valid_formal_indices.add(idx)
-        used_objects[:] = [record.formal_attributes[0][0]]
+        valid_formal_indices = {idx for idx, (_, val) in enumerate(formal) if val}
+        used_objects[:] = [formal[0][0]]
         subj: RdfTerm | None = None
-        if record.formal_attributes[0][1]:
-            subj = URIRef(record.formal_attributes[0][1].uri)
+        if formal[0][1]:
+            subj = URIRef(formal[0][1].uri)
         if identifier is None and subj is not None:
             has_qualifiers = self._encode_relation_binary_triple(
                 container,
-                record,
                 rec_type,
                 pred,
                 subj,
+                formal,
+                extra,
                 valid_formal_indices,
                 used_objects,
                 has_qualifiers,
@@ -1072,7 +1184,7 @@ class ProvRDFSerializer(Serializer):
         if subj and (has_qualifiers or identifier):
             return (
                 *self._encode_qualification_node(
-                    container, record, rec_type, identifier, subj
+                    container, rec_type, identifier, subj, extra, bnode_label
                 ),
                 False,
             )
@@ -1081,10 +1193,11 @@ class ProvRDFSerializer(Serializer):
     def _encode_relation_binary_triple(
         self,
         container: Graph,
-        record: pm.ProvRecord,
         rec_type: pm.QualifiedName,
         pred: URIRef,
         subj: RdfTerm,
+        formal: list[pm.NameValuePair],
+        extra: tuple[pm.NameValuePair, ...],
         valid_formal_indices: set[int],
         used_objects: list[pm.QualifiedName],
         has_qualifiers: bool,
@@ -1093,10 +1206,11 @@ class ProvRDFSerializer(Serializer):
 
         Args:
             container: Graph to add triples to.
-            record: The relation record being encoded.
-            rec_type: ``record``'s record type QualifiedName.
+            rec_type: The relation's record type QualifiedName.
             pred: The relation's PROV-O predicate.
             subj: Subject term for the binary triple.
+            formal: The relation's formal attributes with their value.
+            extra: The relation's other attributes.
             valid_formal_indices: Indices of formal attributes that have a value.
             used_objects: Accumulator, extended with the formal attributes
                 consumed by the emitted triple(s).
@@ -1105,31 +1219,28 @@ class ProvRDFSerializer(Serializer):
         Returns:
             The (possibly updated) ``has_qualifiers`` flag.
         """
-        try:
-            obj_val = record.formal_attributes[1][1]
-        except IndexError:
-            obj_val = None
+        obj_val = formal[1][1] if len(formal) > 1 else None
         if not obj_val:
             return has_qualifiers
         if rec_type in _QUALIFIED_ONLY_RELATIONS and not (
-            valid_formal_indices == {0, 1} and len(record.extra_attributes) == 0
+            valid_formal_indices == {0, 1} and len(extra) == 0
         ):
             return has_qualifiers
         # #250: skip the object append when a qualification node will be
         # minted for this influencer relation and will assert the influencer
         # attribute directly (as a rewrite of the formal attribute).
         if not (rec_type in _BINARY_TRIPLE_INFLUENCER_RELATIONS and has_qualifiers):
-            used_objects.append(record.formal_attributes[1][0])
+            used_objects.append(formal[1][0])
         obj_term: RdfTerm = self.encode_rdf_representation(obj_val)
         container.add((subj, pred, obj_term))
         if rec_type == PROV_MENTION:
-            if record.formal_attributes[2][1]:
-                used_objects.append(record.formal_attributes[2][0])
+            if formal[2][1]:
+                used_objects.append(formal[2][0])
                 container.add(
                     (
                         subj,
                         _prov_uri("asInBundle"),
-                        self.encode_rdf_representation(record.formal_attributes[2][1]),
+                        self.encode_rdf_representation(formal[2][1]),
                     )
                 )
             has_qualifiers = False
@@ -1138,10 +1249,11 @@ class ProvRDFSerializer(Serializer):
     def _encode_qualification_node(
         self,
         container: Graph,
-        record: pm.ProvRecord,
         rec_type: pm.QualifiedName,
         identifier: RdfSubject | None,
         subj: RdfTerm,
+        extra: tuple[pm.NameValuePair, ...],
+        bnode_label: str | None = None,
     ) -> tuple[RdfSubject, BNode | None]:
         """Link (and, when anonymous, create and type) a ``prov:qualified*`` node.
 
@@ -1151,11 +1263,13 @@ class ProvRDFSerializer(Serializer):
 
         Args:
             container: Graph to add triples to.
-            record: The relation record being encoded.
-            rec_type: ``record``'s record type QualifiedName.
+            rec_type: The relation's record type QualifiedName.
             identifier: The relation's subject URIRef, or ``None`` to mint a
                 blank node.
             subj: Subject the qualification node hangs off.
+            extra: The relation's non-formal attributes.
+            bnode_label: Label of the blank node to mint; if ``None``, a
+                fresh one.
 
         Returns:
             ``(node, bnode)``: the qualification node, and the blank node
@@ -1163,7 +1277,7 @@ class ProvRDFSerializer(Serializer):
         """
         qualifier = rec_type._localpart
         rec_uri = rec_type.uri
-        for attr_name, val in record.extra_attributes:
+        for attr_name, val in extra:
             if attr_name == PROV["type"] and val in _DERIVATION_SUBTYPES:
                 qualifier = val._localpart
                 rec_uri = val.uri
@@ -1179,7 +1293,7 @@ class ProvRDFSerializer(Serializer):
         # the main _encode_relation() loop once this node exists (see the
         # `used_objects.remove(...)` in _encode_relation_binary_triple),
         # exactly like every other attribute hanging off the node.
-        bnode = BNode()
+        bnode = BNode(bnode_label)
         container.add((subj, QRole, bnode))
         container.add((bnode, RDF.type, URIRef(rec_uri)))
         return bnode, bnode
@@ -1213,13 +1327,7 @@ class ProvRDFSerializer(Serializer):
             pred = URIRef(attr.uri)
         else:
             pred = self.encode_rdf_representation(attr)
-        for needle, replacement in (
-            *_COMMON_PREDICATE_REWRITES,
-            *_RELATION_PREDICATE_REWRITES.get(rec_type, ()),
-        ):
-            if needle in pred:
-                pred = replacement
-        return pred
+        return _rewrite_qualified_predicate(rec_type, cast(URIRef, pred))
 
     def decode_document(
         self,
@@ -1,8 +1,10 @@
 """PROV-XML serializer for ProvDocument."""
 
 import datetime
+import functools
 import io
 import logging
+import os
 import re
 import warnings
 from typing import Any
@@ -15,10 +17,11 @@ from prov.constants import *
 from prov.model import (
     DEFAULT_NAMESPACES,
     NameValuePair,
+    PathLike,
     canonical_xsd_datatype,
-    sorted_attributes,
 )
 from prov.serializers import Serializer, _is_text_stream
+from prov.serializers.plans import RECORD_PLANS
 
 __author__ = "Lion Krischer"
 __email__ = "krischer@geophysik.uni-muenchen.de"
@@ -36,6 +39,11 @@ FULL_NAMES_MAP.update(ADDITIONAL_N_MAP)
 FULL_PROV_RECORD_IDS_MAP = {
     FULL_NAMES_MAP[rec_type_id]: rec_type_id for rec_type_id in FULL_NAMES_MAP
 }
+# The record subtypes, written as their own element rather than as a
+# prov:type of their base type's
+_SUBTYPES = frozenset(
+    subtype for subtype, base in PROV_BASE_CLS.items() if subtype != base
+)
 # Inverse of FULL_NAMES_MAP: maps each PROV-XML element name back to its
 # record/subtype QualifiedName.
 
@@ -69,6 +77,24 @@ XML_XSD_URI = "http://www.w3.org/2001/XMLSchema"
 _XML_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
 
 
+@functools.cache
+def _prov_xml_schema() -> etree.XMLSchema:
+    # The W3C PROV-XML schema, compiled on first use and then shared by the
+    # whole process. prov.xsd and the schemas it includes and imports are
+    # shipped alongside this module, as files for libxml2 to resolve the
+    # includes and imports against
+    path = os.path.join(os.path.dirname(__file__), "schemas", "prov.xsd")
+    return etree.XMLSchema(etree.parse(path, parser=_XML_PARSER))
+
+
+def _first_validity_error(error_log: etree._ListErrorLog) -> etree._LogEntry | None:
+    # The first violation of the schema in the error log of a parse, if any
+    for entry in error_log:
+        if entry.domain == etree.ErrorDomains.SCHEMASV:
+            return entry
+    return None
+
+
 class ProvXMLException(prov.Error):
     """Raised when a PROV-XML document cannot be serialized or parsed by this package."""
 
@@ -76,6 +102,16 @@ class ProvXMLException(prov.Error):
 class ProvXMLSerializer(Serializer):
     """PROV-XML serializer for :class:`~prov.model.ProvDocument`"""
 
+    def __init__(self, document: prov.model.ProvDocument | None = None):
+        super().__init__(document)
+        # Attribute name, as (namespace URI, local part) -> its element tag,
+        # the local part escaped; kept across writes as the tag of a name
+        # never changes
+        self._tags: dict[tuple[str, str], str] = {}
+        # The part of the namespace map coming from the document, shared by
+        # all its bundles while it is being written
+        self._document_nsmap: dict[str | None, str] | None = None
+
     def serialize(
         self, stream: io.IOBase, force_types: bool = False, **kwargs: Any
     ) -> None:
@@ -102,11 +138,17 @@ class ProvXMLSerializer(Serializer):
         if self.document is None:
             raise ProvXMLException("No document to serialize.")
 
-        xml_root = self.serialize_bundle(bundle=self.document, force_types=force_types)
-        for bundle in self.document.bundles:
-            self.serialize_bundle(
-                bundle=bundle, element=xml_root, force_types=force_types
+        self._document_nsmap = self._build_document_nsmap()
+        try:
+            xml_root = self.serialize_bundle(
+                bundle=self.document, force_types=force_types
             )
+            for bundle in self.document.bundles:
+                self.serialize_bundle(
+                    bundle=bundle, element=xml_root, force_types=force_types
+                )
+        finally:
+            self._document_nsmap = None
         # No encoding must be specified when writing to String object which
         # does not have the concept of an encoding as it should already
         # represent unicode code points.
@@ -150,13 +192,13 @@ class ProvXMLSerializer(Serializer):
 
         if element is not None:
             xml_bundle_root = etree.SubElement(
-                element, _ns_prov("bundleContent"), nsmap=nsmap
+                element, _PROV_BUNDLE_CONTENT_TAG, nsmap=nsmap
             )
         else:
-            xml_bundle_root = etree.Element(_ns_prov("document"), nsmap=nsmap)
+            xml_bundle_root = etree.Element(_PROV_DOCUMENT_TAG, nsmap=nsmap)
 
         if bundle.identifier:
-            xml_bundle_root.attrib[_ns_prov("id")] = str(bundle.identifier)
+            xml_bundle_root.attrib[_PROV_ID_TAG] = str(bundle.identifier)
 
         for record in bundle._records:
             self._encode_record(xml_bundle_root, record, force_types)
@@ -177,24 +219,26 @@ class ProvXMLSerializer(Serializer):
         Returns:
             A prefix-to-URI mapping suitable for lxml's ``nsmap`` argument.
         """
-        nsmap: dict[str, str] = {
+        document_nsmap = self._document_nsmap
+        if document_nsmap is None:
+            document_nsmap = self._build_document_nsmap()
+        nsmap = dict(document_nsmap)
+        for namespace in bundle.namespaces:
+            if namespace not in nsmap:
+                nsmap[namespace.prefix] = namespace.uri
+        nsmap.update(_DEFAULT_NSMAP)
+        return nsmap  # type: ignore[return-value]
+
+    def _build_document_nsmap(self) -> dict[str | None, str]:
+        # The registered namespaces of self.document, then its default
+        # namespace, under the None key
+        nsmap: dict[str | None, str] = {
             ns.prefix: ns.uri
             for ns in self.document._namespaces.get_registered_namespaces()  # type: ignore[union-attr]
         }
         if self.document._namespaces._default:  # type: ignore[union-attr]
             # TODO: Check if the below works as expected.
-            nsmap[None] = self.document._namespaces._default.uri  # type: ignore[union-attr, index]
-        for namespace in bundle.namespaces:
-            if namespace not in nsmap:
-                nsmap[namespace.prefix] = namespace.uri
-
-        for _key, value in DEFAULT_NAMESPACES.items():
-            uri = value.uri
-            if value.prefix == "xsd":
-                # The XSD namespace for some reason has no hash at the end
-                # for PROV XML, but for all other serializations it does.
-                uri = uri.rstrip("#")
-            nsmap[value.prefix] = uri
+            nsmap[None] = self.document._namespaces._default.uri  # type: ignore[union-attr]
         return nsmap
 
     def _encode_record(
@@ -215,19 +259,33 @@ class ProvXMLSerializer(Serializer):
         rec_type = record.get_type()
         identifier = str(record._identifier) if record._identifier else None
 
-        attrs = {_ns_prov("id"): identifier} if identifier else None
+        attrs = {_PROV_ID_TAG: identifier} if identifier else None
 
         # Derive the record label from its attributes which is sometimes
         # needed.
         attributes = record.attributes
-        rec_label = self._derive_record_label(rec_type, attributes)
+        if PROV_TYPE in record._attributes:
+            rec_label = self._derive_record_label(rec_type, attributes)
+        else:
+            rec_label = FULL_NAMES_MAP[rec_type]
 
-        elem = etree.SubElement(xml_bundle_root, _ns_prov(rec_label), attrs)
+        elem = etree.SubElement(xml_bundle_root, _RECORD_TAGS[rec_label], attrs)
 
-        for attr, value in sorted_attributes(rec_type, attributes):
-            _encode_attribute(elem, attr, value, force_types)
+        tags = self._tags
+        for attr, value in RECORD_PLANS[rec_type].sorted_attributes(attributes):
+            key = (attr.namespace.uri, attr.localpart)
+            tag = tags.get(key)
+            if tag is None:
+                tag = tags[key] = _ns(key[0], _escape_ncname_localpart(key[1]))
+            _encode_attribute(elem, tag, attr, value, force_types)
 
-    def deserialize(self, stream: io.IOBase, **kwargs: Any) -> prov.model.ProvDocument:
+    def deserialize(
+        self,
+        stream: io.IOBase,
+        validate: bool = False,
+        streaming: bool = False,
+        **kwargs: Any,
+    ) -> prov.model.ProvDocument:
         """Deserialize a `PROV-XML <http://www.w3.org/TR/prov-xml/>`_
         stream into a :class:`~prov.model.ProvDocument`.
 
@@ -236,20 +294,84 @@ class ProvXMLSerializer(Serializer):
         Args:
             stream: Input data; text streams are UTF-8-encoded before
                 parsing.
+            validate: If ``True``, validate the input against the W3C
+                PROV-XML schema as it is parsed, in the same pass. The
+                schema is compiled once, then shared by the whole process.
+            streaming: If ``True``, decode the records as they are parsed,
+                discarding their XML elements once decoded, rather than
+                building the XML tree of the whole document first.
             **kwargs: Unused; accepted for interface compatibility with
                 :meth:`~prov.serializers.Serializer.deserialize`.
 
         Returns:
             The deserialized :class:`~prov.model.ProvDocument`.
+
+        Raises:
+            ProvXMLException: If ``validate`` is ``True`` and the input is
+                not valid PROV-XML.
         """
         if _is_text_stream(stream):
             with io.BytesIO() as buf:
                 buf.write(stream.read().encode("utf-8"))
                 buf.seek(0, 0)
-                xml_doc: etree._Element = etree.parse(buf, parser=_XML_PARSER).getroot()
-        else:
-            xml_doc = etree.parse(stream, parser=_XML_PARSER).getroot()  # type: ignore[arg-type]
+                return self._deserialize_source(buf, validate, streaming)
+        return self._deserialize_source(stream, validate, streaming)
+
+    def deserialize_file(
+        self,
+        path: PathLike,
+        validate: bool = False,
+        streaming: bool = False,
+        **kwargs: Any,
+    ) -> prov.model.ProvDocument:
+        """Deserialize a PROV-XML file into a :class:`~prov.model.ProvDocument`.
+
+        The path is handed to libxml2, which reads and decodes the file
+        itself (honouring its XML declaration), so no Python-side copy of
+        the content is made.
+
+        Args:
+            path: Path of the PROV-XML file.
+            validate: See :meth:`deserialize`.
+            streaming: See :meth:`deserialize`.
+            **kwargs: Unused; accepted for interface compatibility with
+                :meth:`~prov.serializers.Serializer.deserialize_file`.
+
+        Returns:
+            The deserialized :class:`~prov.model.ProvDocument`.
 
+        Raises:
+            ProvXMLException: If ``validate`` is ``True`` and the file is
+                not valid PROV-XML.
+        """
+        return self._deserialize_source(os.fspath(path), validate, streaming)
+
+    def _deserialize_source(
+        self, source: Any, validate: bool, streaming: bool
+    ) -> prov.model.ProvDocument:
+        """Parse a binary stream or a file path into a new document."""
+        if streaming:
+            return self._deserialize_stream(source, validate)
+        if not validate:
+            xml_doc = etree.parse(source, parser=_XML_PARSER).getroot()
+            return self._deserialize_root(xml_doc)
+        # The hardened parser, validating as it parses; one per parse, for
+        # its error log to be that of the parse
+        parser = etree.XMLParser(
+            resolve_entities=False, no_network=True, schema=_prov_xml_schema()
+        )
+        try:
+            xml_doc = etree.parse(source, parser=parser).getroot()
+        except etree.XMLSyntaxError as e:
+            if entry := _first_validity_error(parser.error_log):
+                raise ProvXMLException(
+                    f"Invalid PROV-XML document: {entry.message}"
+                ) from e
+            raise
+        return self._deserialize_root(xml_doc)
+
+    def _deserialize_root(self, xml_doc: etree._Element) -> prov.model.ProvDocument:
+        """Build a document from a parsed ``<prov:document>`` element."""
         # Remove all comments.
         for c in xml_doc.xpath("//comment()"):  # type: ignore[union-attr]
             p = c.getparent()  # type: ignore[union-attr]
@@ -259,6 +381,63 @@ class ProvXMLSerializer(Serializer):
         self.deserialize_subtree(xml_doc, document)
         return document
 
+    def _deserialize_stream(
+        self, source: Any, validate: bool
+    ) -> prov.model.ProvDocument:
+        """Decode the records of a document as their elements are parsed.
+
+        Only the elements of the record being parsed, and the ancestors of
+        its element, are kept in memory.
+        """
+        document = prov.model.ProvDocument()
+        events = etree.iterparse(
+            source,
+            events=("start", "end"),
+            remove_comments=True,
+            resolve_entities=False,
+            no_network=True,
+            schema=_prov_xml_schema() if validate else None,
+        )
+        bundle: prov.model.ProvDocument | prov.model.ProvBundle = document
+        # The depth of the current element, the root element's being 1
+        depth = 0
+        try:
+            for event, element in events:
+                if event == "start":
+                    depth += 1
+                    if depth == 2 and element.tag == _PROV_BUNDLE_CONTENT_TAG:
+                        # The named bundle its records are then read into
+                        bundle = self._deserialize_element(element, document)  # type: ignore[assignment]
+                    continue
+                depth -= 1
+                if depth == 1 and element.tag == _PROV_BUNDLE_CONTENT_TAG:
+                    bundle = document
+                elif depth == 1 or (depth == 2 and bundle is not document):
+                    # A child of the document or bundle element
+                    self._deserialize_element(element, bundle)
+                else:
+                    continue
+                # Discard the element, and the ones decoded before it
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+        except Exception as e:
+            # The violations of the schema in a chunk of the input are logged
+            # as it is parsed, but only raised once its elements have been
+            # decoded: one failing to decode may well be invalid
+            if validate and (entry := _first_validity_error(events.error_log)):
+                raise ProvXMLException(
+                    f"Invalid PROV-XML document: {entry.message}"
+                ) from e
+            raise
+        if depth or events.root is None:
+            # When validating, lxml may end the events of a malformed document
+            # early instead of raising its syntax error
+            raise etree.XMLSyntaxError(  # type: ignore[call-arg]
+                "Premature end of the document", etree.ErrorTypes.ERR_DOCUMENT_END, 0, 0
+            )
+        return document
+
     def deserialize_subtree(
         self,
         xml_doc: etree._Element,
@@ -289,61 +468,73 @@ class ProvXMLSerializer(Serializer):
         """
 
         for element in xml_doc:
-            qname = etree.QName(element)
-            if qname.namespace != DEFAULT_NAMESPACES["prov"].uri:
-                raise ProvXMLException(
-                    "Non PROV element discovered in document or bundle."
-                )
-            # Ignore the <prov:other> element storing non-PROV information.
-            if qname.localname == "other":
-                warnings.warn(
-                    "Document contains non-PROV information in "
-                    "<prov:other>. It will be ignored in this package.",
-                    UserWarning,
-                    stacklevel=2,
-                )
-                continue
+            named_bundle = self._deserialize_element(element, bundle)
+            if named_bundle is not None:
+                # Recursively read bundles.
+                self.deserialize_subtree(element, named_bundle)
+        return bundle
 
-            id_tag = _ns_prov("id")
-            rec_id = element.attrib.get(id_tag, None)
-            # Try to make a qualified name out of it!
-            prov_rec_id = (
-                xml_qname_to_QualifiedName(element, rec_id)
-                if rec_id is not None
-                else None
-            )
+    def _deserialize_element(
+        self,
+        element: etree._Element,
+        bundle: prov.model.ProvDocument | prov.model.ProvBundle,
+    ) -> prov.model.ProvBundle | None:
+        """Deserialize one child element of a document or bundle element.
 
-            # Recursively read bundles.
-            if qname.localname == "bundleContent":
-                if not isinstance(bundle, prov.model.ProvDocument):
-                    # Only a document may directly contain named bundles;
-                    # nested bundleContent would mean a bundle-within-a-bundle.
-                    raise AssertionError("bundleContent found outside a ProvDocument")
-                if prov_rec_id is None:
-                    raise AssertionError("bundleContent element has no id")
-                b = bundle.bundle(identifier=prov_rec_id)
-                self.deserialize_subtree(element, b)
-                continue
+        Adds the record of a record element to ``bundle``. For a
+        ``<prov:bundleContent>`` element, adds a new named bundle to
+        ``bundle`` and returns it, for the caller to read the content of
+        the element into.
 
-            attributes = _extract_attributes(element)
+        Raises and warns as :meth:`deserialize_subtree`.
+        """
+        qname = etree.QName(element)
+        if qname.namespace != DEFAULT_NAMESPACES["prov"].uri:
+            raise ProvXMLException("Non PROV element discovered in document or bundle.")
+        # Ignore the <prov:other> element storing non-PROV information.
+        if qname.localname == "other":
+            warnings.warn(
+                "Document contains non-PROV information in "
+                "<prov:other>. It will be ignored in this package.",
+                UserWarning,
+                stacklevel=3,
+            )
+            return None
 
-            # Map the record type to its base type.
-            q_prov_name = FULL_PROV_RECORD_IDS_MAP[qname.localname]
-            rec_type = PROV_BASE_CLS[q_prov_name]
+        rec_id = element.attrib.get(_PROV_ID_TAG, None)
+        # Try to make a qualified name out of it!
+        prov_rec_id = (
+            xml_qname_to_QualifiedName(element, rec_id) if rec_id is not None else None
+        )
 
-            if _ns_xsi("type") in element.attrib:
-                value = xml_qname_to_QualifiedName(
-                    element,
-                    element.attrib[_ns_xsi("type")],  # type: ignore[arg-type]
-                )
-                attributes.append((PROV["type"], value))
+        if qname.localname == "bundleContent":
+            if not isinstance(bundle, prov.model.ProvDocument):
+                # Only a document may directly contain named bundles;
+                # nested bundleContent would mean a bundle-within-a-bundle.
+                raise AssertionError("bundleContent found outside a ProvDocument")
+            if prov_rec_id is None:
+                raise AssertionError("bundleContent element has no id")
+            return bundle.bundle(identifier=prov_rec_id)
+
+        attributes = _extract_attributes(element)
+
+        # Map the record type to its base type.
+        q_prov_name = FULL_PROV_RECORD_IDS_MAP[qname.localname]
+        rec_type = PROV_BASE_CLS[q_prov_name]
+
+        if _XSI_TYPE_TAG in element.attrib:
+            value = xml_qname_to_QualifiedName(
+                element,
+                element.attrib[_XSI_TYPE_TAG],  # type: ignore[arg-type]
+            )
+            attributes.append((PROV["type"], value))
 
-            rec = bundle.new_record(rec_type, prov_rec_id, attributes)
+        rec = bundle.new_record(rec_type, prov_rec_id, attributes)
 
-            # Add the actual type in case a base type has been used.
-            if rec_type != q_prov_name:
-                rec.add_asserted_type(q_prov_name)
-        return bundle
+        # Add the actual type in case a base type has been used.
+        if rec_type != q_prov_name:
+            rec.add_asserted_type(q_prov_name)
+        return None
 
     def _derive_record_label(
         self,
@@ -376,7 +567,7 @@ class ProvXMLSerializer(Serializer):
                 value = value.value
             if not isinstance(value, prov.identifier.QualifiedName):
                 continue
-            if value in PROV_BASE_CLS and PROV_BASE_CLS[value] != value:
+            if value in _SUBTYPES:
                 attributes.remove((key, value))
                 rec_label = FULL_NAMES_MAP[value]
                 break
@@ -385,6 +576,7 @@ class ProvXMLSerializer(Serializer):
 
 def _encode_attribute(
     elem: etree._Element,
+    tag: str,
     attr: prov.identifier.QualifiedName,
     value: Any,
     force_types: bool,
@@ -393,27 +585,23 @@ def _encode_attribute(
 
     Args:
         elem: The record element to append the attribute element to.
+        tag: The attribute element's tag, in Clark notation, its local part
+            escaped by :func:`_escape_ncname_localpart`.
         attr: The attribute's name.
         value: The attribute's value.
         force_types: See :meth:`ProvXMLSerializer.serialize`.
     """
-    subelem = etree.SubElement(
-        elem,
-        _ns(
-            attr.namespace.uri,
-            _escape_ncname_localpart(attr.localpart),
-        ),
-    )
+    subelem = etree.SubElement(elem, tag)
     v = _encode_attribute_value(subelem, attr, value)
 
-    has_xsi_type = _ns_xsi("type") in subelem.attrib
+    has_xsi_type = _XSI_TYPE_TAG in subelem.attrib
     if _needs_xsd_type_inference(has_xsi_type, attr, value, v, force_types):
         xsd_type, v = _infer_xsd_type(attr, value, v)
         if xsd_type is not None:
-            subelem.attrib[_ns_xsi("type")] = str(xsd_type)
+            subelem.attrib[_XSI_TYPE_TAG] = str(xsd_type)
 
     if attr in PROV_ATTRIBUTE_QNAMES and v:
-        subelem.attrib[_ns_prov("ref")] = v
+        subelem.attrib[_PROV_REF_TAG] = v
     else:
         subelem.text = v
 
@@ -444,15 +632,15 @@ def _encode_attribute_value(
             value.datatype is not None
             and value.datatype != PROV_INTERNATIONALIZEDSTRING
         ):
-            subelem.attrib[_ns_xsi("type")] = (
+            subelem.attrib[_XSI_TYPE_TAG] = (
                 f"{value.datatype.namespace.prefix}:{value.datatype.localpart}"
             )
         if value.langtag is not None:
-            subelem.attrib[_ns_xml("lang")] = value.langtag
+            subelem.attrib[_XML_LANG_TAG] = value.langtag
         return value.value
     elif isinstance(value, prov.identifier.QualifiedName):
         if attr not in PROV_ATTRIBUTE_QNAMES:
-            subelem.attrib[_ns_xsi("type")] = "xsd:QName"
+            subelem.attrib[_XSI_TYPE_TAG] = "xsd:QName"
         return str(value)
     elif isinstance(value, datetime.datetime):
         return value.isoformat()
@@ -719,6 +907,25 @@ def _ns_xml(tag: str) -> str:
     return _ns(NS_XML, tag)
 
 
+# The tags written for every bundle, record and attribute, in Clark notation
+_PROV_DOCUMENT_TAG = _ns_prov("document")
+_PROV_BUNDLE_CONTENT_TAG = _ns_prov("bundleContent")
+_PROV_ID_TAG = _ns_prov("id")
+_PROV_REF_TAG = _ns_prov("ref")
+_XSI_TYPE_TAG = _ns_xsi("type")
+_XML_LANG_TAG = _ns_xml("lang")
+# PROV-XML element name -> the tag of the record element
+_RECORD_TAGS = {label: _ns_prov(label) for label in FULL_PROV_RECORD_IDS_MAP}
+
+# The namespace map entries added for every bundle, after the document's and
+# the bundle's own: the default namespaces, the XSD namespace for some reason
+# without the hash at the end it has in all other serializations
+_DEFAULT_NSMAP = {
+    ns.prefix: ns.uri.rstrip("#") if ns.prefix == "xsd" else ns.uri
+    for ns in DEFAULT_NAMESPACES.values()
+}
+
+
 # Character classes for the XML 1.0 5th-edition Name productions, minus ':'
 # (NCName), used to detect/escape attribute-name local parts that are not
 # legal NCNames when used as PROV-XML element tags (#289).
@@ -0,0 +1,388 @@
+"""Splitting PROV documents into shards, and merging shards back together.
+
+:func:`shard_document` splits a document into a given number of smaller
+documents, its *shards*, e.g. to process a document too large for one worker
+in several processes or on several nodes: by bundle (:data:`BY_BUNDLE`), by
+hash of the record identifiers (:data:`BY_HASH`) or by connected component
+of the graph of the relations between records (:data:`BY_COMPONENT`). Each
+shard is an ordinary :class:`~prov.model.ProvDocument`, which declares only
+the namespaces its own records use, and :func:`serialize_shards` writes each
+shard out on its own, compactly. :func:`merge_shards` recombines processed
+shards into one document in time linear in the number of their records.
+
+Records are copied into a shard or a merged document sharing their attribute
+storage copy-on-write (see :meth:`~prov.model.ProvRecord.copy`) where their
+names resolve to themselves there, so they are not checked again.
+
+.. moduleauthor:: Trung Dong Huynh <trungdong@donggiang.com>
+"""
+
+from __future__ import annotations  # defer eval: TYPE_CHECKING names in signatures
+
+import heapq
+import zlib
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from typing import Any, cast
+
+from prov.identifier import Namespace, QualifiedName
+from prov.model import ProvBundle, ProvDocument, ProvRecord
+from prov.model.records import TypedValueSet
+
+__author__ = "Trung Dong Huynh"
+__email__ = "trungdong@donggiang.com"
+
+__all__ = [
+    "BY_BUNDLE",
+    "BY_COMPONENT",
+    "BY_HASH",
+    "merge_shards",
+    "serialize_shards",
+    "shard_document",
+]
+
+BY_BUNDLE = "bundle"
+"""Sharding keeping each bundle, and the document's own records, whole."""
+BY_HASH = "hash"
+"""Sharding records by a stable hash of their identifier (of the first name
+an anonymous relation refers to)."""
+BY_COMPONENT = "component"
+"""Sharding keeping the records connected by relations together."""
+
+# A record to put in a shard, with the bundle it is in, or a bundle without
+# records (None) for the shard to have
+_Placement = tuple[int, ProvBundle, ProvRecord | None]
+
+
+def shard_document(
+    document: ProvDocument, count: int, by: str = BY_HASH
+) -> list[ProvDocument]:
+    """Split a document into shards.
+
+    Each record of the document goes into exactly one shard, in the bundle of
+    the same identifier as the one it is in, and keeps its order relative to
+    the other records of its bundle in that shard. How the records are
+    spread depends on ``by``:
+
+    - :data:`BY_BUNDLE`: each bundle goes whole into one shard, and so do the
+      document's own records, the largest first into the shard with the
+      fewest records so far;
+    - :data:`BY_HASH`: each record goes into the shard given by a stable hash
+      (CRC-32) of its identifier's URI, or, for an anonymous relation, of the
+      first name it refers to, e.g. the entity a generation generates, so the
+      shard of a record does not depend on the rest of the document, nor on
+      the process;
+    - :data:`BY_COMPONENT`: the records referring to the same names, directly
+      or through other records, e.g. an entity and all the relations and
+      elements it is linked to, go into the same shard, whichever bundles
+      they are in; the components are spread as bundles are for
+      :data:`BY_BUNDLE`.
+
+    A shard can be left empty, e.g. when there are fewer bundles than
+    shards. Besides, a bundle without records goes into the shard given by
+    the hash of its identifier for :data:`BY_HASH` and :data:`BY_COMPONENT`.
+    The document is left untouched.
+
+    Args:
+        document: The document to split.
+        count: The number of shards.
+        by: How to spread the records, one of :data:`BY_BUNDLE`,
+            :data:`BY_HASH` and :data:`BY_COMPONENT` (default:
+            :data:`BY_HASH`).
+
+    Returns:
+        The ``count`` shards, as new :class:`~prov.model.ProvDocument`\\ s.
+
+    Raises:
+        ValueError: If ``count`` is less than 1 or ``by`` is not a known way
+            of sharding.
+    """
+    if count < 1:
+        raise ValueError(f"Cannot split a document into {count} shards")
+    if by == BY_BUNDLE:
+        placements = _place_by_bundle(document, count)
+    elif by == BY_HASH:
+        placements = _place_by_hash(document, count)
+    elif by == BY_COMPONENT:
+        placements = _place_by_component(document, count)
+    else:
+        raise ValueError(
+            f"Unknown sharding {by!r}; expected one of "
+            f"{BY_BUNDLE!r}, {BY_HASH!r} or {BY_COMPONENT!r}"
+        )
+    return _fill_shards(count, placements)
+
+
+def serialize_shards(
+    shards: Iterable[ProvDocument], format: str = "json", **args: Any
+) -> list[str]:
+    """Serialize each shard on its own.
+
+    The shards are serialized as by :meth:`~prov.model.ProvDocument.serialize`,
+    and, in PROV-JSON with the default codec, without any whitespace between
+    tokens unless ``indent`` or ``separators`` is given.
+
+    Args:
+        shards: The shards to serialize, e.g. as returned by
+            :func:`shard_document`.
+        format: The serialization format (default: ``"json"``).
+        **args: Extra keyword arguments passed to the serializer.
+
+    Returns:
+        The serialization of each shard, in order.
+    """
+    if format == "json" and not {"codec", "indent", "separators"} & set(args):
+        args["separators"] = (",", ":")
+    # with no destination, serialize() returns the serialization
+    return [cast(str, shard.serialize(format=format, **args)) for shard in shards]
+
+
+def merge_shards(shards: Iterable[ProvDocument]) -> ProvDocument:
+    """Recombine shards into one document.
+
+    The records of each shard are added to the document, and those of each
+    of its bundles to the document's bundle of the same identifier, in
+    order. The namespaces declared by each shard and bundle are registered
+    in turn, under the rules of :meth:`~prov.model.NamespaceManager.add_namespace`:
+    a namespace whose prefix is taken by another namespace already is given
+    a new prefix, e.g. ``ex_1``, and the names in it are renamed. Unlike
+    :meth:`~prov.model.ProvDocument.update`, which resolves and checks every
+    attribute of every record again, each namespace is reconciled once per
+    bundle, and a record is either shared copy-on-write or, when some of its
+    names are renamed, copied with its other values as they are, so merging
+    takes time linear in the number of records. The shards are left
+    untouched.
+
+    Args:
+        shards: The shards to merge, e.g. as returned by
+            :func:`shard_document`, or read back after processing.
+
+    Returns:
+        The merged :class:`~prov.model.ProvDocument`.
+    """
+    document = ProvDocument()
+    for shard in shards:
+        _merge_records(document, shard)
+        for bundle in shard.bundles:
+            # bundles are always named
+            bundle_id = document.mandatory_valid_qname(bundle.identifier)  # type: ignore[arg-type]
+            target = document._bundles.get(bundle_id)
+            if target is None:
+                target = document.bundle(bundle_id)
+            _merge_records(target, bundle)
+    return document
+
+
+def _fill_shards(count: int, placements: Iterable[_Placement]) -> list[ProvDocument]:
+    # Create the shards and add the records to them, creating their bundles
+    # as they are first needed
+    shards = [ProvDocument() for _ in range(count)]
+    targets: dict[tuple[int, QualifiedName | None], ProvBundle] = {}
+    for index, bundle, record in placements:
+        key = (index, bundle.identifier)
+        target = targets.get(key)
+        if target is None:
+            shard = shards[index]
+            target = targets[key] = (
+                shard if bundle.identifier is None else shard.bundle(bundle.identifier)
+            )
+        if record is not None:
+            target.add_record(record)
+    return shards
+
+
+def _containers(document: ProvDocument) -> list[ProvBundle]:
+    # The document, for its own records, then its bundles
+    return [document, *document.bundles]
+
+
+def _stable_hash(uri: str) -> int:
+    return zlib.crc32(uri.encode("utf-8"))
+
+
+def _spread(sizes: list[int], count: int) -> list[int]:
+    # The shard of each unit of the given sizes: the largest units first,
+    # each into the shard with the fewest records so far (the first of
+    # those, on a tie)
+    loads = [(0, index) for index in range(count)]
+    shard_of = [0] * len(sizes)
+    for unit in sorted(range(len(sizes)), key=lambda unit: -sizes[unit]):
+        load, index = heapq.heappop(loads)
+        shard_of[unit] = index
+        heapq.heappush(loads, (load + sizes[unit], index))
+    return shard_of
+
+
+def _place_by_bundle(document: ProvDocument, count: int) -> Iterator[_Placement]:
+    containers = _containers(document)
+    shard_of = _spread([len(container._records) for container in containers], count)
+    for container, index in zip(containers, shard_of, strict=True):
+        yield index, container, None
+        for record in container._records:
+            yield index, container, record
+
+
+def _first_name(record: ProvRecord) -> QualifiedName | None:
+    # The record's identifier or, for an anonymous relation, the first name
+    # it refers to
+    if record.identifier is not None:
+        return record.identifier
+    for _, value in record.formal_attributes:
+        if isinstance(value, QualifiedName):
+            return value
+    return None
+
+
+def _place_by_hash(document: ProvDocument, count: int) -> Iterator[_Placement]:
+    for container in _containers(document):
+        if container.identifier is not None and not len(container._records):
+            yield _stable_hash(container.identifier.uri) % count, container, None
+        for record in container._records:
+            name = _first_name(record)
+            key = name.uri if name is not None else record.digest()
+            yield _stable_hash(key) % count, container, record
+
+
+def _find(parent: dict[str, str], uri: str) -> str:
+    # The representative of the component of `uri`, halving the path to it
+    while (up := parent[uri]) != uri:
+        grandparent = parent[up]
+        parent[uri] = grandparent
+        uri = grandparent
+    return uri
+
+
+def _place_by_component(document: ProvDocument, count: int) -> Iterator[_Placement]:
+    # Union-find, by size, over the URIs of the names the records refer to in
+    # their identifier and formal attributes; a record referring to none is a
+    # component of its own
+    parent: dict[str, str] = {}
+    name_counts: dict[str, int] = {}
+    entries: list[tuple[ProvBundle, ProvRecord, str | None]] = []
+    for container in _containers(document):
+        for record in container._records:
+            uris = [
+                value.uri
+                for value in (record.identifier, *record.args)
+                if isinstance(value, QualifiedName)
+            ]
+            for uri in uris:
+                if uri not in parent:
+                    parent[uri] = uri
+                    name_counts[uri] = 1
+            if uris:
+                root = _find(parent, uris[0])
+                for uri in uris[1:]:
+                    other = _find(parent, uri)
+                    if other != root:
+                        if name_counts[root] < name_counts[other]:
+                            root, other = other, root
+                        parent[other] = root
+                        name_counts[root] += name_counts[other]
+            entries.append((container, record, uris[0] if uris else None))
+
+    units: dict[Any, int] = {}
+    unit_of_entries: list[int] = []
+    sizes: list[int] = []
+    for position, (_, _, first_uri) in enumerate(entries):
+        key = _find(parent, first_uri) if first_uri is not None else position
+        unit = units.setdefault(key, len(units))
+        if unit == len(sizes):
+            sizes.append(0)
+        sizes[unit] += 1
+        unit_of_entries.append(unit)
+    shard_of = _spread(sizes, count)
+
+    for container in document.bundles:
+        if not len(container._records):
+            yield _stable_hash(container.identifier.uri) % count, container, None  # type: ignore[union-attr]
+    for (container, record, _), unit in zip(entries, unit_of_entries, strict=True):
+        yield shard_of[unit], container, record
+
+
+def _merge_records(target: ProvBundle, source: ProvBundle) -> None:
+    # Add the records of `source` to `target`, registering the namespaces
+    # `source` declares first
+    for namespace in source.get_registered_namespaces():
+        target.add_namespace(namespace)
+    default_namespace = source.get_default_namespace()
+    if default_namespace is not None and target.get_default_namespace() is None:
+        target.set_default_namespace(default_namespace.uri)
+    renamer = _Renamer(target)
+    for record in source._records:
+        if renamer.keeps_names(record):
+            target._add_record(record._share_to(target))
+        else:
+            target._add_record(renamer.renamed_copy(record))
+
+
+class _Renamer:
+    """How the names of the records of a bundle read in another bundle.
+
+    The namespace of a name is resolved in the other bundle the first time a
+    name in it is met, registering it there under a new prefix if its own is
+    taken (see :meth:`~prov.model.NamespaceManager.add_namespace`), and the
+    other names in it are renamed alike.
+    """
+
+    def __init__(self, bundle: ProvBundle):
+        self._bundle = bundle
+        self._namespaces: dict[Namespace, Namespace] = {}
+
+    def _namespace(self, name: QualifiedName) -> Namespace:
+        namespace = self._namespaces.get(name.namespace)
+        if namespace is None:
+            namespace = self._namespaces[name.namespace] = (
+                self._bundle.mandatory_valid_qname(name).namespace
+            )
+        return namespace
+
+    def _rename(self, name: QualifiedName) -> QualifiedName:
+        return self._namespace(name)[name.localpart]
+
+    def keeps_names(self, record: ProvRecord) -> bool:
+        """Whether the names of a record stay as they are in the bundle."""
+        identifier = record.identifier
+        if (
+            identifier is not None
+            and self._namespace(identifier) != identifier.namespace
+        ):
+            return False
+        for attr_name, values in record._attributes.items():
+            if self._namespace(attr_name) != attr_name.namespace:
+                return False
+            for value in values:
+                if (
+                    isinstance(value, QualifiedName)
+                    and self._namespace(value) != value.namespace
+                ):
+                    return False
+        return True
+
+    def renamed_copy(self, record: ProvRecord) -> ProvRecord:
+        """Return a copy of a record owned by the bundle, its names renamed.
+
+        Its other values are copied as they are, and so is its digest, which
+        only depends on URIs.
+        """
+        rename = self._rename
+        copy = record.__class__.__new__(record.__class__)
+        copy._bundle = self._bundle
+        copy._identifier = (
+            rename(record.identifier) if record.identifier is not None else None
+        )
+        copy._attributes = defaultdict(
+            TypedValueSet,
+            (
+                (
+                    rename(attr_name),
+                    TypedValueSet(
+                        rename(value) if isinstance(value, QualifiedName) else value
+                        for value in values
+                    ),
+                )
+                for attr_name, values in record._attributes.items()
+            ),
+        )
+        copy._digest = record._digest
+        return copy
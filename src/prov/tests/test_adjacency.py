@@ -0,0 +1,126 @@
+"""The compact adjacency-list graph of prov.adjacency."""
+
+import pytest
+
+from prov.adjacency import AdjacencyGraph
+from prov.constants import (
+    PROV_ACTIVITY,
+    PROV_DERIVATION,
+    PROV_ENTITY,
+    PROV_GENERATION,
+    PROV_USAGE,
+)
+from prov.model import ProvDocument
+from prov.tests import examples
+
+
+def _pipeline():
+    # raw -> (clean) -> tidy -> (report) -> summary, plus a side input
+    document = ProvDocument()
+    ex = document.add_namespace("ex", "http://example.org/")
+    document.entity("ex:raw")
+    document.entity("ex:tidy")
+    document.entity("ex:summary")
+    document.activity("ex:clean")
+    document.activity("ex:report")
+    document.used("ex:clean", "ex:raw")
+    document.wasGeneratedBy("ex:tidy", "ex:clean")
+    document.used("ex:report", "ex:tidy")
+    document.used("ex:report", "ex:lookup")
+    document.wasGeneratedBy("ex:summary", "ex:report")
+    document.wasDerivedFrom("ex:summary", "ex:tidy")
+    document.wasDerivedFrom("ex:tidy", "ex:raw")
+    return document, ex
+
+
+def test_nodes_are_mapped_to_qualified_names():
+    document, ex = _pipeline()
+    graph = AdjacencyGraph(document)
+    assert len(graph) == 6
+    assert graph.number_of_edges() == 7
+    assert graph.names[graph.node_id(ex["raw"])] == ex["raw"]
+    assert ex["lookup"] in graph
+    assert graph.node_type(ex["clean"]) == PROV_ACTIVITY
+    assert graph.node_type(ex["raw"]) == PROV_ENTITY
+    assert graph.node_type(ex["lookup"]) is None
+    assert set(graph.relation_types) == {PROV_USAGE, PROV_GENERATION, PROV_DERIVATION}
+    with pytest.raises(KeyError):
+        graph.node_id(ex["unknown"])
+
+
+def test_neighbours():
+    document, ex = _pipeline()
+    graph = AdjacencyGraph(document)
+    assert set(graph.successors(ex["report"])) == {ex["lookup"], ex["tidy"]}
+    assert set(graph.predecessors(ex["tidy"])) == {ex["report"], ex["summary"]}
+    assert list(graph.predecessors(ex["tidy"], [PROV_DERIVATION])) == [ex["summary"]]
+
+
+def test_ancestors_and_descendants():
+    document, ex = _pipeline()
+    graph = AdjacencyGraph(document)
+    assert set(graph.ancestors(ex["summary"])) == {
+        ex["report"],
+        ex["tidy"],
+        ex["lookup"],
+        ex["clean"],
+        ex["raw"],
+    }
+    assert list(graph.ancestors(ex["summary"], relation_types=[PROV_DERIVATION])) == [
+        ex["tidy"],
+        ex["raw"],
+    ]
+    assert set(graph.ancestors(ex["summary"], max_depth=1)) == {
+        ex["report"],
+        ex["tidy"],
+    }
+    assert set(graph.descendants(ex["lookup"])) == {ex["report"], ex["summary"]}
+    assert list(graph.descendants(ex["summary"])) == []
+
+
+def test_ancestors_are_yielded_nearest_first_and_once():
+    document, ex = _pipeline()
+    graph = AdjacencyGraph(document)
+    ancestors = list(graph.ancestors(ex["summary"]))
+    assert len(ancestors) == len(set(ancestors))
+    assert set(ancestors[:2]) == {ex["report"], ex["tidy"]}
+    assert ancestors[-1] == ex["raw"]
+
+
+def test_shortest_path():
+    document, ex = _pipeline()
+    graph = AdjacencyGraph(document)
+    assert graph.shortest_path(ex["summary"], ex["raw"]) == [
+        ex["summary"],
+        ex["tidy"],
+        ex["raw"],
+    ]
+    assert graph.shortest_path(
+        ex["summary"], ex["raw"], relation_types=[PROV_GENERATION, PROV_USAGE]
+    ) == [ex["summary"], ex["report"], ex["tidy"], ex["clean"], ex["raw"]]
+    assert graph.shortest_path(ex["raw"], ex["summary"]) is None
+    assert graph.shortest_path(ex["raw"], ex["raw"]) == [ex["raw"]]
+
+
+def test_bundles_can_be_left_out():
+    document = examples.bundles2()
+    top_level = AdjacencyGraph(document, include_bundles=False)
+    in_bundles = [AdjacencyGraph(bundle) for bundle in document.bundles]
+    assert any(graph.number_of_edges() > 0 for graph in in_bundles)
+    assert AdjacencyGraph(
+        document
+    ).number_of_edges() == top_level.number_of_edges() + sum(
+        graph.number_of_edges() for graph in in_bundles
+    )
+
+
+def test_to_networkx():
+    pytest.importorskip("networkx")
+    document, ex = _pipeline()
+    graph = AdjacencyGraph(document)
+    g = graph.to_networkx()
+    assert g.number_of_nodes() == 6
+    assert g.number_of_edges() == 7
+    assert g.nodes[ex["clean"]]["prov_type"] == PROV_ACTIVITY
+    (relation,) = [data["relation"] for data in g[ex["tidy"]][ex["raw"]].values()]
+    assert relation.get_type() == PROV_DERIVATION
@@ -0,0 +1,172 @@
+"""Asynchronous reading and writing (prov.aread, ProvDocument.aserialize)."""
+
+import asyncio
+import concurrent.futures
+import io
+
+import pytest
+
+import prov
+from prov import aio
+from prov.aio import CHUNK_SIZE
+from prov.model import ProvDocument
+from prov.model.store import SQLiteRecordStore
+from prov.tests.examples import long_literals, primer_example
+
+
+class AsyncReader:
+    """A minimal asynchronous source over in-memory data."""
+
+    def __init__(self, data):
+        self._stream = (
+            io.BytesIO(data) if isinstance(data, bytes) else io.StringIO(data)
+        )
+        self.reads = 0
+
+    async def read(self, size=-1):
+        self.reads += 1
+        await asyncio.sleep(0)
+        return self._stream.read(size)
+
+
+class AsyncWriter:
+    """A minimal asynchronous text destination, as given by aiofiles."""
+
+    encoding = "utf-8"
+
+    def __init__(self):
+        self.chunks = []
+
+    async def write(self, data):
+        await asyncio.sleep(0)
+        self.chunks.append(data)
+
+
+class FailingWriter(AsyncWriter):
+    """An asynchronous destination failing on its first write."""
+
+    async def write(self, data):
+        raise OSError("No space left on device")
+
+
+class StreamWriterLike:
+    """The write()/drain() pair of asyncio.StreamWriter, which takes bytes."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.drains = 0
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        self.drains += 1
+
+
+@pytest.mark.parametrize("format", ["json", "xml", "rdf", "jsonld"])
+def test_aread_from_an_async_stream(format):
+    document = primer_example()
+    data = document.serialize(format=format).encode("utf-8")
+    reader = AsyncReader(data)
+    assert asyncio.run(prov.aread(reader, format=format)) == document
+    assert reader.reads >= 2
+
+
+@pytest.mark.parametrize("format", ["xml", "jsonld"])
+def test_aread_streams_to_streaming_deserializers(format, monkeypatch):
+    document = primer_example()
+    for i in range(2000):
+        document.entity(f"ex:extra{i}", {"ex:label": "x" * 20})
+    data = document.serialize(format=format)
+
+    async def read_all(source):
+        raise AssertionError("The source was read to the end before parsing")
+
+    monkeypatch.setattr(aio, "_read_all", read_all)
+    reader = AsyncReader(data)
+    assert asyncio.run(prov.aread(reader, format=format)) == document
+    assert reader.reads > len(data) // CHUNK_SIZE
+
+
+def test_aread_detects_the_format_and_reads_paths(tmp_path):
+    document = primer_example()
+    path = tmp_path / "doc.json"
+    document.serialize(str(path))
+    assert asyncio.run(prov.aread(AsyncReader(path.read_text()))) == document
+    assert asyncio.run(prov.aread(str(path), format="json")) == document
+
+
+def test_aread_in_a_process_pool(tmp_path):
+    document = primer_example()
+    path = tmp_path / "doc.json"
+    document.serialize(str(path))
+
+    async def main():
+        with concurrent.futures.ProcessPoolExecutor(1) as executor:
+            return await prov.aread(str(path), format="json", executor=executor)
+
+    assert asyncio.run(main()) == document
+
+
+@pytest.mark.parametrize("format", ["json", "provn", "xml", "jsonld"])
+def test_aserialize_to_an_async_stream(format):
+    document = long_literals()
+    writer = AsyncWriter()
+    asyncio.run(document.aserialize(writer, format=format))
+    assert "".join(writer.chunks) == document.serialize(format=format)
+
+
+def test_aserialize_writes_in_chunks():
+    document = primer_example()
+    for i in range(2000):
+        document.entity(f"ex:extra{i}", {"ex:label": "x" * 20})
+    writer = StreamWriterLike()
+    asyncio.run(document.aserialize(writer, format="provn"))
+    assert writer.data.decode("utf-8") == document.serialize(format="provn")
+    assert writer.drains == -(-len(writer.data) // CHUNK_SIZE)
+
+
+def test_aserialize_to_a_string_or_a_path(tmp_path):
+    document = primer_example()
+    assert asyncio.run(document.aserialize(format="provn")) == document.serialize(
+        format="provn"
+    )
+    path = tmp_path / "doc.json"
+    asyncio.run(document.aserialize(str(path)))
+    assert prov.read(str(path), format="json") == document
+
+
+@pytest.mark.parametrize("format", ["json", "provn"])
+def test_aserialize_a_document_in_a_database(format):
+    document = ProvDocument(store=SQLiteRecordStore(batch_size=10))
+    document.update(primer_example())
+    expected = document.serialize(format=format)
+    writer = AsyncWriter()
+    asyncio.run(document.aserialize(writer, format=format))
+    assert "".join(writer.chunks) == expected
+    assert asyncio.run(document.aserialize(format=format)) == expected
+
+
+def test_aserialize_errors_are_raised():
+    document = primer_example()
+    with pytest.raises(TypeError):
+        asyncio.run(document.aserialize(AsyncWriter(), format="json", no_such=1))
+
+
+def test_aserialize_stops_encoding_when_the_destination_fails(monkeypatch):
+    document = primer_example()
+    for i in range(4000):
+        document.entity(f"ex:extra{i}", {"ex:label": "x" * 1000})
+    chunks = []
+    put = aio._ChunkWriter._put
+
+    def counting_put(self, chunk):
+        put(self, chunk)
+        chunks.append(chunk)
+
+    monkeypatch.setattr(aio._ChunkWriter, "_put", counting_put)
+    with pytest.raises(OSError, match="No space left"):
+        asyncio.run(document.aserialize(FailingWriter(), format="provn"))
+    # The chunks queued before the failure was noticed, not the whole output
+    total = len(document.serialize(format="provn")) // CHUNK_SIZE
+    assert len(chunks) < total
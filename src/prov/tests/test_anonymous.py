@@ -0,0 +1,143 @@
+"""Anonymous identifier tests: numbering the unidentified records.
+
+The identifiers are given by position, not by content, and a document gets
+the same ones in PROV-JSON and PROV-O when both number the records through
+the document.
+"""
+
+import json
+
+import pytest
+
+from prov.model import ProvDocument
+from prov.model.store import SQLiteRecordStore
+from prov.serializers.anonymous import AnonymousIDGenerator
+from prov.tests.examples import tests as EXAMPLES
+
+
+def _document():
+    doc = ProvDocument()
+    doc.add_namespace("ex", "http://example.org/")
+    doc.wasGeneratedBy("ex:e", "ex:a", "2011-11-16T16:05:00")
+    doc.used("ex:a", "ex:e", other_attributes={"ex:n": "n1"})
+    doc.entity("ex:e")
+    bundle = doc.bundle("ex:b")
+    bundle.wasDerivedFrom("ex:e2", "ex:e", other_attributes={"ex:n": "n2"})
+    bundle.used("ex:a2", "ex:e2", other_attributes={"ex:n": "n3"})
+    return doc
+
+
+def test_records_are_numbered_by_position():
+    doc = _document()
+    generator = AnonymousIDGenerator()
+    generation, usage, _ = doc.get_records()
+    assert generator.get_anon_id(usage) == "_:id1"
+    assert generator.get_anon_id(generation) == "_:id2"
+    assert generator.get_anon_id(usage) == "_:id1"
+    assert (
+        generator.get_anon_id(next(iter(doc.bundles)).get_records()[0], "r") == "_:r3"
+    )
+
+
+def test_number_skips_identified_records():
+    doc = _document()
+    generator = AnonymousIDGenerator()
+    generator.number(doc.get_records())
+    generation, usage, entity = doc.get_records()
+    assert generator.get_anon_id(usage) == "_:id2"
+    assert generator.get_anon_id(generation) == "_:id1"
+    assert generator.get_anon_id(entity) == "_:id3"
+
+
+def test_equal_records_get_distinct_identifiers():
+    doc = ProvDocument()
+    doc.add_namespace("ex", "http://example.org/")
+    first = doc.used("ex:a", "ex:e")
+    second = doc.used("ex:a", "ex:e")
+    assert first == second
+    generator = AnonymousIDGenerator()
+    assert generator.get_anon_id(first) != generator.get_anon_id(second)
+    content = json.loads(doc.serialize(format="json"))
+    assert list(content["used"]) == ["_:id1", "_:id2"]
+    assert ProvDocument.deserialize(content=json.dumps(content), format="json") == doc
+
+
+def test_json_numbering_scopes():
+    doc = _document()
+    by_bundle = json.loads(doc.serialize(format="json"))
+    by_document = json.loads(doc.serialize(format="json", anonymous_ids="document"))
+    assert list(by_bundle["used"]) == list(by_document["used"]) == ["_:id2"]
+    bundle = by_bundle["bundle"]["ex:b"]
+    assert list(bundle["wasDerivedFrom"]) == ["_:id1"]
+    assert list(bundle["used"]) == ["_:id2"]
+    bundle = by_document["bundle"]["ex:b"]
+    assert list(bundle["wasDerivedFrom"]) == ["_:id3"]
+    assert list(bundle["used"]) == ["_:id4"]
+    for content in (by_bundle, by_document):
+        assert (
+            ProvDocument.deserialize(content=json.dumps(content), format="json") == doc
+        )
+    with pytest.raises(ValueError, match="anonymous_ids"):
+        doc.serialize(format="json", anonymous_ids="record")
+
+
+def _json_and_rdf_ids(doc):
+    # The blank-node identifiers of doc in PROV-JSON and PROV-O, numbered
+    # through the document, each with the ex:n of its record
+    from rdflib import BNode, URIRef
+
+    from prov.serializers.provrdf import ProvRDFSerializer
+
+    content = json.loads(doc.serialize(format="json", anonymous_ids="document"))
+    json_ids = {}
+    for container in (content, content["bundle"]["ex:b"]):
+        for rec_type, records in container.items():
+            if rec_type not in ("prefix", "bundle"):
+                json_ids.update(
+                    (key, record.get("ex:n"))
+                    for key, record in records.items()
+                    if key.startswith("_:")
+                )
+
+    dataset = ProvRDFSerializer().encode_document(doc, anonymous_ids="document")
+    rdf_ids = {f"_:{s}": None for s, _, _, _ in dataset.quads() if isinstance(s, BNode)}
+    rdf_ids.update(
+        (f"_:{s}", o.toPython())
+        for s, _, o, _ in dataset.quads((None, URIRef("http://example.org/n"), None))
+    )
+    return json_ids, rdf_ids
+
+
+def test_json_and_rdf_share_the_identifiers():
+    pytest.importorskip("rdflib")
+    json_ids, rdf_ids = _json_and_rdf_ids(_document())
+    assert json_ids == {"_:id1": None, "_:id2": "n1", "_:id3": "n2", "_:id4": "n3"}
+    assert rdf_ids == json_ids
+
+
+def test_json_and_rdf_share_the_identifiers_of_a_stored_document():
+    # Records read from an SQLite store are new objects on each pass
+    pytest.importorskip("rdflib")
+    doc = ProvDocument(store=SQLiteRecordStore())
+    doc.update(_document())
+    json_ids, rdf_ids = _json_and_rdf_ids(doc)
+    assert json_ids == {"_:id1": None, "_:id2": "n1", "_:id3": "n2", "_:id4": "n3"}
+    assert rdf_ids == json_ids
+
+
+@pytest.mark.parametrize("name, make_doc", EXAMPLES)
+def test_rdf_document_numbering_round_trips(name, make_doc):
+    pytest.importorskip("rdflib")
+    doc = make_doc()
+    content = doc.serialize(format="rdf", anonymous_ids="document")
+    assert content == doc.serialize(format="rdf", anonymous_ids="document")
+    reference = ProvDocument.deserialize(
+        content=doc.serialize(format="rdf"), format="rdf"
+    )
+    assert ProvDocument.deserialize(content=content, format="rdf") == reference
+
+
+def test_rdf_cannot_number_by_bundle():
+    pytest.importorskip("rdflib")
+    with pytest.raises(ValueError, match="anonymous_ids"):
+        _document().serialize(format="rdf", anonymous_ids="bundle")
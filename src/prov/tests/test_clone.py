@@ -0,0 +1,165 @@
+"""Cloning: copies of records, bundles and documents sharing their storage."""
+
+import pytest
+
+from prov.constants import PROV_QUALIFIEDNAME
+from prov.identifier import Namespace
+from prov.model import Literal, ProvBundle, ProvDocument
+from prov.model.store import SQLiteRecordStore
+from prov.tests.examples import tests as EXAMPLES
+
+EX = Namespace("ex", "http://example.org/")
+
+
+def _document(store=None):
+    document = ProvDocument(store=store)
+    document.add_namespace(EX)
+    document.entity("ex:e1", {"prov:label": "e1"})
+    document.activity("ex:a1")
+    document.wasGeneratedBy("ex:e1", "ex:a1")
+    bundle = document.bundle("ex:b")
+    bundle.entity("ex:e2")
+    bundle.wasDerivedFrom("ex:e2", "ex:e1")
+    return document
+
+
+def _shares_attributes(first, second):
+    return all(
+        a._attributes is b._attributes
+        for a, b in zip(first.get_records(), second.get_records(), strict=True)
+    )
+
+
+@pytest.mark.parametrize("name, make_doc", EXAMPLES)
+def test_clone_has_the_content_of_the_document(name, make_doc):
+    document = make_doc()
+    clone = document.clone()
+    assert type(clone) is ProvDocument
+    assert clone == document
+    assert clone.digest() == document.digest()
+    assert clone.serialize(format="provn") == document.serialize(format="provn")
+    assert _shares_attributes(clone, document)
+    for bundle in document.bundles:
+        assert _shares_attributes(clone._bundles[bundle.identifier], bundle)
+
+
+def test_clone_and_document_change_independently():
+    document = _document()
+    clone = document.clone()
+    version = document.version
+
+    clone.get_record("ex:e1")[0].add_attributes({"ex:n": 1})
+    clone.entity("ex:e3")
+    clone.add_namespace("other", "http://example.com/")
+    clone_bundle = next(iter(clone.bundles))
+    clone_bundle.get_record("ex:e2")[0].add_attributes({"ex:n": 2})
+    clone_bundle.entity("ex:e4")
+    clone.bundle("ex:b2")
+    assert document == _document()
+    assert document.version == version
+    assert "other" not in document._namespaces
+
+    document.get_record("ex:a1")[0].add_attributes({"ex:n": 3})
+    assert clone.get_record("ex:a1")[0].get_attribute("ex:n") == set()
+    assert clone.get_record("ex:e1")[0].get_attribute("ex:n") == {1}
+    assert clone_bundle.document is clone
+    assert not clone.frozen
+
+
+def test_clone_of_a_snapshot_can_be_changed():
+    snapshot = _document().freeze()
+    clone = snapshot.clone()
+    assert type(clone) is ProvDocument
+    assert not any(bundle.frozen for bundle in clone.bundles)
+    assert clone == snapshot
+    clone.get_record("ex:e1")[0].add_attributes({"ex:n": 1})
+    clone.entity("ex:e3")
+    assert snapshot == _document()
+
+
+def test_clone_in_a_database():
+    clone = _document().clone(store=SQLiteRecordStore())
+    assert isinstance(clone._records, SQLiteRecordStore)
+    assert all(
+        isinstance(bundle._records, SQLiteRecordStore) for bundle in clone.bundles
+    )
+    assert clone == _document()
+    assert _document(SQLiteRecordStore()).clone() == _document()
+
+
+def test_bundle_clone_belongs_to_no_document():
+    document = _document()
+    bundle = next(iter(document.bundles))
+    clone = bundle.clone()
+    assert type(clone) is ProvBundle
+    assert clone.document is None
+    assert clone.identifier == bundle.identifier
+    assert clone == bundle
+    assert _shares_attributes(clone, bundle)
+    # names resolve against the document's namespaces still
+    assert clone.valid_qualified_name("ex:e5") == EX["e5"]
+
+    other = ProvDocument()
+    other.add_bundle(clone)
+    assert clone.document is other
+    clone.entity("ex:e5")
+    assert bundle == next(iter(_document().bundles))
+
+
+def test_record_copy_is_copy_on_write():
+    document = _document()
+    entity = document.get_record("ex:e1")[0]
+    copy = entity.copy()
+    assert copy == entity
+    assert copy is not entity
+    assert copy.bundle is document
+    assert copy._attributes is entity._attributes
+    copy.add_attributes({"ex:n": 1})
+    assert copy._attributes is not entity._attributes
+    assert entity.get_attribute("ex:n") == set()
+    entity.add_attributes({"ex:n": 2})
+    assert copy.get_attribute("ex:n") == {1}
+
+    # the records of a snapshot can be copied too
+    snapshot_entity = _document().freeze().get_record("ex:e1")[0]
+    assert snapshot_entity.copy() == snapshot_entity
+
+
+def test_add_record_shares_records_resolving_to_themselves():
+    document = _document()
+    flattened = document.flattened()
+    bundle = next(iter(document.bundles))
+    assert _shares_attributes(
+        flattened, ProvDocument([*document.get_records(), *bundle.get_records()])
+    )
+    target = ProvDocument()
+    target.add_namespace(EX)
+    entity = document.get_record("ex:e1")[0]
+    added = target.add_record(entity)
+    assert added._attributes is entity._attributes
+    assert added.bundle is target
+
+
+def test_add_record_recreates_records_resolving_otherwise():
+    document = _document()
+    entity = document.get_record("ex:e1")[0]
+
+    # ex is bound to another namespace here: the record is renamed
+    target = ProvDocument()
+    target.add_namespace("ex", "http://example.com/")
+    added = target.add_record(entity)
+    assert added._attributes is not entity._attributes
+    assert str(added.identifier) == "ex_1:e1"
+    assert added.identifier == entity.identifier
+
+    # a prov:QUALIFIED_NAME literal unresolved in the record's bundle
+    unresolved = Literal("other:x", PROV_QUALIFIEDNAME)
+    record = ProvDocument().entity(EX["e"], {"ex:ref": unresolved})
+    assert record.get_attribute("ex:ref") == {unresolved}
+    target = ProvDocument()
+    target.add_namespace(EX)
+    target.add_namespace("other", "http://example.com/other/")
+    added = target.add_record(record)
+    assert added.get_attribute("ex:ref") == {
+        Namespace("other", "http://example.com/other/")["x"]
+    }
@@ -0,0 +1,65 @@
+"""Structural diff of documents (prov.diff)."""
+
+from prov.diff import ADDED, CHANGED, REMOVED, diff_bundles, diff_documents
+from prov.model import ProvDocument
+from prov.tests.examples import bundles1, primer_example
+
+
+def _doc():
+    document = ProvDocument()
+    document.add_namespace("ex", "http://example.org/")
+    return document
+
+
+def test_identical_documents_have_no_differences():
+    assert list(diff_documents(primer_example(), primer_example())) == []
+
+
+def test_added_removed_and_changed_records():
+    old = _doc()
+    old.entity("ex:kept")
+    old.entity("ex:gone")
+    old.entity("ex:edited", {"ex:version": 1})
+    new = _doc()
+    new.entity("ex:edited", {"ex:version": 2})
+    new.entity("ex:kept")
+    new.entity("ex:fresh")
+    differences = {(d.change, str(d.identifier)): d for d in diff_documents(old, new)}
+    assert set(differences) == {
+        (REMOVED, "ex:gone"),
+        (CHANGED, "ex:edited"),
+        (ADDED, "ex:fresh"),
+    }
+    changed = differences[(CHANGED, "ex:edited")]
+    assert [r.get_attribute("ex:version") for r in changed.old] == [{1}]
+    assert [r.get_attribute("ex:version") for r in changed.new] == [{2}]
+
+
+def test_anonymous_relations_are_matched_by_content():
+    old = _doc()
+    old.wasDerivedFrom("ex:e2", "ex:e1")
+    new = _doc()
+    new.wasDerivedFrom("ex:e2", "ex:e1")
+    new.wasDerivedFrom("ex:e3", "ex:e1")
+    differences = list(diff_bundles(old, new))
+    assert [(d.change, d.identifier) for d in differences] == [(ADDED, None)]
+
+
+def test_differences_are_reported_per_bundle():
+    old = bundles1()
+    new = bundles1()
+    bundle = next(iter(new.bundles))
+    bundle.entity("ex:extra")
+    differences = list(diff_documents(old, new))
+    assert [(d.change, d.bundle) for d in differences] == [(ADDED, bundle.identifier)]
+
+
+def test_bundle_missing_on_one_side():
+    old = _doc()
+    new = _doc()
+    new.bundle("ex:b").entity("ex:e1")
+    differences = list(diff_documents(old, new))
+    assert [(d.change, str(d.bundle), str(d.identifier)) for d in differences] == [
+        (ADDED, "ex:b", "ex:e1")
+    ]
+    assert [d.change for d in diff_documents(new, old)] == [REMOVED]
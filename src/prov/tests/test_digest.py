@@ -0,0 +1,101 @@
+"""Content-addressed digests of records, bundles and documents."""
+
+import datetime
+
+import pytest
+
+from prov.constants import XSD_DECIMAL
+from prov.model import Literal, ProvDocument
+from prov.tests.conftest import ROUNDTRIP_FORMATS, roundtrip_document
+from prov.tests.examples import bundles1, primer_example
+
+
+def _doc(prefix="ex"):
+    document = ProvDocument()
+    document.add_namespace(prefix, "http://example.org/")
+    return document
+
+
+def test_record_digest_ignores_prefix_and_attribute_order():
+    doc_a = _doc("ex")
+    doc_b = _doc("other")
+    e_a = doc_a.entity("ex:e1", [("ex:a", 1), ("ex:b", "x")])
+    e_b = doc_b.entity("other:e1", [("other:b", "x"), ("other:a", 1)])
+    assert e_a == e_b
+    assert e_a.digest() == e_b.digest()
+
+
+def test_record_digest_keeps_python_type_distinct():
+    # #34: 2 and 2.0 are distinct attribute values, so digests differ too.
+    document = _doc()
+    e_int = document.entity("ex:e1", {"ex:a": 2})
+    e_float = document.entity("ex:e1", {"ex:a": 2.0})
+    assert e_int.digest() != e_float.digest()
+
+
+def test_record_digest_follows_literal_value_space():
+    document = _doc()
+    e_1 = document.entity("ex:e1", {"ex:a": Literal("10", XSD_DECIMAL)})
+    e_2 = document.entity("ex:e1", {"ex:a": Literal("10.00", XSD_DECIMAL)})
+    e_3 = document.entity("ex:e1", {"ex:a": Literal("hi", langtag="EN")})
+    e_4 = document.entity("ex:e1", {"ex:a": Literal("hi", langtag="en")})
+    assert e_1.digest() == e_2.digest()
+    assert e_3.digest() == e_4.digest()
+
+
+def test_record_digest_normalises_aware_datetimes():
+    document = _doc()
+    utc = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    plus_one = utc.astimezone(datetime.timezone(datetime.timedelta(hours=1)))
+    a_1 = document.activity("ex:a1", startTime=utc)
+    a_2 = document.activity("ex:a1", startTime=plus_one)
+    assert a_1.digest() == a_2.digest()
+
+
+def test_record_digest_is_invalidated_by_mutation():
+    document = _doc()
+    entity = document.entity("ex:e1")
+    before = entity.digest()
+    bundle_before = document.digest()
+    entity.add_attributes({"ex:a": "x"})
+    assert entity.digest() != before
+    assert document.digest() != bundle_before
+
+
+def test_digests_are_invalidated_by_set_time():
+    document = _doc()
+    bundle = document.bundle("ex:b")
+    activity = bundle.activity("ex:a1")
+    digests = [activity.digest(), bundle.digest(), document.digest()]
+    activity.set_time(datetime.datetime(2020, 1, 1))
+    after_start = [activity.digest(), bundle.digest(), document.digest()]
+    assert all(a != b for a, b in zip(digests, after_start, strict=True))
+    activity.set_time(endTime=datetime.datetime(2020, 1, 2))
+    after_end = [activity.digest(), bundle.digest(), document.digest()]
+    assert all(a != b for a, b in zip(after_start, after_end, strict=True))
+
+
+def test_document_digest_is_record_order_independent():
+    doc_a = _doc()
+    doc_a.entity("ex:e1")
+    doc_a.activity("ex:a1")
+    doc_b = _doc()
+    doc_b.activity("ex:a1")
+    doc_b.entity("ex:e1")
+    assert doc_a.digest() == doc_b.digest()
+    doc_b.entity("ex:e2")
+    assert doc_a.digest() != doc_b.digest()
+
+
+def test_document_digest_covers_bundles():
+    document = bundles1()
+    digest = document.digest()
+    bundle = next(iter(document.bundles))
+    bundle.entity("ex:extra")
+    assert document.digest() != digest
+
+
+@pytest.mark.parametrize("fmt", ROUNDTRIP_FORMATS)
+def test_document_digest_survives_round_trip(fmt):
+    document = primer_example()
+    assert roundtrip_document(document, fmt).digest() == document.digest()
@@ -5,12 +5,13 @@ Created on Aug 13, 2015
 """
 
 import datetime
+import io
 
 import pytest
 
 pydot = pytest.importorskip("pydot")
 
-from prov.dot import htlm_link_if_uri, prov_to_dot
+from prov.dot import htlm_link_if_uri, prov_to_dot, write_dot
 from prov.model import ProvDocument
 from prov.tests import examples
 
@@ -134,3 +135,69 @@ def test_unresolvable_unification_falls_back_to_original_bundle():
     dot = prov_to_dot(doc)
     svg_content = dot.create(format="svg", encoding="utf-8")
     assert len(svg_content) > MIN_SVG_SIZE
+
+
+# write_dot() streams the same DOT text that prov_to_dot() builds with pydot.
+
+
+def _write_dot(bundle, **kwargs):
+    stream = io.StringIO()
+    write_dot(bundle, stream, **kwargs)
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize(
+    "build", [pytest.param(fn, id=name) for name, fn in examples.tests]
+)
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"use_labels": True}, {"show_nary": False, "direction": "LR"}],
+    ids=["default", "labels", "binary"],
+)
+def test_write_dot_matches_prov_to_dot(build, options):
+    document = build()
+    assert (
+        _write_dot(document, **options) == prov_to_dot(document, **options).to_string()
+    )
+
+
+def test_write_dot_to_a_path(tmp_path):
+    path = tmp_path / "doc.dot"
+    document = examples.primer_example()
+    write_dot(document, str(path))
+    assert path.read_text(encoding="utf-8") == prov_to_dot(document).to_string()
+
+
+def _chain(length):
+    doc = ProvDocument()
+    doc.add_namespace("ex", "http://example.org/")
+    for i in range(length):
+        doc.entity(f"ex:e{i}")
+    for i in range(1, length):
+        doc.wasDerivedFrom(f"ex:e{i}", f"ex:e{i - 1}")
+    return doc
+
+
+def test_write_dot_caps_nodes_and_edges():
+    # Each derivation is drawn through a blank node, as two edges
+    text = _write_dot(_chain(10), max_nodes=4)
+    (graph,) = pydot.graph_from_dot_data(text)
+    element_nodes = [n for n in graph.get_nodes() if n.get_name().startswith("n")]
+    assert len(element_nodes) == 4
+    assert len(graph.get_edges()) == 3 * 2
+    assert "// 6 nodes and 6 relations omitted" in text
+    text = _write_dot(_chain(10), max_edges=2)
+    (graph,) = pydot.graph_from_dot_data(text)
+    assert len(graph.get_edges()) == 2 * 2
+    assert "// 0 nodes and 7 relations omitted" in text
+
+
+def test_write_dot_truncates_annotations():
+    doc = ProvDocument()
+    doc.add_namespace("ex", "http://example.org/")
+    doc.entity("ex:e1", {f"ex:a{i}": "x" * 50 for i in range(5)})
+    text = _write_dot(doc, max_attributes=2, max_value_length=10)
+    assert text.count("ex:a") == 2
+    assert "(3 more)" in text
+    assert "x" * 10 + "\u2026" in text
+    assert "x" * 11 not in text
@@ -0,0 +1,64 @@
+"""Deserializing from a file path through Serializer.deserialize_file()."""
+
+import io
+import json
+
+import pytest
+
+from prov import serializers
+from prov.model import ProvDocument
+from prov.tests.examples import primer_example
+
+
+@pytest.mark.parametrize("format", ["json", "xml", "rdf", "jsonld"])
+def test_path_and_stream_inputs_agree(format, tmp_path):
+    document = primer_example()
+    path = tmp_path / f"doc.{format}"
+    document.serialize(str(path), format=format)
+    with open(path, "rb") as stream:
+        from_stream = ProvDocument.deserialize(stream, format=format)
+    from_path = ProvDocument.deserialize(str(path), format=format)
+    assert from_path == from_stream == document
+    assert ProvDocument.deserialize(path, format=format) == document
+
+
+@pytest.mark.parametrize("format", ["json", "jsonld"])
+def test_mapped_json_input_is_decoded_as_utf8(format, tmp_path):
+    document = ProvDocument()
+    document.add_namespace("ex", "http://example.org/")
+    document.entity("ex:e1", {"ex:label": "déjà vu ✓"})
+    path = tmp_path / f"doc.{format}"
+    path.write_bytes(document.serialize(format=format).encode("utf-8"))
+    assert ProvDocument.deserialize(str(path), format=format) == document
+
+
+def test_json_file_arguments_are_passed_to_the_decoder(tmp_path):
+    path = tmp_path / "doc.json"
+    primer_example().serialize(str(path))
+    with pytest.raises(TypeError, match="no_such_option"):
+        ProvDocument.deserialize(str(path), format="json", no_such_option=True)
+
+
+def test_empty_file_is_rejected_like_an_empty_stream(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_bytes(b"")
+    with pytest.raises(json.JSONDecodeError):
+        ProvDocument.deserialize(io.StringIO(""), format="json")
+    with pytest.raises(json.JSONDecodeError):
+        ProvDocument.deserialize(str(path), format="json")
+
+
+def test_default_deserialize_file_reads_a_text_stream(tmp_path):
+    class EchoSerializer(serializers.Serializer):
+        def serialize(self, stream, **args):
+            raise NotImplementedError
+
+        def deserialize(self, stream, **args):
+            self.seen = (stream.read(), args)
+            return ProvDocument()
+
+    path = tmp_path / "doc.txt"
+    path.write_text("content")
+    serializer = EchoSerializer()
+    serializer.deserialize_file(str(path), option=1)
+    assert serializer.seen == ("content", {"option": 1})
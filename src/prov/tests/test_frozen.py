@@ -0,0 +1,118 @@
+"""Frozen documents: read-only, with reads free of side effects, for threads."""
+
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from prov.identifier import Namespace
+from prov.model import ProvDocument, ProvException
+from prov.tests.examples import primer_example, tests as EXAMPLES
+
+
+def _document():
+    document = ProvDocument()
+    document.add_namespace("ex", "http://example.org/")
+    document.entity("ex:e1", {"prov:label": "e1"})
+    document.activity("ex:a1")
+    document.wasGeneratedBy("ex:e1", "ex:a1")
+    bundle = document.bundle("ex:b")
+    bundle.entity("ex:e2")
+    return document
+
+
+def _mutations(document):
+    bundle = next(iter(document.bundles))
+    entity = document.get_record("ex:e1")[0]
+    activity = document.get_record("ex:a1")[0]
+    return [
+        lambda: document.entity("ex:e3"),
+        lambda: document.add_namespace("other", "http://example.com/"),
+        lambda: document.set_default_namespace("http://example.com/"),
+        lambda: document.bundle("ex:b2"),
+        lambda: document.add_bundle(ProvDocument(), "ex:b3"),
+        lambda: document.update(_document()),
+        lambda: bundle.entity("ex:e4"),
+        lambda: entity.add_attributes({"ex:n": 1}),
+        lambda: entity.add_asserted_type(Namespace("ex", "http://example.org/")["T"]),
+        lambda: activity.set_time(datetime.datetime(2026, 1, 1)),
+    ]
+
+
+def test_frozen_document_refuses_changes():
+    document = _document()
+    document.set_frozen()
+    assert document.frozen
+    assert all(bundle.frozen for bundle in document.bundles)
+    version = document.version
+    for mutation in _mutations(document):
+        with pytest.raises(ProvException, match="frozen"):
+            mutation()
+    assert document.version == version
+    assert document == _document()
+
+    document.set_frozen(False)
+    assert not any(bundle.frozen for bundle in document.bundles)
+    for mutation in _mutations(document):
+        mutation()
+    assert document.version > version
+
+
+def test_frozen_names_are_resolved_without_registering_namespaces():
+    document = _document()
+    document.set_frozen()
+    namespaces = document._namespaces.copy()
+    other = Namespace("other", "http://example.com/")
+    assert document.valid_qualified_name(other["x"]) == other["x"]
+    assert document.valid_qualified_name(Namespace("", "http://example.com/")["y"])
+    # a name in a registered namespace, under another prefix, takes its prefix
+    alias = Namespace("alias", "http://example.org/")
+    assert str(document.valid_qualified_name(alias["e1"])) == "ex:e1"
+    assert document.get_record(other["x"]) == []
+    assert document._namespaces == namespaces
+    assert document._namespaces.get_default_namespace() is None
+
+    # ... which a document that is not frozen registers
+    document.set_frozen(False)
+    document.valid_qualified_name(other["x"])
+    assert "other" in document._namespaces
+
+
+def test_reads_do_not_add_attribute_entries():
+    document = primer_example()
+    keys = [list(record._attributes) for record in document.get_records()]
+    for record in document.get_records():
+        for name in ("args", "formal_attributes", "label", "value"):
+            getattr(record, name)
+        record.get_asserted_types()
+        record.get_attribute("prov:location")
+        if hasattr(record, "get_startTime"):
+            record.get_startTime()
+            record.get_endTime()
+    assert [list(record._attributes) for record in document.get_records()] == keys
+    ids = list(document._records._id_map)
+    document.get_record("ex:unknown")
+    assert list(document._records._id_map) == ids
+
+
+@pytest.mark.parametrize("cache", [False, True])
+def test_threads_serialize_a_frozen_document(cache):
+    formats = ["json", "xml", "provn"]
+    documents = [make_doc() for _, make_doc in EXAMPLES]
+    expected = [[doc.serialize(format=fmt) for fmt in formats] for doc in documents]
+    for document in documents:
+        document.set_frozen()
+        if cache:
+            document.enable_serialization_cache(maxsize=2)
+    versions = [document.version for document in documents]
+
+    def serialize(args):
+        index, fmt = args
+        return documents[index].serialize(format=fmt)
+
+    jobs = [(i, fmt) for i in range(len(documents)) for fmt in formats] * 4
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outputs = list(executor.map(serialize, jobs))
+    for (i, fmt), output in zip(jobs, outputs, strict=True):
+        assert output == expected[i][formats.index(fmt)]
+    assert [document.version for document in documents] == versions
@@ -0,0 +1,97 @@
+"""Import-time benchmark: ``import prov`` / ``import prov.model`` stay cheap.
+
+Short-lived processes (the console scripts, serverless functions) pay for
+every module ``import prov.model`` loads. Each test starts a fresh
+interpreter: the first ones check that the modules only needed for
+serialization, digests or record stores are not loaded by the import, and the
+last one times it with ``-X importtime`` against a generous budget, to catch
+a new heavy import rather than to measure small changes.
+"""
+
+import platform
+import subprocess
+import sys
+
+import pytest
+
+# Modules loaded on first use only, not by `import prov.model`
+DEFERRED_MODULES = [
+    "hashlib",
+    "json",
+    "lxml",
+    "prov.dot",
+    "prov.graph",
+    "prov.serializers.provjson",
+    "prov.serializers.provn",
+    "prov.serializers.provxml",
+    "rdflib",
+    "shutil",
+    "sqlite3",
+    "tempfile",
+    "urllib.parse",
+]
+
+# Cumulative import time of prov.model allowed, in microseconds
+IMPORT_TIME_BUDGET = 250_000
+
+
+def _run(code, *options):
+    # Run code in a fresh interpreter
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _loaded_by(statement):
+    # The modules an import statement loads in a fresh interpreter, leaving
+    # out those already loaded at startup (e.g. by .pth files)
+    code = (
+        "import sys; before = set(sys.modules); "
+        f"{statement}; print(*sorted(set(sys.modules) - before))"
+    )
+    return set(_run(code).stdout.split())
+
+
+def test_import_prov_does_not_load_the_model():
+    loaded = _loaded_by("import prov")
+    assert "prov.model" not in loaded
+    assert "logging" not in loaded
+
+
+def test_import_prov_model_defers_helpers_and_serializers():
+    loaded = _loaded_by("import prov.model")
+    assert "prov.model.bundle" in loaded
+    assert loaded.isdisjoint(DEFERRED_MODULES)
+
+
+def test_deferred_names_are_still_exported():
+    import shutil
+    import tempfile
+    from urllib.parse import urlparse
+
+    import prov.model
+
+    assert {"shutil", "tempfile", "urlparse"} <= set(dir(prov.model))
+    assert prov.model.shutil is shutil
+    assert prov.model.tempfile is tempfile
+    assert prov.model.urlparse is urlparse
+    with pytest.raises(AttributeError):
+        prov.model.no_such_name  # noqa: B018
+
+
+@pytest.mark.skipif(
+    platform.python_implementation() != "CPython",
+    reason="-X importtime is CPython only",
+)
+def test_import_time_budget():
+    timings = []
+    for _ in range(3):
+        report = _run("import prov.model", "-X", "importtime").stderr
+        (line,) = [
+            line for line in report.splitlines() if line.endswith("| prov.model")
+        ]
+        timings.append(int(line.split("|")[1]))
+    assert min(timings) < IMPORT_TIME_BUDGET
@@ -0,0 +1,157 @@
+"""JSON codec tests: selecting the engine of the JSON serializers.
+
+The whole example corpus goes through each installed codec in both JSON
+formats: the JSON values written must be those written with the standard
+library, and read back to the same documents.
+"""
+
+import io
+import json
+
+import pytest
+
+from prov.model import ProvDocument
+from prov.serializers import DoNotExist, jsoncodec
+from prov.serializers.jsoncodec import (
+    CODECS,
+    JSONCodec,
+    OrjsonCodec,
+    StdlibCodec,
+    get_codec,
+    set_default_codec,
+)
+from prov.serializers.provjsonld import ProvJSONLDException
+from prov.tests.examples import tests as EXAMPLES
+
+
+def _installed_codecs():
+    for name in CODECS:
+        try:
+            get_codec(name)
+        except DoNotExist:
+            continue
+        yield name
+
+
+INSTALLED_CODECS = list(_installed_codecs())
+JSON_FORMATS = ("json", "jsonld")
+
+
+@pytest.fixture
+def default_codec():
+    # Restore the default codec after a test changes it
+    saved = jsoncodec._default
+    yield
+    jsoncodec._default = saved
+
+
+def _serialize(doc, fmt, **args):
+    try:
+        return doc.serialize(format=fmt, **args)
+    except ProvJSONLDException:
+        pytest.skip("The document cannot be encoded in PROV-JSONLD")
+
+
+@pytest.mark.parametrize("codec", INSTALLED_CODECS)
+@pytest.mark.parametrize("fmt", JSON_FORMATS)
+@pytest.mark.parametrize("name, make_doc", EXAMPLES)
+def test_codecs_write_and_read_the_same_json(name, make_doc, fmt, codec):
+    doc = make_doc()
+    expected = _serialize(doc, fmt)
+    content = _serialize(doc, fmt, codec=codec)
+    assert json.loads(content) == json.loads(expected)
+    reference = ProvDocument.deserialize(content=expected, format=fmt)
+    assert ProvDocument.deserialize(content=content, format=fmt) == reference
+    for stream in (io.StringIO(expected), io.BytesIO(expected.encode("utf-8"))):
+        assert ProvDocument.deserialize(stream, format=fmt, codec=codec) == reference
+
+
+@pytest.mark.parametrize("codec", INSTALLED_CODECS)
+@pytest.mark.parametrize("fmt", JSON_FORMATS)
+def test_codec_reads_files_and_writes_binary_streams(codec, fmt, tmp_path):
+    doc = ProvDocument()
+    doc.add_namespace("ex", "http://example.org/")
+    doc.entity("ex:e1", {"prov:label": "café ☃", "ex:count": 3})
+    path = tmp_path / f"doc.{fmt}"
+    with path.open("wb") as f:
+        doc.serialize(f, format=fmt, codec=codec)
+    assert ProvDocument.deserialize(path, format=fmt, codec=codec) == doc
+    (tmp_path / "empty").touch()
+    with pytest.raises(json.JSONDecodeError):
+        ProvDocument.deserialize(tmp_path / "empty", format=fmt, codec=codec)
+
+
+@pytest.mark.parametrize("codec", INSTALLED_CODECS)
+def test_streaming_writer_lays_out_the_text_of_the_codec(codec):
+    doc = EXAMPLES[0][1]()
+    args = {"indent": 2} if codec == "orjson" else {"indent": 4}
+    expected = doc.serialize(format="jsonld", codec=codec, **args)
+    streamed = io.StringIO()
+    doc.serialize(streamed, format="jsonld", codec=codec, streaming=True, **args)
+    assert streamed.getvalue() == expected
+
+
+def test_default_codec_can_be_set_globally(default_codec, monkeypatch):
+    calls = []
+
+    class RecordingCodec(StdlibCodec):
+        name = "recording"
+
+        def dumps(self, obj, **args):
+            calls.append("dumps")
+            return super().dumps(obj, **args)
+
+        def loads(self, data, **args):
+            calls.append("loads")
+            return super().loads(data, **args)
+
+    monkeypatch.setitem(CODECS, "recording", RecordingCodec)
+    monkeypatch.setattr(jsoncodec, "_instances", {})
+    set_default_codec("recording")
+    doc = EXAMPLES[0][1]()
+    for fmt in JSON_FORMATS:
+        content = doc.serialize(format=fmt)
+        assert ProvDocument.deserialize(content=content, format=fmt) == doc
+    assert calls == ["dumps", "loads"] * 2
+    # A codec given for a call takes precedence
+    doc.serialize(format="json", codec="json")
+    assert len(calls) == 4
+
+
+def test_get_codec():
+    stdlib = get_codec("json")
+    assert isinstance(stdlib, StdlibCodec)
+    assert get_codec() is stdlib
+    assert get_codec(stdlib) is stdlib
+    assert isinstance(get_codec("auto"), JSONCodec)
+    with pytest.raises(DoNotExist, match="available codecs"):
+        get_codec("simplejson")
+    with pytest.raises(DoNotExist):
+        set_default_codec("simplejson")
+
+
+def test_unavailable_codec(monkeypatch):
+    class MissingCodec(StdlibCodec):
+        name = "missing"
+
+        def __init__(self):
+            import prov_no_such_json_engine  # noqa: F401
+
+    monkeypatch.setitem(CODECS, "missing", MissingCodec)
+    with pytest.raises(DoNotExist, match="prov_no_such_json_engine"):
+        get_codec("missing")
+
+
+def test_orjson_codec_rejects_unsupported_options():
+    pytest.importorskip("orjson")
+    codec = get_codec("orjson")
+    assert isinstance(codec, OrjsonCodec)
+    assert get_codec("auto") is codec
+    doc = EXAMPLES[0][1]()
+    for args in ({"indent": 4}, {"separators": (",", ":")}, {"ensure_ascii": True}):
+        with pytest.raises(ValueError, match="orjson"):
+            doc.serialize(format="json", codec="orjson", **args)
+    with pytest.raises(ValueError, match="parse_float"):
+        ProvDocument.deserialize(
+            content="{}", format="json", codec="orjson", parse_float=str
+        )
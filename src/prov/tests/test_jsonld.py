@@ -12,7 +12,9 @@ from prov.serializers.provjsonld import (
     JSONLD_CONTEXT_URL,
     ProvJSONLDException,
     ProvJSONLDSerializer,
+    iter_jsonld_document,
 )
+from prov.tests.examples import tests as EXAMPLES
 
 EX_URI = "http://example.org/"
 FIXTURE_DIR = Path(__file__).parent / "jsonld"
@@ -310,9 +312,12 @@ def test_roundtrip_context_embed_registers_no_extra_namespaces():
         ({"@context": [], "@graph": [{"@type": ["Entity"]}]}, "@type"),
     ],
 )
-def test_deserialize_malformed(payload, match):
+@pytest.mark.parametrize("streaming", [False, True])
+def test_deserialize_malformed(payload, match, streaming):
     with pytest.raises(ProvJSONLDException, match=match):
-        ProvDocument.deserialize(content=json.dumps(payload), format="jsonld")
+        ProvDocument.deserialize(
+            content=json.dumps(payload), format="jsonld", streaming=streaming
+        )
 
 
 def _expected_primer_document() -> ProvDocument:
@@ -387,3 +392,117 @@ def test_interop_provtoolbox_mini_primer():
     doc = prov.read(FIXTURE_DIR / "provtoolbox-mini-primer.jsonld", format="jsonld")
     assert doc == _expected_provtoolbox_primer_document()
     assert _roundtrip(doc) == doc
+
+
+def _bundled_doc() -> ProvDocument:
+    doc = _new_doc()
+    doc.entity("ex:e1", {"ex:note": "caf\u00e9 \u2603"})
+    bundle = doc.bundle("ex:b1")
+    bundle.add_namespace("other", "http://example.org/other#")
+    for i in range(200):
+        bundle.entity(f"other:e{i}", {"prov:value": i})
+        bundle.wasDerivedFrom(f"other:e{i}", "ex:e1")
+    doc.activity("ex:a1")
+    return doc
+
+
+@pytest.mark.parametrize("name, make_doc", EXAMPLES)
+def test_streaming_writer_matches_the_document_encoder(name, make_doc):
+    doc = make_doc()
+    try:
+        expected = doc.serialize(format="jsonld")
+    except ProvJSONLDException:
+        pytest.skip(f"{name} cannot be encoded in PROV-JSONLD")
+    text_stream = io.StringIO()
+    doc.serialize(text_stream, format="jsonld", streaming=True)
+    assert text_stream.getvalue() == expected
+    binary_stream = io.BytesIO()
+    doc.serialize(binary_stream, format="jsonld", streaming=True)
+    assert binary_stream.getvalue() == expected.encode("utf-8")
+
+
+def test_streaming_writer_emits_the_context_first():
+    doc = _bundled_doc()
+    pieces = iter_jsonld_document(doc, "embed", indent=2)
+    head = next(pieces)
+    assert head.startswith('{\n  "@context": ')
+    assert head.endswith('"@graph": ')
+    assert head + "".join(pieces) == doc.serialize(
+        format="jsonld", context="embed", indent=2
+    )
+
+
+@pytest.mark.parametrize("name, make_doc", EXAMPLES)
+def test_streaming_reader_roundtrip(name, make_doc):
+    doc = make_doc()
+    try:
+        content = doc.serialize(format="jsonld")
+    except ProvJSONLDException:
+        pytest.skip(f"{name} cannot be encoded in PROV-JSONLD")
+    expected = ProvDocument.deserialize(content=content, format="jsonld")
+    for stream in (io.StringIO(content), io.BytesIO(content.encode("utf-8"))):
+        assert (
+            ProvDocument.deserialize(stream, format="jsonld", streaming=True)
+            == expected
+        )
+
+
+def test_streaming_reader_decodes_large_bundles_statement_by_statement(
+    monkeypatch, tmp_path
+):
+    from prov.serializers import provjsonld
+
+    # Tiny chunks and entries, to split values across reads and stream
+    # the bundle's statements
+    monkeypatch.setattr(provjsonld, "STREAM_CHUNK_SIZE", 5)
+    monkeypatch.setattr(provjsonld, "_MAX_BUFFERED_ENTRY", 64)
+    entries = []
+    original = provjsonld._decode_graph_entry
+
+    def spy(item, document):
+        entries.append(item)
+        return original(item, document)
+
+    monkeypatch.setattr(provjsonld, "_decode_graph_entry", spy)
+    doc = _bundled_doc()
+    path = tmp_path / "doc.jsonld"
+    doc.serialize(str(path), format="jsonld", indent=1, streaming=True)
+    assert ProvDocument.deserialize(path, format="jsonld", streaming=True) == doc
+    # The bundle was never held as a whole
+    assert [entry["@type"] for entry in entries] == ["Entity", "Activity"]
+
+
+def test_streaming_reader_accepts_graph_before_context():
+    doc = _bundled_doc()
+    container = _dump(doc)
+    content = json.dumps({"@graph": container["@graph"], **container})
+    assert content.startswith('{"@graph"')
+    assert (
+        ProvDocument.deserialize(content=content, format="jsonld", streaming=True)
+        == doc
+    )
+
+
+@pytest.mark.parametrize(
+    "content, match",
+    [
+        ('{"@context": []}', "@graph"),
+        ('{"@graph": []}', "@context"),
+        ('{"@context": [], "@graph": {}}', "array"),
+        ("[]", "object"),
+        ('{"@context": [], "@graph": []', "Expected"),
+        ('{"@context": [], "@graph": [}', "Invalid JSON"),
+        ('{"@context": [], "@graph": []} []', "Extra data"),
+    ],
+)
+def test_streaming_reader_malformed(content, match):
+    with pytest.raises(ProvJSONLDException, match=match):
+        ProvDocument.deserialize(content=content, format="jsonld", streaming=True)
+
+
+def test_streaming_reader_reports_positions_in_the_whole_input(monkeypatch):
+    monkeypatch.setattr("prov.serializers.provjsonld.STREAM_CHUNK_SIZE", 16)
+    prefix = '{"@context": [], "@graph": [], "ex:other": [' + '"x", ' * 40
+    content = prefix + "}]}"
+    with pytest.raises(ProvJSONLDException, match=f"at character {len(prefix)}$"):
+        ProvDocument.deserialize(content=content, format="jsonld", streaming=True)
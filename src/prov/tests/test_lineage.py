@@ -0,0 +1,135 @@
+"""Transitive lineage queries: ProvBundle.ancestors() and descendants()."""
+
+import itertools
+
+from prov.constants import PROV_ATTRIBUTION, PROV_DERIVATION
+from prov.model import ProvDocument
+
+
+def _pipeline():
+    document = ProvDocument()
+    ex = document.add_namespace("ex", "http://example.org/")
+    document.agent("ex:alice")
+    document.used("ex:clean", "ex:raw")
+    document.wasGeneratedBy("ex:tidy", "ex:clean")
+    document.wasAttributedTo("ex:tidy", "ex:alice")
+    document.used("ex:report", "ex:tidy")
+    document.wasGeneratedBy("ex:summary", "ex:report")
+    document.wasDerivedFrom("ex:summary", "ex:tidy")
+    return document, ex
+
+
+def test_ancestors_follow_data_flow_by_default():
+    document, ex = _pipeline()
+    assert set(document.ancestors("ex:summary")) == {
+        ex["report"],
+        ex["tidy"],
+        ex["clean"],
+        ex["raw"],
+    }
+    assert set(
+        document.ancestors(
+            "ex:summary", relation_types=[PROV_DERIVATION, PROV_ATTRIBUTION]
+        )
+    ) == {ex["tidy"], ex["alice"]}
+
+
+def test_descendants_for_impact_analysis():
+    document, ex = _pipeline()
+    assert list(document.descendants("ex:summary")) == []
+    assert set(document.descendants("ex:raw")) == {
+        ex["clean"],
+        ex["tidy"],
+        ex["report"],
+        ex["summary"],
+    }
+    assert set(document.descendants(ex["raw"], max_depth=2)) == {
+        ex["clean"],
+        ex["tidy"],
+    }
+    assert set(document.descendants("ex:alice", relation_types=[PROV_ATTRIBUTION])) == {
+        ex["tidy"]
+    }
+
+
+def test_several_and_unknown_starting_points():
+    document, ex = _pipeline()
+    assert set(document.ancestors("ex:tidy", "ex:unknown", "ex:report")) == {
+        ex["clean"],
+        ex["raw"],
+        ex["tidy"],
+    }
+    assert list(document.ancestors("ex:unknown")) == []
+
+
+def test_results_are_streamed_from_a_cached_index():
+    document = ProvDocument()
+    document.add_namespace("ex", "http://example.org/")
+    for i in range(1, 1000):
+        document.wasDerivedFrom(f"ex:e{i}", f"ex:e{i - 1}")
+    first_two = list(itertools.islice(document.ancestors("ex:e999"), 2))
+    assert [str(name) for name in first_two] == ["ex:e998", "ex:e997"]
+    graph = document._lineage_graph
+    assert sum(1 for _ in document.ancestors("ex:e999")) == 999
+    assert document._lineage_graph is graph
+
+
+def test_index_follows_changes_to_the_document():
+    document, ex = _pipeline()
+    assert list(document.ancestors("ex:raw")) == []
+    bundle = document.bundle("ex:b")
+    bundle.wasDerivedFrom("ex:raw", "ex:source")
+    assert list(document.ancestors("ex:raw")) == [ex["source"]]
+    assert list(bundle.ancestors("ex:tidy")) == []
+
+
+def test_sliced_keeps_the_lineage_of_the_seed():
+    document, _ = _pipeline()
+    document.entity("ex:raw", {"ex:size": 10})
+    document.entity("ex:unrelated")
+    sliced = document.sliced("ex:tidy")
+    expected = ProvDocument()
+    expected.add_namespace("ex", "http://example.org/")
+    expected.entity("ex:raw", {"ex:size": 10})
+    expected.used("ex:clean", "ex:raw")
+    expected.wasGeneratedBy("ex:tidy", "ex:clean")
+    assert sliced == expected
+    assert set(sliced.get_registered_namespaces()) == set(
+        document.get_registered_namespaces()
+    )
+    assert list(document.get_record("ex:unrelated"))
+
+
+def test_sliced_downstream_and_with_depth_limit():
+    document, _ = _pipeline()
+    downstream = document.sliced("ex:tidy", ancestors=False, descendants=True)
+    assert {str(record.get_type()) for record in downstream.get_records()} == {
+        "prov:Usage",
+        "prov:Generation",
+        "prov:Derivation",
+    }
+    # report and tidy are one step away, and so is the usage between them
+    assert len(document.sliced("ex:summary", max_depth=1).get_records()) == 3
+    assert document.sliced("ex:unknown") == ProvDocument()
+
+
+def test_sliced_keeps_bundle_membership_without_revalidating():
+    document, ex = _pipeline()
+    bundle = document.bundle("ex:b")
+    bundle.add_namespace("b", "http://example.org/bundle/")
+    bundle.entity("ex:raw", {"b:checked": True})
+    bundle.wasDerivedFrom("ex:raw", "b:source")
+    bundle.entity("b:other")
+    sliced = document.sliced("ex:clean")
+    (sliced_bundle,) = sliced.bundles
+    assert sliced_bundle.identifier == ex["b"]
+    assert sliced_bundle.namespaces == bundle.namespaces
+    assert sliced_bundle.get_record("ex:raw") == bundle.get_record("ex:raw")
+    assert len(sliced_bundle.get_records()) == 2
+    record = sliced_bundle.get_record("ex:raw")[0]
+    assert record.bundle is sliced_bundle
+    assert record is not bundle.get_record("ex:raw")[0]
+    assert record.digest() == bundle.get_record("ex:raw")[0].digest()
+    # The copied records are independent of the original ones
+    record.add_attributes({"b:checked": False})
+    assert bundle.get_record("ex:raw")[0].get_attribute("b:checked") == {True}
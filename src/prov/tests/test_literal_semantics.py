@@ -1,8 +1,16 @@
 """Literal value-space semantics (3.0): #77 decimal, #259 langtag, #89 string form."""
 
+import copy
 import io
+import pickle
 
-from prov.constants import XSD_DECIMAL, XSD_INT
+from prov.constants import (
+    PROV_INTERNATIONALIZEDSTRING,
+    PROV_TYPE,
+    XSD_DECIMAL,
+    XSD_INT,
+    XSD_STRING,
+)
 from prov.model import Literal, ProvDocument
 
 
@@ -46,3 +54,39 @@ def test_rdf_plain_string_emitted_without_xsd_string():
     buf = io.BytesIO()
     document.serialize(buf, format="rdf", rdf_format="nt11")
     assert b"^^" not in buf.getvalue()
+
+
+def test_literals_are_slotted():
+    literal = Literal("10.0", XSD_DECIMAL)
+    assert not hasattr(literal, "__dict__")
+
+
+def test_pickled_and_copied_literals_keep_their_semantics():
+    literal = Literal("10.0", XSD_DECIMAL)
+    for clone in (pickle.loads(pickle.dumps(literal)), copy.deepcopy(literal)):
+        assert clone == literal
+        assert hash(clone) == hash(Literal(10, XSD_DECIMAL))
+        assert clone.value == "10.0"
+
+
+def test_interned_literals_are_shared():
+    first = Literal.intern("1.5", XSD_DECIMAL)
+    assert Literal.intern("1.5", XSD_DECIMAL) is first
+    assert Literal.intern("1.5") is not first
+    assert Literal.intern("hello", langtag="en") == Literal("hello", langtag="EN")
+    # looked up once the datatype of a language-tagged string is normalised
+    tagged = Literal.intern("bonjour", langtag="fr")
+    assert Literal.intern("bonjour", PROV_INTERNATIONALIZEDSTRING, "fr") is tagged
+    assert Literal.intern("bonjour", XSD_STRING, "fr") is tagged
+    # equal literals written differently keep their own lexical form
+    assert Literal.intern("1.50", XSD_DECIMAL) == first
+    assert Literal.intern("1.50", XSD_DECIMAL).value == "1.50"
+    document = _doc()
+    for i in range(3):
+        document.entity(f"ex:e{i}", {PROV_TYPE: Literal.intern("report", langtag="en")})
+    values = {
+        id(value)
+        for record in document.get_records()
+        for value in record.get_attribute(PROV_TYPE)
+    }
+    assert len(values) == 1
@@ -0,0 +1,89 @@
+"""Encoding plan tests: the per-type tables agree with what they replace.
+
+The serializers' outputs are pinned by the round-trip and format-specific
+tests; these check the plans themselves against the per-record derivations
+they stand for, over the example corpus.
+"""
+
+import pytest
+
+from prov.constants import PROV_N_MAP
+from prov.model import PROV_REC_CLS, ProvDocument, sorted_attributes
+from prov.serializers.plans import RECORD_PLANS
+from prov.tests.examples import tests as EXAMPLES
+
+
+def _records(doc: ProvDocument):
+    yield from doc.get_records()
+    for bundle in doc.bundles:
+        yield from bundle.get_records()
+
+
+def test_every_record_type_has_a_plan():
+    assert set(RECORD_PLANS) == set(PROV_REC_CLS)
+    for rec_type, plan in RECORD_PLANS.items():
+        assert plan.label == PROV_N_MAP[rec_type]
+        assert tuple(attr for attr, _ in plan.formal_attributes) == (
+            PROV_REC_CLS[rec_type].FORMAL_ATTRIBUTES
+        )
+
+
+@pytest.mark.parametrize("name, make_doc", EXAMPLES)
+def test_plans_match_the_records(name, make_doc):
+    for record in _records(make_doc()):
+        plan = RECORD_PLANS[record.get_type()]
+        before = list(record._attributes)
+        formal_values = plan.formal_values(record)
+        # ... without adding empty entries to the record
+        assert list(record._attributes) == before
+        assert formal_values == list(record.formal_attributes)
+        attributes = record.attributes
+        assert plan.sorted_attributes(attributes) == sorted_attributes(
+            record.get_type(), attributes
+        )
+
+
+def test_sorted_attributes_orders_formal_then_universal_then_others():
+    doc = ProvDocument()
+    doc.add_namespace("ex", "http://example.org/")
+    generation = doc.generation(
+        "ex:e",
+        "ex:a",
+        "2011-11-16T16:05:00",
+        other_attributes=[
+            ("ex:z", "1"),
+            ("prov:type", "ex:T2"),
+            ("ex:b", "2"),
+            ("prov:label", "l"),
+            ("prov:type", "ex:T1"),
+        ],
+    )
+    names = [
+        str(attr)
+        for attr, _ in RECORD_PLANS[generation.get_type()].sorted_attributes(
+            generation.attributes
+        )
+    ]
+    assert names == [
+        "prov:entity",
+        "prov:activity",
+        "prov:time",
+        "prov:label",
+        "prov:type",
+        "prov:type",
+        "ex:b",
+        "ex:z",
+    ]
+
+
+def test_qualified_predicates_match_their_derivation():
+    pytest.importorskip("rdflib")
+    from prov.serializers.provrdf import _QUALIFIED_PREDICATES, ProvRDFSerializer
+
+    serializer = ProvRDFSerializer()
+    for rec_type, predicates in _QUALIFIED_PREDICATES.items():
+        formal = list(PROV_REC_CLS[rec_type].FORMAL_ATTRIBUTES)
+        for attr, predicate in predicates.items():
+            assert predicate == serializer._qualified_attr_predicate(
+                rec_type, attr, formal
+            )
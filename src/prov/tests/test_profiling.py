@@ -0,0 +1,93 @@
+"""Phase counters and timers of prov.profiling."""
+
+import io
+import pickle
+import threading
+
+import pytest
+
+import prov
+from prov.model import NamespaceManager, ProvBundle
+from prov.profiling import PHASES, ProfileStats, profile
+from prov.serializers.provjson import ProvJSONSerializer
+from prov.tests.examples import primer_example
+
+
+def test_phases_are_counted_and_timed():
+    content = primer_example().serialize(format="json")
+    with profile() as stats:
+        document = prov.read(content, format="json")
+        output = io.BytesIO()
+        document.serialize(output, format="xml")
+    assert stats.counts["parse"] == 1
+    assert stats.counts["build"] == len(document.records)
+    assert stats.counts["resolve"] >= len(document.records)
+    assert stats.counts["coerce"] > 0
+    assert stats.counts["encode"] == 1
+    assert stats.counts["write"] >= 1
+    assert output.getvalue()
+    assert all(stats.times[phase] >= 0 for phase in PHASES)
+    assert sum(stats.times.values()) <= stats.total
+
+
+def test_streams_passed_by_keyword_are_timed():
+    serializer = ProvJSONSerializer(primer_example())
+    with profile() as stats:
+        output = io.StringIO()
+        serializer.serialize(stream=output)
+    assert stats.counts["encode"] == 1
+    assert stats.counts["write"] >= 1
+    assert output.getvalue()
+
+
+def test_times_are_exclusive():
+    stats = ProfileStats()
+    stats._enter("parse")
+    stats._enter("resolve")
+    stats._enter("resolve")  # nested call of the same phase
+    stats._exit()
+    stats._exit()
+    stats._exit()
+    assert stats.counts["parse"] == stats.counts["resolve"] == 1
+    assert stats._stack == []
+
+
+def test_methods_are_only_instrumented_within_the_block():
+    original = NamespaceManager.valid_qualified_name
+    with profile():
+        assert NamespaceManager.valid_qualified_name is not original
+        assert ProvJSONSerializer.serialize.__wrapped__ is not None
+    assert NamespaceManager.valid_qualified_name is original
+    assert "__wrapped__" not in vars(ProvBundle.new_record)
+
+
+def test_methods_are_restored_after_an_error():
+    original = ProvBundle.new_record
+    with pytest.raises(ValueError), profile():
+        raise ValueError
+    assert ProvBundle.new_record is original
+
+
+def test_only_one_block_at_a_time():
+    with profile(), pytest.raises(RuntimeError), profile():
+        pass
+
+
+def test_other_threads_are_not_recorded():
+    with profile() as stats:
+        thread = threading.Thread(target=primer_example)
+        thread.start()
+        thread.join()
+    assert stats.counts == dict.fromkeys(PHASES, 0)
+
+
+def test_merge_and_report():
+    with profile() as stats:
+        primer_example()
+    copy = pickle.loads(pickle.dumps(stats))
+    copy.merge(stats)
+    assert copy.counts["build"] == 2 * stats.counts["build"]
+    assert copy.total == pytest.approx(2 * stats.total)
+    report = copy.report().splitlines()
+    assert report[0].split() == ["phase", "calls", "time", "(s)", "%"]
+    assert [line.split()[0] for line in report[1:]] == [*PHASES, "other", "total"]
@@ -0,0 +1,209 @@
+"""Record stores backing ProvBundle (prov.model.store)."""
+
+import datetime
+import io
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from prov.constants import PROV, XSD_LONG
+from prov.identifier import Identifier
+from prov.model import Literal, ProvDerivation, ProvDocument, ProvException
+from prov.model.store import MemoryRecordStore, SQLiteRecordStore
+from prov.tests import examples
+
+
+def _copy_into(document, store):
+    # A copy of `document` whose records (and its bundles') are in `store`
+    copy = ProvDocument(namespaces=document.namespaces, store=store)
+    copy.update(document)
+    return copy
+
+
+def test_memory_store_is_the_default():
+    document = examples.primer_example()
+    assert isinstance(document._records, MemoryRecordStore)
+    for bundle in examples.bundles1().bundles:
+        assert isinstance(bundle._records, MemoryRecordStore)
+
+
+@pytest.mark.parametrize(
+    "example",
+    [
+        examples.primer_example,
+        examples.bundles1,
+        examples.bundles2,
+        examples.datatypes,
+        examples.collections,
+        examples.long_literals,
+    ],
+)
+def test_sqlite_store_keeps_records(example):
+    document = example()
+    copy = _copy_into(document, SQLiteRecordStore(batch_size=3))
+    assert copy == document
+    for bundle in copy.bundles:
+        assert isinstance(bundle._records, SQLiteRecordStore)
+    assert ProvDocument.deserialize(content=copy.serialize()) == document
+
+
+def test_sqlite_store_keeps_value_types():
+    document = ProvDocument()
+    document.add_namespace("ex", "http://example.org/")
+    attributes = {
+        "ex:flag": True,
+        "ex:int": 2,
+        "ex:float": 2.0,
+        "ex:big": 2**70,
+        "ex:long": Literal("42", XSD_LONG),
+        "ex:text": Literal("bonjour", langtag="fr"),
+        "ex:plain": "text",
+        "ex:ref": document.valid_qualified_name("ex:other"),
+        "ex:uri": Identifier("http://example.org/page"),
+        "ex:when": datetime.datetime(2026, 5, 6, 7, 8, tzinfo=datetime.timezone.utc),
+    }
+    document.entity("ex:e1", attributes)
+    copy = _copy_into(document, SQLiteRecordStore())
+    (record,) = copy.get_record("ex:e1")
+    assert record == document.get_record("ex:e1")[0]
+    original = document.get_record("ex:e1")[0]
+    assert [(name, type(value), value) for name, value in record.attributes] == [
+        (name, type(value), value) for name, value in original.attributes
+    ]
+    assert record.bundle is copy
+
+
+def test_sqlite_store_indexes_identifiers_and_unifies():
+    document = ProvDocument(store=SQLiteRecordStore(batch_size=2))
+    document.add_namespace("ex", "http://example.org/")
+    document.entity("ex:e1", {"ex:a": 1})
+    document.activity("ex:a1")
+    document.entity("ex:e1", {"ex:b": 2})
+    assert len(document.get_record("ex:e1")) == 2
+    assert document.get_record("ex:unknown") == []
+    assert len(document._records) == 3
+    unified = document.unified()
+    (entity,) = unified.get_record("ex:e1")
+    assert entity.get_attribute("ex:a") == {1}
+    assert entity.get_attribute("ex:b") == {2}
+
+
+def test_sqlite_store_persists_to_a_file(tmp_path):
+    path = tmp_path / "prov.sqlite"
+    store = SQLiteRecordStore(path)
+    document = _copy_into(examples.bundles2(), store)
+    store.close()
+
+    reopened = ProvDocument(store=SQLiteRecordStore(path))
+    assert set(reopened.get_records()) == set(examples.bundles2().get_records())
+    with sqlite3.connect(path) as connection:
+        (bundles,) = connection.execute(
+            "SELECT count(DISTINCT bundle) FROM prov_records"
+        ).fetchone()
+    assert bundles == 1 + len(list(document.bundles))
+
+
+def test_sqlite_store_streams_serialization():
+    store = SQLiteRecordStore(batch_size=10)
+    document = ProvDocument(store=store)
+    document.add_namespace("ex", "http://example.org/")
+    for i in range(100):
+        document.entity(f"ex:e{i}", {"ex:n": i})
+    assert len(store._pending) <= 10
+    output = io.StringIO()
+    document.serialize(output, format="provn")
+    assert output.getvalue().count("entity(ex:e") == 100
+
+
+def test_values_that_cannot_be_stored_are_rejected():
+    document = ProvDocument(store=SQLiteRecordStore(batch_size=1))
+    document.add_namespace("ex", "http://example.org/")
+    document.entity("ex:e0")
+    # the record is rejected when added, not when its batch is written
+    with pytest.raises(ProvException, match="Cannot store a value of type"):
+        document.entity("ex:e1", {"ex:a": object()})
+    document.entity("ex:e2")
+    document.entity("ex:e3")
+    assert [str(record.identifier) for record in document.get_records()] == [
+        "ex:e0",
+        "ex:e2",
+        "ex:e3",
+    ]
+
+
+def test_changes_just_after_adding_a_record_are_saved():
+    document = ProvDocument(store=SQLiteRecordStore(batch_size=1))
+    document.add_namespace("ex", "http://example.org/")
+    document.revision("ex:e2", "ex:e1")
+    document.entity("ex:e3")
+    (revision,) = document.get_records(ProvDerivation)
+    assert revision.get_asserted_types() == {PROV["Revision"]}
+
+
+def test_changes_to_written_records_are_saved():
+    document = ProvDocument(store=SQLiteRecordStore(batch_size=1))
+    document.add_namespace("ex", "http://example.org/")
+    entity = document.entity("ex:e")
+    document.entity("ex:f")
+    document.activity("ex:a1")
+    entity.add_attributes({"ex:a": 1})
+    document.get_record("ex:f")[0].add_attributes({"ex:b": 2})
+    document.get_record("ex:a1")[0].set_time(datetime.datetime(2026, 1, 1))
+    assert document.get_record("ex:e")[0].get_attribute("ex:a") == {1}
+    assert document.get_record("ex:f")[0].get_attribute("ex:b") == {2}
+    provn = document.get_provn()
+    assert "entity(ex:e, [ex:a=1])" in provn
+    assert "entity(ex:f, [ex:b=2])" in provn
+    assert "activity(ex:a1, 2026-01-01T00:00:00, -)" in provn
+
+
+def test_changes_to_pending_records_are_encoded_at_once():
+    document = ProvDocument(store=SQLiteRecordStore(batch_size=10))
+    document.add_namespace("ex", "http://example.org/")
+    entity = document.entity("ex:e")
+    entity.add_attributes({"ex:a": 1})
+    with pytest.raises(ProvException, match="Cannot store a value of type"):
+        entity.add_attributes({"ex:b": object()})
+    document.entity("ex:f")
+    assert document.get_record("ex:e")[0].get_attribute("ex:a") == {1}
+    assert document.get_record("ex:e")[0].get_attribute("ex:b") == set()
+    assert len(document.get_records()) == 2
+
+
+def test_changes_to_read_records_that_cannot_be_stored_are_rejected():
+    document = ProvDocument(store=SQLiteRecordStore(batch_size=1))
+    document.add_namespace("ex", "http://example.org/")
+    document.entity("ex:e", {"ex:a": 1})
+    document.entity("ex:f")
+    with pytest.raises(ProvException, match="Cannot store a value of type"):
+        document.get_record("ex:e")[0].add_attributes({"ex:b": object()})
+    assert document.get_record("ex:e")[0].get_attribute("ex:b") == set()
+    assert document.get_record("ex:e")[0].get_attribute("ex:a") == {1}
+
+
+def test_sqlite_store_can_be_used_from_other_threads():
+    document = _copy_into(examples.bundles1(), SQLiteRecordStore(batch_size=2))
+    expected = document.serialize(format="provn")
+    with ThreadPoolExecutor(4) as executor:
+        outputs = list(
+            executor.map(lambda _: document.serialize(format="provn"), range(8))
+        )
+        executor.submit(document.entity, "ex:added").result()
+    assert outputs == [expected] * 8
+    assert len(document.get_record("ex:added")) == 1
+
+
+def test_records_can_be_changed_while_iterating():
+    document = ProvDocument(store=SQLiteRecordStore(batch_size=2))
+    document.add_namespace("ex", "http://example.org/")
+    for i in range(5):
+        document.entity(f"ex:e{i}")
+    for i, record in enumerate(document.get_records()):
+        record.add_attributes({"ex:n": i})
+    for i, record in enumerate(document._records):
+        record.add_attributes({"ex:m": i})
+    assert [
+        (record.get_attribute("ex:n"), record.get_attribute("ex:m"))
+        for record in document._records
+    ] == [({i}, {i}) for i in range(5)]
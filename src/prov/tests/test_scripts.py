@@ -15,18 +15,24 @@ argument, rather than passing ``argv=[...]`` to ``main()``.
 """
 
 import io
+import json
+import os
 import shutil
 import sys
 
 import pytest
 
 from prov.model import ProvDocument
+from prov.profiling import ProfileStats
 from prov.scripts.compare import main as compare_main
 from prov.scripts.convert import (
     GRAPHVIZ_SUPPORTED_FORMATS,
     CLIError,
+    collect_inputs,
+    convert_batch,
     convert_file,
     main as convert_main,
+    sniff_format,
 )
 from prov.tests.examples import primer_example, w3c_publication_1
 
@@ -197,6 +203,203 @@ def test_convert_closes_files_even_when_conversion_fails(infile, tmp_path, monke
     assert captured["outfile"].closed
 
 
+def test_convert_with_an_input_format(tmp_path, monkeypatch):
+    source = tmp_path / "doc.xml"
+    outfile = tmp_path / "doc.json"
+    primer_example().serialize(str(source), format="xml")
+    monkeypatch.setattr(
+        sys, "argv", ["prov-convert", "-i", "xml", str(source), str(outfile)]
+    )
+    assert convert_main() == 0
+    assert ProvDocument.deserialize(str(outfile)) == primer_example()
+
+
+@pytest.fixture
+def batch_inputs(tmp_path):
+    # data/a.json, data/b.xml, data/sub/c.jsonld, data/sub/d.trig, data/bad.json
+    data = tmp_path / "data"
+    (data / "sub").mkdir(parents=True)
+    document = primer_example()
+    document.serialize(str(data / "a.json"), format="json")
+    document.serialize(str(data / "b.xml"), format="xml")
+    document.serialize(str(data / "sub" / "c.jsonld"), format="jsonld")
+    document.serialize(str(data / "sub" / "d.trig"), format="rdf")
+    (data / "bad.json").write_text("{not json")
+    return data
+
+
+def test_sniff_format(batch_inputs):
+    assert sniff_format(str(batch_inputs / "a.json")) == "json"
+    assert sniff_format(str(batch_inputs / "b.xml")) == "xml"
+    assert sniff_format(str(batch_inputs / "sub" / "c.jsonld")) == "jsonld"
+    assert sniff_format(str(batch_inputs / "sub" / "d.trig")) == "rdf"
+    unknown = batch_inputs / "notes.txt"
+    unknown.write_text("hello")
+    assert sniff_format(str(unknown)) is None
+
+
+def test_collect_inputs(batch_inputs, tmp_path):
+    data = str(batch_inputs)
+    assert [relative for _, relative in collect_inputs([data])] == [
+        "a.json",
+        "b.xml",
+        "bad.json",
+        os.path.join("sub", "c.jsonld"),
+        os.path.join("sub", "d.trig"),
+    ]
+    found = list(
+        collect_inputs(
+            [os.path.join(data, "**", "*.json*"), os.path.join(data, "a.json")]
+        )
+    )
+    assert [relative for _, relative in found] == [
+        "a.json",
+        "bad.json",
+        os.path.join("sub", "c.jsonld"),
+    ]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_convert_batch(batch_inputs, tmp_path, jobs):
+    output_dir = tmp_path / "out"
+    errors = io.StringIO()
+    converted, failed = convert_batch(
+        [str(batch_inputs)], str(output_dir), "json", jobs=jobs, errors=errors
+    )
+    assert (converted, failed) == (4, 1)
+    assert errors.getvalue().startswith(f"{batch_inputs / 'bad.json'}: ")
+    assert errors.getvalue().count("\n") == 1
+    for name in ("a.json", "b.json", "sub/c.json", "sub/d.json"):
+        assert ProvDocument.deserialize(str(output_dir / name)) == primer_example()
+    assert not (output_dir / "bad.json").exists()
+
+
+def test_convert_batch_leaves_no_output_for_a_failed_conversion(
+    batch_inputs, tmp_path, monkeypatch
+):
+    def failing_write_document(prov_doc, outfile, output_format):
+        outfile.write(b"partial")
+        raise ValueError("cannot encode")
+
+    monkeypatch.setattr("prov.scripts.convert.write_document", failing_write_document)
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    (output_dir / "b.json").write_text("previous")
+    errors = io.StringIO()
+    converted, failed = convert_batch(
+        [str(batch_inputs / "*.*")], str(output_dir), "json", jobs=1, errors=errors
+    )
+    assert (converted, failed) == (0, 3)
+    assert "ValueError: cannot encode" in errors.getvalue()
+    assert sorted(path.name for path in output_dir.iterdir()) == ["b.json"]
+    assert (output_dir / "b.json").read_text() == "previous"
+
+
+def test_convert_batch_reports_clashing_outputs(batch_inputs, tmp_path):
+    primer_example().serialize(str(batch_inputs / "a.xml"), format="xml")
+    errors = io.StringIO()
+    converted, failed = convert_batch(
+        [str(batch_inputs / "a.*")], str(tmp_path / "out"), "provn", errors=errors
+    )
+    assert (converted, failed) == (1, 1)
+    assert "would overwrite" in errors.getvalue()
+    assert (tmp_path / "out" / "a.provn").read_text().startswith("document")
+
+
+def test_convert_batch_with_an_input_format(batch_inputs, tmp_path):
+    errors = io.StringIO()
+    converted, failed = convert_batch(
+        [str(batch_inputs / "*.json")],
+        str(tmp_path / "out"),
+        "xml",
+        input_format="json",
+        jobs=1,
+        errors=errors,
+    )
+    assert (converted, failed) == (1, 1)
+    assert (tmp_path / "out" / "a.xml").exists()
+
+
+def test_convert_batch_rejects_an_unsupported_format(batch_inputs, tmp_path):
+    with pytest.raises(CLIError):
+        convert_batch([str(batch_inputs)], str(tmp_path / "out"), "bogus")
+
+
+def test_convert_batch_main(batch_inputs, tmp_path, monkeypatch):
+    output_dir = tmp_path / "out"
+    stderr = io.StringIO()
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "prov-convert",
+            "-f",
+            "provn",
+            "-o",
+            str(output_dir),
+            "-j",
+            "1",
+            "-b",
+            str(batch_inputs / "a.json"),
+            str(batch_inputs / "sub"),
+        ],
+    )
+    monkeypatch.setattr(sys, "stderr", stderr)
+    assert convert_main() == 0
+    assert stderr.getvalue() == "prov-convert: 3 converted, 0 failed\n"
+    assert sorted(path.name for path in output_dir.iterdir()) == [
+        "a.provn",
+        "c.provn",
+        "d.provn",
+    ]
+
+    monkeypatch.setattr(
+        sys, "argv", ["prov-convert", "-o", str(output_dir), "-b", str(batch_inputs)]
+    )
+    assert convert_main() == 2
+
+
+def test_convert_stats(infile, tmp_path, monkeypatch):
+    outfile = tmp_path / "doc.xml"
+    stderr = io.StringIO()
+    monkeypatch.setattr(
+        sys, "argv", ["prov-convert", "--stats", "-f", "xml", str(infile), str(outfile)]
+    )
+    monkeypatch.setattr(sys, "stderr", stderr)
+    assert convert_main() == 0
+    rows = {
+        line.split()[0]: line.split()[1:] for line in stderr.getvalue().splitlines()
+    }
+    assert rows["parse"][0] == "1"
+    assert rows["encode"][0] == "1"
+    assert int(rows["build"][0]) == len(primer_example().records)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_convert_batch_stats(batch_inputs, tmp_path, jobs):
+    stats = ProfileStats()
+    convert_batch(
+        [str(batch_inputs)],
+        str(tmp_path / "out"),
+        "provn",
+        jobs=jobs,
+        errors=io.StringIO(),
+        stats=stats,
+    )
+    # Every file is parsed, but only the good ones are encoded
+    assert stats.counts["parse"] == 5
+    assert stats.counts["encode"] == 4
+    assert stats.total > 0
+
+
+def test_convert_batch_needs_an_output_dir(batch_inputs, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["prov-convert", "-b", str(batch_inputs)])
+    monkeypatch.setattr(sys, "stderr", io.StringIO())
+    with pytest.raises(SystemExit) as ctx:
+        convert_main()
+    assert ctx.value.code == 2
+
+
 @pytest.fixture
 def compare_files(tmp_path):
     json_file = tmp_path / "doc.json"
@@ -282,3 +485,43 @@ def test_closes_both_files_on_error(compare_files, monkeypatch):
     assert len(captured_sources) == 2
     for source in captured_sources:
         assert source.closed
+
+
+def test_diff_writes_json_lines(compare_files, tmp_path, monkeypatch):
+    json_file, _xml_file = compare_files
+    other = primer_example()
+    other.entity("ex:extra")
+    other_file = tmp_path / "other.json"
+    other.serialize(str(other_file), format="json")
+    stdout = io.StringIO()
+    monkeypatch.setattr(
+        sys, "argv", ["prov-compare", "--diff", str(json_file), str(other_file)]
+    )
+    monkeypatch.setattr(sys, "stdout", stdout)
+    rc = compare_main()
+    assert rc == 1
+    lines = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert lines == [
+        {
+            "change": "added",
+            "bundle": None,
+            "type": "prov:Entity",
+            "id": "ex:extra",
+            "old": [],
+            "new": ["entity(ex:extra)"],
+        }
+    ]
+
+
+def test_summary_of_equivalent_documents(compare_files, monkeypatch):
+    json_file, xml_file = compare_files
+    stdout = io.StringIO()
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["prov-compare", "-s", "-F", "xml", str(json_file), str(xml_file)],
+    )
+    monkeypatch.setattr(sys, "stdout", stdout)
+    rc = compare_main()
+    assert rc == 0
+    assert stdout.getvalue() == "No differences.\n"
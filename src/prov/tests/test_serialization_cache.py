@@ -0,0 +1,155 @@
+"""Mutation versioning and the opt-in ProvDocument serialization cache."""
+
+import datetime
+import io
+
+import pytest
+
+from prov import serializers
+from prov.model import ProvDocument
+from prov.tests.examples import primer_example
+
+
+def _count_serializer_calls(monkeypatch, format):
+    serializer_cls = serializers.get(format)
+    original = serializer_cls.serialize
+    calls = []
+
+    def counting_serialize(self, stream, **args):
+        calls.append(args)
+        return original(self, stream, **args)
+
+    monkeypatch.setattr(serializer_cls, "serialize", counting_serialize)
+    return calls
+
+
+def test_version_bumps_on_every_kind_of_mutation():
+    document = ProvDocument()
+    versions = [document.version]
+    document.add_namespace("ex", "http://example.org/")
+    versions.append(document.version)
+    entity = document.entity("ex:e1")
+    versions.append(document.version)
+    entity.add_attributes({"ex:a": 1})
+    versions.append(document.version)
+    bundle = document.bundle("ex:b")
+    versions.append(document.version)
+    bundle.entity("ex:e2")
+    versions.append(document.version)
+    activity = bundle.activity("ex:a1")
+    versions.append(document.version)
+    activity.set_time(datetime.datetime(2020, 1, 1))
+    versions.append(document.version)
+    assert versions == sorted(set(versions))
+
+
+def test_cache_is_off_by_default(monkeypatch):
+    calls = _count_serializer_calls(monkeypatch, "json")
+    document = primer_example()
+    document.serialize()
+    document.serialize()
+    assert len(calls) == 2
+
+
+def test_cached_output_is_reused_until_mutation(monkeypatch):
+    calls = _count_serializer_calls(monkeypatch, "json")
+    document = primer_example()
+    document.enable_serialization_cache()
+    first = document.serialize(indent=2)
+    assert document.serialize(indent=2) == first
+    assert len(calls) == 1
+    document.serialize(indent=4)
+    assert len(calls) == 2
+    document.entity("ex:new")
+    changed = document.serialize(indent=2)
+    assert len(calls) == 3
+    assert changed != first
+
+
+def test_cached_output_is_refreshed_after_set_time():
+    document = primer_example()
+    document.enable_serialization_cache()
+    (activity,) = document.get_record("ex:compose")
+    before = document.serialize(format="provn")
+    activity.set_time(datetime.datetime(2020, 1, 1))
+    after = document.serialize(format="provn")
+    assert after != before
+    assert after == primer_example().serialize(format="provn").replace(
+        "activity(ex:compose, -, -)", "activity(ex:compose, 2020-01-01T00:00:00, -)"
+    )
+
+
+# RDF is left out: rdflib's output order is not stable between two
+# serializations, cached or not.
+@pytest.mark.parametrize("format", ["json", "xml", "provn", "jsonld"])
+def test_cached_output_matches_uncached(format):
+    expected_text = primer_example().serialize(format=format)
+    expected_bytes = io.BytesIO()
+    primer_example().serialize(expected_bytes, format=format)
+    document = primer_example()
+    document.enable_serialization_cache()
+    for _ in range(2):
+        assert document.serialize(format=format) == expected_text
+        stream = io.BytesIO()
+        document.serialize(stream, format=format)
+        assert stream.getvalue() == expected_bytes.getvalue()
+
+
+def test_cached_rdf_output_round_trips():
+    document = primer_example()
+    document.enable_serialization_cache()
+    text = document.serialize(format="rdf")
+    stream = io.BytesIO()
+    document.serialize(stream, format="rdf")
+    assert document.serialize(format="rdf") == text
+    assert ProvDocument.deserialize(content=text, format="rdf") == document
+    stream.seek(0)
+    assert ProvDocument.deserialize(stream, format="rdf") == document
+
+
+def test_cache_writes_to_a_path(tmp_path):
+    document = primer_example()
+    document.enable_serialization_cache()
+    path = tmp_path / "doc.json"
+    document.serialize(str(path))
+    document.serialize(str(path))
+    assert ProvDocument.deserialize(str(path)) == document
+
+
+def test_cache_encoding_error_leaves_the_file_untouched(tmp_path):
+    document = primer_example()
+    document.enable_serialization_cache()
+    path = tmp_path / "doc.json"
+    path.write_text("previous")
+    with pytest.raises(TypeError):
+        document.serialize(str(path), no_such_argument=1)
+    assert path.read_text() == "previous"
+
+
+def test_cache_is_size_bounded(monkeypatch):
+    calls = _count_serializer_calls(monkeypatch, "json")
+    document = primer_example()
+    document.enable_serialization_cache(maxsize=1)
+    document.serialize(indent=2)
+    document.serialize(indent=4)
+    document.serialize(indent=2)
+    assert len(calls) == 3
+
+
+def test_unhashable_arguments_bypass_the_cache(monkeypatch):
+    calls = _count_serializer_calls(monkeypatch, "json")
+    document = primer_example()
+    document.enable_serialization_cache()
+    document.serialize(separators=[",", ":"])
+    document.serialize(separators=[",", ":"])
+    assert len(calls) == 2
+
+
+def test_disable_and_invalid_maxsize():
+    document = primer_example()
+    with pytest.raises(ValueError):
+        document.enable_serialization_cache(maxsize=0)
+    document.enable_serialization_cache()
+    document.serialize()
+    document.disable_serialization_cache()
+    assert document._serialization_cache is None
@@ -0,0 +1,218 @@
+"""Sharding documents, and merging the shards back together."""
+
+import json
+
+import pytest
+
+from prov.model import ProvDocument
+from prov.sharding import (
+    BY_BUNDLE,
+    BY_COMPONENT,
+    BY_HASH,
+    merge_shards,
+    serialize_shards,
+    shard_document,
+)
+from prov.tests.examples import tests as EXAMPLES
+
+STRATEGIES = [BY_BUNDLE, BY_HASH, BY_COMPONENT]
+
+
+def _document():
+    document = ProvDocument()
+    document.add_namespace("ex", "http://example.org/")
+    document.add_namespace("unused", "http://example.org/unused/")
+    document.entity("ex:e1")
+    document.entity("ex:e2")
+    document.wasDerivedFrom("ex:e2", "ex:e1")
+    document.activity("ex:a1")
+    document.wasGeneratedBy("ex:e1", "ex:a1")
+    document.entity("ex:f1")
+    document.agent("ex:ag")
+    bundle = document.bundle("ex:b1")
+    bundle.add_namespace("other", "http://example.com/")
+    bundle.entity("other:e3")
+    bundle.wasDerivedFrom("other:e3", "ex:e1")
+    document.bundle("ex:b2").entity("ex:e4")
+    document.bundle("ex:empty")
+    return document
+
+
+def _records(document):
+    return [
+        (bundle.identifier, record)
+        for bundle in (document, *document.bundles)
+        for record in bundle.get_records()
+    ]
+
+
+def _assert_same_document(merged, document):
+    assert merged == document
+    assert {bundle.identifier: bundle for bundle in merged.bundles} == {
+        bundle.identifier: bundle for bundle in document.bundles
+    }
+
+
+@pytest.mark.parametrize("by", STRATEGIES)
+@pytest.mark.parametrize("name, make_doc", EXAMPLES)
+def test_merged_shards_are_the_document(name, make_doc, by):
+    document = make_doc()
+    for count in (1, 3):
+        shards = shard_document(document, count, by=by)
+        assert len(shards) == count
+        assert sum(len(_records(shard)) for shard in shards) == len(_records(document))
+        _assert_same_document(merge_shards(shards), document)
+        contents = serialize_shards(shards)
+        _assert_same_document(
+            merge_shards(
+                ProvDocument.deserialize(content=content) for content in contents
+            ),
+            document,
+        )
+
+
+@pytest.mark.parametrize("by", STRATEGIES)
+def test_shards_declare_the_namespaces_they_use(by):
+    for shard in shard_document(_document(), 3, by=by):
+        used = {
+            name.namespace.uri
+            for _, record in _records(shard)
+            for name in (record.identifier, *record.args)
+            if name is not None
+        } | {bundle.identifier.namespace.uri for bundle in shard.bundles}
+        declared = {
+            namespace.uri
+            for bundle in (shard, *shard.bundles)
+            for namespace in bundle.get_registered_namespaces()
+        }
+        assert "http://example.org/unused/" not in declared
+        assert used - {"http://www.w3.org/ns/prov#"} <= declared
+
+
+def test_shards_by_bundle_keep_bundles_whole():
+    document = _document()
+    shards = shard_document(document, 2, by=BY_BUNDLE)
+    # the document's own records, the largest unit, fill the first shard
+    assert len(shards[0].get_records()) == len(document.get_records())
+    assert not shards[0].has_bundles()
+    assert sorted(str(bundle.identifier) for bundle in shards[1].bundles) == [
+        "ex:b1",
+        "ex:b2",
+        "ex:empty",
+    ]
+    # as many units as shards: one each
+    shards = shard_document(document, 4, by=BY_BUNDLE)
+    assert [
+        len(shard.get_records()) + len(list(shard.bundles)) for shard in shards
+    ] == [len(document.get_records()), 1, 1, 1]
+
+
+def test_shards_by_hash_are_stable():
+    document = _document()
+    larger = _document()
+    larger.entity("ex:e5")
+    larger.used("ex:a1", "ex:e5")
+
+    def shard_of(shards):
+        return {
+            (bundle_id, str(record)): index
+            for index, shard in enumerate(shards)
+            for bundle_id, record in _records(shard)
+        }
+
+    placement = shard_of(shard_document(document, 3))
+    assert shard_of(shard_document(larger, 3)).items() >= placement.items()
+    # an anonymous relation goes with the first name it refers to
+    assert (
+        placement[(None, "wasDerivedFrom(ex:e2, ex:e1, -, -, -)")]
+        == placement[(None, "entity(ex:e2)")]
+    )
+
+
+def test_shards_by_component_keep_connected_records_together():
+    document = _document()
+    shards = shard_document(document, 3, by=BY_COMPONENT)
+    placement = {
+        str(record): index
+        for index, shard in enumerate(shards)
+        for _, record in _records(shard)
+    }
+    connected = [
+        "entity(ex:e1)",
+        "entity(ex:e2)",
+        "activity(ex:a1, -, -)",
+        "wasGeneratedBy(ex:e1, ex:a1, -)",
+        # across bundles
+        "entity(other:e3)",
+        "wasDerivedFrom(other:e3, ex:e1, -, -, -)",
+    ]
+    assert len({placement[record] for record in connected}) == 1
+    # the largest component goes first into the first shard, the others
+    # (of one record each) into the emptiest shards
+    assert placement["entity(ex:e1)"] == 0
+    assert {placement["entity(ex:f1)"], placement["agent(ex:ag)"]} == {1, 2}
+
+
+def test_shards_are_serialized_compactly():
+    shards = shard_document(_document(), 2)
+    for content, shard in zip(serialize_shards(shards), shards, strict=True):
+        assert "\n" not in content
+        assert content == json.dumps(json.loads(content), separators=(",", ":"))
+        assert ProvDocument.deserialize(content=content) == shard
+    assert serialize_shards(shards, indent=2) == [
+        shard.serialize(indent=2) for shard in shards
+    ]
+    assert serialize_shards(shards, format="provn") == [
+        shard.serialize(format="provn") for shard in shards
+    ]
+
+
+def test_shard_document_arguments():
+    with pytest.raises(ValueError, match="0 shards"):
+        shard_document(_document(), 0)
+    with pytest.raises(ValueError, match="Unknown sharding"):
+        shard_document(_document(), 2, by="size")
+
+
+def test_merge_renames_namespaces_with_a_taken_prefix():
+    first = ProvDocument()
+    first.add_namespace("ex", "http://example.org/first/")
+    first.entity("ex:e", {"ex:n": 1})
+    second = ProvDocument()
+    second.add_namespace("ex", "http://example.org/second/")
+    second.entity("ex:e", {"ex:n": 2, "ex:ref": second.valid_qualified_name("ex:x")})
+    second.wasDerivedFrom("ex:e", "ex:x")
+
+    merged = merge_shards([first, second])
+    expected = ProvDocument()
+    expected.update(first)
+    expected.update(second)
+    assert merged.serialize(format="provn") == expected.serialize(format="provn")
+    assert [str(record) for record in merged.get_records()] == [
+        "entity(ex:e, [ex:n=1])",
+        "entity(ex_1:e, [ex_1:n=2, ex_1:ref='ex_1:x'])",
+        "wasDerivedFrom(ex_1:e, ex_1:x, -, -, -)",
+    ]
+    # renamed records keep their digest, which does not depend on prefixes
+    assert [record.digest() for record in merged.get_records()] == [
+        record.digest() for record in (*first.get_records(), *second.get_records())
+    ]
+    assert second == merge_shards([second])
+
+
+def test_merge_shares_records_and_combines_bundles():
+    shards = shard_document(_document(), 3, by=BY_HASH)
+    merged = merge_shards(shards)
+    merged_records = {str(record): record for _, record in _records(merged)}
+    for shard in shards:
+        for _, record in _records(shard):
+            assert merged_records[str(record)]._attributes is record._attributes
+    # each bundle is in one piece again
+    assert sorted(str(bundle.identifier) for bundle in merged.bundles) == [
+        "ex:b1",
+        "ex:b2",
+        "ex:empty",
+    ]
+    # the shards are left untouched
+    merged.get_record("ex:e1")[0].add_attributes({"ex:n": 1})
+    assert shards == shard_document(_document(), 3, by=BY_HASH)
@@ -0,0 +1,160 @@
+"""Frozen snapshots: immutable, sharing the records of their document."""
+
+import datetime
+
+import pytest
+
+from prov.model import (
+    ProvActivity,
+    ProvDocument,
+    ProvElement,
+    ProvEntity,
+    ProvException,
+    ProvGeneration,
+    ProvRelation,
+)
+from prov.model.snapshot import FrozenProvBundle, FrozenProvDocument
+from prov.model.store import SQLiteRecordStore
+from prov.tests.examples import primer_example, tests as EXAMPLES
+
+
+def _document(store=None):
+    document = ProvDocument(store=store)
+    document.add_namespace("ex", "http://example.org/")
+    document.entity("ex:e1", {"prov:label": "e1"})
+    document.activity("ex:a1")
+    document.wasGeneratedBy("ex:e1", "ex:a1")
+    document.alternateOf("ex:e1", "ex:e1")
+    bundle = document.bundle("ex:b")
+    bundle.entity("ex:e2")
+    bundle.wasDerivedFrom("ex:e2", "ex:e1")
+    return document
+
+
+@pytest.mark.parametrize("name, make_doc", EXAMPLES)
+def test_snapshot_has_the_content_of_the_document(name, make_doc):
+    document = make_doc()
+    snapshot = document.freeze()
+    assert isinstance(snapshot, FrozenProvDocument)
+    assert snapshot == document
+    assert document == snapshot
+    assert snapshot.digest() == document.digest()
+    assert snapshot.serialize(format="provn") == document.serialize(format="provn")
+    assert snapshot.freeze() is snapshot
+
+
+def test_snapshot_cannot_be_changed_nor_unfrozen():
+    snapshot = _document().freeze()
+    bundle = next(iter(snapshot.bundles))
+    assert isinstance(bundle, FrozenProvBundle)
+    assert snapshot.frozen and bundle.frozen
+    entity = snapshot.get_record("ex:e1")[0]
+    for mutation in (
+        lambda: snapshot.entity("ex:e3"),
+        lambda: snapshot.add_namespace("other", "http://example.com/"),
+        lambda: snapshot.bundle("ex:b2"),
+        lambda: bundle.entity("ex:e3"),
+        lambda: entity.add_attributes({"ex:n": 1}),
+    ):
+        with pytest.raises(ProvException, match="frozen"):
+            mutation()
+    for frozen_bundle in (snapshot, bundle):
+        with pytest.raises(ProvException, match="unfrozen"):
+            frozen_bundle.set_frozen(False)
+    assert snapshot == _document()
+
+
+def test_snapshot_shares_the_records_until_the_document_changes_them():
+    document = _document()
+    entity = document.get_record("ex:e1")[0]
+    activity = document.get_record("ex:a1")[0]
+    snapshot = document.freeze()
+    frozen_entity = snapshot.get_record("ex:e1")[0]
+    frozen_activity = snapshot.get_record("ex:a1")[0]
+    assert frozen_entity is not entity
+    assert frozen_entity.bundle is snapshot
+    assert frozen_entity._attributes is entity._attributes
+
+    entity.add_attributes({"ex:n": 1})
+    entity.add_asserted_type(document.valid_qualified_name("ex:T"))
+    activity.set_time(datetime.datetime(2026, 1, 1))
+    document.entity("ex:e3")
+    document.add_namespace("other", "http://example.com/")
+    document.bundle("ex:b2")
+    next(iter(document.bundles)).entity("ex:e4")
+
+    assert frozen_entity._attributes is not entity._attributes
+    assert frozen_entity.attributes == [
+        (document.valid_qualified_name("prov:label"), "e1")
+    ]
+    assert frozen_activity.get_startTime() is None
+    assert snapshot == _document()
+    assert snapshot != document
+    assert "other" not in snapshot._namespaces
+    assert snapshot != document.freeze()
+
+
+def test_snapshot_of_a_document_in_a_database():
+    document = _document(SQLiteRecordStore())
+    snapshot = document.freeze()
+    assert snapshot == _document()
+    assert isinstance(snapshot.get_record("ex:e1")[0], ProvEntity)
+
+
+def test_records_are_indexed_by_type_and_references():
+    document = primer_example()
+    snapshot = document.freeze()
+    for classes in (
+        ProvEntity,
+        ProvActivity,
+        ProvGeneration,
+        ProvElement,
+        ProvRelation,
+        (ProvActivity, ProvGeneration),
+    ):
+        assert list(snapshot.get_records(classes)) == list(
+            document.get_records(classes)
+        )
+    assert snapshot.get_records() == document.get_records()
+
+    referencing = [
+        record
+        for record in document.get_records()
+        if any(
+            value == snapshot.valid_qualified_name("ex:article")
+            for value in dict(record.formal_attributes).values()
+        )
+    ]
+    assert snapshot.get_records_referencing("ex:article") == referencing
+    assert len(referencing) == 3
+    assert snapshot.get_records_referencing("ex:unknown") == []
+    assert snapshot.get_records_referencing("_:blank") == []
+
+    # a record referring to a name twice is listed once
+    bundle_snapshot = _document().freeze()
+    assert [
+        str(record.get_type())
+        for record in bundle_snapshot.get_records_referencing("ex:e1")
+    ] == ["prov:Generation", "prov:Alternate"]
+    bundle = next(iter(bundle_snapshot.bundles))
+    assert len(bundle.get_records_referencing("ex:e1")) == 1
+
+
+def test_snapshots_are_hashable_and_compared_by_digest():
+    first = _document().freeze()
+    second = _document().freeze()
+    assert first == second
+    assert hash(first) == hash(second)
+    assert {first: "cached"}[second] == "cached"
+    bundles = [next(iter(snapshot.bundles)) for snapshot in (first, second)]
+    assert bundles[0] == bundles[1]
+    assert hash(bundles[0]) == hash(bundles[1])
+    other = primer_example().freeze()
+    assert first != other
+
+    record = first.get_record("ex:e1")[0]
+    assert record._hash is None
+    record_hash = hash(record)
+    assert record._hash == record_hash
+    assert hash(_document().get_record("ex:e1")[0]) == record_hash
+    assert _document().get_record("ex:e1")[0]._hash is None
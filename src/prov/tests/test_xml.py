@@ -15,6 +15,7 @@ from prov.serializers.provxml import (
     ProvXMLException,
     ProvXMLSerializer,
     _escape_ncname_localpart,
+    _prov_xml_schema,
     _unescape_ncname_localpart,
     xml_qname_to_QualifiedName,
 )
@@ -657,6 +658,200 @@ def test_escape_unescape_ncname_localpart_is_inverse(local):
         etree.Element(escaped)
 
 
+def test_writer_tags_are_cached_by_namespace_and_local_part():
+    # Two attribute names with the same URI, split differently between
+    # namespace and local part, are equal QualifiedNames but distinct tags
+    document = prov.ProvDocument()
+    document.add_namespace("ex", "http://example.org/")
+    document.add_namespace("exa", "http://example.org/a")
+    document.entity("ex:e1", {"ex:ab": "1", "ex:weird'key": "3"})
+    document.entity("ex:e2", {"exa:b": "2"})
+    serializer = ProvXMLSerializer(document)
+    outputs = []
+    for _ in range(2):
+        with io.StringIO() as stream:
+            serializer.serialize(stream)
+            outputs.append(stream.getvalue())
+    assert outputs[0] == outputs[1]
+    assert "<ex:ab>1</ex:ab>" in outputs[0]
+    assert "<exa:b>2</exa:b>" in outputs[0]
+    assert "<ex:weird_x0027_key>" in outputs[0]
+    assert set(serializer._tags) >= {
+        ("http://example.org/", "ab"),
+        ("http://example.org/a", "b"),
+        ("http://example.org/", "weird'key"),
+    }
+
+
+def test_writer_namespace_map_follows_the_document_between_writes():
+    document = prov.ProvDocument()
+    document.add_namespace("ex", "http://example.org/")
+    bundle = document.bundle("ex:b1")
+    bundle.add_namespace("b", "http://example.org/b/")
+    bundle.entity("b:e1")
+    serializer = ProvXMLSerializer(document)
+    with io.StringIO() as stream:
+        serializer.serialize(stream)
+        assert "xmlns:tr" not in stream.getvalue()
+    document.add_namespace(*EX_TR)
+    document.entity("tr:e2")
+    with io.StringIO() as stream:
+        serializer.serialize(stream)
+        root = etree.fromstring(stream.getvalue().encode("utf-8"))
+    assert root.nsmap["tr"] == EX_TR[1]
+    (bundle_content,) = root.findall(f"{{{PROV.uri}}}bundleContent")
+    assert bundle_content.nsmap["b"] == "http://example.org/b/"
+    assert bundle_content.nsmap["tr"] == EX_TR[1]
+    # A bundle serialized on its own builds its namespace map afresh
+    element = serializer.serialize_bundle(bundle)
+    assert element.nsmap["b"] == "http://example.org/b/"
+    assert element.nsmap["tr"] == EX_TR[1]
+
+
+# The ways of parsing PROV-XML, as deserialize() keyword arguments
+PARSE_MODES = [
+    pytest.param({}, id="tree"),
+    pytest.param({"validate": True}, id="validated"),
+    pytest.param({"streaming": True}, id="streaming"),
+    pytest.param({"validate": True, "streaming": True}, id="validated-streaming"),
+]
+
+INVALID_XML_FILES = {"example_34.xml", "pc1.xml"}
+
+
+def _deserialize_or_error(path, **args):
+    try:
+        return prov.ProvDocument.deserialize(path, format="xml", **args)
+    except ProvXMLException as e:
+        return str(e)
+
+
+@pytest.mark.parametrize("args", PARSE_MODES[1:])
+@pytest.mark.parametrize(
+    "filename", sorted(name for name in os.listdir(DATA_PATH) if name.endswith(".xml"))
+)
+def test_parse_modes_read_the_same_documents(filename, args):
+    path = os.path.join(DATA_PATH, filename)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = _deserialize_or_error(path)
+        actual = _deserialize_or_error(path, **args)
+    if args.get("validate") and filename in INVALID_XML_FILES:
+        assert actual.startswith("Invalid PROV-XML document: ")
+    else:
+        assert actual == expected
+
+
+@pytest.mark.parametrize("args", PARSE_MODES)
+def test_parse_modes_read_bundles_from_streams(args):
+    document = prov.ProvDocument()
+    document.add_namespace(*EX_NS)
+    document.entity("ex:e0", {"prov:label": "top"})
+    for i in range(3):
+        bundle = document.bundle(f"ex:b{i}")
+        bundle.entity(f"ex:e{i}", {"ex:n": i})
+        bundle.activity(f"ex:a{i}")
+        bundle.wasGeneratedBy(f"ex:e{i}", f"ex:a{i}")
+    document.agent("ex:ag")
+    content = document.serialize(format="xml")
+    for stream in (io.StringIO(content), io.BytesIO(content.encode("utf-8"))):
+        actual = prov.ProvDocument.deserialize(stream, format="xml", **args)
+        assert actual == document
+
+
+INVALID_DOCUMENT = """<prov:document
+    xmlns:prov="http://www.w3.org/ns/prov#"
+    xmlns:ex="http://example.com/ns/ex#">
+  <prov:entity prov:id="ex:e1"/>
+  <prov:activity prov:id="ex:a1"><prov:entity prov:ref="ex:e1"/></prov:activity>
+  <prov:wasGeneratedBy><prov:entity prov:ref="ex:e1"/></prov:wasGeneratedBy>
+</prov:document>
+"""
+
+
+VALID_DOCUMENT = INVALID_DOCUMENT.replace(
+    '<prov:entity prov:ref="ex:e1"/></prov:activity>', "</prov:activity>"
+)
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_validation_rejects_invalid_documents(streaming):
+    # Read as is without validation ...
+    document = prov.ProvDocument.deserialize(
+        content=INVALID_DOCUMENT, format="xml", streaming=streaming
+    )
+    assert len(document.records) == 3
+    # ... but an activity has no prov:entity attribute
+    with pytest.raises(ProvXMLException, match="Invalid PROV-XML document"):
+        prov.ProvDocument.deserialize(
+            content=INVALID_DOCUMENT, format="xml", validate=True, streaming=streaming
+        )
+    document = prov.ProvDocument.deserialize(
+        content=VALID_DOCUMENT, format="xml", validate=True, streaming=streaming
+    )
+    assert len(document.records) == 3
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_validation_reports_invalid_elements_before_failing_to_read_them(
+    streaming,
+):
+    # An element this package cannot read either: the violation of the
+    # schema is reported, rather than the failure to read it
+    content = INVALID_DOCUMENT.replace("prov:activity", "prov:notARecord")
+    with pytest.raises(KeyError):
+        prov.ProvDocument.deserialize(
+            content=content, format="xml", streaming=streaming
+        )
+    with pytest.raises(ProvXMLException, match="notARecord"):
+        prov.ProvDocument.deserialize(
+            content=content, format="xml", validate=True, streaming=streaming
+        )
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize(
+    "content",
+    [
+        pytest.param(VALID_DOCUMENT[:-20], id="truncated"),
+        pytest.param(VALID_DOCUMENT[:150], id="truncated-in-tag"),
+        pytest.param(VALID_DOCUMENT.replace("ex:a1", "a & b"), id="bare-ampersand"),
+        pytest.param("<!-- no element -->", id="no-element"),
+    ],
+)
+def test_validation_leaves_malformed_xml_errors_alone(content, streaming):
+    with pytest.raises(etree.XMLSyntaxError):
+        prov.ProvDocument.deserialize(
+            content=content, format="xml", validate=True, streaming=streaming
+        )
+
+
+def test_validation_schema_is_compiled_once():
+    assert _prov_xml_schema() is _prov_xml_schema()
+
+
+def test_streaming_discards_the_elements_read(tmp_path):
+    document = prov.ProvDocument()
+    document.add_namespace(*EX_NS)
+    for i in range(50):
+        document.entity(f"ex:e{i}", {"ex:n": i})
+    path = tmp_path / "doc.xml"
+    document.serialize(path, format="xml")
+    seen = []
+    serializer = ProvXMLSerializer()
+    read = serializer._deserialize_element
+
+    def spy(element, bundle):
+        # The elements read before are gone from the tree, but for the last
+        # one, emptied
+        seen.append([len(e) for e in element.itersiblings(preceding=True)])
+        return read(element, bundle)
+
+    serializer._deserialize_element = spy
+    assert serializer.deserialize_file(path, streaming=True) == document
+    assert seen == [[]] + [[0]] * 49
+
+
 # Hardening against XXE / entity expansion (#273).
 #
 # Three distinct vectors were checked against unmodified pre-fix HEAD
@@ -759,7 +954,8 @@ _BILLION_LAUGHS_DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
 """
 
 
-def test_external_entity_does_not_leak_file_contents(tmp_path):
+@pytest.mark.parametrize("args", PARSE_MODES)
+def test_external_entity_does_not_leak_file_contents(tmp_path, args):
     # Actual hardened behaviour observed with `_XML_PARSER`
     # (resolve_entities=False): the document deserializes without raising,
     # but the SYSTEM entity reference is left unresolved rather than
@@ -775,7 +971,7 @@ def test_external_entity_does_not_leak_file_contents(tmp_path):
     secret_path.write_text("TOPSECRET123")
 
     xml_string = _xxe_document(secret_path.as_posix())
-    document = prov.ProvDocument.deserialize(content=xml_string, format="xml")
+    document = prov.ProvDocument.deserialize(content=xml_string, format="xml", **args)
 
     assert "TOPSECRET123" not in document.get_provn()
     entity = next(iter(document.get_records(prov.ProvEntity)))
@@ -783,18 +979,22 @@ def test_external_entity_does_not_leak_file_contents(tmp_path):
     assert values == [""]
 
 
-def test_billion_laughs_does_not_expand():
+@pytest.mark.parametrize("args", PARSE_MODES)
+def test_billion_laughs_does_not_expand(args):
     # Guards against unbounded entity amplification. This is libxml2's own
     # long-standing hard-coded amplification cap doing the work, not
     # anything provxml.py configures -- kept here as a regression guard in
     # case that upstream protection is ever weakened (e.g. via a future
     # `huge_tree=True`, which this module deliberately never sets).
     with pytest.raises(etree.XMLSyntaxError):
-        prov.ProvDocument.deserialize(content=_BILLION_LAUGHS_DOCUMENT, format="xml")
+        prov.ProvDocument.deserialize(
+            content=_BILLION_LAUGHS_DOCUMENT, format="xml", **args
+        )
 
 
+@pytest.mark.parametrize("args", PARSE_MODES)
 def test_deserialize_ignores_tampered_default_parser(
-    tmp_path, restore_default_xml_parser
+    tmp_path, restore_default_xml_parser, args
 ):
     # The reproducible vector: provxml.py's own `etree.parse` calls pass an
     # explicit, hardened parser, so they are unaffected even when some other
@@ -810,7 +1010,7 @@ def test_deserialize_ignores_tampered_default_parser(
     etree.set_default_parser(etree.XMLParser(resolve_entities=True, no_network=True))
 
     xml_string = _xxe_document(secret_path.as_posix())
-    document = prov.ProvDocument.deserialize(content=xml_string, format="xml")
+    document = prov.ProvDocument.deserialize(content=xml_string, format="xml", **args)
 
     entity = next(iter(document.get_records(prov.ProvEntity)))
     values = list(entity.get_attribute(PROV["type"]))
@@ -2,8 +2,9 @@
 
 Serializes each of the 8 canonical `examples.tests` documents and one document
 per entry of the `ATTRIBUTE_VALUES` datatype corpus, then validates the
-resulting XML against the vendored `prov.xsd` schema closure
-(`src/prov/tests/schemas/`, see that directory's README.md for provenance).
+resulting XML against the vendored `prov.xsd` schema closure, the one shipped
+with the package for `validate=True` (`src/prov/serializers/schemas/`, see
+`src/prov/tests/schemas/README.md` for provenance).
 
 Audit authority: docs/superpowers/specs/2026-07-10-conformance-audit-findings.md
 section 3.1.
@@ -16,11 +17,12 @@ import pytest
 
 etree = pytest.importorskip("lxml.etree")
 
+from prov import serializers  # noqa: E402
 from prov.model import ProvDocument  # noqa: E402
 from prov.tests import examples  # noqa: E402
 from prov.tests.attribute_values import ATTRIBUTE_VALUES, EX_NS  # noqa: E402
 
-SCHEMA_DIR = Path(__file__).parent / "schemas"
+SCHEMA_DIR = Path(serializers.__file__).parent / "schemas"
 
 # --- Triage: schema/spec limitations (documented skips, not prov bugs) ------
 #